@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import copy
+import multiprocessing
 import random
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Protocol, Tuple
+from typing import Any, Callable, Dict, List, Optional, Protocol, Tuple
 
 from domain.entities.alliance import AllianceArmyAssignment
 from domain.entities.alliance_battle import (
@@ -20,8 +25,9 @@ from domain.entities.alliance_registration import (
 )
 from domain.repositories.alliance_repo import IAllianceRepo
 from domain.repositories.player_repo import IPlayerRepo
-from domain.services.pvp_battle_engine import PvpPlayer, run_pvp_battle
+from domain.services.pvp_battle_engine import PvpBeast, PvpPlayer, run_pvp_battle
 from application.services.beast_pvp_service import BeastPvpService
+from infrastructure.db.unit_of_work import transaction
 
 
 class PlayerBeastRepoProtocol(Protocol):
@@ -34,6 +40,31 @@ SIGNUP_STATUS_ENGAGED = 2
 SIGNUP_STATUS_ELIMINATED = 3
 SIGNUP_STATUS_ADVANCED = 4
 
+# 阵容缓存键：(registration_id, user_id)
+RosterKey = Tuple[int, int]
+
+# 战斗进度监听：(战斗, 左方报名, 右方报名)，配对、每回合结束、整块结算后调用
+ProgressListener = Callable[[AllianceLandBattle, AllianceRegistration, AllianceRegistration], None]
+
+# 已结束回合的对战详情缓存条数（结束后不再变化，只按 LRU 淘汰）
+ROUND_DUELS_CACHE_LIMIT = 512
+
+# 进行中战斗的阵容缓存场数（配对后无人推进的战斗也会按 LRU 淘汰）
+ROSTER_CACHE_LIMIT = 256
+
+
+@dataclass
+class _CachedRoster:
+    """一场战斗的阵容缓存
+
+    round_no 为阵容气血对应的待进行回合；与库中进行中的回合不一致，
+    说明其它进程已推进过这场战斗，需要按库中的报名状态重建。
+    """
+
+    land_id: int
+    round_no: int
+    players: Dict[RosterKey, PvpPlayer]
+
 
 class AllianceBattleService:
     """Handles land battle preparation, pairing, and round progression."""
@@ -49,6 +80,27 @@ class AllianceBattleService:
         self.player_repo = player_repo
         self.player_beast_repo = player_beast_repo
         self.beast_pvp_service = beast_pvp_service
+        # battle_id -> 阵容缓存
+        # 配对时构建一次，回合之间在内存中保留幻兽气血；战斗结束、土地重新配对或按 LRU 淘汰时移除
+        self._rosters: "OrderedDict[int, _CachedRoster]" = OrderedDict()
+        # land_id -> 整块土地一次结算后预先生成的战况（重新配对时移除）
+        self._land_overviews: Dict[int, dict] = {}
+        # round_id -> 已结束回合的对战详情；(battle_id, round_no) -> round_id
+        self._round_duels: "OrderedDict[int, dict]" = OrderedDict()
+        self._round_index: Dict[Tuple[int, int], int] = {}
+        self._progress_listeners: List[ProgressListener] = []
+
+    def add_progress_listener(self, listener: ProgressListener) -> None:
+        self._progress_listeners.append(listener)
+
+    def _notify_progress(
+        self,
+        battle: AllianceLandBattle,
+        left_registration: AllianceRegistration,
+        right_registration: AllianceRegistration,
+    ) -> None:
+        for listener in self._progress_listeners:
+            listener(battle, left_registration, right_registration)
 
     def lock_and_pair_land(self, land_id: int, seed: Optional[int] = None) -> dict:
         """Lock confirmed registrations on a land and pair them into battles."""
@@ -72,6 +124,11 @@ class AllianceBattleService:
                 ],
             }
 
+        self._land_overviews.pop(land_id, None)
+        # 上一轮配对中未打完的战斗不会再推进
+        for stale_id in [bid for bid, cached in self._rosters.items() if cached.land_id == land_id]:
+            del self._rosters[stale_id]
+
         # Reactivate waiting registrations so they join the next pairing batch.
         if waiting_regs:
             for reg in waiting_regs:
@@ -125,6 +182,7 @@ class AllianceBattleService:
             left_signups = self._build_army_signups(left, now)
             right_signups = self._build_army_signups(right, now)
             self.alliance_repo.add_army_signups(left_signups + right_signups)
+            self._cache_roster(battle_id, land_id, 1, self._build_roster(left_signups + right_signups))
 
             round_record = AllianceLandBattleRound(
                 id=None,
@@ -142,6 +200,7 @@ class AllianceBattleService:
             right.status = STATUS_IN_BATTLE
             self.alliance_repo.save_land_registration(left)
             self.alliance_repo.save_land_registration(right)
+            self._notify_progress(battle, left, right)
 
             battle_summaries.append(
                 {
@@ -165,6 +224,7 @@ class AllianceBattleService:
         if not battle:
             return {"ok": False, "error": "未找到战斗"}
         if battle.phase >= 2:
+            self._rosters.pop(battle_id, None)
             return {"ok": False, "error": "战斗已结束"}
 
         rounds = self.alliance_repo.list_battle_rounds(battle_id)
@@ -183,26 +243,21 @@ class AllianceBattleService:
 
         left_signups = self.alliance_repo.list_army_signups(left_registration.id or 0)
         right_signups = self.alliance_repo.list_army_signups(right_registration.id or 0)
+        roster = self._get_roster(battle, current_round.round_no, left_signups + right_signups)
+        initial_states = {
+            s.id: (s.status, s.hp_state) for s in left_signups + right_signups
+        }
 
-        duels: List[AllianceLandBattleDuel] = []
-        duel_summaries: List[dict] = []
-
-        while True:
-            left_signup = self._next_available_signup(left_signups)
-            right_signup = self._next_available_signup(right_signups)
-            if not left_signup or not right_signup:
-                break
-
-            duel_result = self._conduct_duel(left_signup, right_signup)
-            duels.append(duel_result["entity"])
-            duel_summaries.append(duel_result["summary"])
+        duels, duel_summaries = _play_round(left_signups, right_signups, roster)
+        for duel in duels:
+            duel.round_id = current_round.id or 0
 
         if duels:
             self.alliance_repo.add_battle_duels(duels)
 
         now = datetime.utcnow()
-        current_round.left_alive = self._count_alive(left_signups)
-        current_round.right_alive = self._count_alive(right_signups)
+        current_round.left_alive = _count_alive(left_signups)
+        current_round.right_alive = _count_alive(right_signups)
         current_round.status = 1
         current_round.finished_at = now
         self.alliance_repo.update_battle_round(current_round)
@@ -221,20 +276,18 @@ class AllianceBattleService:
 
         if current_round.left_alive == 0 or current_round.right_alive == 0:
             # Battle finished
+            self._flush_signup_states(left_signups + right_signups, initial_states)
+            self._rosters.pop(battle_id, None)
             battle.phase = 2
             battle.finished_at = now
             self.alliance_repo.update_land_battle(battle)
-
-            if current_round.left_alive > current_round.right_alive:
-                self._finalize_registration(left_registration, STATUS_VICTOR)
-                self._finalize_registration(right_registration, STATUS_ELIMINATED)
-            elif current_round.right_alive > current_round.left_alive:
-                self._finalize_registration(left_registration, STATUS_ELIMINATED)
-                self._finalize_registration(right_registration, STATUS_VICTOR)
-            else:
-                # 双方同时战败
-                self._finalize_registration(left_registration, STATUS_ELIMINATED)
-                self._finalize_registration(right_registration, STATUS_ELIMINATED)
+            self._finalize_battle_registrations(
+                left_registration,
+                right_registration,
+                current_round.left_alive,
+                current_round.right_alive,
+            )
+            self._notify_progress(battle, left_registration, right_registration)
 
             return {"ok": True, "battle_finished": True, "round": round_result}
 
@@ -249,25 +302,288 @@ class AllianceBattleService:
             started_at=now,
             finished_at=None,
         )
-        self._reset_ready_state(left_signups)
-        self._reset_ready_state(right_signups)
+        _reset_ready_state(left_signups)
+        _reset_ready_state(right_signups)
+        self._flush_signup_states(left_signups + right_signups, initial_states)
         self.alliance_repo.create_battle_round(next_round)
 
         battle.current_round = next_round.round_no
         self.alliance_repo.update_land_battle(battle)
+        self._cache_roster(battle_id, battle.land_id, next_round.round_no, roster)
+        self._notify_progress(battle, left_registration, right_registration)
 
         return {"ok": True, "battle_finished": False, "round": round_result}
 
+    def resolve_land(
+        self,
+        land_id: int,
+        *,
+        seed: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        max_rounds: Optional[int] = None,
+    ) -> dict:
+        """Simulate every active battle on a land in one call, to completion or for max_rounds rounds.
+
+        - Signups of all battles are read with one query and missing rosters are built
+          in one pass, so every battle starts from the same snapshot;
+        - battles are independent of each other: with max_workers > 1 they are simulated
+          in a process pool. Each battle uses a seed derived from (seed, land_id, battle_id),
+          so serial and parallel runs give identical results for the same seed;
+        - rounds, duels, signup states and battles are written with bulk statements
+          in a single transaction;
+        - the resulting overview is cached and served by get_land_battle_overview /
+          get_round_duels until the land is paired again;
+        - with max_rounds, unfinished battles stop after that many rounds with the next
+          round opened, so the war scheduler can play one round per tick.
+        """
+
+        battles = self.alliance_repo.list_active_battles_by_land(land_id)
+        if not battles:
+            return {"ok": False, "error": "当前土地没有进行中的战斗"}
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(63)
+
+        registrations = {
+            reg.id: reg for reg in self.alliance_repo.list_land_registrations_by_land(land_id)
+        }
+        registration_ids = [
+            reg_id
+            for battle in battles
+            for reg_id in (battle.left_registration_id, battle.right_registration_id)
+        ]
+        signups_by_registration: Dict[int, List[AllianceArmySignup]] = {}
+        for signup in self.alliance_repo.list_army_signups_by_registrations(registration_ids):
+            signups_by_registration.setdefault(signup.registration_id, []).append(signup)
+
+        battle_rounds: Dict[int, List[AllianceLandBattleRound]] = {}
+        runnable: List[Tuple[AllianceLandBattle, AllianceLandBattleRound]] = []
+        skipped: List[int] = []
+        for battle in battles:
+            rounds = self.alliance_repo.list_battle_rounds(battle.id or 0)
+            open_round = next((r for r in rounds if r.status == 0), None)
+            if (
+                open_round is None
+                or battle.left_registration_id not in registrations
+                or battle.right_registration_id not in registrations
+            ):
+                skipped.append(battle.id or 0)
+                continue
+            battle_rounds[battle.id or 0] = rounds
+            runnable.append((battle, open_round))
+        if not runnable:
+            return {"ok": False, "error": "没有可结算的战斗", "skipped_battle_ids": skipped}
+
+        # 阵容快照：已缓存的直接使用，其余报名一次性构建
+        snapshot: Dict[RosterKey, PvpPlayer] = {}
+        missing: List[AllianceArmySignup] = []
+        for battle, open_round in runnable:
+            cached = self._cached_roster(battle.id or 0, open_round.round_no) or {}
+            for signup in self._battle_signups(battle, signups_by_registration):
+                key = _roster_key(signup)
+                if key in cached:
+                    snapshot[key] = cached[key]
+                else:
+                    missing.append(signup)
+        if missing:
+            snapshot.update(self._build_roster(missing))
+
+        tasks: List[_LandBattleTask] = []
+        initial_states: Dict[Optional[int], Tuple[int, Optional[dict]]] = {}
+        for battle, open_round in runnable:
+            left_signups = signups_by_registration.get(battle.left_registration_id, [])
+            right_signups = signups_by_registration.get(battle.right_registration_id, [])
+            initial_states.update(
+                {s.id: (s.status, s.hp_state) for s in left_signups + right_signups}
+            )
+            tasks.append(
+                _LandBattleTask(
+                    seed=f"{seed}:{land_id}:{battle.id}",
+                    round_no=open_round.round_no,
+                    max_rounds=max_rounds,
+                    left_signups=left_signups,
+                    right_signups=right_signups,
+                    roster={
+                        _roster_key(s): snapshot[_roster_key(s)]
+                        for s in left_signups + right_signups
+                    },
+                )
+            )
+
+        executor = (
+            ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+            if (max_workers or 1) > 1
+            else None
+        )
+        try:
+            if executor is not None:
+                outcomes = list(executor.map(_simulate_land_battle, tasks))
+            else:
+                outcomes = [_simulate_land_battle(task) for task in tasks]
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        now = datetime.utcnow().replace(microsecond=0)  # 缓存的战况与库中 DATETIME(0) 一致
+        closed_rounds: List[AllianceLandBattleRound] = []
+        new_rounds: List[AllianceLandBattleRound] = []
+        played_rounds: List[Tuple[AllianceLandBattleRound, List[AllianceLandBattleDuel]]] = []
+        changed: List[AllianceArmySignup] = []
+        for (battle, open_round), outcome in zip(runnable, outcomes):
+            battle_id = battle.id or 0
+            for played in outcome.rounds:
+                if played.round_no == open_round.round_no:
+                    record = open_round
+                    closed_rounds.append(record)
+                else:
+                    record = AllianceLandBattleRound(
+                        id=None,
+                        battle_id=battle_id,
+                        round_no=played.round_no,
+                        left_alive=0,
+                        right_alive=0,
+                        status=0,
+                        started_at=now,
+                        finished_at=None,
+                    )
+                    new_rounds.append(record)
+                    battle_rounds[battle_id].append(record)
+                record.left_alive = played.left_alive
+                record.right_alive = played.right_alive
+                record.status = 1
+                record.finished_at = now
+                played_rounds.append((record, played.duels))
+
+            last = outcome.rounds[-1]
+            battle.started_at = battle.started_at or now
+            if outcome.finished:
+                battle.phase = 2
+                battle.finished_at = now
+            else:
+                # 出现无法推进的报名状态时保留下一回合，交给 advance_round 处理
+                next_round = AllianceLandBattleRound(
+                    id=None,
+                    battle_id=battle_id,
+                    round_no=last.round_no + 1,
+                    left_alive=last.left_alive,
+                    right_alive=last.right_alive,
+                    status=0,
+                    started_at=now,
+                    finished_at=None,
+                )
+                new_rounds.append(next_round)
+                battle_rounds[battle_id].append(next_round)
+                battle.current_round = next_round.round_no
+            changed.extend(
+                s for s in outcome.signups
+                if s.id and initial_states.get(s.id) != (s.status, s.hp_state)
+            )
+
+        with transaction():
+            self.alliance_repo.update_battle_rounds(closed_rounds)
+            self.alliance_repo.add_battle_rounds(new_rounds)
+            duels: List[AllianceLandBattleDuel] = []
+            for record, round_duels in played_rounds:
+                for duel in round_duels:
+                    duel.round_id = record.id or 0
+                duels.extend(round_duels)
+            self.alliance_repo.add_battle_duels(duels)
+            if changed:
+                self.alliance_repo.update_army_signup_states(changed)
+            self.alliance_repo.update_land_battles([battle for battle, _ in runnable])
+            for (battle, _), outcome in zip(runnable, outcomes):
+                if outcome.finished:
+                    last = outcome.rounds[-1]
+                    self._finalize_battle_registrations(
+                        registrations[battle.left_registration_id],
+                        registrations[battle.right_registration_id],
+                        last.left_alive,
+                        last.right_alive,
+                    )
+
+        for battle, _ in runnable:
+            # 工作进程修改的是阵容副本；未结束的战斗下次按写回的气血重建
+            self._rosters.pop(battle.id or 0, None)
+            self._notify_progress(
+                battle,
+                registrations[battle.left_registration_id],
+                registrations[battle.right_registration_id],
+            )
+
+        registration_list = list(registrations.values())
+        overviews = [
+            self._format_battle_overview(
+                battle,
+                sorted(battle_rounds[battle.id or 0], key=lambda r: r.round_no),
+                registration_list,
+            )
+            for battle, _ in runnable
+        ]
+        overview_payload = {"ok": True, "battle": overviews[0], "battles": overviews}
+        if not skipped and all(outcome.finished for outcome in outcomes):
+            self._land_overviews[land_id] = overview_payload
+        for record, round_duels in played_rounds:
+            # ID 全部回填后才缓存，保证与查库返回的数据一致
+            if record.id and all(duel.id for duel in round_duels):
+                self._cache_round_duels(self._format_round_duels(record, round_duels))
+
+        return {
+            "ok": True,
+            "land_id": land_id,
+            "seed": seed,
+            "battle_count": len(runnable),
+            "duel_count": len(duels),
+            "skipped_battle_ids": skipped,
+            "overview": overview_payload,
+        }
+
     # ---------------------- Query helpers ---------------------- #
 
     def get_land_battle_overview(self, land_id: int) -> dict:
+        cached = self._land_overviews.get(land_id)
+        if cached is not None:
+            return cached
+
         battle = self.alliance_repo.get_active_battle_by_land(land_id)
         if not battle:
             return {"ok": False, "error": "当前土地没有进行中的战斗"}
 
         rounds = self.alliance_repo.list_battle_rounds(battle.id or 0)
-        latest_round = rounds[-1] if rounds else None
         registrations = self.alliance_repo.list_land_registrations_by_land(battle.land_id)
+        return {"ok": True, "battle": self._format_battle_overview(battle, rounds, registrations)}
+
+    def get_round_duels(
+        self, *, battle_id: Optional[int] = None, round_no: Optional[int] = None, round_id: Optional[int] = None
+    ) -> dict:
+        cached_id = round_id
+        if cached_id is None and battle_id is not None and round_no is not None:
+            cached_id = self._round_index.get((battle_id, round_no))
+        if cached_id is not None and cached_id in self._round_duels:
+            self._round_duels.move_to_end(cached_id)
+            return self._round_duels[cached_id]
+
+        if round_id is None:
+            if battle_id is None or round_no is None:
+                return {"ok": False, "error": "缺少 round_id 或 (battle_id, round_no)"}
+            rounds = self.alliance_repo.list_battle_rounds(battle_id)
+            target = next((r for r in rounds if r.round_no == round_no), None)
+            if not target:
+                return {"ok": False, "error": "指定回合不存在"}
+            round_id = target.id
+        else:
+            target = self.alliance_repo.get_battle_round_by_id(round_id)
+            if not target:
+                return {"ok": False, "error": "指定回合不存在"}
+
+        duels = self.alliance_repo.list_duels_by_round(round_id)
+        return self._format_round_duels(target, duels)
+
+    @staticmethod
+    def _format_battle_overview(
+        battle: AllianceLandBattle,
+        rounds: List[AllianceLandBattleRound],
+        registrations: List[AllianceRegistration],
+    ) -> dict:
+        latest_round = rounds[-1] if rounds else None
         bye_registrations = [
             {
                 "registration_id": reg.id,
@@ -309,25 +625,12 @@ class AllianceBattleService:
         else:
             overview["left_alive"] = overview["right_alive"] = 0
 
-        return {"ok": True, "battle": overview}
+        return overview
 
-    def get_round_duels(
-        self, *, battle_id: Optional[int] = None, round_no: Optional[int] = None, round_id: Optional[int] = None
+    @staticmethod
+    def _format_round_duels(
+        target: AllianceLandBattleRound, duels: List[AllianceLandBattleDuel]
     ) -> dict:
-        if round_id is None:
-            if battle_id is None or round_no is None:
-                return {"ok": False, "error": "缺少 round_id 或 (battle_id, round_no)"}
-            rounds = self.alliance_repo.list_battle_rounds(battle_id)
-            target = next((r for r in rounds if r.round_no == round_no), None)
-            if not target:
-                return {"ok": False, "error": "指定回合不存在"}
-            round_id = target.id
-        else:
-            target = self.alliance_repo.get_battle_round_by_id(round_id)
-            if not target:
-                return {"ok": False, "error": "指定回合不存在"}
-
-        duels = self.alliance_repo.list_duels_by_round(round_id)
         formatted = []
         for duel in duels:
             log_data = duel.log_data or {}
@@ -346,7 +649,7 @@ class AllianceBattleService:
         return {
             "ok": True,
             "round": {
-                "round_id": round_id,
+                "round_id": target.id,
                 "battle_id": target.battle_id,
                 "round_no": target.round_no,
                 "left_alive": target.left_alive,
@@ -356,8 +659,25 @@ class AllianceBattleService:
             "duels": formatted,
         }
 
+    def _cache_round_duels(self, payload: dict) -> None:
+        round_info = payload["round"]
+        self._round_duels[round_info["round_id"]] = payload
+        self._round_index[(round_info["battle_id"], round_info["round_no"])] = round_info["round_id"]
+        while len(self._round_duels) > ROUND_DUELS_CACHE_LIMIT:
+            _, evicted = self._round_duels.popitem(last=False)
+            self._round_index.pop((evicted["round"]["battle_id"], evicted["round"]["round_no"]), None)
+
     # ---------------------- Internal helpers ---------------------- #
 
+    @staticmethod
+    def _battle_signups(
+        battle: AllianceLandBattle,
+        signups_by_registration: Dict[int, List[AllianceArmySignup]],
+    ) -> List[AllianceArmySignup]:
+        return signups_by_registration.get(battle.left_registration_id, []) + signups_by_registration.get(
+            battle.right_registration_id, []
+        )
+
     def _build_army_signups(
         self, registration: AllianceRegistration, timestamp: datetime
     ) -> List[AllianceArmySignup]:
@@ -382,167 +702,97 @@ class AllianceBattleService:
             )
         return signups
 
-    def _next_available_signup(
-        self, signups: List[AllianceArmySignup]
-    ) -> Optional[AllianceArmySignup]:
-        ready = [
-            s
-            for s in signups
-            if s.status in (SIGNUP_STATUS_READY, SIGNUP_STATUS_ADVANCED)
-        ]
-        ready.sort(key=lambda s: (s.signup_order, s.id or 0))
-        if not ready:
+    def _get_roster(
+        self, battle: AllianceLandBattle, round_no: int, signups: List[AllianceArmySignup]
+    ) -> Dict[RosterKey, PvpPlayer]:
+        """Return the battle-scoped roster, building any missing entries from stored HP state.
+
+        A cached roster is only reused when it was left at this round by this process.
+        """
+
+        battle_id = battle.id or 0
+        roster = self._cached_roster(battle_id, round_no)
+        if roster is None:
+            roster = {}
+        missing = [s for s in signups if _roster_key(s) not in roster]
+        if missing:
+            roster.update(self._build_roster(missing))
+        self._cache_roster(battle_id, battle.land_id, round_no, roster)
+        return roster
+
+    def _cached_roster(self, battle_id: int, round_no: int) -> Optional[Dict[RosterKey, PvpPlayer]]:
+        cached = self._rosters.get(battle_id)
+        if cached is None:
             return None
-        signup = ready[0]
-        self._update_signup_state(signup, SIGNUP_STATUS_ENGAGED, signup.hp_state)
-        return signup
-
-    def _conduct_duel(
-        self, left_signup: AllianceArmySignup, right_signup: AllianceArmySignup
-    ) -> Dict[str, Any]:
-        left_player = self._build_pvp_player(left_signup)
-        right_player = self._build_pvp_player(right_signup)
-
-        if not left_player["beasts"] and not right_player["beasts"]:
-            # 双方无兵，随机判负
-            winner = random.choice(["left", "right"])
-            loser = "right" if winner == "left" else "left"
-            return self._finalize_duel(
-                left_signup,
-                right_signup,
-                winner_side=winner,
-                logs=[],
-                reason="双方无参战幻兽，随机判负",
-            )
-
-        if not left_player["beasts"]:
-            return self._finalize_duel(
-                left_signup,
-                right_signup,
-                winner_side="right",
-                logs=[],
-                reason="对手无人参战，直接获胜",
-            )
-
-        if not right_player["beasts"]:
-            return self._finalize_duel(
-                left_signup,
-                right_signup,
-                winner_side="left",
-                logs=[],
-                reason="对手无人参战，直接获胜",
-            )
-
-        pvp_result = run_pvp_battle(
-            left_player["pvp_player"],
-            right_player["pvp_player"],
-            max_log_turns=50,
-        )
-        winner_side = (
-            "left"
-            if pvp_result.winner_player_id == left_player["pvp_player"].player_id
-            else "right"
-        )
-
-        logs_payload = [log.__dict__ for log in pvp_result.logs]
-        return self._finalize_duel(
-            left_signup,
-            right_signup,
-            winner_side=winner_side,
-            logs=logs_payload,
-            reason="",
-        )
+        if cached.round_no != round_no:
+            # 其它进程已推进过这场战斗，内存中的气血已过期
+            del self._rosters[battle_id]
+            return None
+        self._rosters.move_to_end(battle_id)
+        return cached.players
 
-    def _finalize_duel(
-        self,
-        left_signup: AllianceArmySignup,
-        right_signup: AllianceArmySignup,
-        *,
-        winner_side: str,
-        logs: List[dict],
-        reason: str,
-    ) -> Dict[str, Any]:
-        winner_signup = left_signup if winner_side == "left" else right_signup
-        loser_signup = right_signup if winner_side == "left" else left_signup
+    def _cache_roster(
+        self, battle_id: int, land_id: int, round_no: int, players: Dict[RosterKey, PvpPlayer]
+    ) -> None:
+        self._rosters[battle_id] = _CachedRoster(land_id=land_id, round_no=round_no, players=players)
+        self._rosters.move_to_end(battle_id)
+        while len(self._rosters) > ROSTER_CACHE_LIMIT:
+            self._rosters.popitem(last=False)
 
-        winner_state = self._capture_hp_state(winner_signup)
-        loser_state = self._capture_hp_state(loser_signup)
+    def _build_roster(self, signups: List[AllianceArmySignup]) -> Dict[RosterKey, PvpPlayer]:
+        """Load players and team beasts for all signups at once and convert them to PvpPlayers."""
 
-        self._update_signup_state(winner_signup, SIGNUP_STATUS_ADVANCED, winner_state)
-        self._update_signup_state(loser_signup, SIGNUP_STATUS_ELIMINATED, loser_state)
+        user_ids = list(dict.fromkeys(s.user_id for s in signups))
+        players = {uid: self.player_repo.get_by_id(uid) for uid in user_ids}
+        present = [uid for uid in user_ids if players.get(uid)]
 
-        duel_entity = AllianceLandBattleDuel(
-            id=None,
-            round_id=0,  # 将在仓储层 INSERT 时自动关联
-            attacker_signup_id=left_signup.id or 0,
-            defender_signup_id=right_signup.id or 0,
-            attacker_result=1 if winner_side == "left" else 2,
-            log_data={"logs": logs, "reason": reason},
-            created_at=datetime.utcnow(),
-        )
+        batch = getattr(self.player_beast_repo, "get_team_beasts_by_users", None)
+        if batch is not None:
+            raw_teams = batch(present) if present else {}
+        else:
+            raw_teams = {uid: self.player_beast_repo.get_team_beasts(uid) for uid in present}
+        teams = self.beast_pvp_service.to_pvp_teams({uid: raw_teams.get(uid) or [] for uid in present})
 
-        duel_summary = {
-            "winner_signup_id": winner_signup.id,
-            "winner_user_id": winner_signup.user_id,
-            "loser_signup_id": loser_signup.id,
-            "logs": logs,
-            "reason": reason,
-        }
-        return {"entity": duel_entity, "summary": duel_summary}
-
-    def _capture_hp_state(self, signup: AllianceArmySignup) -> Dict[str, Any]:
-        # After combat, the PvpPlayer objects have updated HP. We store the latest HP snapshot.
-        state = signup.hp_state or {}
-        beasts_state = state.get("beasts", [])
-        return {"beasts": beasts_state}
-
-    def _build_pvp_player(self, signup: AllianceArmySignup) -> Dict[str, Any]:
-        player = self.player_repo.get_by_id(signup.user_id)
-        if not player:
-            return {"beasts": [], "pvp_player": PvpPlayer(player_id=signup.user_id, level=1, beasts=[])}
-
-        team_beasts = self.player_beast_repo.get_team_beasts(signup.user_id)
-        pvp_beasts = self.beast_pvp_service.to_pvp_beasts(team_beasts)
-
-        hp_map = {}
-        if signup.hp_state and "beasts" in signup.hp_state:
-            hp_map = {item["id"]: item.get("hp", 0) for item in signup.hp_state["beasts"]}
-        beasts_state: List[dict] = []
-        for beast in pvp_beasts:
-            if hp_map:
-                stored_hp = hp_map.get(beast.id)
-                if stored_hp is not None:
-                    beast.hp_current = max(0, min(beast.hp_max, stored_hp))
-                    if beast.hp_current == 0:
-                        beast.is_dead = True
-            beasts_state.append({"id": beast.id, "hp": beast.hp_current})
-
-        signup.hp_state = {"beasts": beasts_state}
-        return {
-            "beasts": pvp_beasts,
-            "pvp_player": PvpPlayer(
+        roster: Dict[RosterKey, PvpPlayer] = {}
+        for signup in signups:
+            player = players.get(signup.user_id)
+            if not player:
+                roster[_roster_key(signup)] = PvpPlayer(player_id=signup.user_id, level=1, beasts=[])
+                continue
+            # 同一玩家的队伍按报名各复制一份，避免不同战斗共享气血
+            beasts = copy.deepcopy(teams.get(signup.user_id) or [])
+            self._apply_hp_state(beasts, signup.hp_state)
+            roster[_roster_key(signup)] = PvpPlayer(
                 player_id=player.user_id,
                 level=player.level or 1,
-                beasts=pvp_beasts,
+                beasts=beasts,
                 name=player.nickname or f"玩家{player.user_id}",
-            ),
-        }
-
-    def _update_signup_state(
-        self, signup: AllianceArmySignup, status: int, hp_state: Optional[dict]
+            )
+        return roster
+
+    @staticmethod
+    def _apply_hp_state(beasts: List[PvpBeast], hp_state: Optional[dict]) -> None:
+        if not hp_state or "beasts" not in hp_state:
+            return
+        hp_map = {item["id"]: item.get("hp", 0) for item in hp_state["beasts"]}
+        for beast in beasts:
+            stored_hp = hp_map.get(beast.id)
+            if stored_hp is not None:
+                beast.hp_current = max(0, min(beast.hp_max, stored_hp))
+                if beast.hp_current == 0:
+                    beast.is_dead = True
+
+    def _flush_signup_states(
+        self,
+        signups: List[AllianceArmySignup],
+        initial_states: Dict[Optional[int], Tuple[int, Optional[dict]]],
     ) -> None:
-        signup.status = status
-        signup.hp_state = hp_state
-        if signup.id:
-            self.alliance_repo.update_army_signup_state(signup.id, status, hp_state or {})
-
-    def _count_alive(self, signups: List[AllianceArmySignup]) -> int:
-        return sum(1 for s in signups if s.status != SIGNUP_STATUS_ELIMINATED)
-
-    def _reset_ready_state(self, signups: List[AllianceArmySignup]) -> None:
-        for signup in signups:
-            if signup.status == SIGNUP_STATUS_ADVANCED:
-                self._update_signup_state(signup, SIGNUP_STATUS_READY, signup.hp_state)
+        changed = [
+            s for s in signups
+            if s.id and initial_states.get(s.id) != (s.status, s.hp_state)
+        ]
+        if changed:
+            self.alliance_repo.update_army_signup_states(changed)
 
     def _finalize_registration(self, registration: AllianceRegistration, status: int) -> None:
         registration.status = status
@@ -550,3 +800,242 @@ class AllianceBattleService:
         if status == STATUS_VICTOR:
             season_key = datetime.utcnow().strftime("%Y-%m")
             self.alliance_repo.increment_alliance_war_score(registration.alliance_id, season_key, 1)
+
+    def _finalize_battle_registrations(
+        self,
+        left_registration: AllianceRegistration,
+        right_registration: AllianceRegistration,
+        left_alive: int,
+        right_alive: int,
+    ) -> None:
+        if left_alive > right_alive:
+            self._finalize_registration(left_registration, STATUS_VICTOR)
+            self._finalize_registration(right_registration, STATUS_ELIMINATED)
+        elif right_alive > left_alive:
+            self._finalize_registration(left_registration, STATUS_ELIMINATED)
+            self._finalize_registration(right_registration, STATUS_VICTOR)
+        else:
+            # 双方同时战败
+            self._finalize_registration(left_registration, STATUS_ELIMINATED)
+            self._finalize_registration(right_registration, STATUS_ELIMINATED)
+
+
+# ---------------------- Duel simulation ---------------------- #
+# 纯内存的对战逻辑：advance_round 与整块土地结算（含进程池工作函数）共用
+
+
+def _roster_key(signup: AllianceArmySignup) -> RosterKey:
+    return (signup.registration_id, signup.user_id)
+
+
+def _update_signup_state(
+    signup: AllianceArmySignup, status: int, hp_state: Optional[dict]
+) -> None:
+    # 只改内存，回合结束时一次写回
+    signup.status = status
+    signup.hp_state = hp_state
+
+
+def _count_alive(signups: List[AllianceArmySignup]) -> int:
+    return sum(1 for s in signups if s.status != SIGNUP_STATUS_ELIMINATED)
+
+
+def _reset_ready_state(signups: List[AllianceArmySignup]) -> None:
+    for signup in signups:
+        if signup.status == SIGNUP_STATUS_ADVANCED:
+            _update_signup_state(signup, SIGNUP_STATUS_READY, signup.hp_state)
+
+
+def _next_available_signup(signups: List[AllianceArmySignup]) -> Optional[AllianceArmySignup]:
+    ready = [
+        s
+        for s in signups
+        if s.status in (SIGNUP_STATUS_READY, SIGNUP_STATUS_ADVANCED)
+    ]
+    ready.sort(key=lambda s: (s.signup_order, s.id or 0))
+    if not ready:
+        return None
+    signup = ready[0]
+    _update_signup_state(signup, SIGNUP_STATUS_ENGAGED, signup.hp_state)
+    return signup
+
+
+def _capture_hp_state(
+    roster: Dict[RosterKey, PvpPlayer], signup: AllianceArmySignup
+) -> Dict[str, Any]:
+    # 阵容中的 PvpBeast 在战斗后保留了最新气血，直接取快照
+    pvp_player = roster.get(_roster_key(signup))
+    beasts = pvp_player.beasts if pvp_player else []
+    return {"beasts": [{"id": beast.id, "hp": beast.hp_current} for beast in beasts]}
+
+
+def _finalize_duel(
+    left_signup: AllianceArmySignup,
+    right_signup: AllianceArmySignup,
+    *,
+    winner_side: str,
+    logs: List[dict],
+    reason: str,
+    roster: Dict[RosterKey, PvpPlayer],
+) -> Dict[str, Any]:
+    winner_signup = left_signup if winner_side == "left" else right_signup
+    loser_signup = right_signup if winner_side == "left" else left_signup
+
+    winner_state = _capture_hp_state(roster, winner_signup)
+    loser_state = _capture_hp_state(roster, loser_signup)
+
+    _update_signup_state(winner_signup, SIGNUP_STATUS_ADVANCED, winner_state)
+    _update_signup_state(loser_signup, SIGNUP_STATUS_ELIMINATED, loser_state)
+
+    duel_entity = AllianceLandBattleDuel(
+        id=None,
+        round_id=0,  # 写库前由调用方关联到回合
+        attacker_signup_id=left_signup.id or 0,
+        defender_signup_id=right_signup.id or 0,
+        attacker_result=1 if winner_side == "left" else 2,
+        log_data={"logs": logs, "reason": reason},
+        created_at=datetime.utcnow().replace(microsecond=0),  # 与库中 DATETIME(0) 一致
+    )
+
+    duel_summary = {
+        "winner_signup_id": winner_signup.id,
+        "winner_user_id": winner_signup.user_id,
+        "loser_signup_id": loser_signup.id,
+        "logs": logs,
+        "reason": reason,
+    }
+    return {"entity": duel_entity, "summary": duel_summary}
+
+
+def _conduct_duel(
+    left_signup: AllianceArmySignup,
+    right_signup: AllianceArmySignup,
+    roster: Dict[RosterKey, PvpPlayer],
+    rng: Optional[random.Random] = None,
+) -> Dict[str, Any]:
+    left_player = roster[_roster_key(left_signup)]
+    right_player = roster[_roster_key(right_signup)]
+
+    if not left_player.beasts and not right_player.beasts:
+        # 双方无兵，随机判负
+        winner = (rng or random).choice(["left", "right"])
+        return _finalize_duel(
+            left_signup,
+            right_signup,
+            winner_side=winner,
+            logs=[],
+            reason="双方无参战幻兽，随机判负",
+            roster=roster,
+        )
+
+    if not left_player.beasts:
+        return _finalize_duel(
+            left_signup,
+            right_signup,
+            winner_side="right",
+            logs=[],
+            reason="对手无人参战，直接获胜",
+            roster=roster,
+        )
+
+    if not right_player.beasts:
+        return _finalize_duel(
+            left_signup,
+            right_signup,
+            winner_side="left",
+            logs=[],
+            reason="对手无人参战，直接获胜",
+            roster=roster,
+        )
+
+    pvp_result = run_pvp_battle(left_player, right_player, max_log_turns=50, rng=rng)
+    winner_side = "left" if pvp_result.winner_player_id == left_player.player_id else "right"
+
+    logs_payload = [log.__dict__ for log in pvp_result.logs]
+    for beast in left_player.beasts + right_player.beasts:
+        # 气血带入下一场，战斗中的临时状态不保留
+        beast.status_effects = []
+    return _finalize_duel(
+        left_signup,
+        right_signup,
+        winner_side=winner_side,
+        logs=logs_payload,
+        reason="",
+        roster=roster,
+    )
+
+
+def _play_round(
+    left_signups: List[AllianceArmySignup],
+    right_signups: List[AllianceArmySignup],
+    roster: Dict[RosterKey, PvpPlayer],
+    rng: Optional[random.Random] = None,
+) -> Tuple[List[AllianceLandBattleDuel], List[dict]]:
+    """双方按报名顺序车轮战，直到一方没有可出战的玩家；返回 (对战记录, 对战摘要)
+
+    rng 未传入时使用模块级 random。
+    """
+    duels: List[AllianceLandBattleDuel] = []
+    summaries: List[dict] = []
+    while True:
+        left_signup = _next_available_signup(left_signups)
+        right_signup = _next_available_signup(right_signups)
+        if not left_signup or not right_signup:
+            break
+        duel_result = _conduct_duel(left_signup, right_signup, roster, rng)
+        duels.append(duel_result["entity"])
+        summaries.append(duel_result["summary"])
+    return duels, summaries
+
+
+@dataclass
+class _LandBattleTask:
+    """一场待结算的土地战斗（可序列化后发送到子进程）"""
+
+    seed: str
+    round_no: int  # 当前未结束回合的回合号
+    left_signups: List[AllianceArmySignup]
+    right_signups: List[AllianceArmySignup]
+    roster: Dict[RosterKey, PvpPlayer]
+    max_rounds: Optional[int] = None  # 最多模拟的回合数，None 表示打到结束
+
+
+@dataclass
+class _PlayedRound:
+    round_no: int
+    left_alive: int
+    right_alive: int
+    duels: List[AllianceLandBattleDuel]
+
+
+@dataclass
+class _LandBattleOutcome:
+    rounds: List[_PlayedRound]
+    signups: List[AllianceArmySignup]
+    finished: bool
+
+
+def _simulate_land_battle(task: _LandBattleTask) -> _LandBattleOutcome:
+    """把一场土地战斗逐回合模拟到结束（或模拟满 max_rounds 回合）。
+
+    进程池工作函数：只依赖入参和种子，同一任务在任何进程中结果都相同。
+    某回合没有产生任何对战（报名状态异常）或达到回合上限时停止，由调用方保留下一回合。
+    """
+    # 每场战斗使用独立的随机数生成器，不影响进程内的模块级 random
+    rng = random.Random(task.seed)
+    left_signups, right_signups = task.left_signups, task.right_signups
+    rounds: List[_PlayedRound] = []
+    round_no = task.round_no
+    while True:
+        duels, _ = _play_round(left_signups, right_signups, task.roster, rng)
+        left_alive, right_alive = _count_alive(left_signups), _count_alive(right_signups)
+        rounds.append(_PlayedRound(round_no, left_alive, right_alive, duels))
+        if left_alive == 0 or right_alive == 0:
+            return _LandBattleOutcome(rounds, left_signups + right_signups, True)
+        if not duels:
+            return _LandBattleOutcome(rounds, left_signups + right_signups, False)
+        _reset_ready_state(left_signups)
+        _reset_ready_state(right_signups)
+        if task.max_rounds is not None and len(rounds) >= task.max_rounds:
+            return _LandBattleOutcome(rounds, left_signups + right_signups, False)
+        round_no += 1
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from domain.repositories.alliance_repo import IAllianceRepo
+from infrastructure.db.unit_of_work import after_commit
+
+
+@dataclass
+class AllianceDirectoryEntry:
+    """联盟列表中的一行（成员数为维护的计数，不再逐页 GROUP BY）"""
+
+    id: int
+    name: str
+    level: int
+    leader_id: int
+    notice: str
+    member_count: int
+
+    def to_row(self) -> Dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "level": self.level,
+            "leader_id": self.leader_id,
+            "notice": self.notice,
+            "member_count": self.member_count,
+        }
+
+
+def _name_grams(text: str) -> Set[str]:
+    """单字 + 相邻两字；联盟名称通常很短，这两种切分足以覆盖任意关键字"""
+    return set(text) | {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+class NameIndex:
+    """联盟名称的 n-gram 倒排索引
+
+    关键字先取其全部相邻两字（单字关键字取该字）的倒排表求交集得到候选，
+    再对候选做子串校验，结果与 LIKE '%kw%' 一致（大小写不敏感）。
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Set[int]] = {}
+
+    def add(self, alliance_id: int, name: str) -> None:
+        for gram in _name_grams(name.casefold()):
+            self._postings.setdefault(gram, set()).add(alliance_id)
+
+    def remove(self, alliance_id: int, name: str) -> None:
+        for gram in _name_grams(name.casefold()):
+            ids = self._postings.get(gram)
+            if ids is not None:
+                ids.discard(alliance_id)
+                if not ids:
+                    del self._postings[gram]
+
+    def candidates(self, keyword: str) -> Set[int]:
+        kw = keyword.casefold()
+        grams = [kw] if len(kw) == 1 else [kw[i:i + 2] for i in range(len(kw) - 1)]
+        postings = sorted((self._postings.get(g, set()) for g in set(grams)), key=len)
+        if not postings or not postings[0]:
+            return set()
+        result = set(postings[0])
+        for ids in postings[1:]:
+            result &= ids
+            if not result:
+                break
+        return result
+
+
+class AllianceDirectory:
+    """全部联盟按 (等级降序, ID降序) 排列的有序数组 + 名称索引"""
+
+    def __init__(self, entries: Iterable[AllianceDirectoryEntry] = ()):
+        self.entries: Dict[int, AllianceDirectoryEntry] = {e.id: e for e in entries}
+        self._keys: List[Tuple[int, int]] = sorted(self._key(e) for e in self.entries.values())
+        self._index = NameIndex()
+        for e in self.entries.values():
+            self._index.add(e.id, e.name)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @staticmethod
+    def _key(entry: AllianceDirectoryEntry) -> Tuple[int, int]:
+        return (-entry.level, -entry.id)
+
+    def upsert(self, entry: AllianceDirectoryEntry) -> None:
+        self.remove(entry.id)
+        self.entries[entry.id] = entry
+        insort(self._keys, self._key(entry))
+        self._index.add(entry.id, entry.name)
+
+    def remove(self, alliance_id: int) -> None:
+        old = self.entries.pop(alliance_id, None)
+        if old is None:
+            return
+        del self._keys[bisect_left(self._keys, self._key(old))]
+        self._index.remove(alliance_id, old.name)
+
+    def page(self, keyword: Optional[str], offset: int, size: int) -> Tuple[List[AllianceDirectoryEntry], int]:
+        offset, size = max(0, offset), max(0, size)
+        kw = (keyword or "").strip()
+        if not kw:
+            keys = self._keys[offset:offset + size]
+            return [self.entries[-key[1]] for key in keys], len(self._keys)
+
+        folded = kw.casefold()
+        matched = [
+            self.entries[aid]
+            for aid in self._index.candidates(kw)
+            if folded in self.entries[aid].name.casefold()
+        ]
+        matched.sort(key=self._key)
+        return matched[offset:offset + size], len(matched)
+
+
+class AllianceDirectoryService:
+    """联盟列表（浏览 / 搜索）的进程内物化视图
+
+    - 首次查询时一次读取全部联盟及成员数，之后每隔 reconcile_interval 秒对账
+    - 建盟、入盟、踢人、改名、升级、改公告时由 AllianceService 增量更新（处于事务中则提交后再更新）
+    - 翻页为有序数组切片；名称搜索走 n-gram 倒排索引，不再 LIKE '%kw%' 全表扫描
+    """
+
+    def __init__(
+        self,
+        alliance_repo: IAllianceRepo,
+        reconcile_interval: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.alliance_repo = alliance_repo
+        self.reconcile_interval = reconcile_interval
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._directory = AllianceDirectory()
+        self._loaded_at: Optional[float] = None
+
+    # ===================== 对账 =====================
+    def reconcile(self) -> None:
+        """从 MySQL 全量重建联盟列表"""
+        rows = self.alliance_repo.load_alliance_directory()
+        directory = AllianceDirectory(
+            AllianceDirectoryEntry(
+                id=int(r["id"]),
+                name=r.get("name") or "",
+                level=int(r.get("level") or 1),
+                leader_id=int(r.get("leader_id") or 0),
+                notice=r.get("notice") or "",
+                member_count=int(r.get("member_count") or 0),
+            )
+            for r in rows
+        )
+        with self._lock:
+            self._directory = directory
+            self._loaded_at = self._clock()
+
+    def _ensure_fresh(self) -> None:
+        with self._lock:
+            loaded_at = self._loaded_at
+            if loaded_at is not None and self._clock() - loaded_at < self.reconcile_interval:
+                return
+            self.reconcile()
+
+    # ===================== 增量更新 =====================
+    def record_alliance_created(self, alliance_id: int, name: str, leader_id: int, level: int = 1) -> None:
+        entry = AllianceDirectoryEntry(
+            id=int(alliance_id), name=name or "", level=int(level or 1),
+            leader_id=int(leader_id or 0), notice="", member_count=0,
+        )
+        after_commit(lambda: self._apply(lambda d: d.upsert(entry)))
+
+    def record_member_delta(self, alliance_id: int, delta: int) -> None:
+        self._update(int(alliance_id), lambda e: setattr(e, "member_count", max(0, e.member_count + delta)))
+
+    def record_renamed(self, alliance_id: int, name: str) -> None:
+        self._update(int(alliance_id), lambda e: setattr(e, "name", name or ""))
+
+    def record_level(self, alliance_id: int, level: int) -> None:
+        self._update(int(alliance_id), lambda e: setattr(e, "level", int(level or 1)))
+
+    def record_notice(self, alliance_id: int, notice: str) -> None:
+        self._update(int(alliance_id), lambda e: setattr(e, "notice", notice or ""))
+
+    def _update(self, alliance_id: int, change: Callable[[AllianceDirectoryEntry], None]) -> None:
+        def apply(directory: AllianceDirectory) -> None:
+            old = directory.entries.get(alliance_id)
+            if old is None:
+                return  # 其他进程创建的联盟，对账时补上
+            entry = AllianceDirectoryEntry(**vars(old))
+            change(entry)
+            directory.upsert(entry)
+
+        after_commit(lambda: self._apply(apply))
+
+    def _apply(self, change: Callable[[AllianceDirectory], None]) -> None:
+        with self._lock:
+            if self._loaded_at is None:
+                return  # 尚未加载，首次查询时会全量读取
+            change(self._directory)
+
+    # ===================== 查询 =====================
+    def page(self, keyword: Optional[str], offset: int, size: int) -> Tuple[List[Dict], int]:
+        """返回 (与原 list_alliances 相同字段的行, 总数)"""
+        with self._lock:
+            self._ensure_fresh()
+            entries, total = self._directory.page(keyword, offset, size)
+            return [e.to_row() for e in entries], total
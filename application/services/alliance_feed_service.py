@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from infrastructure.db.unit_of_work import after_commit
+
+
+TOPIC_CHAT = "chat"
+TOPIC_WAR = "war"
+
+
+@dataclass
+class FeedEvent:
+    """推送流中的一条事件；id 为本进程内递增的游标，客户端以 since_id 续读"""
+
+    id: int
+    data: Dict
+    key: Optional[Hashable] = None  # 业务去重键（聊天为消息 ID）
+
+
+@dataclass
+class FeedPoll:
+    """一次拉取的结果
+
+    reset 为 True 表示游标无效（首次拉取、落后超过队列容量、来自其它进程或重启前），
+    此时 events 为队列中保留的全部事件，客户端应整体替换本地数据。
+    """
+
+    events: List[Dict]
+    cursor: int
+    reset: bool
+
+
+class FeedChannel:
+    """单个联盟单个话题的推送队列：按游标升序保存最近 capacity 条事件
+
+    changed 与推送中心共用一把锁，只唤醒等待本队列的拉取。
+    """
+
+    def __init__(self, capacity: int, floor_id: int, lock: threading.RLock):
+        self.events: Deque[FeedEvent] = deque()
+        self.changed = threading.Condition(lock)
+        self.capacity = capacity
+        self.floor_id = floor_id  # 游标大于 floor_id 的事件都仍在队列中
+        self.synced_at: Optional[float] = None
+        self._keys: Set[Hashable] = set()
+
+    @property
+    def latest_id(self) -> int:
+        return self.events[-1].id if self.events else self.floor_id
+
+    def has_key(self, key: Hashable) -> bool:
+        return key in self._keys
+
+    def append(self, event: FeedEvent) -> None:
+        self.events.append(event)
+        if event.key is not None:
+            self._keys.add(event.key)
+        while len(self.events) > self.capacity:
+            dropped = self.events.popleft()
+            self.floor_id = dropped.id
+            self._keys.discard(dropped.key)
+
+    def since(self, since_id: Optional[int]) -> Optional[List[FeedEvent]]:
+        """返回游标之后的事件；游标无效时返回 None"""
+        if since_id is None or since_id < self.floor_id or since_id > self.latest_id:
+            return None
+        return [e for e in self.events if e.id > since_id]
+
+
+class AllianceFeedHub:
+    """联盟聊天 / 战况的进程内推送中心（长轮询）
+
+    - 每个 (联盟, 话题) 一条有界队列，只有被客户端拉取过的联盟才会建立队列；
+      未建立队列的联盟发布事件直接丢弃，空闲联盟不占内存也不产生查询
+    - publish 处于事务中则提交后再入队，只唤醒等待该联盟该话题的拉取
+    - poll 在没有新事件时阻塞等待，最长 max_wait 秒；客户端只拿到游标之后的增量
+    - 队列只覆盖本进程内的写入；聊天由 AllianceService 每隔 sync_interval 秒从 MySQL 合并一次，
+      兜底其它进程写入的消息
+    """
+
+    def __init__(
+        self,
+        capacity: int = 100,
+        max_wait: float = 25.0,
+        sync_interval: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.capacity = capacity
+        self.max_wait = max_wait
+        self.sync_interval = sync_interval
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._channels: Dict[Tuple[int, str], FeedChannel] = {}
+        self._last_id = 0
+
+    # ===================== 游标 =====================
+    def _next_id(self) -> int:
+        # 以微秒时间戳为基准，进程重启后旧游标只会落在 floor_id 之前或 latest_id 之后，按失效处理
+        self._last_id = max(self._last_id + 1, time.time_ns() // 1000)
+        return self._last_id
+
+    def _channel(self, alliance_id: int, topic: str) -> FeedChannel:
+        key = (int(alliance_id), topic)
+        channel = self._channels.get(key)
+        if channel is None:
+            channel = FeedChannel(self.capacity, floor_id=self._next_id(), lock=self._lock)
+            self._channels[key] = channel
+        return channel
+
+    def is_open(self, alliance_id: int, topic: str) -> bool:
+        with self._lock:
+            return (int(alliance_id), topic) in self._channels
+
+    # ===================== 写入 =====================
+    def publish(self, alliance_id: int, topic: str, data: Dict, key: Optional[Hashable] = None) -> None:
+        after_commit(lambda: self._append(int(alliance_id), topic, [(data, key)], create=False))
+
+    def needs_sync(self, alliance_id: int, topic: str) -> bool:
+        with self._lock:
+            channel = self._channels.get((int(alliance_id), topic))
+            if channel is None or channel.synced_at is None:
+                return True
+            return self._clock() - channel.synced_at >= self.sync_interval
+
+    def merge(self, alliance_id: int, topic: str, items: Iterable[Tuple[Dict, Hashable]]) -> None:
+        """合并从 MySQL 读取的事件（按时间升序）；键已在队列中的事件会被跳过"""
+        with self._lock:
+            self._append(int(alliance_id), topic, items, create=True)
+            self._channels[(int(alliance_id), topic)].synced_at = self._clock()
+
+    def _append(
+        self, alliance_id: int, topic: str, items: Iterable[Tuple[Dict, Optional[Hashable]]], create: bool
+    ) -> None:
+        with self._lock:
+            channel = self._channel(alliance_id, topic) if create else self._channels.get((alliance_id, topic))
+            if channel is None:
+                return  # 没有客户端拉取过该联盟，首次拉取时会从 MySQL 读取
+            added = False
+            for data, key in items:
+                if key is not None and channel.has_key(key):
+                    continue
+                channel.append(FeedEvent(id=self._next_id(), data=data, key=key))
+                added = True
+            if added:
+                channel.changed.notify_all()
+
+    # ===================== 拉取 =====================
+    def poll(self, alliance_id: int, topic: str, since_id: Optional[int], wait: float = 0.0) -> FeedPoll:
+        """返回游标之后的事件；没有新事件时最多等待 wait 秒（上限 max_wait）"""
+        deadline = time.monotonic() + max(0.0, min(float(wait or 0), self.max_wait))
+        with self._lock:
+            channel = self._channel(alliance_id, topic)
+            while True:
+                events = channel.since(since_id)
+                if events is None:
+                    return FeedPoll([e.data for e in channel.events], channel.latest_id, True)
+                if events:
+                    return FeedPoll([e.data for e in events], events[-1].id, False)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return FeedPoll([], channel.latest_id, False)
+                channel.changed.wait(remaining)
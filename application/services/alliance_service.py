@@ -14,6 +14,7 @@ from domain.entities.alliance import (
     AllianceTrainingParticipant,
     AllianceActivity,
 )
+from domain.entities.alliance_battle import AllianceLandBattle
 from domain.entities.alliance_registration import (
     AllianceRegistration,
     STATUS_CONFIRMED,
@@ -26,12 +27,19 @@ from domain.repositories.alliance_repo import IAllianceRepo
 from domain.repositories.player_repo import IPlayerRepo
 from domain.repositories.beast_repo import IBeastRepo
 from application.services.inventory_service import InventoryService, InventoryError
+from application.services.alliance_directory_service import AllianceDirectoryService
+from application.services.alliance_feed_service import TOPIC_CHAT, TOPIC_WAR, AllianceFeedHub
+from application.services.alliance_war_leaderboard_service import AllianceWarLeaderboardService
 from domain.rules.alliance_rules import AllianceRules
 
+# 聊天首屏 / 游标失效时返回的消息条数
+CHAT_HISTORY_LIMIT = 50
+
 class AllianceService:
     WAR_START_WEEKDAYS = (2, 5)  # Wednesday=2, Saturday=5
     WAR_START_HOUR = 20
     WAR_START_MINUTE = 0
+    WAR_ROUND_INTERVAL_MINUTES = 5  # 开战配对后，每隔多少分钟推进一回合
 
     ARMY_LEVEL_THRESHOLD = 40
     ARMY_DRAGON = 1
@@ -77,11 +85,17 @@ class AllianceService:
         player_repo: IPlayerRepo,
         inventory_service: InventoryService,
         beast_repo: IBeastRepo,
+        war_leaderboard: Optional[AllianceWarLeaderboardService] = None,
+        directory: Optional[AllianceDirectoryService] = None,
+        feed: Optional[AllianceFeedHub] = None,
     ):
         self.alliance_repo = alliance_repo
         self.player_repo = player_repo
         self.inventory_service = inventory_service
         self.beast_repo = beast_repo
+        self.war_leaderboard = war_leaderboard or AllianceWarLeaderboardService(alliance_repo)
+        self.directory = directory or AllianceDirectoryService(alliance_repo)
+        self.feed = feed or AllianceFeedHub()
         self._honor_effects_cache: List[Dict] | None = None
         self._honor_effects_map: Dict[str, Dict] | None = None
 
@@ -135,6 +149,8 @@ class AllianceService:
             role=1  # 盟主
         )
         self.alliance_repo.add_member(leader_member)
+        self.directory.record_alliance_created(alliance_id, alliance_name, user_id, new_alliance.level)
+        self.directory.record_member_delta(alliance_id, 1)
         for building_key in AllianceRules.BUILDING_KEYS:
             self.alliance_repo.set_alliance_building_level(alliance_id, building_key, 1)
         self._record_activity(
@@ -167,8 +183,7 @@ class AllianceService:
         size_i = max(1, min(50, size_i))
         offset = (page_i - 1) * size_i
 
-        total = self.alliance_repo.count_alliances(keyword)
-        rows = self.alliance_repo.list_alliances(keyword, limit=size_i, offset=offset)
+        rows, total = self.directory.page(keyword, offset, size_i)
 
         self_member = self.alliance_repo.get_member(user_id)
         already_in_alliance = self_member is not None
@@ -234,6 +249,7 @@ class AllianceService:
             role=AllianceRules.ROLE_MEMBER,
         )
         self.alliance_repo.add_member(member)
+        self.directory.record_member_delta(alliance_id, 1)
 
         self._record_activity(
             alliance_id=alliance_id,
@@ -299,6 +315,7 @@ class AllianceService:
             return {"ok": False, "error": "公告限制为35个字以内"}
 
         self.alliance_repo.update_notice(member.alliance_id, content)
+        self.directory.record_notice(member.alliance_id, content)
 
         return {"ok": True, "notice": content}
 
@@ -336,6 +353,8 @@ class AllianceService:
 
         self.alliance_repo.update_alliance_name(alliance.id, cleaned_name)
         alliance.name = cleaned_name
+        self.war_leaderboard.rename_alliance(alliance.id, cleaned_name)
+        self.directory.record_renamed(alliance.id, cleaned_name)
 
         self._record_activity(
             alliance_id=alliance.id,
@@ -448,6 +467,7 @@ class AllianceService:
             return {"ok": False, "error": "无权踢出该成员"}
 
         self.alliance_repo.remove_member(target_user_id)
+        self.directory.record_member_delta(actor.alliance_id, -1)
         self._record_activity(
             alliance_id=actor.alliance_id,
             event_type="kick",
@@ -1400,6 +1420,7 @@ class AllianceService:
 
         new_level = rule["next_level"]
         self.alliance_repo.update_alliance_level(alliance.id, new_level)
+        self.directory.record_level(alliance.id, new_level)
         self.alliance_repo.set_alliance_building_level(alliance.id, "council", new_level)
         alliance.level = new_level
 
@@ -1877,26 +1898,24 @@ class AllianceService:
         except (TypeError, ValueError):
             size = 10
         size = max(1, min(50, size))
-        offset = (page - 1) * size
 
         season_key = datetime.utcnow().strftime("%Y-%m")
-        season_start = datetime.strptime(season_key, "%Y-%m")
 
-        rows = self.alliance_repo.list_alliance_war_leaderboard(season_start, size, offset)
-        total = self.alliance_repo.count_alliance_war_leaderboard(season_start)
+        board_page = self.war_leaderboard.get_page(season_key, page, size)
+        total = board_page["total"]
         ranking = [
             {
-                "rank": offset + idx + 1,
+                "rank": row["rank"],
                 "allianceId": row["alliance_id"],
                 "allianceName": row["alliance_name"],
                 "score": row["score"],
             }
-            for idx, row in enumerate(rows)
+            for row in board_page["list"]
         ]
 
         my_rank = None
         if alliance:
-            entry = self.alliance_repo.get_alliance_war_leaderboard_entry(alliance.id, season_start)
+            entry = self.war_leaderboard.get_entry(season_key, alliance.id)
             if entry:
                 my_rank = {
                     "rank": entry["rank"],
@@ -2012,6 +2031,8 @@ class AllianceService:
             )
 
         self.alliance_repo.save_land_registration(registration)
+        # 报名即上本赛季战功榜（0 分），获胜后由土地战累加
+        self.alliance_repo.increment_alliance_war_score(alliance.id, now.strftime("%Y-%m"), 0)
 
         self._record_activity(
             alliance_id=alliance.id,
@@ -2264,65 +2285,117 @@ class AllianceService:
         if error:
             return error
 
-        battles = self.alliance_repo.list_alliance_battles(alliance.id)
+        return {"ok": True, "data": {"battles": self._build_war_live_feed(alliance.id)}}
+
+    def poll_war_live_feed(self, user_id: int, since_id: Optional[int] = None, wait: float = 0.0) -> dict:
+        """长轮询联盟战况：游标有效时只返回之后有变化的战斗，没有变化时最多等待 wait 秒；
+        游标无效（首次拉取等）时返回完整列表，reset 为 True"""
+        member = self.alliance_repo.get_member(user_id)
+        if not member:
+            return {"ok": False, "error": "未加入联盟"}
+
+        poll = self.feed.poll(member.alliance_id, TOPIC_WAR, since_id, wait)
+        if poll.reset:
+            # 队列已建立，此后的进度都会入队；快照与增量可能重叠，客户端按 battle_id 覆盖即可
+            battles = self._build_war_live_feed(member.alliance_id)
+        else:
+            battles = list({row["battle_id"]: row for row in poll.events}.values())
+        return {"ok": True, "data": {"battles": battles, "cursor": poll.cursor, "reset": poll.reset}}
+
+    def on_battle_progress(
+        self,
+        battle: AllianceLandBattle,
+        left_registration: AllianceRegistration,
+        right_registration: AllianceRegistration,
+    ) -> None:
+        """AllianceBattleService 进度监听：向双方联盟的战况队列推送该战斗的最新状态"""
+        for own_reg, opponent_reg in (
+            (left_registration, right_registration),
+            (right_registration, left_registration),
+        ):
+            if not self.feed.is_open(own_reg.alliance_id, TOPIC_WAR):
+                continue  # 没有成员在看战况，不查询也不推送
+            opponent = self.alliance_repo.get_alliance_by_id(opponent_reg.alliance_id)
+            opponent_name = opponent.name if opponent else f"联盟{opponent_reg.alliance_id}"
+            self.feed.publish(
+                own_reg.alliance_id, TOPIC_WAR, self._format_war_live_entry(battle, own_reg, opponent_name)
+            )
+
+    def _build_war_live_feed(self, alliance_id: int) -> List[dict]:
+        battles = self.alliance_repo.list_alliance_battles(alliance_id)
         if not battles:
-            return {"ok": True, "data": {"battles": []}}
+            return []
 
         registrations_cache: Dict[int, AllianceRegistration] = {}
         alliance_cache: Dict[int, Alliance] = {}
         results = []
 
         for battle in battles:
-            land_meta = self.WAR_LANDS.get(battle.land_id, {})
-            land_name = land_meta.get("land_name", f"未知土地{battle.land_id}")
-
             left_reg = self._get_cached_registration(battle.left_registration_id, registrations_cache)
             right_reg = self._get_cached_registration(battle.right_registration_id, registrations_cache)
             if not left_reg or not right_reg:
                 continue
 
-            is_left = left_reg.alliance_id == alliance.id
+            is_left = left_reg.alliance_id == alliance_id
             own_reg = left_reg if is_left else right_reg
             opponent_reg = right_reg if is_left else left_reg
 
             opponent = self._get_cached_alliance(opponent_reg.alliance_id, alliance_cache)
             opponent_name = opponent.name if opponent else f"联盟{opponent_reg.alliance_id}"
 
-            result_label = self._derive_battle_result(own_reg.status)
+            results.append(self._format_war_live_entry(battle, own_reg, opponent_name))
 
-            results.append(
-                {
-                    "battle_id": battle.id,
-                    "land_id": battle.land_id,
-                    "land_name": land_name,
-                    "opponent_alliance_name": opponent_name,
-                    "phase": battle.phase,
-                    "current_round": battle.current_round,
-                    "result": result_label,
-                }
-            )
+        return results
 
-        return {"ok": True, "data": {"battles": results}}
+    def _format_war_live_entry(
+        self, battle: AllianceLandBattle, own_reg: AllianceRegistration, opponent_name: str
+    ) -> dict:
+        land_meta = self.WAR_LANDS.get(battle.land_id, {})
+        return {
+            "battle_id": battle.id,
+            "land_id": battle.land_id,
+            "land_name": land_meta.get("land_name", f"未知土地{battle.land_id}"),
+            "opponent_alliance_name": opponent_name,
+            "phase": battle.phase,
+            "current_round": battle.current_round,
+            "result": self._derive_battle_result(own_reg.status),
+        }
 
     def get_chat_messages(self, user_id: int) -> dict:
         """获取联盟聊天消息"""
         member = self.alliance_repo.get_member(user_id)
         if not member:
             return {"ok": False, "error": "未加入联盟"}
-        
-        messages = self.alliance_repo.get_chat_messages(member.alliance_id)
+
+        poll = self._poll_chat(member.alliance_id, None, 0)
+        return {"ok": True, "messages": poll.events[-CHAT_HISTORY_LIMIT:]}
+
+    def poll_chat_messages(self, user_id: int, since_id: Optional[int] = None, wait: float = 0.0) -> dict:
+        """长轮询联盟聊天：只返回 since_id 之后的新消息，没有新消息时最多等待 wait 秒；
+        游标无效（首次拉取等）时返回最近的消息，reset 为 True"""
+        member = self.alliance_repo.get_member(user_id)
+        if not member:
+            return {"ok": False, "error": "未加入联盟"}
+
+        poll = self._poll_chat(member.alliance_id, since_id, wait)
+        messages = poll.events[-CHAT_HISTORY_LIMIT:] if poll.reset else poll.events
+        return {"ok": True, "messages": messages, "cursor": poll.cursor, "reset": poll.reset}
+
+    def _poll_chat(self, alliance_id: int, since_id: Optional[int], wait: float):
+        # 首次拉取或距上次合并超过 sync_interval 时读取一次 MySQL，补上其它进程写入的消息
+        if self.feed.needs_sync(alliance_id, TOPIC_CHAT):
+            messages = self.alliance_repo.get_chat_messages(alliance_id, limit=CHAT_HISTORY_LIMIT)
+            self.feed.merge(alliance_id, TOPIC_CHAT, ((self._format_chat_message(m), m.id) for m in messages))
+        return self.feed.poll(alliance_id, TOPIC_CHAT, since_id, wait)
+
+    @staticmethod
+    def _format_chat_message(message: AllianceChatMessage) -> dict:
         return {
-            "ok": True,
-            "messages": [
-                {
-                    "id": m.id,
-                    "user_id": m.user_id,
-                    "nickname": m.nickname or f"玩家{m.user_id}",
-                    "content": m.content,
-                    "created_at": m.created_at.strftime("%H:%M:%S") if m.created_at else ""
-                }
-                for m in messages
-            ]
+            "id": message.id,
+            "user_id": message.user_id,
+            "nickname": message.nickname or f"玩家{message.user_id}",
+            "content": message.content,
+            "created_at": message.created_at.strftime("%H:%M:%S") if message.created_at else ""
         }
 
     def send_chat_message(self, user_id: int, content: str) -> dict:
@@ -2339,7 +2412,10 @@ class AllianceService:
             user_id=user_id,
             content=content.strip()
         )
-        self.alliance_repo.add_chat_message(message)
+        message.id = self.alliance_repo.add_chat_message(message)
+        message.nickname = member.nickname
+        message.created_at = message.created_at or datetime.now()
+        self.feed.publish(member.alliance_id, TOPIC_CHAT, self._format_chat_message(message), key=message.id)
         
         return {"ok": True}
 
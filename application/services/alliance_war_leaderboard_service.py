@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from application.services.leaderboard_service import RankBoard
+from domain.repositories.alliance_repo import IAllianceRepo
+from infrastructure.db.unit_of_work import after_commit
+
+
+class AllianceWarLeaderboardService:
+    """联盟战功榜（按自然月赛季）的进程内物化视图
+
+    - 以 alliance_war_scores 为准：联盟报名土地时写入 0 分记录，土地战获胜时累加
+    - 战功变化由 MySQLAllianceRepo 的监听增量更新（处于事务中则提交后再更新）
+    - 每个赛季首次查询时按 season_key 读取一次，之后每隔 reconcile_interval 秒对账
+    - 分页与本盟名次均为 RankBoard 二分查找；同分名次相同，同分按联盟ID排序
+    """
+
+    # 只保留最近查询的几个赛季
+    MAX_SEASONS = 2
+
+    def __init__(
+        self,
+        alliance_repo: IAllianceRepo,
+        reconcile_interval: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.alliance_repo = alliance_repo
+        self.reconcile_interval = reconcile_interval
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._boards: "OrderedDict[str, Tuple[RankBoard, float]]" = OrderedDict()
+        self._names: Dict[int, str] = {}  # alliance_id -> 联盟名称
+
+    # ===================== 对账 =====================
+    def reconcile(self, season_key: str) -> RankBoard:
+        """从 MySQL 重建指定赛季的榜单"""
+        rows = self.alliance_repo.load_alliance_war_scores(season_key)
+        board = RankBoard()
+        board.load((int(r["alliance_id"]), (int(r.get("score") or 0),)) for r in rows)
+        with self._lock:
+            for r in rows:
+                self._names[int(r["alliance_id"])] = r.get("name") or ""
+            self._boards[season_key] = (board, self._clock())
+            self._boards.move_to_end(season_key)
+            while len(self._boards) > self.MAX_SEASONS:
+                self._boards.popitem(last=False)
+        return board
+
+    def _board(self, season_key: str) -> RankBoard:
+        with self._lock:
+            cached = self._boards.get(season_key)
+            if cached is not None and self._clock() - cached[1] < self.reconcile_interval:
+                self._boards.move_to_end(season_key)
+                return cached[0]
+            return self.reconcile(season_key)
+
+    # ===================== 增量更新 =====================
+    def on_war_score(self, alliance_id: int, season_key: str, delta: int) -> None:
+        """MySQLAllianceRepo.increment_alliance_war_score 监听"""
+        after_commit(lambda: self._apply_score(int(alliance_id), season_key, int(delta)))
+
+    def _apply_score(self, alliance_id: int, season_key: str, delta: int) -> None:
+        with self._lock:
+            cached = self._boards.get(season_key)
+            if cached is None:
+                return  # 该赛季尚未加载，首次查询时会全量读取
+            board = cached[0]
+            current = board.score_of(alliance_id)
+            board.update(alliance_id, ((current[0] if current else 0) + delta,))
+
+    def rename_alliance(self, alliance_id: int, name: str) -> None:
+        """联盟改名后更新榜单展示名称"""
+        with self._lock:
+            if alliance_id in self._names:
+                self._names[alliance_id] = name
+
+    # ===================== 查询 =====================
+    def get_page(self, season_key: str, page: int, size: int) -> Dict:
+        """返回 {"list": [{rank, alliance_id, alliance_name, score}], "total"}"""
+        with self._lock:
+            board = self._board(season_key)
+            entries = board.page((max(1, page) - 1) * size, size)
+            return {
+                "list": [self._row(board, aid, score) for aid, score in entries],
+                "total": len(board),
+            }
+
+    def get_entry(self, season_key: str, alliance_id: int) -> Optional[Dict]:
+        with self._lock:
+            board = self._board(season_key)
+            score = board.score_of(alliance_id)
+            if score is None:
+                return None
+            return self._row(board, alliance_id, score)
+
+    def _row(self, board: RankBoard, alliance_id: int, score: Tuple[int, ...]) -> Dict:
+        return {
+            "rank": board.rank_of(alliance_id),
+            "alliance_id": alliance_id,
+            "alliance_name": self._name_of(alliance_id),
+            "score": score[0],
+        }
+
+    def _name_of(self, alliance_id: int) -> str:
+        name = self._names.get(alliance_id)
+        if name is None:
+            # 本赛季新上榜、尚未对账过的联盟
+            alliance = self.alliance_repo.get_alliance_by_id(alliance_id)
+            name = alliance.name if alliance else f"联盟{alliance_id}"
+            self._names[alliance_id] = name
+        return name
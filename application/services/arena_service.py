@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import threading
+from typing import Dict, Optional, Tuple
+
+from domain.entities.arena import ArenaSlot
+from domain.repositories.arena_repo import IArenaRepo
+from domain.services.battle_report import encode_battle_report
+from domain.services.pvp_battle_engine import LOG_COMPACT, PvpPlayer, run_pvp_battle
+from infrastructure.db.unit_of_work import transaction
+
+
+ARENA_BALL_NORMAL = 4002
+ARENA_BALL_GOLD = 4003
+ARENA_MAX_WINS = 10
+
+
+def get_arena_ball_id(arena_type: str) -> int:
+    return ARENA_BALL_GOLD if arena_type == "gold" else ARENA_BALL_NORMAL
+
+
+def get_arena_ball_name(arena_type: str) -> str:
+    return "强力捕捉球" if arena_type == "gold" else "捕捉球"
+
+
+def get_arena_type_name(arena_type: str) -> str:
+    return "黄金场" if arena_type == "gold" else "普通场"
+
+
+class _Rejected(Exception):
+    """校验失败：回滚整笔事务并把提示返回给玩家"""
+
+
+class ArenaService:
+    """擂台占领 / 挑战
+
+    - 同一擂台的请求在进程内按到达顺序排队（每个擂台一把锁），同一进程的并发挑战不会在 MySQL 行锁上互相等待
+    - 每次占领/挑战在一个事务内完成：擂台行 SELECT ... FOR UPDATE（兜底多进程部署），
+      挑战次数与捕捉球用条件更新扣除，不足则整体回滚，不会出现负数或超额挑战
+    - 排行榜等副作用在事务提交后才生效
+    """
+
+    def __init__(
+        self,
+        arena_repo: IArenaRepo,
+        battle_repo,
+        player_beast_repo,
+        beast_pvp_service,
+        leaderboard_service=None,
+    ):
+        self.arena_repo = arena_repo
+        self.battle_repo = battle_repo
+        self.player_beast_repo = player_beast_repo
+        self.beast_pvp_service = beast_pvp_service
+        self.leaderboard_service = leaderboard_service
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _arena_lock(self, rank_name: str, arena_type: str) -> threading.Lock:
+        key = (rank_name, arena_type)
+        lock = self._locks.get(key)
+        if lock is None:
+            with self._locks_guard:
+                lock = self._locks.setdefault(key, threading.Lock())
+        return lock
+
+    # ===================== 占领 =====================
+    def occupy(self, user_id: int, nickname: str, rank_name: str, arena_type: str) -> Dict:
+        """占领空置擂台，消耗 1 个捕捉球并放入奖池"""
+        try:
+            with self._arena_lock(rank_name, arena_type), transaction():
+                slot = self._lock_slot(rank_name, arena_type)
+                if slot.has_champion:
+                    raise _Rejected("擂台已有擂主，请选择挑战")
+                self._consume_ball(user_id, arena_type)
+                slot.crown(user_id, nickname)
+                slot.prize_pool += 1
+                self.arena_repo.save_arena(slot)
+        except _Rejected as e:
+            return {"ok": False, "error": str(e)}
+        return {
+            "ok": True,
+            "message": f"成功占领{rank_name}擂台（{get_arena_type_name(arena_type)}）！",
+        }
+
+    # ===================== 挑战 =====================
+    def challenge(
+        self,
+        user_id: int,
+        nickname: str,
+        level: int,
+        rank_name: str,
+        arena_type: str,
+        daily_limit: int,
+    ) -> Dict:
+        """挑战擂主：扣次数、扣球、奖池 +1、战斗、写战报、结算擂主与奖池"""
+        try:
+            with self._arena_lock(rank_name, arena_type), transaction():
+                return self._challenge_locked(user_id, nickname, level, rank_name, arena_type, daily_limit)
+        except _Rejected as e:
+            return {"ok": False, "error": str(e)}
+
+    def _challenge_locked(
+        self,
+        user_id: int,
+        nickname: str,
+        level: int,
+        rank_name: str,
+        arena_type: str,
+        daily_limit: int,
+    ) -> Dict:
+        slot = self._lock_slot(rank_name, arena_type)
+        if not slot.has_champion:
+            raise _Rejected("擂台无擂主，请选择占领")
+        if slot.champion_user_id == user_id:
+            raise _Rejected("不能挑战自己")
+        if not self.arena_repo.take_daily_challenge(user_id, daily_limit):
+            raise _Rejected(f"今日挑战次数已用完（{daily_limit}次/天）")
+        ball_id = self._consume_ball(user_id, arena_type)
+        slot.prize_pool += 1
+
+        champion_user_id = slot.champion_user_id
+        champion_nickname = slot.champion_nickname
+        challenger_wins, battle_report = self._fight(user_id, nickname, level, slot)
+        battle_id = self.battle_repo.save_battle(
+            arena_type=arena_type,
+            rank_name=rank_name,
+            challenger_id=user_id,
+            challenger_name=nickname,
+            champion_id=champion_user_id,
+            champion_name=champion_nickname,
+            is_challenger_win=challenger_wins,
+            battle_data=None if battle_report else {
+                "is_victory": False, "attacker_wins": 0, "defender_wins": 1, "battles": [],
+            },
+            battle_report=battle_report,
+        )
+
+        prize_pool = slot.prize_pool
+        if challenger_wins:
+            slot.crown(user_id, nickname)
+            slot.prize_pool = 0
+            self.arena_repo.save_arena(slot)
+            self.arena_repo.grant_item(user_id, ball_id, prize_pool)
+            return {
+                "ok": True,
+                "win": True,
+                "message": (
+                    f"恭喜！你击败了{champion_nickname}，成为新擂主！"
+                    f"获得奖池{prize_pool}个{get_arena_ball_name(arena_type)}！"
+                ),
+                "prizeWon": prize_pool,
+                "battleId": battle_id,
+            }
+
+        new_wins = slot.consecutive_wins + 1
+        if new_wins >= ARENA_MAX_WINS:
+            self.arena_repo.add_success(champion_user_id, rank_name)
+            if self.leaderboard_service is not None:
+                self.leaderboard_service.record_arena_success(champion_user_id, rank_name)
+            self.arena_repo.grant_item(champion_user_id, ball_id, prize_pool)
+            slot.vacate()
+            slot.prize_pool = 0
+            self.arena_repo.save_arena(slot)
+            return {
+                "ok": True,
+                "win": False,
+                "message": f"挑战失败！{champion_nickname}达成10连胜，领取奖池{prize_pool}个球后下台！",
+                "championStepDown": True,
+                "battleId": battle_id,
+            }
+
+        slot.consecutive_wins = new_wins
+        self.arena_repo.save_arena(slot)
+        return {
+            "ok": True,
+            "win": False,
+            "message": f"挑战失败！{champion_nickname}成功守擂，当前连胜{new_wins}场！",
+            "battleId": battle_id,
+        }
+
+    # ===================== 内部 =====================
+    def _lock_slot(self, rank_name: str, arena_type: str) -> ArenaSlot:
+        slot = self.arena_repo.lock_arena(rank_name, arena_type)
+        if slot is None:
+            raise _Rejected("擂台不存在")
+        return slot
+
+    def _consume_ball(self, user_id: int, arena_type: str) -> int:
+        ball_id = get_arena_ball_id(arena_type)
+        if not self.arena_repo.consume_item(user_id, ball_id, 1):
+            raise _Rejected(f"{get_arena_ball_name(arena_type)}不足")
+        return ball_id
+
+    def _fight(self, user_id: int, nickname: str, level: int, slot: ArenaSlot) -> Tuple[bool, Optional[bytes]]:
+        """挑战者与擂主的当前出战队伍对战，返回 (挑战者是否获胜, 紧凑战报)；任一方没有幻兽时判挑战失败"""
+        champion_user_id = slot.champion_user_id
+        challenger_beasts = self.player_beast_repo.get_team_beasts(user_id)
+        champion_beasts = self.player_beast_repo.get_team_beasts(champion_user_id)
+        if not challenger_beasts or not champion_beasts:
+            return False, None
+
+        champion_level = None
+        if self.leaderboard_service is not None:
+            champion_level = self.leaderboard_service.get_player_level(champion_user_id)
+
+        attacker_player = PvpPlayer(
+            player_id=user_id,
+            level=level,
+            beasts=self.beast_pvp_service.to_pvp_beasts(challenger_beasts),
+            name=nickname,
+        )
+        defender_player = PvpPlayer(
+            player_id=champion_user_id,
+            level=champion_level or level,
+            beasts=self.beast_pvp_service.to_pvp_beasts(champion_beasts),
+            name=slot.champion_nickname,
+        )
+        # 挑战接口只返回战报ID，战报以紧凑格式落库，查看详情时再还原描述
+        pvp_result = run_pvp_battle(attacker_player, defender_player, max_log_turns=50, log_mode=LOG_COMPACT)
+        challenger_wins = pvp_result.winner_player_id == attacker_player.player_id
+        return challenger_wins, encode_battle_report(pvp_result, attacker_player, defender_player)
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+from infrastructure.db.arena_battle_repo_mysql import ArenaBattleLog, MySQLArenaBattleRepo
+from infrastructure.db.unit_of_work import after_commit
+from infrastructure.db.zhenyao_battle_repo_mysql import MySQLZhenyaoBattleRepo, ZhenyaoBattleLog
+
+
+T = TypeVar("T")
+
+# (before_id, limit) -> 按 ID 倒序的记录
+Loader = Callable[[Optional[int], int], List[T]]
+
+
+class FeedRing(Generic[T]):
+    """单个动态流：按 ID 倒序保存最近 capacity 条记录的环形缓冲
+
+    complete 表示缓冲里已经是这条流的全部历史（首次加载不足 capacity 条，且之后没有挤出过旧记录），
+    此时更早的分页也可以直接从内存返回。
+    """
+
+    def __init__(self, capacity: int, rows: List[T], loaded_at: float):
+        self.capacity = capacity
+        self.loaded_at = loaded_at
+        self._items: Deque[T] = deque(rows[:capacity], maxlen=capacity)
+        self.complete = len(rows) < capacity
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def add(self, item: T) -> None:
+        items = self._items
+        if not items or item.id > items[0].id:
+            if len(items) == self.capacity:
+                self.complete = False
+            items.appendleft(item)
+            return
+
+        # 事务提交顺序与自增 ID 顺序不一致，或加载时已读到这条记录
+        if any(x.id == item.id for x in items):
+            return
+        pos = next((i for i, x in enumerate(items) if x.id < item.id), len(items))
+        if len(items) == self.capacity:
+            self.complete = False
+            if pos == len(items):
+                return  # 比缓冲中所有记录都旧
+            items.pop()
+        items.insert(pos, item)
+
+    def page(self, before_id: Optional[int], limit: int) -> Optional[List[T]]:
+        """返回 before_id 之前（不含）的 limit 条记录；内存中不足且不完整时返回 None"""
+        result: List[T] = []
+        for item in self._items:
+            if before_id is not None and item.id >= before_id:
+                continue
+            result.append(item)
+            if len(result) == limit:
+                return result
+        return result if self.complete else None
+
+
+class _PendingLoad(Generic[T]):
+    """一条流正在从 MySQL 加载：记录加载期间提交的战报，装入新缓冲时补上"""
+
+    def __init__(self):
+        self.loaders = 0
+        self.items: List[T] = []
+
+
+class _FeedTable(Generic[T]):
+    """一组动态流（全服 / 按类型 / 按玩家）及其加载方式"""
+
+    def __init__(self, loader: Callable[[Hashable], Loader], max_feeds: Optional[int]):
+        self.loader = loader
+        self.max_feeds = max_feeds
+        self.rings: "OrderedDict[Hashable, FeedRing[T]]" = OrderedDict()
+        self.loading: Dict[Hashable, _PendingLoad[T]] = {}
+
+
+class BattleFeedService:
+    """擂台 / 镇妖动态的进程内信息流
+
+    - 每条流（全服、每种擂台场次、每个玩家）保存最近 capacity 条记录，首次查询时从 MySQL 加载
+    - 战报写库后（处于事务中则提交后）追加到已加载的流，最新一页不再查询 MySQL
+    - 翻页使用 before_id 游标：内存中够一页直接返回，否则按游标查询 MySQL
+    - 每条流加载 reload_interval 秒后，下一次查询时重新加载，兜底其它进程写入的战报
+    - 查询 MySQL 时不持有锁；并发加载同一条流时只装入最新开始的那次结果
+    - 玩家流按 LRU 最多保留 max_user_feeds 个
+    """
+
+    def __init__(
+        self,
+        arena_repo: MySQLArenaBattleRepo,
+        zhenyao_repo: MySQLZhenyaoBattleRepo,
+        capacity: int = 200,
+        max_user_feeds: int = 5000,
+        reload_interval: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.arena_repo = arena_repo
+        self.zhenyao_repo = zhenyao_repo
+        self.capacity = capacity
+        self.reload_interval = reload_interval
+        self._clock = clock
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+        self._arena: _FeedTable[ArenaBattleLog] = _FeedTable(self._arena_loader, None)
+        self._arena_user: _FeedTable[ArenaBattleLog] = _FeedTable(self._arena_user_loader, max_user_feeds)
+        self._zhenyao: _FeedTable[ZhenyaoBattleLog] = _FeedTable(self._zhenyao_loader, None)
+        self._zhenyao_user: _FeedTable[ZhenyaoBattleLog] = _FeedTable(self._zhenyao_user_loader, max_user_feeds)
+
+    # ===================== 加载方式 =====================
+    def _arena_loader(self, arena_type: Optional[str]) -> Loader:
+        return lambda before_id, limit: self.arena_repo.get_recent_battles(
+            arena_type=arena_type, limit=limit, before_id=before_id
+        )
+
+    def _arena_user_loader(self, user_id: int) -> Loader:
+        return lambda before_id, limit: self.arena_repo.get_user_battles(user_id, limit, before_id=before_id)
+
+    def _zhenyao_loader(self, _key: None) -> Loader:
+        return lambda before_id, limit: self.zhenyao_repo.get_recent_battles(limit, before_id=before_id)
+
+    def _zhenyao_user_loader(self, user_id: int) -> Loader:
+        return lambda before_id, limit: self.zhenyao_repo.get_user_battles(user_id, limit, before_id=before_id)
+
+    # ===================== 写入 =====================
+    def on_arena_battle_saved(self, log: ArenaBattleLog) -> None:
+        """MySQLArenaBattleRepo 写入监听"""
+        after_commit(lambda: self._append(
+            log,
+            (self._arena, None),
+            (self._arena, log.arena_type),
+            (self._arena_user, log.challenger_id),
+            (self._arena_user, log.champion_id),
+        ))
+
+    def on_zhenyao_battle_saved(self, log: ZhenyaoBattleLog) -> None:
+        """MySQLZhenyaoBattleRepo 写入监听"""
+        after_commit(lambda: self._append(
+            log,
+            (self._zhenyao, None),
+            (self._zhenyao_user, log.attacker_id),
+            (self._zhenyao_user, log.defender_id),
+        ))
+
+    def _append(self, log, *targets: Tuple[_FeedTable, Hashable]) -> None:
+        with self._lock:
+            seen = set()
+            for table, key in targets:
+                if (id(table), key) in seen:
+                    continue
+                seen.add((id(table), key))
+                pending = table.loading.get(key)
+                if pending is not None:
+                    pending.items.append(log)  # 加载结果可能不含这条，装入时补上
+                ring = table.rings.get(key)
+                if ring is not None:
+                    ring.add(log)  # 尚未加载的流首次查询时会从 MySQL 读取
+
+    # ===================== 查询 =====================
+    def get_arena_battles(
+        self,
+        arena_type: Optional[str] = None,
+        user_id: Optional[int] = None,
+        before_id: Optional[int] = None,
+        limit: int = 20,
+    ) -> List[ArenaBattleLog]:
+        """擂台动态：传 user_id 为个人动态，否则为全服（可按场次过滤）"""
+        if user_id:
+            return self._page(self._arena_user, user_id, before_id, limit)
+        return self._page(self._arena, arena_type or None, before_id, limit)
+
+    def get_zhenyao_battles(
+        self,
+        user_id: Optional[int] = None,
+        before_id: Optional[int] = None,
+        limit: int = 20,
+    ) -> List[ZhenyaoBattleLog]:
+        """镇妖动态：传 user_id 为个人动态，否则为全服"""
+        if user_id:
+            return self._page(self._zhenyao_user, user_id, before_id, limit)
+        return self._page(self._zhenyao, None, before_id, limit)
+
+    def _page(self, table: _FeedTable, key: Hashable, before_id: Optional[int], limit: int) -> List:
+        limit = max(0, int(limit))
+        if limit == 0:
+            return []
+        if limit > self.capacity:
+            self.misses += 1
+            return table.loader(key)(before_id, limit)
+        ring = self._ring(table, key)
+        with self._lock:
+            rows = ring.page(before_id, limit)
+            if rows is not None:
+                self.hits += 1
+                return rows
+            self.misses += 1
+        return table.loader(key)(before_id, limit)
+
+    def _ring(self, table: _FeedTable, key: Hashable) -> FeedRing:
+        started = self._clock()
+        with self._lock:
+            ring = table.rings.get(key)
+            if ring is not None and started - ring.loaded_at < self.reload_interval:
+                table.rings.move_to_end(key)
+                return ring
+            pending = table.loading.get(key)
+            if pending is None:
+                pending = table.loading[key] = _PendingLoad()
+            pending.loaders += 1
+
+        try:
+            rows = table.loader(key)(None, self.capacity)  # 不持锁查询，其它流的读写不受影响
+            with self._lock:
+                current = table.rings.get(key)
+                if current is not None and current.loaded_at >= started:
+                    return current  # 更晚开始的加载已经装入，丢弃本次结果
+                ring = FeedRing(self.capacity, rows, started)
+                for log in pending.items:
+                    ring.add(log)
+                table.rings[key] = ring
+                table.rings.move_to_end(key)
+                if table.max_feeds is not None and len(table.rings) > table.max_feeds:
+                    table.rings.popitem(last=False)
+                return ring
+        finally:
+            with self._lock:
+                pending.loaders -= 1
+                if pending.loaders == 0 and table.loading.get(key) is pending:
+                    del table.loading[key]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "arena_feeds": len(self._arena.rings),
+                "arena_user_feeds": len(self._arena_user.rings),
+                "zhenyao_feeds": len(self._zhenyao.rings),
+                "zhenyao_user_feeds": len(self._zhenyao_user.rings),
+            }
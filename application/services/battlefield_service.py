@@ -3,13 +3,17 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import List, Dict, Optional, Tuple
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+import copy
+import multiprocessing
 import random
 
 from infrastructure.db.connection import execute_query, execute_update
 from infrastructure.db.player_beast_repo_mysql import MySQLPlayerBeastRepo, PlayerBeastData
 from infrastructure.db.battlefield_repo_mysql import MySQLBattlefieldBattleRepo
 from domain.repositories.player_repo import IPlayerRepo
-from domain.services.pvp_battle_engine import PvpBeast, PvpPlayer, run_pvp_battle
+from domain.services.battle_report import encode_battle_report
+from domain.services.pvp_battle_engine import LOG_COMPACT, PvpBattleResult, PvpBeast, PvpPlayer, run_pvp_battle
 from domain.services.skill_system import apply_buff_debuff_skills
 from application.services.beast_pvp_service import BeastPvpService
 
@@ -37,7 +41,7 @@ class BattlefieldService:
     主要职责：
     - 根据战场类型，自动筛选符合等级范围的玩家作为参赛者（后续可改为真正的“报名表”）。
     - 按淘汰赛规则自动匹配对战，使用统一 PVP+技能战斗引擎决出胜负。
-    - 为每一场对战生成与镇妖/擂台相同结构的 battle_data，并写入 battlefield_battle_log。
+    - 为每一场对战生成紧凑战报（读取时还原为与镇妖/擂台相同结构的 battle_data），并写入 battlefield_battle_log。
     - 根据战报统计上一期的战王和玩家个人战绩，用于战场首页展示。
     """
 
@@ -58,10 +62,23 @@ class BattlefieldService:
     # 对外主入口
     # ------------------------------------------------------------------
 
-    def run_tournament(self, battlefield_type: str) -> Dict:
+    def run_tournament(
+        self,
+        battlefield_type: str,
+        *,
+        seed: Optional[int] = None,
+        max_workers: Optional[int] = None,
+    ) -> Dict:
         """为指定战场类型运行一整期淘汰赛并写入所有战报。
 
-        返回简单汇总信息：期数、参赛人数、冠军等。
+        - 所有参赛者的出战幻兽及装备在开赛前一次性批量加载；
+        - 每一轮的对局互不依赖，max_workers > 1 时分发到进程池并行模拟
+          （子进程以 spawn 方式启动，调用方所在的多线程 Web / 调度进程不会被 fork）；
+        - 每场对局使用由 (seed, 期数, 轮次, 场次) 派生的独立随机种子，
+          因此同一 seed 下无论串行还是并行，结果完全一致；
+        - 每轮战报用一条多行 INSERT 批量写入。
+
+        返回简单汇总信息：期数、参赛人数、冠军、本期随机种子等。
         """
 
         cfg = BATTLEFIELD_TYPES.get(battlefield_type)
@@ -72,8 +89,13 @@ class BattlefieldService:
         if len(participants) < 2:
             return {"ok": False, "error": "参赛玩家不足，至少需要2人"}
 
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(63)
+        rng = random.Random(seed)
+
         # 分配阵营（简单按人数对半分红/蓝）
-        random.shuffle(participants)
+        participants.sort(key=lambda p: p.user_id)
+        rng.shuffle(participants)
         half = len(participants) // 2
         for idx, p in enumerate(participants):
             p.team = "red" if idx < half else "blue"
@@ -81,46 +103,73 @@ class BattlefieldService:
         last_period = self.battle_repo.get_latest_period(battlefield_type) or 0
         period = last_period + 1
 
-        remaining: List[BattlefieldParticipant] = participants[:]
-        next_round: List[BattlefieldParticipant] = []
+        teams = self._load_pvp_teams(participants)
 
+        remaining: List[BattlefieldParticipant] = participants[:]
         round_num = 0
         wins_count: Dict[int, int] = defaultdict(int)
 
-        while len(remaining) > 1:
-            round_num += 1
-            match_num = 0
-            next_round.clear()
-
-            # 处理轮空：若为奇数人，随机挑一人直接晋级
-            temp_players = remaining[:]
-            bye_player: Optional[BattlefieldParticipant] = None
-            if len(temp_players) % 2 == 1:
-                bye_index = random.randint(0, len(temp_players) - 1)
-                bye_player = temp_players.pop(bye_index)
-                next_round.append(bye_player)
-
-            random.shuffle(temp_players)
-
-            for i in range(0, len(temp_players), 2):
-                p1 = temp_players[i]
-                p2 = temp_players[i + 1]
-                match_num += 1
-
-                battle_result = self._run_single_battle(
-                    battlefield_type=battlefield_type,
-                    period=period,
-                    round_num=round_num,
-                    match_num=match_num,
-                    first=p1,
-                    second=p2,
-                )
-
-                winner = battle_result["winner"]
-                wins_count[winner.user_id] += 1
-                next_round.append(winner)
-
-            remaining = next_round[:]
+        executor = (
+            ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+            if (max_workers or 1) > 1
+            else None
+        )
+        try:
+            while len(remaining) > 1:
+                round_num += 1
+                next_round: List[BattlefieldParticipant] = []
+
+                # 处理轮空：若为奇数人，随机挑一人直接晋级
+                temp_players = remaining[:]
+                if len(temp_players) % 2 == 1:
+                    bye_index = rng.randint(0, len(temp_players) - 1)
+                    next_round.append(temp_players.pop(bye_index))
+
+                rng.shuffle(temp_players)
+                pairs = [(temp_players[i], temp_players[i + 1]) for i in range(0, len(temp_players), 2)]
+
+                tasks = [
+                    _MatchTask(
+                        seed=f"{seed}:{battlefield_type}:{period}:{round_num}:{match_num}",
+                        first=self._to_pvp_player(first, teams),
+                        second=self._to_pvp_player(second, teams),
+                    )
+                    for match_num, (first, second) in enumerate(pairs, start=1)
+                ]
+                if executor is not None:
+                    outcomes = list(executor.map(_simulate_match, tasks))
+                else:
+                    outcomes = [_simulate_match(task) for task in tasks]
+
+                logs = []
+                for match_num, ((first, second), (is_first_win, battle_report)) in enumerate(
+                    zip(pairs, outcomes), start=1
+                ):
+                    winner = first if is_first_win else second
+                    wins_count[winner.user_id] += 1
+                    next_round.append(winner)
+                    logs.append({
+                        "battlefield_type": battlefield_type,
+                        "period": period,
+                        "round_num": round_num,
+                        "match_num": match_num,
+                        "first_user_id": first.user_id,
+                        "first_user_name": first.nickname,
+                        "second_user_id": second.user_id,
+                        "second_user_name": second.nickname,
+                        "first_user_team": first.team,
+                        "second_user_team": second.team,
+                        "is_first_win": is_first_win,
+                        # 胜负标签：先简单用 “胜利/失败”，后续可根据剩余血量细分小胜/完美胜利
+                        "result_label": "胜利" if is_first_win else "失败",
+                        "battle_report": battle_report,
+                    })
+
+                self._save_round_logs(logs)
+                remaining = next_round
+        finally:
+            if executor is not None:
+                executor.shutdown()
 
         champion = remaining[0]
         champion_wins = wins_count.get(champion.user_id, 0)
@@ -139,6 +188,7 @@ class BattlefieldService:
             "ok": True,
             "battlefield_type": battlefield_type,
             "period": period,
+            "seed": seed,
             "total_players": len(participants),
             "total_rounds": round_num,
             "champion_id": champion.user_id,
@@ -303,231 +353,75 @@ class BattlefieldService:
         return participants
 
 
-    def _build_battle_data(self, pvp_result, attacker_player: PvpPlayer, defender_player: PvpPlayer) -> Dict:
-        """根据 PvpBattleResult 构建战报数据结构（与擂台/镇妖保持一致）。"""
-
-        attacker_name = attacker_player.name or str(attacker_player.player_id)
-        defender_name = defender_player.name or str(defender_player.player_id)
-
-        def get_player_name(pid: int) -> str:
-            return attacker_name if pid == attacker_player.player_id else defender_name
-
-        def get_side_flag(pid: int) -> str:
-            return "attacker" if pid == attacker_player.player_id else "defender"
-
-        def build_battle_segment(battle_index: int, seg_logs):
-            if not seg_logs:
-                return {
-                    "battle_num": battle_index,
-                    "attacker_beast": "",
-                    "defender_beast": "",
-                    "winner": "defender",
-                    "rounds": [],
-                    "result": "",
-                }
-
-            rounds = []
-            for idx, log in enumerate(seg_logs, start=1):
-                rounds.append({
-                    "round": idx,
-                    "action": log.description,
-                    "a_hp": log.attacker_hp_after,
-                    "d_hp": log.defender_hp_after,
-                })
-
-            beast_state: Dict[Tuple[int, int], Tuple[str, int]] = {}
-            for log in seg_logs:
-                if log.attacker_beast_id != 0:
-                    beast_state[(log.attacker_player_id, log.attacker_beast_id)] = (
-                        log.attacker_name,
-                        log.attacker_hp_after,
-                    )
-                if log.defender_beast_id != 0:
-                    beast_state[(log.defender_player_id, log.defender_beast_id)] = (
-                        log.defender_name,
-                        log.defender_hp_after,
-                    )
-
-            winner_player_id = pvp_result.winner_player_id
-            loser_player_id = (
-                attacker_player.player_id
-                if winner_player_id == defender_player.player_id
-                else defender_player.player_id
-            )
-            winner_beast_name = ""
-            loser_beast_name = ""
-            winner_hp = 0
-
-            keys = list(beast_state.keys())
-            if keys:
-                if len(keys) == 1:
-                    keys = keys * 2
-                (p1, b1), (p2, b2) = keys[0], keys[1]
-                name1, hp1 = beast_state[(p1, b1)]
-                name2, hp2 = beast_state[(p2, b2)]
-
-                if hp1 > 0 and hp2 <= 0:
-                    winner_player_id, loser_player_id = p1, p2
-                    winner_beast_name, winner_hp = name1, hp1
-                    loser_beast_name = name2
-                elif hp2 > 0 and hp1 <= 0:
-                    winner_player_id, loser_player_id = p2, p1
-                    winner_beast_name, winner_hp = name2, hp2
-                    loser_beast_name = name1
-                elif hp1 != hp2:
-                    if hp1 > hp2:
-                        winner_player_id, loser_player_id = p1, p2
-                        winner_beast_name, winner_hp = name1, hp1
-                        loser_beast_name = name2
-                    else:
-                        winner_player_id, loser_player_id = p2, p1
-                        winner_beast_name, winner_hp = name2, hp2
-                        loser_beast_name = name1
-
-            winner_player_name = get_player_name(winner_player_id)
-            winner_flag = get_side_flag(winner_player_id)
-
-            if winner_beast_name and loser_beast_name:
-                result_text = f"『{winner_player_name}』的{winner_beast_name}获胜，剩余气血{winner_hp}"
-            else:
-                result_text = f"『{winner_player_name}』获胜"
-
-            return {
-                "battle_num": battle_index,
-                "attacker_beast": "",
-                "defender_beast": "",
-                "winner": winner_flag,
-                "rounds": rounds,
-                "result": result_text,
-            }
-
-        battles = []
-        current_pair = None
-        current_logs = []
-
-        for log in pvp_result.logs:
-            if log.attacker_beast_id == 0 and current_pair is not None:
-                current_logs.append(log)
-                continue
+    def _load_pvp_teams(self, participants: List[BattlefieldParticipant]) -> Dict[int, List[PvpBeast]]:
+        """开赛前一次性加载所有参赛者的出战幻兽并转换为 PvpBeast（满血模板）"""
+        user_ids = [p.user_id for p in participants]
+        batch = getattr(self.player_beast_repo, "get_team_beasts_by_users", None)
+        if batch is not None:
+            raw_teams = batch(user_ids)
+        else:
+            raw_teams = {uid: self.player_beast_repo.get_team_beasts(uid) for uid in user_ids}
+        raw_teams = {uid: raw_teams.get(uid) or [] for uid in user_ids}
+        return self.beast_pvp_service.to_pvp_teams(raw_teams)
+
+    @staticmethod
+    def _to_pvp_player(p: BattlefieldParticipant, teams: Dict[int, List[PvpBeast]]) -> PvpPlayer:
+        # 每场对局都从满血模板复制一份，避免上一场的气血/状态带入下一场
+        return PvpPlayer(
+            player_id=p.user_id,
+            level=p.level,
+            beasts=copy.deepcopy(teams.get(p.user_id) or []),
+            name=p.nickname,
+        )
 
-            pair = frozenset({log.attacker_beast_id, log.defender_beast_id})
+    def _save_round_logs(self, logs: List[Dict]) -> None:
+        """一轮战报批量写入（仓库不支持批量时逐条写入）"""
+        save_battles = getattr(self.battle_repo, "save_battles", None)
+        if save_battles is not None:
+            save_battles(logs)
+            return
+        for log in logs:
+            self.battle_repo.save_battle(**log)
 
-            if current_pair is None:
-                current_pair = pair
-                current_logs.append(log)
-            elif pair == current_pair:
-                current_logs.append(log)
-            else:
-                battles.append(build_battle_segment(len(battles) + 1, current_logs))
-                current_pair = pair
-                current_logs = [log]
 
-        if current_logs:
-            battles.append(build_battle_segment(len(battles) + 1, current_logs))
+@dataclass
+class _MatchTask:
+    """一场待模拟的对局（可序列化后发送到子进程）"""
 
-        is_victory = pvp_result.winner_player_id == attacker_player.player_id
-        attacker_wins = 1 if is_victory else 0
-        defender_wins = 1 - attacker_wins
+    seed: str
+    first: PvpPlayer
+    second: PvpPlayer
 
-        return {
-            "is_victory": is_victory,
-            "attacker_wins": attacker_wins,
-            "defender_wins": defender_wins,
-            "battles": battles,
-        }
 
-    def _run_single_battle(
-        self,
-        *,
-        battlefield_type: str,
-        period: int,
-        round_num: int,
-        match_num: int,
-        first: BattlefieldParticipant,
-        second: BattlefieldParticipant,
-    ) -> Dict:
-        """执行一场玩家 vs 玩家 对战，并写入 battlefield_battle_log。
+def _simulate_match(task: _MatchTask) -> Tuple[bool, bytes]:
+    """模拟一场对局，返回 (先手方是否获胜, 紧凑战报)。
 
-        返回 winner 这个 BattlefieldParticipant。
-        """
+    进程池工作函数：只依赖入参和种子，同一任务在任何进程中结果都相同。
+    战斗以 compact 模式记录，不在模拟时拼描述文本；战报在查看详情时才还原。
+    """
+    first, second = task.first, task.second
 
-        beasts1 = self.player_beast_repo.get_team_beasts(first.user_id)
-        beasts2 = self.player_beast_repo.get_team_beasts(second.user_id)
-
-        # 若某一方没有出战幻兽，则判为直接失败
-        if not beasts1 and not beasts2:
-            # 都没有，直接随机一方胜利
-            winner = random.choice([first, second])
-            loser = second if winner is first else first
-            is_first_win = winner is first
-            battle_data = {
-                "is_victory": is_first_win,
-                "attacker_wins": 1 if is_first_win else 0,
-                "defender_wins": 0 if is_first_win else 1,
-                "battles": [],
-            }
-        elif not beasts1:
-            winner = second
-            loser = first
-            is_first_win = False
-            battle_data = {
-                "is_victory": False,
-                "attacker_wins": 0,
-                "defender_wins": 1,
-                "battles": [],
-            }
-        elif not beasts2:
-            winner = first
-            loser = second
+    # 若某一方没有出战幻兽，则判为直接失败；都没有则随机一方胜利
+    if not first.beasts or not second.beasts:
+        if first.beasts:
             is_first_win = True
-            battle_data = {
-                "is_victory": True,
-                "attacker_wins": 1,
-                "defender_wins": 0,
-                "battles": [],
-            }
+        elif second.beasts:
+            is_first_win = False
         else:
-            pvp_beasts1 = self.beast_pvp_service.to_pvp_beasts(beasts1)
-            pvp_beasts2 = self.beast_pvp_service.to_pvp_beasts(beasts2)
-
-            attacker_player = PvpPlayer(
-                player_id=first.user_id,
-                level=first.level,
-                beasts=pvp_beasts1,
-                name=first.nickname,
-            )
-            defender_player = PvpPlayer(
-                player_id=second.user_id,
-                level=second.level,
-                beasts=pvp_beasts2,
-                name=second.nickname,
-            )
-
-            pvp_result = run_pvp_battle(attacker_player, defender_player, max_log_turns=50)
-            is_first_win = pvp_result.winner_player_id == first.user_id
-            winner = first if is_first_win else second
-            loser = second if is_first_win else first
-
-            battle_data = self._build_battle_data(pvp_result, attacker_player, defender_player)
-
-        # 胜负标签：先简单用 “胜利/失败”，后续可根据剩余血量细分小胜/完美胜利
-        result_label = "胜利" if is_first_win else "失败"
-
-        # 写入战报表
-        self.battle_repo.save_battle(
-            battlefield_type=battlefield_type,
-            period=period,
-            round_num=round_num,
-            match_num=match_num,
-            first_user_id=first.user_id,
-            first_user_name=first.nickname,
-            second_user_id=second.user_id,
-            second_user_name=second.nickname,
-            first_user_team=first.team,
-            second_user_team=second.team,
-            is_first_win=is_first_win,
-            result_label=result_label,
-            battle_data=battle_data,
+            is_first_win = random.Random(task.seed).random() < 0.5
+        winner, loser = (first, second) if is_first_win else (second, first)
+        pvp_result = PvpBattleResult(
+            attacker_player_id=first.player_id,
+            defender_player_id=second.player_id,
+            winner_player_id=winner.player_id,
+            loser_player_id=loser.player_id,
+            total_turns=0,
         )
-
-        return {"winner": winner, "loser": loser, "is_first_win": is_first_win}
+        return is_first_win, encode_battle_report(pvp_result, first, second)
+
+    # 每场对局使用独立的随机数生成器，不影响进程内的模块级 random
+    pvp_result = run_pvp_battle(
+        first, second, max_log_turns=50, log_mode=LOG_COMPACT, rng=random.Random(task.seed)
+    )
+    is_first_win = pvp_result.winner_player_id == first.player_id
+    return is_first_win, encode_battle_report(pvp_result, first, second)
@@ -1,7 +1,9 @@
 """
 幻兽PVP数据转换服务
 """
-from typing import List, Dict, Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, Iterable, List, Optional
+from domain.entities.mosoul import BeastMoSoulSlot
 from domain.services.pvp_battle_engine import PvpBeast
 from domain.services.skill_system import apply_buff_debuff_skills
 from domain.repositories.spirit_repo import ISpiritRepo
@@ -10,6 +12,14 @@ from domain.repositories.mosoul_repo import IBeastMoSoulRepo
 from infrastructure.config.bone_system_config import get_bone_system_config
 
 
+@dataclass
+class BeastEquipment:
+    """单只幻兽的装备快照（战灵 / 魔魂槽位 / 战骨）"""
+    spirits: List = field(default_factory=list)
+    mosoul_slot: Optional[BeastMoSoulSlot] = None
+    bones: List = field(default_factory=list)
+
+
 class BeastPvpService:
     """幻兽PVP数据转换服务，统一计算装备加成和技能效果"""
 
@@ -25,15 +35,64 @@ class BeastPvpService:
         self.bone_cfg = get_bone_system_config()
 
     def to_pvp_beasts(self, raw_beasts: List) -> List[PvpBeast]:
-        """将数据库中的幻兽数据转换为 PvpBeast，并应用所有装备加成和技能效果。"""
-        pvp_beasts: List[PvpBeast] = []
-        for b in raw_beasts:
-            pvp_beasts.append(self.to_pvp_beast(b))
-        return pvp_beasts
-
-    def to_pvp_beast(self, b) -> PvpBeast:
-        """将单个原始幻兽转换为 PvpBeast"""
-        stats = self.get_beast_stats(b)
+        """将数据库中的幻兽数据转换为 PvpBeast，并应用所有装备加成和技能效果。
+
+        整队的战灵/魔魂/战骨各用一次批量查询加载。
+        """
+        equipment = self.load_equipment(b.id for b in raw_beasts)
+        return [self.to_pvp_beast(b, equipment.get(b.id)) for b in raw_beasts]
+
+    def to_pvp_teams(self, teams: Dict[Hashable, List]) -> Dict[Hashable, List[PvpBeast]]:
+        """批量转换多支队伍（如整个淘汰赛对阵表），所有幻兽的装备只加载一次。
+
+        Args:
+            teams: {队伍键（如玩家ID）: 原始幻兽列表}
+        """
+        equipment = self.load_equipment(b.id for beasts in teams.values() for b in beasts)
+        return {
+            key: [self.to_pvp_beast(b, equipment.get(b.id)) for b in beasts]
+            for key, beasts in teams.items()
+        }
+
+    def load_equipment(self, beast_ids: Iterable[int]) -> Dict[int, BeastEquipment]:
+        """批量加载装备：每张表一条 WHERE beast_id IN (...) 查询"""
+        ids = [bid for bid in dict.fromkeys(beast_ids) if bid is not None]
+        if not ids:
+            return {}
+
+        spirits = self._batch_load(self.spirit_repo, "get_by_beast_ids", "get_by_beast_id", ids)
+        slots = self._batch_load(self.mosoul_repo, "get_by_beast_ids", "get_by_beast_id", ids)
+        bones = self._batch_load(self.bone_repo, "get_by_beast_ids", "get_by_beast_id", ids)
+
+        return {
+            bid: BeastEquipment(
+                spirits=spirits.get(bid) or [],
+                mosoul_slot=slots.get(bid),
+                bones=bones.get(bid) or [],
+            )
+            for bid in ids
+        }
+
+    @staticmethod
+    def _batch_load(repo, batch_method: str, single_method: str, ids: List[int]) -> Dict[int, Any]:
+        """优先使用仓库的批量接口；仓库未实现时逐个查询。查询失败视为无装备。"""
+        loader = getattr(repo, batch_method, None)
+        if loader is not None:
+            try:
+                return loader(ids) or {}
+            except Exception:
+                return {}
+        result = {}
+        for bid in ids:
+            try:
+                result[bid] = getattr(repo, single_method)(bid)
+            except Exception:
+                result[bid] = None
+        return result
+
+    def to_pvp_beast(self, b, equipment: Optional[BeastEquipment] = None) -> PvpBeast:
+        """将单个原始幻兽转换为 PvpBeast（equipment 为空时单独查询装备）"""
+        stats = self.get_beast_stats(b, equipment)
         nature = getattr(b, "nature", "") or ""
         attack_type = "magic" if "法" in nature else "physical"
         skills = getattr(b, "skills", []) or []
@@ -91,8 +150,14 @@ class BeastPvpService:
             poison_resist=special_effects.get("poison_resist", 0.0) or 0.0,
         )
 
-    def get_beast_stats(self, b) -> Dict[str, int]:
-        """计算幻兽应用所有装备加成后的基础属性（不含技能加成）"""
+    def get_beast_stats(self, b, equipment: Optional[BeastEquipment] = None) -> Dict[str, int]:
+        """计算幻兽应用所有装备加成后的基础属性（不含技能加成）
+
+        equipment 为预加载的装备快照；为空时按幻兽ID单独查询。
+        """
+        if equipment is None:
+            equipment = self.load_equipment([b.id]).get(b.id) or BeastEquipment()
+
         nature = getattr(b, "nature", "") or ""
         attack_type = "magic" if "法" in nature else "physical"
 
@@ -105,10 +170,7 @@ class BeastPvpService:
         raw_spd = int(getattr(b, "speed", 0) or 0)
 
         # 1) 战灵加成 (百分比)
-        try:
-            equipped_spirits = self.spirit_repo.get_by_beast_id(b.id)
-        except Exception:
-            equipped_spirits = []
+        equipped_spirits = equipment.spirits
 
         hp_bp, pa_bp, ma_bp, pd_bp, md_bp, spd_bp = 0, 0, 0, 0, 0, 0
         for sp in equipped_spirits:
@@ -139,7 +201,7 @@ class BeastPvpService:
         mosoul_flat_bonus = {"hp": 0, "physical_attack": 0, "magic_attack": 0, "physical_defense": 0, "magic_defense": 0, "speed": 0}
 
         try:
-            mosoul_slot = self.mosoul_repo.get_by_beast_id(b.id)
+            mosoul_slot = equipment.mosoul_slot
             if mosoul_slot:
                 bonuses = mosoul_slot.get_total_stat_bonus()
                 for attr, bonus in bonuses.items():
@@ -158,10 +220,7 @@ class BeastPvpService:
         spd = raw_spd + int(raw_spd * (spd_bp / 10000 + mosoul_pct_bonus["speed"] / 100))
 
         # 3) 战骨加成 (固定值)
-        try:
-            bones = self.bone_repo.get_by_beast_id(b.id)
-        except Exception:
-            bones = []
+        bones = equipment.bones
 
         bone_hp, bone_atk, bone_pd, bone_md, bone_spd = 0, 0, 0, 0, 0
         for bn in bones:
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Callable, Dict, List, Optional
+
+from domain.repositories.beast_repo import IBeastDerivedStatsRepo
+
+
+# 属性公式/成长配置调整时递增，使全部缓存一次性失效
+STATS_FORMULA_VERSION = 1
+
+# _calc_beast_stats 会写回的字段，只有这些字段真正变化时才回写幻兽表
+_PERSISTED_FIELDS = (
+    "hp",
+    "speed",
+    "physical_attack",
+    "magic_attack",
+    "physical_defense",
+    "magic_defense",
+    "combat_power",
+    "nature",
+    "attack_type",
+)
+
+
+def calc_stats_stamp(beast) -> str:
+    """幻兽基础输入（等级/境界/资质/成长/属性类型）的版本摘要"""
+    parts = (
+        STATS_FORMULA_VERSION,
+        getattr(beast, "name", ""),
+        getattr(beast, "realm", ""),
+        int(getattr(beast, "level", 0) or 0),
+        int(getattr(beast, "growth_rate", 0) or 0),
+        int(getattr(beast, "hp_aptitude", 0) or 0),
+        int(getattr(beast, "speed_aptitude", 0) or 0),
+        int(getattr(beast, "physical_attack_aptitude", 0) or 0),
+        int(getattr(beast, "magic_attack_aptitude", 0) or 0),
+        int(getattr(beast, "physical_defense_aptitude", 0) or 0),
+        int(getattr(beast, "magic_defense_aptitude", 0) or 0),
+        getattr(beast, "nature", "") or "",
+        getattr(beast, "attack_type", "") or "",
+    )
+    return hashlib.sha1("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+
+
+class BeastStatsCacheService:
+    """幻兽派生属性缓存
+
+    - 缓存键：beast_id + 基础输入摘要（等级、境界、资质等变化后摘要不同，自动失效）
+    - 装备类变化（战灵/战骨/魔魂穿戴、卸下、洗练、升级）不体现在摘要中，由调用方 invalidate
+    - 命中时直接返回总战力，幻兽表中的属性即为上次计算结果，不再重算也不回写
+    """
+
+    def __init__(self, cache_repo: IBeastDerivedStatsRepo, player_beast_repo):
+        self.cache_repo = cache_repo
+        self.player_beast_repo = player_beast_repo
+
+    def resolve_powers(
+        self,
+        beasts: List,
+        *,
+        calc_stats: Callable,
+        calc_power: Callable,
+    ) -> Dict[int, int]:
+        """返回 {beast_id: 含装备加成的总战力}
+
+        未命中的幻兽会原地重算属性（calc_stats），仅在属性确有变化时回写幻兽表，
+        并批量写入新的缓存行。
+        """
+        if not beasts:
+            return {}
+
+        cached = self.cache_repo.get_by_beast_ids([b.id for b in beasts])
+
+        powers: Dict[int, int] = {}
+        fresh = []
+        for beast in beasts:
+            entry = cached.get(beast.id)
+            if entry is not None and entry[0] == calc_stats_stamp(beast):
+                powers[beast.id] = entry[1]
+                continue
+
+            before = tuple(getattr(beast, f, None) for f in _PERSISTED_FIELDS)
+            calc_stats(beast)
+            if tuple(getattr(beast, f, None) for f in _PERSISTED_FIELDS) != before:
+                self.player_beast_repo.update_beast(beast)
+
+            power = int(calc_power(beast) or 0)
+            powers[beast.id] = power
+            fresh.append((beast.id, calc_stats_stamp(beast), power))
+
+        if fresh:
+            self.cache_repo.upsert_many(fresh)
+        return powers
+
+    def invalidate(self, *beast_ids: Optional[int]) -> None:
+        """使指定幻兽的缓存失效（忽略空 ID）"""
+        ids = [int(i) for i in beast_ids if i]
+        if ids:
+            self.cache_repo.delete_by_beast_ids(ids)
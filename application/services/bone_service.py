@@ -45,11 +45,13 @@ class BoneService:
         bone_template_repo: IBoneTemplateRepo,
         inventory_service,
         player_repo,
+        beast_stats_cache=None,
     ):
         self.bone_repo = bone_repo
         self.bone_template_repo = bone_template_repo
         self.inventory_service = inventory_service
         self.player_repo = player_repo
+        self.beast_stats_cache = beast_stats_cache
         self.config = get_bone_system_config()
 
     # ===================== 查询 =====================
@@ -132,8 +134,10 @@ class BoneService:
                 b.beast_id = None
                 self.bone_repo.save(b)
 
+        prev_beast_id = bone.beast_id
         bone.beast_id = beast_id
         self.bone_repo.save(bone)
+        self._invalidate_beast_stats(beast_id, prev_beast_id)
 
         stage_cfg = self.config.get_stage_config(bone.stage)
         stage_name = stage_cfg["name"] if stage_cfg else ""
@@ -146,8 +150,10 @@ class BoneService:
         if bone is None or bone.user_id != user_id:
             raise BoneError("战骨不存在")
 
+        prev_beast_id = bone.beast_id
         bone.beast_id = None
         self.bone_repo.save(bone)
+        self._invalidate_beast_stats(prev_beast_id)
 
         stage_cfg = self.config.get_stage_config(bone.stage)
         stage_name = stage_cfg["name"] if stage_cfg else ""
@@ -303,6 +309,7 @@ class BoneService:
 
         # 保存
         self.bone_repo.save(bone)
+        self._invalidate_beast_stats(bone.beast_id)
 
         stage_name = stage_cfg["name"]
         stars = stage_cfg["stars"]
@@ -492,12 +499,17 @@ class BoneService:
 
         # 保存
         self.bone_repo.save(bone)
+        self._invalidate_beast_stats(bone.beast_id)
 
         stage_name = next_stage_cfg["name"]
         stars = next_stage_cfg["stars"]
         return BoneWithInfo(bone=bone, stage_name=stage_name, stars=stars)
 
     # ===================== 辅助方法 =====================
+    def _invalidate_beast_stats(self, *beast_ids) -> None:
+        if self.beast_stats_cache is not None:
+            self.beast_stats_cache.invalidate(*beast_ids)
+
     def _recalc_bone_stats(self, bone: BeastBone) -> None:
         """重新计算战骨属性"""
         stats = self.config.calc_bone_stats(bone.stage, bone.slot, bone.level)
@@ -597,6 +609,7 @@ class BoneService:
         # 计算属性并保存
         self._recalc_bone_stats(bone)
         self.bone_repo.save(bone)
+        self._invalidate_beast_stats(beast_id)
 
         stage_cfg = self.config.get_stage_config(1)
         stage_name = stage_cfg["name"] if stage_cfg else "原始"
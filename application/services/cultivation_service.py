@@ -346,8 +346,7 @@ class CultivationService:
 
         # 1. 应用玩家基础奖励
         player.prestige += reward.prestige
-        if reward.spirit_stones > 0:
-            self.inventory_service.add_item(user_id, 9001, reward.spirit_stones)
+        reward_items = [(9001, reward.spirit_stones)] if reward.spirit_stones > 0 else []
         
         # 2. 应用幻兽经验
         beast_summaries = []
@@ -375,8 +374,9 @@ class CultivationService:
                 # 寻找物品ID
                 item_template = self.item_repo.get_by_name(item_name)
                 if item_template:
-                    self.inventory_service.add_item(user_id, item_template.id, quantity)
+                    reward_items.append((item_template.id, quantity))
                     item_summaries.append(item_str)
+        self.inventory_service.add_items(user_id, reward_items)
 
         # 重置修行状态
         player.cultivation_start_time = None
@@ -443,8 +443,7 @@ class CultivationService:
 
         # 应用奖励
         player.prestige += reward.prestige
-        if reward.spirit_stones > 0:
-            self.inventory_service.add_item(user_id, 9001, reward.spirit_stones)
+        reward_items = [(9001, reward.spirit_stones)] if reward.spirit_stones > 0 else []
         
         beast_summaries = []
         for beast_gain in reward.beast_exp_gains:
@@ -467,8 +466,9 @@ class CultivationService:
                 quantity = int(match.group(2))
                 item_template = self.item_repo.get_by_name(item_name)
                 if item_template:
-                    self.inventory_service.add_item(user_id, item_template.id, quantity)
+                    reward_items.append((item_template.id, quantity))
                     item_summaries.append(item_str)
+        self.inventory_service.add_items(user_id, reward_items)
 
         self.player_repo.save(player)
 
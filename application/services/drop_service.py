@@ -57,9 +57,4 @@ class DropService:
 
     def apply_drops(self, user_id: int, drops: List[DropResult]) -> None:
         """将掉落物品存入背包"""
-        for drop in drops:
-            self.inventory_service.add_item(
-                user_id=user_id,
-                item_id=drop.item_id,
-                quantity=drop.quantity,
-            )
+        self.inventory_service.add_items(user_id, [(drop.item_id, drop.quantity) for drop in drops])
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from application.services.inventory_service import InventoryService, InventoryError
-from domain.entities.immortalize_pool import ImmortalizePool
+from domain.entities.immortalize_pool import FormationGrant, ImmortalizePool
 from domain.repositories.immortalize_pool_repo import IImmortalizePoolRepo
 from domain.repositories.player_repo import IPlayerRepo
 from infrastructure.config.immortalize_config import ImmortalizeConfig
@@ -139,56 +140,74 @@ class ImmortalizePoolService:
     def _grant_formation_exp(
         self, pool: ImmortalizePool, now: Optional[datetime] = None
     ) -> Optional[Dict]:
+        grant, result = self._settle_formation(pool, now or self._now(), *self._formation_tables())
+        if grant is not None:
+            self.pool_repo.upsert(pool)
+        return result
+
+    def _formation_tables(self) -> Tuple[Dict[int, int], Dict[int, int]]:
+        """化仙阵每小时经验表、化仙池容量表（按等级）"""
+        hourly = {int(k): int(v or 0) for k, v in self.config.get_all_formation_hourly_exp().items()}
+        capacity = {int(k): int(v or 0) for k, v in self.config.get_all_pool_capacity().items()}
+        return hourly, capacity
+
+    def _settle_formation(
+        self,
+        pool: ImmortalizePool,
+        now: datetime,
+        hourly_table: Dict[int, int],
+        capacity_table: Dict[int, int],
+    ) -> Tuple[Optional[FormationGrant], Optional[Dict]]:
+        """在内存中结算化仙阵收益并修改 pool
+
+        Returns:
+            (需要写回的结算，None 表示无需写库；结算结果，None 表示本次没有发放经验)
+        """
         start = self._ensure_datetime(pool.formation_started_at)
         end = self._ensure_datetime(pool.formation_ends_at)
         if not start or not end:
-            return None
+            return None, None
 
         last = self._ensure_datetime(pool.formation_last_grant_at) or start
-        now = now or self._now()
         if last >= end or now <= last:
             if now >= end:
                 self._clear_formation(pool)
-                self.pool_repo.upsert(pool)
-            return None
+                return self._formation_grant(pool, 0, 0), None
+            return None, None
 
         grant_until = min(now, end)
         elapsed_seconds = (grant_until - last).total_seconds()
         hours_to_grant = int(elapsed_seconds // 3600)
         if hours_to_grant <= 0:
-            return None
+            return None, None
 
-        hourly_exp = self.config.get_formation_hourly_exp(
-            pool.formation_level or pool.pool_level
-        )
-        total_added = 0
-        remaining_hours = hours_to_grant
-        processed_hours = 0
-        while remaining_hours > 0:
-            capacity = self._get_capacity(pool.pool_level)
-            added = pool.add_exp(hourly_exp, capacity)
-            if added <= 0:
-                break
-            total_added += added
-            remaining_hours -= 1
-            processed_hours += 1
+        hourly_exp = hourly_table.get(pool.formation_level or pool.pool_level, 0)
+        capacity = capacity_table.get(pool.pool_level, 0)
+        if capacity <= 0:
+            raise ImmortalizeError("化仙池容量配置缺失，请稍后重试")
+
+        # 每小时注入 hourly_exp，池满即停：发放小时数与经验可直接算出
+        processed_hours = total_added = 0
+        if hourly_exp > 0:
+            free_space = max(capacity - pool.current_exp, 0)
+            processed_hours = min(hours_to_grant, -(-free_space // hourly_exp))
+            total_added = pool.add_exp(processed_hours * hourly_exp, capacity)
+        remaining_hours = hours_to_grant - processed_hours
 
         pool.formation_last_grant_at = last + timedelta(hours=processed_hours)
         finished = False
         if processed_hours <= 0:
             if grant_until >= end:
                 self._clear_formation(pool)
-                finished = True
-            self.pool_repo.upsert(pool)
-            return None
+                return self._formation_grant(pool, 0, capacity), None
+            return None, None
 
         if grant_until >= end or remaining_hours > 0:
             # 阵结束或容量不足，终止化仙阵
             self._clear_formation(pool)
             finished = True
 
-        self.pool_repo.upsert(pool)
-        return {
+        return self._formation_grant(pool, total_added, capacity), {
             "user_id": pool.user_id,
             "hours_processed": processed_hours,
             "exp_per_hour": hourly_exp,
@@ -196,6 +215,65 @@ class ImmortalizePoolService:
             "finished": finished,
         }
 
+    @staticmethod
+    def _formation_grant(pool: ImmortalizePool, exp_added: int, capacity: int) -> FormationGrant:
+        return FormationGrant(
+            user_id=pool.user_id,
+            exp_added=exp_added,
+            capacity=capacity,
+            formation_level=pool.formation_level,
+            formation_started_at=pool.formation_started_at,
+            formation_ends_at=pool.formation_ends_at,
+            formation_last_grant_at=pool.formation_last_grant_at,
+        )
+
+    def settle_formations(self, now: Optional[datetime] = None, chunk_size: int = 500) -> Dict:
+        """批量结算所有运行中的化仙阵（定时任务用）
+
+        一次查询读出全部运行中的化仙池，在内存中按经验表结算，
+        再按 chunk_size 分块用 UPDATE ... CASE 写回。返回本次运行的统计。
+        """
+        started = time.perf_counter()
+        now = now or self._now()
+        pools = self.pool_repo.get_active_formations()
+        loaded = time.perf_counter()
+
+        hourly_table, capacity_table = self._formation_tables()
+        grants: List[FormationGrant] = []
+        granted = finished = failed = total_exp = 0
+        for pool in pools:
+            snapshot = pool.formation_last_grant_at
+            try:
+                grant, result = self._settle_formation(pool, now, hourly_table, capacity_table)
+            except ImmortalizeError:
+                failed += 1
+                continue
+            if grant is not None:
+                grant.expected_last_grant_at = snapshot
+                grants.append(grant)
+            if result:
+                granted += 1
+                total_exp += result["total_added"]
+                finished += int(result["finished"])
+        computed = time.perf_counter()
+
+        updated = self.pool_repo.apply_formation_grants(grants, chunk_size) if grants else 0
+        done = time.perf_counter()
+        return {
+            "pools": len(pools),
+            "granted": granted,
+            "finished": finished,
+            "failed": failed,
+            "total_exp": total_exp,
+            "rows_written": len(grants),
+            "rows_updated": updated,
+            "chunks": -(-len(grants) // max(1, chunk_size)),
+            "load_ms": (loaded - started) * 1000,
+            "compute_ms": (computed - loaded) * 1000,
+            "write_ms": (done - computed) * 1000,
+            "total_ms": (done - started) * 1000,
+        }
+
     def spend_exp(self, user_id: int, amount: int) -> Dict:
         if amount <= 0:
             raise ImmortalizeError("消耗经验必须大于0")
@@ -1,10 +1,11 @@
-from typing import List, Tuple, Optional, TYPE_CHECKING
+from typing import Dict, Iterable, List, Tuple, Optional, TYPE_CHECKING
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import os
 import json
 import random
 from infrastructure.db.connection import execute_query, execute_update
+from infrastructure.db.unit_of_work import transactional
 
 from domain.entities.item import Item, InventoryItem, PlayerBag
 from domain.repositories.item_repo import IItemRepo
@@ -114,6 +115,7 @@ class InventoryService:
         slot_count = self.inventory_repo.get_slot_count(user_id, is_temporary=False)
         return slot_count >= bag.capacity
 
+    @transactional
     def add_item(self, user_id: int, item_id: int, quantity: int = 1) -> Tuple[InventoryItem, bool]:
         """
         给玩家添加物品（单格上限99）
@@ -192,6 +194,87 @@ class InventoryService:
         
         return last_item, is_temp
 
+    @transactional
+    def add_items(self, user_id: int, items: Iterable[Tuple[int, int]]) -> bool:
+        """
+        批量给玩家添加多种物品（奖励包、宝箱等），堆叠与溢出规则同 add_item
+        背包只读取一次，在内存中规划各格子的数量，再合并写回
+        :param items: [(item_id, quantity), ...]，同一物品可出现多次
+        返回: 是否有物品放入临时背包
+        """
+        wanted = [(int(item_id), int(quantity)) for item_id, quantity in items if quantity > 0]
+        if not wanted:
+            return False
+
+        templates = {}
+        for item_id, _ in wanted:
+            if item_id not in templates:
+                item_template = self.item_repo.get_by_id(item_id)
+                if item_template is None:
+                    raise InventoryError(f"物品不存在: {item_id}")
+                templates[item_id] = item_template
+
+        MAX_STACK = PlayerBag.MAX_STACK_SIZE  # 99
+        stacks: Dict[Tuple[int, bool], List[InventoryItem]] = {}
+        slot_count = 0
+        for inv in self.inventory_repo.get_by_user_id(user_id, include_temp=True):
+            stacks.setdefault((inv.item_id, inv.is_temporary), []).append(inv)
+            if not inv.is_temporary:
+                slot_count += 1
+        capacity = self.inventory_repo.get_bag_info(user_id).capacity
+
+        changed: Dict[int, InventoryItem] = {}
+        created: List[InventoryItem] = []
+        has_temp = False
+        now = datetime.now()
+
+        def fill(existing: List[InventoryItem], remaining: int) -> int:
+            """填充未满99的格子，返回剩余数量"""
+            for inv in existing:
+                if remaining <= 0:
+                    break
+                if inv.quantity < MAX_STACK:
+                    add_amount = min(MAX_STACK - inv.quantity, remaining)
+                    inv.quantity += add_amount
+                    remaining -= add_amount
+                    if inv.id is not None:
+                        changed[inv.id] = inv
+            return remaining
+
+        for item_id, remaining in wanted:
+            stackable = templates[item_id].stackable
+            if stackable:
+                remaining = fill(stacks.get((item_id, False), []), remaining)
+
+            while remaining > 0:
+                is_temp = slot_count >= capacity
+                item_stacks = stacks.setdefault((item_id, is_temp), [])
+                if is_temp:
+                    # 背包已满，先填充临时背包中的同类格子
+                    has_temp = True
+                    if stackable:
+                        remaining = fill(item_stacks, remaining)
+                        if remaining <= 0:
+                            break
+                else:
+                    slot_count += 1
+
+                add_amount = min(MAX_STACK, remaining)
+                new_item = InventoryItem(
+                    user_id=user_id,
+                    item_id=item_id,
+                    quantity=add_amount,
+                    is_temporary=is_temp,
+                    created_at=now if is_temp else None,
+                )
+                item_stacks.append(new_item)
+                created.append(new_item)
+                remaining -= add_amount
+
+        self.inventory_repo.save_many(list(changed.values()) + created)
+        return has_temp
+
+    @transactional
     def remove_item(self, user_id: int, item_id: int, quantity: int = 1) -> bool:
         """移除玩家物品（只从正式背包移除，支持跨多格）"""
         total = self._get_item_count(user_id, item_id)
@@ -309,6 +392,7 @@ class InventoryService:
         items = self.inventory_repo.find_all_items(user_id, item_id, is_temporary=False)
         return sum(item.quantity for item in items)
     
+    @transactional
     def upgrade_bag(self, user_id: int) -> PlayerBag:
         """升级背包"""
         config = load_bag_upgrade_config()
@@ -374,6 +458,7 @@ class InventoryService:
         today_midnight = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
         return self.inventory_repo.delete_temp_items_before(today_midnight)
     
+    @transactional
     def transfer_temp_to_bag(self, user_id: int) -> List[dict]:
         """
         将临时背包中的物品转移到正式背包（按时间先后顺序）
@@ -470,6 +555,7 @@ class InventoryService:
                 result.append(InventoryItemWithInfo(inv_item=inv, item_info=item_info))
         return result
 
+    @transactional
     def use_item(self, user_id: int, inv_item_id: int, quantity: int = 1) -> str:
         """
         使用背包中的物品
@@ -706,6 +792,7 @@ class InventoryService:
                 return cnt
 
             rewards_summary: dict[str, int] = {}
+            reward_items: list[tuple[int, int]] = []
             gold_total = 0
 
             # 常用道具ID
@@ -728,7 +815,7 @@ class InventoryService:
 
             def _add_item_reward(item_id: int, count: int = 1):
                 nonlocal rewards_summary
-                self.add_item(user_id, int(item_id), int(count))
+                reward_items.append((int(item_id), int(count)))
                 it = self.item_repo.get_by_id(int(item_id))
                 name = it.name if it else f"物品{item_id}"
                 rewards_summary[name] = rewards_summary.get(name, 0) + int(count)
@@ -840,6 +927,7 @@ class InventoryService:
                         _add_item_reward(random.choice(pool11), 1)
                     continue
 
+            self.add_items(user_id, reward_items)
             if gold_total > 0:
                 player.gold = int(getattr(player, 'gold', 0) or 0) + gold_total
                 self.player_repo.save(player)
@@ -865,6 +953,7 @@ class InventoryService:
 
             total_gold = 0
             item_summary: dict[str, int] = {}
+            reward_items: list[tuple[int, int]] = []
             for _ in range(quantity):
                 total_gold += int(rewards_def.get("gold", 0) or 0)
                 for item_cfg in rewards_def.get("items", []) or []:
@@ -876,10 +965,11 @@ class InventoryService:
 
                     if item_id:
                         count = int(item_cfg.get("count", 1) or 1)
-                        self.add_item(user_id, int(item_id), count)
+                        reward_items.append((int(item_id), count))
                         item_name = item_cfg.get("name") or (self.item_repo.get_by_id(int(item_id)).name if self.item_repo.get_by_id(int(item_id)) else f"物品{item_id}")
                         item_summary[item_name] = item_summary.get(item_name, 0) + count
 
+            self.add_items(user_id, reward_items)
             if total_gold > 0:
                 player.gold += total_gold
                 self.player_repo.save(player)
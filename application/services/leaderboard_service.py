@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left, insort
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from domain.repositories.leaderboard_repo import ILeaderboardRepo
+from infrastructure.db.unit_of_work import after_commit
+
+
+Score = Tuple[int, ...]
+
+TOWER_TYPE = "tongtian"
+ALL_ARENA_NAME = "全部擂台"
+
+
+def _start_daemon_thread(task: Callable[[], None]) -> None:
+    threading.Thread(target=task, name="leaderboard-reconcile", daemon=True).start()
+
+
+class RankBoard:
+    """单个排行榜：按分数降序、user_id 升序排列的有序数组
+
+    - 名次与分页均为二分查找，O(log n)
+    - 分数相同的玩家名次相同（与原 COUNT(*)+1 的口径一致），分页内按 user_id 排序
+    """
+
+    def __init__(self):
+        self._keys: List[Tuple[int, ...]] = []  # (-score..., user_id)
+        self._scores: Dict[int, Score] = {}  # user_id -> (-score...)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def load(self, entries: Iterable[Tuple[int, Score]]) -> None:
+        self._scores = {int(uid): tuple(-int(v) for v in score) for uid, score in entries}
+        self._keys = sorted(neg + (uid,) for uid, neg in self._scores.items())
+
+    def update(self, user_id: int, score: Score) -> None:
+        neg = tuple(-int(v) for v in score)
+        old = self._scores.get(user_id)
+        if old == neg:
+            return
+        if old is not None:
+            del self._keys[bisect_left(self._keys, old + (user_id,))]
+        insort(self._keys, neg + (user_id,))
+        self._scores[user_id] = neg
+
+    def score_of(self, user_id: int) -> Optional[Score]:
+        neg = self._scores.get(user_id)
+        return None if neg is None else tuple(-v for v in neg)
+
+    def rank_of(self, user_id: int) -> Optional[int]:
+        neg = self._scores.get(user_id)
+        if neg is None:
+            return None
+        return bisect_left(self._keys, neg) + 1
+
+    def page(self, offset: int, size: int) -> List[Tuple[int, Score]]:
+        offset = max(0, offset)
+        return [(key[-1], tuple(-v for v in key[:-1])) for key in self._keys[offset:offset + max(0, size)]]
+
+
+class LeaderboardService:
+    """等级榜 / 擂台榜 / 通天塔榜的进程内物化视图
+
+    - 玩家存档、擂台成功、通天塔层数变化时增量更新（处于事务中则提交后再更新）
+    - 每隔 reconcile_interval 秒从 MySQL 全量对账一次，兜底其它进程或直接 SQL 写入造成的偏差：
+      到期后的查询只触发后台对账（run_in_background）并继续返回旧榜单；只有首次加载需要等待
+    - 对账的全表查询不持锁，新榜单在锁内整体替换；查询期间提交的增量在替换后重放，不会被快照覆盖
+    """
+
+    def __init__(
+        self,
+        repo: ILeaderboardRepo,
+        reconcile_interval: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+        run_in_background: Callable[[Callable[[], None]], None] = _start_daemon_thread,
+    ):
+        self.repo = repo
+        self.reconcile_interval = reconcile_interval
+        self._clock = clock
+        self._run_in_background = run_in_background
+        self._lock = threading.RLock()
+        self._loaded_at: Optional[float] = None
+        self._reconcile_lock = threading.RLock()  # 同一时间只跑一次全量查询
+        self._reconciling = False
+        # 对账查询期间提交的增量，替换榜单后按顺序重放；不在对账中时为 None
+        self._journal: Optional[List[Callable[[], None]]] = None
+
+        self._profiles: Dict[int, Tuple[str, int]] = {}  # user_id -> (nickname, level)
+        self._level = RankBoard()
+        self._tower = RankBoard()
+        self._arena_all = RankBoard()
+        self._arena_by_rank: Dict[str, RankBoard] = {}
+        self._arena_counts: Dict[int, Dict[str, int]] = {}
+
+    # ===================== 对账 =====================
+    def reconcile(self) -> None:
+        """从 MySQL 全量重建所有榜单（查询不持锁，替换时重放查询期间提交的增量）"""
+        with self._reconcile_lock:
+            with self._lock:
+                self._journal = []
+            try:
+                self._rebuild()
+            finally:
+                with self._lock:
+                    self._journal = None
+                    self._reconciling = False
+
+    def _rebuild(self) -> None:
+        players = self.repo.load_players()
+        arena_rows = self.repo.load_arena_success()
+        tower_rows = self.repo.load_tower_floors(TOWER_TYPE)
+
+        profiles: Dict[int, Tuple[str, int]] = {}
+        level_entries = []
+        for r in players:
+            uid = int(r["user_id"])
+            level = int(r.get("level") or 0)
+            profiles[uid] = (r.get("nickname") or "", level)
+            level_entries.append((uid, (level, int(r.get("exp") or 0))))
+
+        arena_counts: Dict[int, Dict[str, int]] = {}
+        for r in arena_rows:
+            uid = int(r["user_id"])
+            arena_counts.setdefault(uid, {})[r["rank_name"]] = int(r.get("success_count") or 0)
+
+        level_board = RankBoard()
+        level_board.load(level_entries)
+        tower_board = RankBoard()
+        tower_board.load((int(r["user_id"]), (int(r.get("max_floor") or 0),)) for r in tower_rows)
+        arena_all = RankBoard()
+        arena_all.load((uid, (sum(counts.values()),)) for uid, counts in arena_counts.items())
+        arena_by_rank: Dict[str, RankBoard] = {}
+        for rank_name in {name for counts in arena_counts.values() for name in counts}:
+            board = RankBoard()
+            board.load(
+                (uid, (counts[rank_name],)) for uid, counts in arena_counts.items() if rank_name in counts
+            )
+            arena_by_rank[rank_name] = board
+
+        with self._lock:
+            journal, self._journal = self._journal or [], None
+            self._profiles = profiles
+            self._level = level_board
+            self._tower = tower_board
+            self._arena_all = arena_all
+            self._arena_by_rank = arena_by_rank
+            self._arena_counts = arena_counts
+            self._loaded_at = self._clock()
+            for replay in journal:
+                replay()
+
+    def _ensure_fresh(self) -> None:
+        """查询前调用（不可持锁）：首次加载同步执行，之后到期只触发后台对账"""
+        with self._lock:
+            loaded_at = self._loaded_at
+            if loaded_at is not None:
+                if self._reconciling or self._clock() - loaded_at < self.reconcile_interval:
+                    return
+                self._reconciling = True
+        if loaded_at is not None:
+            self._run_in_background(self.reconcile)
+            return
+        with self._reconcile_lock:
+            if self._loaded_at is None:  # 并发的首次查询只加载一次
+                self.reconcile()
+
+    # ===================== 增量更新 =====================
+    def record_player(self, user_id: int, nickname: str, level: int, exp: int) -> None:
+        after_commit(lambda: self._apply_player(int(user_id), nickname or "", int(level or 0), int(exp or 0)))
+
+    def record_arena_success(self, user_id: int, rank_name: str, count: int = 1) -> None:
+        after_commit(lambda: self._apply_arena_success(int(user_id), rank_name, int(count)))
+
+    def record_tower_floor(self, user_id: int, max_floor: int) -> None:
+        after_commit(lambda: self._apply_tower_floor(int(user_id), int(max_floor or 0)))
+
+    def on_player_saved(self, player) -> None:
+        """MySQLPlayerRepo 存档监听"""
+        self.record_player(player.user_id, player.nickname, player.level, player.exp)
+
+    def on_tower_state_saved(self, state) -> None:
+        """MySQLTowerStateRepo 存档监听"""
+        if state.tower_type == TOWER_TYPE:
+            self.record_tower_floor(state.user_id, state.max_floor_record)
+
+    def _apply_player(self, user_id: int, nickname: str, level: int, exp: int) -> None:
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append(lambda: self._apply_player(user_id, nickname, level, exp))
+            if self._loaded_at is None:
+                return  # 尚未加载，首次查询时会全量读取
+            self._profiles[user_id] = (nickname, level)
+            self._level.update(user_id, (level, exp))
+
+    def _apply_arena_success(self, user_id: int, rank_name: str, count: int) -> None:
+        with self._lock:
+            if self._loaded_at is None or user_id not in self._profiles:
+                return
+            counts = self._arena_counts.setdefault(user_id, {})
+            counts[rank_name] = counts.get(rank_name, 0) + count
+            self._set_arena_count(user_id, rank_name, counts[rank_name])
+            if self._journal is not None:
+                # 快照可能已含这次增量：重放时取两者较大值，而不是再加一次
+                live = counts[rank_name]
+                self._journal.append(lambda: self._raise_arena_count(user_id, rank_name, live))
+
+    def _raise_arena_count(self, user_id: int, rank_name: str, count: int) -> None:
+        if user_id not in self._profiles:
+            return
+        if self._arena_counts.get(user_id, {}).get(rank_name, 0) < count:
+            self._set_arena_count(user_id, rank_name, count)
+
+    def _set_arena_count(self, user_id: int, rank_name: str, count: int) -> None:
+        counts = self._arena_counts.setdefault(user_id, {})
+        counts[rank_name] = count
+        self._arena_by_rank.setdefault(rank_name, RankBoard()).update(user_id, (count,))
+        self._arena_all.update(user_id, (sum(counts.values()),))
+
+    def _apply_tower_floor(self, user_id: int, max_floor: int) -> None:
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append(lambda: self._apply_tower_floor(user_id, max_floor))
+            if self._loaded_at is None or user_id not in self._profiles:
+                return
+            self._tower.update(user_id, (max_floor,))
+
+    # ===================== 查询 =====================
+    def get_level_page(self, page: int, size: int, user_id: int = 0) -> Dict:
+        def row(uid: int, score: Score) -> Dict:
+            return {"userId": uid, "nickname": self._profiles[uid][0], "level": score[0], "exp": score[1]}
+
+        return self._page(lambda: self._level, page, size, user_id, row)
+
+    def get_arena_page(self, page: int, size: int, user_id: int = 0, rank_name: Optional[str] = None) -> Dict:
+        label = rank_name or ALL_ARENA_NAME
+
+        def board() -> RankBoard:
+            if not rank_name:
+                return self._arena_all
+            return self._arena_by_rank.get(rank_name) or RankBoard()
+
+        def row(uid: int, score: Score) -> Dict:
+            nickname, level = self._profiles[uid]
+            return {"userId": uid, "nickname": nickname, "level": level, "successCount": score[0], "rankName": label}
+
+        return self._page(board, page, size, user_id, row)
+
+    def get_tower_page(self, page: int, size: int, user_id: int = 0) -> Dict:
+        def row(uid: int, score: Score) -> Dict:
+            nickname, level = self._profiles[uid]
+            return {"userId": uid, "nickname": nickname, "level": level, "maxFloor": score[0]}
+
+        return self._page(lambda: self._tower, page, size, user_id, row)
+
+    def get_player_level(self, user_id: int) -> Optional[int]:
+        self._ensure_fresh()
+        with self._lock:
+            profile = self._profiles.get(user_id)
+            return profile[1] if profile else None
+
+    def _page(self, select_board: Callable[[], RankBoard], page: int, size: int, user_id: int, to_row) -> Dict:
+        self._ensure_fresh()
+        with self._lock:
+            board = select_board()  # 对账会整体替换榜单对象，需在锁内再取
+            entries = board.page((max(1, page) - 1) * size, size)
+            return {
+                "list": [to_row(uid, score) for uid, score in entries],
+                "total": len(board),
+                "myRank": board.rank_of(user_id) if user_id else None,
+            }
@@ -4,6 +4,7 @@ from domain.repositories.manor_repo import IManorRepo
 from domain.repositories.player_repo import IPlayerRepo
 from domain.rules.manor_rules import ManorRules, GROWTH_HOURS
 from application.services.inventory_service import InventoryService, InventoryError
+from infrastructure.db.unit_of_work import transactional
 
 MANOR_MANUAL_ITEM_ID = 6029  # 庄园建造手册
 
@@ -18,6 +19,7 @@ class ManorService:
         self.player_repo = player_repo
         self.inventory_service = inventory_service
 
+    @transactional
     def expand_land(self, user_id: int, land_index: int) -> Tuple[bool, str]:
         """开启/扩建土地"""
         player = self.player_repo.get_by_id(user_id)
@@ -67,6 +69,7 @@ class ManorService:
             return True, "开启成功"
         return False, "开启失败，数据库错误"
 
+    @transactional
     def plant_tree(self, user_id: int, land_indices: List[int], tree_type: int) -> Tuple[bool, str]:
         """种植摇钱树（支持一键种植）"""
         player = self.player_repo.get_by_id(user_id)
@@ -129,6 +132,7 @@ class ManorService:
         actual_cost = success_count * cost_per_tree
         return True, f"成功种植{success_count}块土地，消耗{actual_cost}元宝"
 
+    @transactional
     def harvest_all(self, user_id: int) -> Tuple[bool, str, Dict]:
         """一键收获成熟土地"""
         player = self.player_repo.get_by_id(user_id)
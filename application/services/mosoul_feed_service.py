@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from domain.entities.mosoul import get_mosoul_template
+from domain.repositories.mosoul_repo import IMoSoulRepo
+from domain.services.mosoul_system import MoSoulExpTable
+from infrastructure.db.unit_of_work import transaction
+
+
+class MoSoulFeedError(Exception):
+    """一键噬魂失败"""
+
+
+@dataclass
+class MoSoulFeedResult:
+    target_id: int
+    beast_id: Optional[int]
+    consumed_count: int
+    exp_total: int
+    exp_used: int
+    before_level: int
+    after_level: int
+    after_exp: int
+
+    @property
+    def exp_wasted(self) -> int:
+        return max(0, self.exp_total - self.exp_used)
+
+
+class MoSoulFeedService:
+    """一键噬魂：储魂器中的魔魂全部（或指定品质）吞噬给目标魔魂
+
+    - 材料只按模板品质累加经验，不做逐个详情转换与自动升级回写
+    - 目标的新等级由经验表累计值二分查找得出
+    - 一个事务内：目标一条 UPDATE，材料一条 DELETE ... WHERE id IN (...)
+    """
+
+    def __init__(self, mosoul_repo: IMoSoulRepo, exp_table: Optional[MoSoulExpTable] = None):
+        self.mosoul_repo = mosoul_repo
+        self.exp_table = exp_table or MoSoulExpTable.load()
+        self._template_grades: Dict[int, Optional[str]] = {}
+
+    def _grade(self, template_id: int) -> Optional[str]:
+        if template_id not in self._template_grades:
+            template = get_mosoul_template(int(template_id))
+            self._template_grades[template_id] = template.grade.value if template else None
+        return self._template_grades[template_id]
+
+    def consume_all(self, user_id: int, target_id: int, grade_filter: str = '') -> MoSoulFeedResult:
+        with transaction():
+            target = self.mosoul_repo.get_by_id(target_id)
+            if not target or int(target.user_id) != int(user_id):
+                raise MoSoulFeedError('目标魔魂不存在')
+            target_grade = self._grade(target.template_id)
+            if target_grade is None:
+                raise MoSoulFeedError('目标魔魂数据异常')
+
+            material_ids = []
+            exp_total = 0
+            for soul in self.mosoul_repo.get_unequipped_by_user_id(user_id):
+                if soul.id == target.id:
+                    continue
+                grade = self._grade(soul.template_id)
+                if grade is None or (grade_filter and grade != grade_filter):
+                    continue
+                material_ids.append(soul.id)
+                exp_total += self.exp_table.exp_provide(grade)
+            if not material_ids:
+                raise MoSoulFeedError('没有可吞噬的材料魔魂')
+
+            before_level = self.exp_table.feed(target_grade, target.level, target.exp, 0)[0]
+            target.level, target.exp, exp_used = self.exp_table.feed(
+                target_grade, target.level, target.exp, exp_total
+            )
+            self.mosoul_repo.save(target)
+            self.mosoul_repo.delete_batch(material_ids)
+
+        return MoSoulFeedResult(
+            target_id=target.id,
+            beast_id=target.beast_id,
+            consumed_count=len(material_ids),
+            exp_total=exp_total,
+            exp_used=exp_used,
+            before_level=before_level,
+            after_level=target.level,
+            after_exp=target.exp,
+        )
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from typing import Dict, Optional
+
+from domain.repositories.mosoul_repo import IMoSoulBatchHuntRepo
+from domain.services.mosoul_system import (
+    ADV_DRAGON_PITY_COUNTER_KEY,
+    MAX_BATCH_HUNTS,
+    NORMAL_HEAVEN_PITY_COUNTER_KEY,
+    SOUL_CHARM_ITEM_ID,
+    BatchHuntPlan,
+    BatchHuntSnapshot,
+    MoSoulBatchHuntEngine,
+)
+from infrastructure.db.unit_of_work import transaction
+
+
+class MoSoulHuntError(Exception):
+    """一键猎魂失败（整笔回滚）"""
+
+
+class MoSoulBatchHuntService:
+    """一键猎魂
+
+    - 一个事务内：保底计数行 SELECT ... FOR UPDATE，读取铜钱、追魂法宝与储魂器数量作为快照
+    - 引擎在内存中连续猎魂（次数不限于 10 次），不访问数据库
+    - 新魔魂一条多行 INSERT，铜钱一次增量更新（余额不足则整体回滚），追魂法宝一次扣除，保底计数写回一次
+    """
+
+    def __init__(
+        self,
+        hunt_repo: IMoSoulBatchHuntRepo,
+        inventory_service,
+        player_repo,
+        ensure_tables=None,
+        engine: Optional[MoSoulBatchHuntEngine] = None,
+    ):
+        self.hunt_repo = hunt_repo
+        self.inventory_service = inventory_service
+        self.player_repo = player_repo  # infrastructure.db.player_repo_mysql 模块
+        self.ensure_tables = ensure_tables
+        self.engine = engine or MoSoulBatchHuntEngine()
+
+    def batch_hunt(
+        self,
+        user_id: int,
+        arena_type: str,
+        unlocked: Dict[str, bool],
+        count: int,
+        warehouse_capacity: int,
+    ) -> BatchHuntPlan:
+        """执行 count 次（最多 MAX_BATCH_HUNTS 次）猎魂；unlocked 为当前猎魂师解锁状态，结束状态见 plan.end.unlocked"""
+        count = max(1, min(int(count), MAX_BATCH_HUNTS))
+        normal = arena_type == 'normal'
+        if self.ensure_tables is not None:
+            self.ensure_tables()
+
+        with transaction():
+            personal_soul_charm = personal_copper = 0
+            global_soul_charm = global_copper = 0
+            if normal:
+                global_soul_charm, global_copper = self.hunt_repo.lock_global_consumed(NORMAL_HEAVEN_PITY_COUNTER_KEY)
+            else:
+                personal_soul_charm, personal_copper = self.hunt_repo.lock_personal_consumed(user_id)
+                global_soul_charm, global_copper = self.hunt_repo.lock_global_consumed(ADV_DRAGON_PITY_COUNTER_KEY)
+
+            player = self.player_repo.get_player_by_id(user_id)
+            snapshot = BatchHuntSnapshot(
+                arena_type=arena_type,
+                gold=int(player.get('gold', 0) or 0) if player else 0,
+                soul_charm=self.inventory_service.get_item_count(user_id, SOUL_CHARM_ITEM_ID),
+                warehouse_count=self.hunt_repo.count_unequipped(user_id),
+                warehouse_capacity=warehouse_capacity,
+                unlocked=dict(unlocked),
+                global_copper_consumed=global_copper,
+                personal_soul_charm_consumed=personal_soul_charm,
+                global_soul_charm_consumed=global_soul_charm,
+            )
+            plan = self.engine.roll(snapshot, count)
+            if not plan.rolls:
+                return plan
+
+            end = plan.end
+            if plan.gold_delta and not self.player_repo.update_gold(user_id, plan.gold_delta, min_balance=0):
+                raise MoSoulHuntError('铜钱不足')
+            if plan.soul_charm_spent:
+                self.inventory_service.remove_item(user_id, SOUL_CHARM_ITEM_ID, plan.soul_charm_spent)
+            if normal:
+                self.hunt_repo.save_global_consumed(
+                    NORMAL_HEAVEN_PITY_COUNTER_KEY, global_soul_charm, end.global_copper_consumed
+                )
+            else:
+                self.hunt_repo.save_personal_consumed(user_id, end.personal_soul_charm_consumed, personal_copper)
+                self.hunt_repo.save_global_consumed(
+                    ADV_DRAGON_PITY_COUNTER_KEY, end.global_soul_charm_consumed, global_copper
+                )
+            plan.soul_ids = self.hunt_repo.create_mosouls(user_id, plan.template_ids)
+        return plan
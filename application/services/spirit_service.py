@@ -38,6 +38,7 @@ class SpiritService:
         player_repo: IPlayerRepo,
         tower_state_repo: ITowerStateRepo,
         player_beast_repo,
+        beast_stats_cache=None,
     ) -> None:
         self.spirit_repo = spirit_repo
         self.account_repo = account_repo
@@ -45,6 +46,7 @@ class SpiritService:
         self.player_repo = player_repo
         self.tower_state_repo = tower_state_repo
         self.player_beast_repo = player_beast_repo
+        self.beast_stats_cache = beast_stats_cache
         self.config = get_spirit_system_config()
 
     # ===================== 账户 =====================
@@ -184,16 +186,20 @@ class SpiritService:
                 old.beast_id = None
                 self.spirit_repo.save(old)
 
+        prev_beast_id = sp.beast_id
         sp.beast_id = beast_id
         self.spirit_repo.save(sp)
+        self._invalidate_beast_stats(beast_id, prev_beast_id)
         return SpiritWithInfo(spirit=sp, element_name=self.config.get_element_name(sp.element))
 
     def unequip_spirit(self, user_id: int, spirit_id: int) -> SpiritWithInfo:
         sp = self.spirit_repo.get_by_id(spirit_id)
         if sp is None or sp.user_id != user_id:
             raise SpiritError("战灵不存在")
+        prev_beast_id = sp.beast_id
         sp.beast_id = None
         self.spirit_repo.save(sp)
+        self._invalidate_beast_stats(prev_beast_id)
         return SpiritWithInfo(spirit=sp, element_name=self.config.get_element_name(sp.element))
 
     # ===================== 词条解锁/锁定 =====================
@@ -230,6 +236,7 @@ class SpiritService:
         line.locked = False
 
         self.spirit_repo.save(sp)
+        self._invalidate_beast_stats(sp.beast_id)
         return SpiritWithInfo(spirit=sp, element_name=self.config.get_element_name(sp.element))
 
     def set_line_lock(self, user_id: int, spirit_id: int, line_index: int, locked: bool) -> SpiritWithInfo:
@@ -300,6 +307,7 @@ class SpiritService:
 
         self.spirit_repo.save(sp)
         self.account_repo.save(acc)
+        self._invalidate_beast_stats(sp.beast_id)
 
         return {
             "spirit": SpiritWithInfo(spirit=sp, element_name=self.config.get_element_name(sp.element)).to_dict(),
@@ -369,6 +377,10 @@ class SpiritService:
         }
 
     # ===================== 内部：随机逻辑 =====================
+    def _invalidate_beast_stats(self, *beast_ids) -> None:
+        if self.beast_stats_cache is not None:
+            self.beast_stats_cache.invalidate(*beast_ids)
+
     def _roll_new_spirit(self, user_id: int, element_key: str) -> Spirit:
         race = self._pick_weighted(self.config.get_race_weights(element_key))
 
@@ -1,4 +1,4 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 import random
@@ -10,8 +10,16 @@ from domain.entities.beast import Beast, BeastTemplate
 from domain.repositories.tower_repo import ITowerStateRepo, ITowerConfigRepo
 from domain.repositories.player_repo import IPlayerRepo
 from application.services.inventory_service import InventoryService
-from domain.services.pvp_battle_engine import PvpBeast, PvpPlayer, run_pvp_battle
+from domain.services.pvp_battle_engine import (
+    LOG_FULL,
+    LOG_NONE,
+    PvpBattleResult,
+    PvpBeast,
+    PvpPlayer,
+    run_pvp_battle,
+)
 from domain.services.skill_system import apply_buff_debuff_skills
+from domain.services.tower_floor import GuardianFloor, build_guardian_floor, fresh_beasts, guardians_to_pvp_beasts
 
 
 class TowerError(Exception):
@@ -238,12 +246,10 @@ class TowerBattleService:
         
         # 发放累积的奖励到背包
         if pending_rewards and self.inventory_service:
-            for item in pending_rewards.get("items", []):
-                self.inventory_service.add_item(
-                    user_id=user_id,
-                    item_id=item["item_id"],
-                    quantity=item.get("quantity", 1),
-                )
+            self.inventory_service.add_items(
+                user_id,
+                [(item["item_id"], item.get("quantity", 1)) for item in pending_rewards.get("items", [])],
+            )
         
         # 重置当前层数为1
         state.current_floor = 1
@@ -381,79 +387,14 @@ class TowerBattleService:
 
     def _to_pvp_beasts_from_guardians(self, guardians: List[TowerGuardian]) -> List[PvpBeast]:
         """将守塔幻兽转换为 PvpBeast。当前暂不配置技能。"""
-        pvp_beasts: List[PvpBeast] = []
-        for g in guardians:
-            attack_type = "magic" if g.is_magic_type() else "physical"
-            # 守塔幻兽暂不使用技能，后续可在配置中增加 skills 字段再接入。
-            skills: List[str] = []
+        return guardians_to_pvp_beasts(guardians)
 
-            # 这里也走一遍 apply_buff_debuff_skills，便于未来给守塔幻兽加被动技能。
-            (
-                final_hp,
-                final_physical_attack,
-                final_magic_attack,
-                final_physical_defense,
-                final_magic_defense,
-                final_speed,
-                _special_effects,
-            ) = apply_buff_debuff_skills(
-                skills=skills,
-                attack_type=attack_type,
-                raw_hp=g.hp,
-                raw_physical_attack=g.physical_attack,
-                raw_magic_attack=g.magic_attack,
-                raw_physical_defense=g.physical_defense,
-                raw_magic_defense=g.magic_defense,
-                raw_speed=g.speed,
-            )
-
-            pvp_beasts.append(
-                PvpBeast(
-                    id=id(g),  # 守塔幻兽没有全局ID，用内存id占位即可
-                    name=g.name,
-                    hp_max=final_hp,
-                    hp_current=final_hp,
-                    physical_attack=final_physical_attack,
-                    magic_attack=final_magic_attack,
-                    physical_defense=final_physical_defense,
-                    magic_defense=final_magic_defense,
-                    speed=final_speed,
-                    grade=0,
-                    hp_star=0,
-                    attack_star=0,
-                    physical_defense_star=0,
-                    magic_defense_star=0,
-                    speed_star=0,
-                    hp_aptitude=0,
-                    attack_aptitude=0,
-                    physical_defense_aptitude=0,
-                    magic_defense_aptitude=0,
-                    speed_aptitude=0,
-                    attack_type=attack_type,
-                    skills=skills,
-                )
-            )
-        return pvp_beasts
+    def get_guardian_floor(self, tower_type: str, floor: int) -> GuardianFloor:
+        """某层守塔幻兽的 PvpBeast 模板（配置加载时预编译）"""
+        return self.config_repo.get_guardian_floor(tower_type, floor)
 
-    def battle_one_floor(
-        self,
-        user_id: int,
-        tower_type: str,
-        player_beasts: List[PlayerBeast],
-        guardians: List[TowerGuardian],
-        floor: int,
-    ) -> FloorBattle:
-        """使用统一 PVP 战斗引擎挑战一层。
-
-        - 每层内玩家与守塔幻兽按 PVP 规则对战（速度/品质/属性先手 + 统一伤害公式 + 技能系统）。
-        - 每层战斗日志只保留前 50 回合，供前端展示详细战报。
-        """
-        rounds: List[BattleRound] = []
-
-        # 记录参战幻兽（用于前端展示）
-        beasts_used: List[str] = [b.full_name for b in player_beasts]
-
-        # 获取玩家信息（用于日志中的玩家名称和等级）
+    def _resolve_attacker(self, user_id: int, player_beasts: List[PlayerBeast]) -> Tuple[str, int]:
+        """玩家名称和等级（用于战报），每次闯塔只查一次"""
         player_level = player_beasts[0].level if player_beasts else 1
         player_name = f"玩家{user_id}"
         if self.player_repo is not None:
@@ -462,32 +403,46 @@ class TowerBattleService:
                 player_level = player.level or player_level
                 if player.nickname:
                     player_name = player.nickname
+        return player_name, player_level
 
-        # 塔名称用于作为“防守方玩家”的名字，便于日志展示：『通天塔第10层』
-        tower_config = self.config_repo.get_tower_config(tower_type)
-        tower_base_name = tower_config.get("name", tower_type)
-        tower_player_name = f"{tower_base_name}{floor}层"
-
-        # 转换为 PVP 引擎使用的实体
-        attacker_beasts = self._to_pvp_beasts_from_players(player_beasts)
-        defender_beasts = self._to_pvp_beasts_from_guardians(guardians)
-
+    def _fight_floor(
+        self,
+        user_id: int,
+        player_name: str,
+        player_level: int,
+        attacker_templates: List[PvpBeast],
+        tower_name: str,
+        floor: int,
+        guardian_floor: GuardianFloor,
+        log_mode: str = LOG_FULL,
+        rng: Optional[random.Random] = None,
+    ) -> Tuple[PvpBattleResult, PvpPlayer]:
         attacker_player = PvpPlayer(
             player_id=user_id,
             level=player_level,
-            beasts=attacker_beasts,
+            beasts=fresh_beasts(attacker_templates),
             name=player_name,
         )
         defender_player = PvpPlayer(
             player_id=-1,
-            level=guardians[0].level if guardians else player_level,
-            beasts=defender_beasts,
-            name=tower_player_name,
+            level=guardian_floor.level if guardian_floor.beasts else player_level,
+            beasts=fresh_beasts(guardian_floor.beasts),
+            # 塔名称用于作为“防守方玩家”的名字，便于日志展示：『通天塔第10层』
+            name=f"{tower_name}{floor}层",
         )
+        pvp_result = run_pvp_battle(attacker_player, defender_player, max_log_turns=50, log_mode=log_mode, rng=rng)
+        return pvp_result, attacker_player
 
-        pvp_result = run_pvp_battle(attacker_player, defender_player, max_log_turns=50)
-
+    @staticmethod
+    def _to_floor_battle(
+        floor: int,
+        guardian_floor: GuardianFloor,
+        beasts_used: List[str],
+        pvp_result: PvpBattleResult,
+        attacker_player: PvpPlayer,
+    ) -> FloorBattle:
         # 将 AttackLog 转换为塔战斗用的 BattleRound
+        rounds: List[BattleRound] = []
         for log in pvp_result.logs:
             attacker_side = "player" if log.attacker_player_id == attacker_player.player_id else "guardian"
             rounds.append(
@@ -504,30 +459,40 @@ class TowerBattleService:
                 )
             )
 
-        is_victory = pvp_result.winner_player_id == attacker_player.player_id
-
         # 奖励仍由上层 challenge_floor / auto_challenge 负责填充，这里先给空
-        rewards: Dict = {}
-
         return FloorBattle(
             floor=floor,
-            guardians=[
-                {
-                    "name": g.name,
-                    "level": g.level,
-                    "nature": g.nature,
-                    "hp": g.hp,
-                    "physical_attack": g.physical_attack,
-                    "magic_attack": g.magic_attack,
-                    "physical_defense": g.physical_defense,
-                    "magic_defense": g.magic_defense,
-                }
-                for g in guardians
-            ],
-            beasts_used=beasts_used,
+            guardians=list(guardian_floor.guardians),
+            beasts_used=list(beasts_used),
             rounds=rounds,
-            is_victory=is_victory,
-            rewards=rewards,
+            is_victory=pvp_result.winner_player_id == attacker_player.player_id,
+            rewards={},
+        )
+
+    def battle_one_floor(
+        self,
+        user_id: int,
+        tower_type: str,
+        player_beasts: List[PlayerBeast],
+        guardians: List[TowerGuardian],
+        floor: int,
+        rng: Optional[random.Random] = None,
+    ) -> FloorBattle:
+        """使用统一 PVP 战斗引擎挑战一层。
+
+        - 每层内玩家与守塔幻兽按 PVP 规则对战（速度/品质/属性先手 + 统一伤害公式 + 技能系统）。
+        - 每层战斗日志只保留前 50 回合，供前端展示详细战报。
+        """
+        player_name, player_level = self._resolve_attacker(user_id, player_beasts)
+        tower_name = self.config_repo.get_tower_config(tower_type).get("name", tower_type)
+        guardian_floor = build_guardian_floor(guardians)
+        pvp_result, attacker_player = self._fight_floor(
+            user_id, player_name, player_level,
+            self._to_pvp_beasts_from_players(player_beasts),
+            tower_name, floor, guardian_floor, rng=rng,
+        )
+        return self._to_floor_battle(
+            floor, guardian_floor, [b.full_name for b in player_beasts], pvp_result, attacker_player
         )
     
     def challenge_floor(
@@ -600,10 +565,14 @@ class TowerBattleService:
         tower_type: str,
         player_beasts: List[PlayerBeast],
         use_buff: bool = True,
+        rng: Optional[random.Random] = None,
     ) -> AutoChallengeResult:
         """
         自动闯塔 - 一次性计算所有层
+
+        rng 为各层战斗使用的随机数生成器（未传入时新建一个），失败层按其状态快照重放。
         """
+        rng = rng or random.Random()
         state = self.state_repo.get_by_user_id(user_id, tower_type)
         state.reset_daily_if_needed()
 
@@ -625,42 +594,52 @@ class TowerBattleService:
         battles: List[FloorBattle] = []
         total_rewards = {"gold": 0, "exp": 0, "items": []}
         stopped_reason = ""
+
+        # 整个闯塔过程中不变的数据只准备一次：玩家名称/等级、塔名、玩家幻兽的 PvpBeast 模板
+        player_name, player_level = self._resolve_attacker(user_id, player_beasts)
+        tower_name = config.get("name", tower_type)
+        attacker_templates = self._to_pvp_beasts_from_players(player_beasts)
+        beasts_used = [b.full_name for b in player_beasts]
         
         while True:
             if state.current_floor > max_floor:
                 stopped_reason = "max_floor"
                 break
-            
-            # 每层幻兽HP恢复满
-            for beast in player_beasts:
-                beast.current_hp = beast.hp
-            
-            # 获取守塔幻兽
-            guardians = self.config_repo.get_guardians_for_floor(tower_type, state.current_floor)
-
-            # 战斗
-            battle = self.battle_one_floor(
-                user_id=user_id,
-                tower_type=tower_type,
-                player_beasts=player_beasts,
-                guardians=guardians,
-                floor=state.current_floor,
+
+            floor = state.current_floor
+            guardian_floor = self.get_guardian_floor(tower_type, floor)
+
+            # 中间层只算胜负；最后一层（失败层或顶层）才保留详细战报。
+            # 失败时从本层开战前的随机数状态重放一次完整战报，结果与只算胜负时一致。
+            # 快照与重放只作用于本次闯塔自己的 rng，不回拨进程内的模块级 random。
+            is_top_floor = floor >= max_floor
+            rng_state = None if is_top_floor else rng.getstate()
+            pvp_result, attacker_player = self._fight_floor(
+                user_id, player_name, player_level, attacker_templates, tower_name, floor, guardian_floor,
+                log_mode=LOG_FULL if is_top_floor else LOG_NONE, rng=rng,
             )
+            if rng_state is not None and pvp_result.winner_player_id != user_id:
+                rng.setstate(rng_state)
+                pvp_result, attacker_player = self._fight_floor(
+                    user_id, player_name, player_level, attacker_templates, tower_name, floor, guardian_floor,
+                    rng=rng,
+                )
+            battle = self._to_floor_battle(floor, guardian_floor, beasts_used, pvp_result, attacker_player)
             
             # 获取奖励
             if battle.is_victory:
-                floor_rewards = self.config_repo.get_floor_rewards(tower_type, state.current_floor)
-                battle.rewards = dict(floor_rewards)
+                floor_reward = self.config_repo.get_floor_reward_entry(tower_type, state.current_floor)
+                battle.rewards = {"gold": floor_reward.gold, "exp": floor_reward.exp, "items": list(floor_reward.items)}
                 
                 # 累加奖励
-                total_rewards["gold"] += floor_rewards.get("gold", 0)
-                total_rewards["exp"] += floor_rewards.get("exp", 0)
+                total_rewards["gold"] += floor_reward.gold
+                total_rewards["exp"] += floor_reward.exp
                 
                 # 检查里程碑奖励
-                milestone = self.config_repo.get_milestone_reward(tower_type, state.current_floor)
+                milestone = self.config_repo.get_milestone_entry(tower_type, state.current_floor)
                 if milestone:
-                    battle.rewards["milestone"] = milestone
-                    total_rewards["gold"] += milestone.get("gold", 0)
+                    battle.rewards["milestone"] = {"gold": milestone.gold, "items": list(milestone.items)}
+                    total_rewards["gold"] += milestone.gold
                 
                 # 检查特殊奖励（每5层）
                 if self.config_repo.should_give_special_reward(tower_type, state.current_floor):
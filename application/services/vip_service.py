@@ -1,22 +1,15 @@
 # application/services/vip_service.py
 """VIP特权服务 - 统一管理VIP特权配置读取"""
 
-import json
-import os
-from functools import lru_cache
 from typing import Dict, Any, Optional
 
+from infrastructure.config.registry import get_config
+
 
-@lru_cache(maxsize=1)
 def _load_vip_config() -> Dict[str, Any]:
-    """加载VIP配置（带缓存）"""
-    config_path = os.path.join(
-        os.path.dirname(__file__), 
-        '..', '..', 'configs', 'vip_privileges.json'
-    )
+    """加载VIP配置（配置注册表共享，文件变化后自动重新加载）"""
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return get_config("vip_privileges.json")
     except Exception:
         return {"vip_levels": []}
 
@@ -7,7 +7,9 @@ import random
 
 from domain.entities.player import Player, ZhenyaoFloor
 from domain.repositories.player_repo import IPlayerRepo, IZhenyaoRepo
+from domain.services.battle_report import RESULT_STYLE_FALLEN, build_battle_data, encode_battle_report
 from domain.services.pvp_battle_engine import (
+    LOG_COMPACT,
     PvpPlayer,
     PvpBeast,
     run_pvp_battle,
@@ -22,6 +24,7 @@ from infrastructure.db.zhenyao_battle_repo_mysql import (
 )
 from domain.repositories.bone_repo import IBoneRepo
 from domain.repositories.spirit_repo import ISpiritRepo
+from application.services.battle_feed_service import BattleFeedService
 from application.services.beast_pvp_service import BeastPvpService
 from application.services.inventory_service import InventoryService
 from infrastructure.db.bone_repo_mysql import MySQLBoneRepo
@@ -72,6 +75,7 @@ class ZhenyaoService:
         spirit_repo: ISpiritRepo | None = None,
         beast_pvp_service: BeastPvpService | None = None,
         inventory_service: InventoryService | None = None,
+        battle_feed: BattleFeedService | None = None,
     ):
         self.player_repo = player_repo
         self.zhenyao_repo = zhenyao_repo
@@ -79,6 +83,7 @@ class ZhenyaoService:
         self.beast_repo = beast_repo or MySQLPlayerBeastRepo()
         self.battle_repo = battle_repo or MySQLZhenyaoBattleRepo()
         self.daily_count_repo = daily_count_repo or MySQLZhenyaoDailyCountRepo()
+        self.battle_feed = battle_feed
         self.inventory_service = inventory_service
 
         # 装备系统转换服务
@@ -475,7 +480,7 @@ class ZhenyaoService:
         
         # 7. 进行战斗（使用统一 PVP 引擎）
         remaining_seconds = floor_info.get_remaining_seconds()
-        battle_result = self._do_battle(
+        battle_result, battle_report = self._do_battle(
             attacker_beasts,
             defender_beasts,
             attacker_name=attacker.nickname,
@@ -499,7 +504,7 @@ class ZhenyaoService:
             defender_name=floor_info.occupant_name,
             is_success=battle_result["is_victory"],
             remaining_seconds=remaining_seconds,
-            battle_data=battle_result,
+            battle_report=battle_report,
         )
         
         # 10. 如果胜利，更新占领信息
@@ -531,10 +536,10 @@ class ZhenyaoService:
         defender_name: str,
         attacker_level: int,
         defender_level: int,
-    ) -> Dict:
-        """使用统一 PVP 引擎执行完整战斗，并转换为镇妖前端需要的数据结构。
+    ) -> Tuple[Dict, bytes]:
+        """使用统一 PVP 引擎执行完整战斗，返回 (镇妖前端需要的数据结构, 落库用的紧凑战报)。
 
-        返回结构示例：
+        数据结构示例：
         {
             "is_victory": bool,          # 挑战者是否胜利
             "attacker_wins": int,       # 兼容字段，这里胜利=1, 失败=0
@@ -553,166 +558,24 @@ class ZhenyaoService:
         }
         """
 
-        pvp_result = run_pvp_battle(
-            PvpPlayer(
-                player_id=1,
-                level=attacker_level,
-                beasts=self.beast_pvp_service.to_pvp_beasts(attacker_beasts),
-                name=attacker_name,
-            ),
-            PvpPlayer(
-                player_id=2,
-                level=defender_level,
-                beasts=self.beast_pvp_service.to_pvp_beasts(defender_beasts),
-                name=defender_name,
-            ),
-            max_log_turns=50
+        attacker_player = PvpPlayer(
+            player_id=1,
+            level=attacker_level,
+            beasts=self.beast_pvp_service.to_pvp_beasts(attacker_beasts),
+            name=attacker_name,
         )
+        defender_player = PvpPlayer(
+            player_id=2,
+            level=defender_level,
+            beasts=self.beast_pvp_service.to_pvp_beasts(defender_beasts),
+            name=defender_name,
+        )
+        pvp_result = run_pvp_battle(attacker_player, defender_player, max_log_turns=50, log_mode=LOG_COMPACT)
 
-        attacker_player_id = 1
-        is_victory = pvp_result.winner_player_id == attacker_player_id
-
-        # ===== 将整场 PVP 日志按 "每只幻兽对战" 分成多场战斗 =====
-        def get_player_name(pid: int) -> str:
-            return attacker_name if pid == attacker_player_id else defender_name
-
-        def get_side_flag(pid: int) -> str:
-            return "attacker" if pid == attacker_player_id else "defender"
-
-        def build_battle_segment(battle_index: int, seg_logs):
-            """根据一段连续日志（同一对幻兽对战）构建一场战斗的数据结构。
-
-            seg_logs 中既包含普通攻击/技能攻击日志，也可能包含中毒等持续伤害日志。
-            """
-            if not seg_logs:
-                return {
-                    "battle_num": battle_index,
-                    "attacker_beast": "",
-                    "defender_beast": "",
-                    "winner": "defender",
-                    "rounds": [],
-                    "result": "",
-                }
-
-            # 每一小战内部回合重新从 1 计数
-            rounds = []
-            for idx, log in enumerate(seg_logs, start=1):
-                rounds.append({
-                    "round": idx,
-                    "action": log.description,
-                    "a_hp": log.attacker_hp_after,
-                    "d_hp": log.defender_hp_after,
-                })
-
-            # 统计本场对战中每只幻兽的最终气血
-            # key = (player_id, beast_id) -> (beast_name, hp_after)
-            beast_state: dict[tuple[int, int], tuple[str, int]] = {}
-            for log in seg_logs:
-                if log.attacker_beast_id != 0:
-                    beast_state[(log.attacker_player_id, log.attacker_beast_id)] = (
-                        log.attacker_name,
-                        log.attacker_hp_after,
-                    )
-                if log.defender_beast_id != 0:
-                    beast_state[(log.defender_player_id, log.defender_beast_id)] = (
-                        log.defender_name,
-                        log.defender_hp_after,
-                    )
-
-            # 默认使用整场战斗的胜负兜底
-            winner_player_id = pvp_result.winner_player_id
-            loser_player_id = pvp_result.loser_player_id
-            winner_beast_name = ""
-            loser_beast_name = ""
-            winner_hp = 0
-
-            keys = list(beast_state.keys())
-            if keys:
-                # 正常情况下这里有两只幻兽；如果只有一只，就简单复制一份避免下标错误
-                if len(keys) == 1:
-                    keys = keys * 2
-                (p1, b1), (p2, b2) = keys[0], keys[1]
-                name1, hp1 = beast_state[(p1, b1)]
-                name2, hp2 = beast_state[(p2, b2)]
-
-                if hp1 > 0 and hp2 <= 0:
-                    winner_player_id, loser_player_id = p1, p2
-                    winner_beast_name, winner_hp = name1, hp1
-                    loser_beast_name = name2
-                elif hp2 > 0 and hp1 <= 0:
-                    winner_player_id, loser_player_id = p2, p1
-                    winner_beast_name, winner_hp = name2, hp2
-                    loser_beast_name = name1
-                elif hp1 != hp2:
-                    # 双方都活着，谁血多谁赢（主要用于日志截断等极端情况）
-                    if hp1 > hp2:
-                        winner_player_id, loser_player_id = p1, p2
-                        winner_beast_name, winner_hp = name1, hp1
-                        loser_beast_name = name2
-                    else:
-                        winner_player_id, loser_player_id = p2, p1
-                        winner_beast_name, winner_hp = name2, hp2
-                        loser_beast_name = name1
-
-            winner_player_name = get_player_name(winner_player_id)
-            loser_player_name = get_player_name(loser_player_id)
-            winner_flag = get_side_flag(winner_player_id)
-
-            # 结果文案，贴近老版本："某某的X阵亡，某某的Y剩余气血N"
-            if winner_beast_name and loser_beast_name:
-                result_text = (
-                    f"『{loser_player_name}』的{loser_beast_name}阵亡，"
-                    f"『{winner_player_name}』的{winner_beast_name}剩余气血{winner_hp}"
-                )
-            else:
-                # 兜底：只写玩家胜负
-                result_text = f"『{winner_player_name}』获胜"
-
-            return {
-                "battle_num": battle_index,
-                "attacker_beast": "",
-                "defender_beast": "",
-                "winner": winner_flag,
-                "rounds": rounds,
-                "result": result_text,
-            }
-
-        battles = []
-        current_pair = None  # 当前这场小战参与的两只幻兽（ID 集合）
-        current_logs = []
-
-        for log in pvp_result.logs:
-            # 中毒等持续伤害（attacker_beast_id == 0）归入当前小战，不单独拆分
-            if log.attacker_beast_id == 0 and current_pair is not None:
-                current_logs.append(log)
-                continue
-
-            pair = frozenset({log.attacker_beast_id, log.defender_beast_id})
-
-            if current_pair is None:
-                current_pair = pair
-                current_logs.append(log)
-            elif pair == current_pair:
-                current_logs.append(log)
-            else:
-                # 一方幻兽阵亡，开始新的小战
-                battles.append(build_battle_segment(len(battles) + 1, current_logs))
-                current_pair = pair
-                current_logs = [log]
-
-        # 收尾最后一场小战
-        if current_logs:
-            battles.append(build_battle_segment(len(battles) + 1, current_logs))
-
-        attacker_wins = 1 if is_victory else 0
-        defender_wins = 1 - attacker_wins
-
-        return {
-            "is_victory": is_victory,
-            "attacker_wins": attacker_wins,
-            "defender_wins": defender_wins,
-            "battles": battles,
-        }
+        battle_report = encode_battle_report(pvp_result, attacker_player, defender_player, RESULT_STYLE_FALLEN)
+        pvp_result.expand_logs(attacker_player, defender_player)
+        battle_data = build_battle_data(pvp_result, attacker_player, defender_player, RESULT_STYLE_FALLEN)
+        return battle_data, battle_report
     
     def _battle_one(self, attacker, defender, attacker_name: str, defender_name: str, battle_num: int) -> Dict:
         """
@@ -829,7 +692,13 @@ class ZhenyaoService:
             return log.to_dict()
         return None
     
-    def get_dynamics(self, user_id: int = None, dynamic_type: str = "all", limit: int = 20) -> List[Dict]:
+    def get_dynamics(
+        self,
+        user_id: int = None,
+        dynamic_type: str = "all",
+        limit: int = 20,
+        before_id: Optional[int] = None,
+    ) -> List[Dict]:
         """
         获取动态列表
         
@@ -837,14 +706,18 @@ class ZhenyaoService:
             user_id: 用户ID（个人动态需要）
             dynamic_type: "all" = 全服动态, "personal" = 个人动态
             limit: 返回数量
+            before_id: 翻页游标，只返回 ID 小于它的记录（上一页最后一条的 id）
         
         Returns:
             动态列表
         """
-        if dynamic_type == "personal" and user_id:
-            logs = self.battle_repo.get_user_battles(user_id, limit)
+        personal_id = user_id if dynamic_type == "personal" and user_id else None
+        if self.battle_feed is not None:
+            logs = self.battle_feed.get_zhenyao_battles(user_id=personal_id, before_id=before_id, limit=limit)
+        elif personal_id:
+            logs = self.battle_repo.get_user_battles(personal_id, limit, before_id=before_id)
         else:
-            logs = self.battle_repo.get_recent_battles(limit)
+            logs = self.battle_repo.get_recent_battles(limit, before_id=before_id)
         
         result = []
         for log in logs:
@@ -0,0 +1,30 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class ArenaSlot:
+    """一个擂台（等级阶段 + 场次）的当前状态"""
+
+    rank_name: str
+    arena_type: str  # normal / gold
+    champion_user_id: Optional[int] = None
+    champion_nickname: Optional[str] = None
+    consecutive_wins: int = 0
+    prize_pool: int = 0
+
+    @property
+    def has_champion(self) -> bool:
+        return bool(self.champion_user_id)
+
+    def crown(self, user_id: int, nickname: str) -> None:
+        """换上新擂主，连胜清零"""
+        self.champion_user_id = user_id
+        self.champion_nickname = nickname
+        self.consecutive_wins = 0
+
+    def vacate(self) -> None:
+        """擂主下台，擂台空置"""
+        self.champion_user_id = None
+        self.champion_nickname = None
+        self.consecutive_wins = 0
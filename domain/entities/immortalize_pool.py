@@ -36,3 +36,21 @@ class ImmortalizePool:
 
     def is_formation_active(self) -> bool:
         return bool(self.formation_started_at and self.formation_ends_at)
+
+
+@dataclass
+class FormationGrant:
+    """一次化仙阵结算对单个化仙池的写入（经验按增量写回，受容量限制）
+
+    expected_last_grant_at 为结算时读到的 formation_last_grant_at，写回时作为比较条件：
+    其它进程或重试已先写过同一时段时不再重复发放。
+    """
+
+    user_id: int
+    exp_added: int
+    capacity: int
+    formation_level: int = 0
+    formation_started_at: Optional[str] = None
+    formation_ends_at: Optional[str] = None
+    formation_last_grant_at: Optional[str] = None
+    expected_last_grant_at: Optional[str] = None
@@ -7,6 +7,8 @@ import json
 from pathlib import Path
 from typing import Dict, Optional, Tuple
 
+from domain.services.config_source import get_derived_config
+
 
 # ===================== 玩家升级经验配置加载 =====================
 _player_level_exp_cache: Dict[int, int] = {}
@@ -104,6 +106,26 @@ def _get_required_exp_for_player_level(level: int) -> int:
     return level * 100
 
 
+# ===================== VIP 活力上限 =====================
+# 每恢复 1 点活力所需分钟数（与调度器每分钟 +1 的任务一致）
+ENERGY_RECOVERY_MINUTES = 1
+
+
+def _build_vitality_max_table(data: Dict) -> Dict[int, int]:
+    return {
+        lv_data.get("level"): lv_data.get("privileges", {}).get("vitality_max", 100)
+        for lv_data in data.get("vip_levels", [])
+    }
+
+
+def _vitality_max_table() -> Dict[int, int]:
+    """VIP等级 -> 活力上限（按 configs/vip_privileges.json 构建，配置变化后自动重建）"""
+    try:
+        return get_derived_config("vip_privileges.json", _build_vitality_max_table)
+    except Exception:
+        return {}
+
+
 # 等级段配置：(最小等级, 最大等级, 阶位名称, 可镇妖层数范围)
 RANK_CONFIG = [
     (1, 29, "黄阶", None),           # 不能镇妖
@@ -158,19 +180,7 @@ class Player:
     @property
     def max_energy(self) -> int:
         """获取活力上限（基于 VIP 等级）"""
-        # 从配置文件读取
-        import json
-        from pathlib import Path
-        try:
-            config_path = Path(__file__).resolve().parents[2] / "configs" / "vip_privileges.json"
-            with config_path.open("r", encoding="utf-8") as f:
-                data = json.load(f)
-            for lv_data in data.get("vip_levels", []):
-                if lv_data.get("level") == self.vip_level:
-                    return lv_data.get("privileges", {}).get("vitality_max", 100)
-        except Exception:
-            pass
-        return 100
+        return _vitality_max_table().get(self.vip_level, 100)
 
     location: str = "林中空地"                # 当前所在地点
     last_signin_date: Optional[date] = None  # 上次签到日期
@@ -306,7 +316,7 @@ class Player:
 
     def recover_energy(self, current_time: Optional[datetime] = None) -> bool:
         """
-        每10分钟恢复1点活力，直到达到上限。
+        每 ENERGY_RECOVERY_MINUTES 分钟恢复1点活力，直到达到VIP活力上限。
         返回是否发生了变化（恢复或强制修正上限）。
         """
         if current_time is None:
@@ -323,27 +333,29 @@ class Player:
             self.last_energy_recovery_time = current_time
             return modified
             
-        # 规则 2: 每10分钟恢复1点活力
+        # 规则 2: 每 ENERGY_RECOVERY_MINUTES 分钟恢复1点活力
         # 如果已经达到上限，则只更新时间，不增加活力
         if self.energy >= self.max_energy:
-            # 如果当前时间比上次记录时间晚，则更新时间戳，保留不满10分钟的部分（或直接对齐）
+            # 如果当前时间比上次记录时间晚，则更新时间戳，保留不满一个恢复周期的部分（或直接对齐）
             # 这里的逻辑是：一旦能量满了，我们就让时间戳跟着走，或者停在满的那一刻
             # 推荐做法：停在满的那一刻或者平移，这样一旦消耗了，可以立刻开始计时
             diff = current_time - self.last_energy_recovery_time
-            if diff.total_seconds() >= 600:
+            if diff.total_seconds() >= ENERGY_RECOVERY_MINUTES * 60:
                 self.last_energy_recovery_time = current_time
                 modified = True
             return modified
 
         diff = current_time - self.last_energy_recovery_time
         minutes = int(diff.total_seconds() / 60)
-        recovery_points = minutes // 10
+        recovery_points = minutes // ENERGY_RECOVERY_MINUTES
         
         if recovery_points > 0:
             new_energy = self.energy + recovery_points
             self.energy = min(new_energy, self.max_energy)
-            # 更新恢复时间，保留不足10分钟的余数
-            self.last_energy_recovery_time = self.last_energy_recovery_time + timedelta(minutes=recovery_points * 10)
+            # 更新恢复时间，保留不足一个恢复周期的余数
+            self.last_energy_recovery_time = self.last_energy_recovery_time + timedelta(
+                minutes=recovery_points * ENERGY_RECOVERY_MINUTES
+            )
             modified = True
             
         return modified
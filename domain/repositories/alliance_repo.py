@@ -40,13 +40,8 @@ class IAllianceRepo(ABC):
         pass
 
     @abstractmethod
-    def list_alliances(self, keyword: Optional[str], limit: int, offset: int) -> List[Dict]:
-        """联盟大厅：分页获取联盟列表（包含成员数等）"""
-        pass
-
-    @abstractmethod
-    def count_alliances(self, keyword: Optional[str]) -> int:
-        """联盟大厅：统计联盟总数（支持关键字筛选）"""
+    def load_alliance_directory(self) -> List[Dict]:
+        """返回全部联盟及成员数 [{id, name, level, notice, leader_id, member_count}]（用于联盟列表对账）"""
         pass
 
     @abstractmethod
@@ -281,18 +276,8 @@ class IAllianceRepo(ABC):
         pass
 
     @abstractmethod
-    def list_alliance_war_leaderboard(self, since: datetime, limit: int, offset: int) -> List[Dict]:
-        """按时间窗口分页列出联盟战功排行"""
-        pass
-
-    @abstractmethod
-    def count_alliance_war_leaderboard(self, since: datetime) -> int:
-        """统计参与排行的联盟数量"""
-        pass
-
-    @abstractmethod
-    def get_alliance_war_leaderboard_entry(self, alliance_id: int, since: datetime) -> Optional[Dict]:
-        """获取指定联盟在战功榜中的数据及排名"""
+    def load_alliance_war_scores(self, season_key: str) -> List[Dict]:
+        """返回指定赛季的全部战功记录 [{alliance_id, score, name, level}]（用于战功榜对账）"""
         pass
 
     # === 土地报名 ===
@@ -336,6 +321,13 @@ class IAllianceRepo(ABC):
         """按报名记录获取所有军团玩家（按报名顺序排序）"""
         pass
 
+    @abstractmethod
+    def list_army_signups_by_registrations(
+        self, registration_ids: List[int]
+    ) -> List[AllianceArmySignup]:
+        """一次获取多个报名记录的军团玩家（按报名记录、报名顺序排序）"""
+        pass
+
     @abstractmethod
     def update_army_signup_state(
         self, signup_id: int, status: int, hp_state: Optional[dict]
@@ -343,6 +335,11 @@ class IAllianceRepo(ABC):
         """更新军团玩家的状态和血量快照"""
         pass
 
+    @abstractmethod
+    def update_army_signup_states(self, signups: List[AllianceArmySignup]) -> None:
+        """批量写回军团玩家的状态和血量快照（一条语句）"""
+        pass
+
     # === 土地战斗 ===
     @abstractmethod
     def create_land_battle(self, battle: AllianceLandBattle) -> int:
@@ -364,6 +361,16 @@ class IAllianceRepo(ABC):
         """获取土地上进行中的战斗"""
         pass
 
+    @abstractmethod
+    def list_active_battles_by_land(self, land_id: int) -> List[AllianceLandBattle]:
+        """获取土地上全部进行中的战斗"""
+        pass
+
+    @abstractmethod
+    def update_land_battles(self, battles: List[AllianceLandBattle]) -> None:
+        """批量更新土地战斗的阶段、回合与时间（一条语句）"""
+        pass
+
     @abstractmethod
     def list_alliance_battles(self, alliance_id: int) -> List[AllianceLandBattle]:
         """返回该联盟参与的所有战斗（包含左右两侧）"""
@@ -380,6 +387,16 @@ class IAllianceRepo(ABC):
         """更新战斗轮次信息"""
         pass
 
+    @abstractmethod
+    def add_battle_rounds(self, rounds: List[AllianceLandBattleRound]) -> None:
+        """批量创建战斗轮次（一条多行 INSERT），并回填各轮次 ID"""
+        pass
+
+    @abstractmethod
+    def update_battle_rounds(self, rounds: List[AllianceLandBattleRound]) -> None:
+        """批量更新战斗轮次的存活人数、状态与结束时间（一条语句）"""
+        pass
+
     @abstractmethod
     def list_battle_rounds(self, battle_id: int) -> List[AllianceLandBattleRound]:
         """列出战斗的全部轮次"""
@@ -393,7 +410,7 @@ class IAllianceRepo(ABC):
     # === 战斗对战日志 ===
     @abstractmethod
     def add_battle_duels(self, duels: List[AllianceLandBattleDuel]) -> None:
-        """批量写入 1v1 对战日志"""
+        """批量写入 1v1 对战日志，并回填各条的 id"""
         pass
 
     @abstractmethod
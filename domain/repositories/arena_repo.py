@@ -0,0 +1,35 @@
+try:
+    from typing import Protocol, Optional
+except ImportError:
+    from typing_extensions import Protocol
+    from typing import Optional
+
+from domain.entities.arena import ArenaSlot
+
+
+class IArenaRepo(Protocol):
+    """擂台状态与挑战消耗（需在事务内调用，条件更新保证并发安全）"""
+
+    def lock_arena(self, rank_name: str, arena_type: str) -> Optional[ArenaSlot]:
+        """读取并锁定擂台行直到事务结束，不存在返回 None"""
+        ...
+
+    def save_arena(self, slot: ArenaSlot) -> None:
+        """写回擂主、连胜、奖池，并刷新最后战斗时间"""
+        ...
+
+    def take_daily_challenge(self, user_id: int, daily_limit: int) -> bool:
+        """今日挑战次数未达上限时 +1 并返回 True，否则不变并返回 False"""
+        ...
+
+    def consume_item(self, user_id: int, item_id: int, quantity: int = 1) -> bool:
+        """背包数量足够时扣除并返回 True，否则不变并返回 False"""
+        ...
+
+    def grant_item(self, user_id: int, item_id: int, quantity: int) -> None:
+        """发放道具到正式背包"""
+        ...
+
+    def add_success(self, user_id: int, rank_name: str) -> None:
+        """守擂成功（十连胜）次数 +1"""
+        ...
@@ -1,8 +1,8 @@
 try:
-    from typing import Protocol, Optional, List, Dict
+    from typing import Protocol, Optional, List, Dict, Tuple
 except ImportError:
     from typing_extensions import Protocol
-    from typing import Optional, List, Dict
+    from typing import Optional, List, Dict, Tuple
 from domain.entities.beast import Beast, BeastTemplate
 
 
@@ -45,3 +45,19 @@ class IBeastRepo(Protocol):
     def get_by_user_and_id(self, user_id: int, beast_id: int) -> Optional[Beast]:
         """根据ID获取某个玩家的幻兽"""
         ...
+
+
+class IBeastDerivedStatsRepo(Protocol):
+    """幻兽派生属性缓存数据访问接口"""
+
+    def get_by_beast_ids(self, beast_ids: List[int]) -> Dict[int, Tuple[str, int]]:
+        """批量读取 {beast_id: (stats_stamp, total_power)}"""
+        ...
+
+    def upsert_many(self, entries: List[Tuple[int, str, int]]) -> int:
+        """批量写入 (beast_id, stats_stamp, total_power)"""
+        ...
+
+    def delete_by_beast_ids(self, beast_ids: List[int]) -> int:
+        """删除缓存（装备/洗练等变化时调用）"""
+        ...
@@ -29,6 +29,9 @@ class IBoneRepo(Protocol):
     def get_by_beast_id(self, beast_id: int) -> List[BeastBone]:
         ...
 
+    def get_by_beast_ids(self, beast_ids: List[int]) -> Dict[int, List[BeastBone]]:
+        ...
+
     def save(self, bone: BeastBone) -> None:
         ...
 
@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import List, Optional
 
-from domain.entities.immortalize_pool import ImmortalizePool
+from domain.entities.immortalize_pool import FormationGrant, ImmortalizePool
 
 
 class IImmortalizePoolRepo(ABC):
@@ -12,3 +12,11 @@ class IImmortalizePoolRepo(ABC):
     @abstractmethod
     def upsert(self, pool: ImmortalizePool) -> ImmortalizePool:
         """保存或创建玩家化仙池信息"""
+
+    @abstractmethod
+    def get_active_formations(self) -> List[ImmortalizePool]:
+        """获取所有化仙阵运行中的化仙池"""
+
+    @abstractmethod
+    def apply_formation_grants(self, grants: List[FormationGrant], chunk_size: int = 500) -> int:
+        """按块批量写回化仙阵结算结果，返回更新的行数"""
@@ -26,6 +26,10 @@ class IInventoryRepo(Protocol):
         """保存/更新背包物品"""
         ...
 
+    def save_many(self, inv_items: List[InventoryItem]) -> None:
+        """批量保存/更新背包物品（新格子不回填 id）"""
+        ...
+
     def delete(self, inv_item_id: int) -> None:
         """删除背包物品（数量为0时）"""
         ...
@@ -0,0 +1,21 @@
+try:
+    from typing import Protocol, List, Dict, Any
+except ImportError:
+    from typing_extensions import Protocol
+    from typing import List, Dict, Any
+
+
+class ILeaderboardRepo(Protocol):
+    """排行榜全量数据源（仅用于定期对账）"""
+
+    def load_players(self) -> List[Dict[str, Any]]:
+        """返回 [{user_id, nickname, level, exp}]"""
+        ...
+
+    def load_arena_success(self) -> List[Dict[str, Any]]:
+        """返回 [{user_id, rank_name, success_count}]"""
+        ...
+
+    def load_tower_floors(self, tower_type: str) -> List[Dict[str, Any]]:
+        """返回 [{user_id, max_floor}]"""
+        ...
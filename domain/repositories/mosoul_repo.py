@@ -1,9 +1,9 @@
 """魔魂系统数据访问接口定义。"""
 try:
-    from typing import Protocol, Optional, List
+    from typing import Protocol, Optional, Dict, List
 except ImportError:
     from typing_extensions import Protocol
-    from typing import Optional, List
+    from typing import Optional, Dict, List
 
 from domain.entities.mosoul import (
     MoSoul,
@@ -25,10 +25,18 @@ class IMoSoulRepo(Protocol):
         """获取玩家所有魔魂"""
         ...
 
+    def get_unequipped_by_user_id(self, user_id: int) -> List[MoSoul]:
+        """获取玩家储魂器中（未装备）的魔魂"""
+        ...
+
     def get_equipped_by_beast_id(self, beast_id: int) -> List[MoSoul]:
         """获取幻兽已装备的所有魔魂"""
         ...
 
+    def get_equipped_by_beast_ids(self, beast_ids: List[int]) -> Dict[int, List[MoSoul]]:
+        """批量获取多只幻兽已装备的魔魂，返回 {beast_id: [魔魂]}"""
+        ...
+
     def save(self, soul: MoSoul) -> MoSoul:
         """保存/更新魔魂，返回带ID的魔魂"""
         ...
@@ -65,6 +73,10 @@ class IBeastMoSoulRepo(Protocol):
         """获取幻兽的魔魂装备槽位"""
         ...
 
+    def get_by_beast_ids(self, beast_ids: List[int]) -> Dict[int, BeastMoSoulSlot]:
+        """批量获取多只幻兽的魔魂装备槽位，返回 {beast_id: 槽位}"""
+        ...
+
     def get_by_user_id(self, user_id: int) -> List[BeastMoSoulSlot]:
         """获取玩家所有幻兽的魔魂装备信息"""
         ...
@@ -112,3 +124,29 @@ class IGlobalPityRepo(Protocol):
     def reset(self, counter_key: str = "kevin_adv_pity") -> None:
         """重置计数器"""
         ...
+
+
+class IMoSoulBatchHuntRepo(Protocol):
+    """一键猎魂数据访问接口（保底计数行锁读取 + 批量写入）"""
+
+    def count_unequipped(self, user_id: int) -> int:
+        """储魂器中（未装备）的魔魂数量"""
+        ...
+
+    def lock_personal_consumed(self, user_id: int) -> tuple:
+        """加锁读取个人累计消耗 (追魂法宝, 铜钱)"""
+        ...
+
+    def save_personal_consumed(self, user_id: int, soul_charm_consumed: int, copper_consumed: int) -> None:
+        ...
+
+    def lock_global_consumed(self, counter_key: str) -> tuple:
+        """加锁读取全服累计消耗 (追魂法宝, 铜钱)"""
+        ...
+
+    def save_global_consumed(self, counter_key: str, soul_charm_consumed: int, copper_consumed: int) -> None:
+        ...
+
+    def create_mosouls(self, user_id: int, template_ids: List[int]) -> List[int]:
+        """批量创建 1 级魔魂，按顺序返回新魔魂ID"""
+        ...
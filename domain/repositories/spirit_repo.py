@@ -1,8 +1,8 @@
 try:
-    from typing import Protocol, Optional, List
+    from typing import Protocol, Optional, Dict, List
 except ImportError:
     from typing_extensions import Protocol
-    from typing import Optional, List
+    from typing import Optional, Dict, List
 
 from domain.entities.spirit import Spirit, SpiritAccount
 
@@ -19,6 +19,9 @@ class ISpiritRepo(Protocol):
     def get_by_beast_id(self, beast_id: int) -> List[Spirit]:
         ...
 
+    def get_by_beast_ids(self, beast_ids: List[int]) -> Dict[int, List[Spirit]]:
+        ...
+
     def save(self, spirit: Spirit) -> None:
         ...
 
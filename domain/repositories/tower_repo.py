@@ -4,6 +4,7 @@ except ImportError:
     from typing_extensions import Protocol
     from typing import Optional, List, Dict
 from domain.entities.tower import TowerState, TowerGuardian
+from domain.services.tower_floor import FloorReward, GuardianFloor, MilestoneReward
 
 
 class ITowerStateRepo(Protocol):
@@ -29,6 +30,10 @@ class ITowerConfigRepo(Protocol):
         """获取某层的守塔幻兽列表"""
         ...
     
+    def get_guardian_floor(self, tower_type: str, floor: int) -> GuardianFloor:
+        """获取某层预编译的守塔幻兽（属性块 + PvpBeast 模板），只读"""
+        ...
+    
     def get_guardian_count_for_floor(self, tower_type: str, floor: int) -> int:
         """获取某层需要的守塔幻兽数量"""
         ...
@@ -40,3 +45,11 @@ class ITowerConfigRepo(Protocol):
     def get_milestone_reward(self, tower_type: str, floor: int) -> Optional[dict]:
         """获取里程碑奖励（如果有）"""
         ...
+    
+    def get_floor_reward_entry(self, tower_type: str, floor: int) -> FloorReward:
+        """获取某层的奖励（只读元组）"""
+        ...
+    
+    def get_milestone_entry(self, tower_type: str, floor: int) -> Optional[MilestoneReward]:
+        """获取里程碑奖励（只读元组，没有则为 None）"""
+        ...
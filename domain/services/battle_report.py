@@ -0,0 +1,267 @@
+"""PVP 战报：前端战报结构的生成，以及落库用的紧凑二进制编码
+
+镇妖 / 擂台 / 古战场共用同一份战报结构：
+{
+    "is_victory": bool,
+    "attacker_wins": 0/1,
+    "defender_wins": 0/1,
+    "battles": [ { battle_num, winner, rounds: [{round, action, a_hp, d_hp}], result }, ... ]
+}
+
+落库时不保存上面的结构（每回合一整句中文描述），而是保存紧凑战报：
+双方玩家/幻兽名单（幻兽在回合流中用名单下标表示）+ CompactAttack 回合流（技能用 skill_id 表示），
+zlib 压缩后写入 BLOB；读取时用 expand_compact_logs 还原描述，再生成同样的战报结构。
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+import zlib
+from typing import Dict, List, Tuple
+
+from domain.services.pvp_battle_engine import (
+    CompactAttack,
+    PvpBattleResult,
+    PvpBeast,
+    PvpPlayer,
+    expand_compact_logs,
+)
+
+
+# 小战结果文案
+RESULT_STYLE_WINNER = "winner"   # 『A』的X获胜，剩余气血N（擂台 / 古战场）
+RESULT_STYLE_FALLEN = "fallen"   # 『B』的Y阵亡，『A』的X剩余气血N（镇妖）
+
+REPORT_VERSION = 1
+_HEADER = struct.Struct("<BI")  # 版本号, 名单 JSON 长度
+# turn, actor, attacker_index, defender_index, skill_id, damage,
+# passive_skill_id, reflect_damage, attacker_hp_after, defender_hp_after, poison_resisted
+_TURN = struct.Struct("<HBBBHiHiiiB")
+
+
+def build_battle_data(
+    pvp_result: PvpBattleResult,
+    attacker_player: PvpPlayer,
+    defender_player: PvpPlayer,
+    result_style: str = RESULT_STYLE_WINNER,
+) -> Dict:
+    """根据 PvpBattleResult 构建前端战报结构（整场日志按“每对幻兽对战”拆成多场小战）"""
+
+    attacker_name = attacker_player.name or str(attacker_player.player_id)
+    defender_name = defender_player.name or str(defender_player.player_id)
+
+    def get_player_name(pid: int) -> str:
+        return attacker_name if pid == attacker_player.player_id else defender_name
+
+    def get_side_flag(pid: int) -> str:
+        return "attacker" if pid == attacker_player.player_id else "defender"
+
+    def build_battle_segment(battle_index: int, seg_logs):
+        if not seg_logs:
+            return {
+                "battle_num": battle_index,
+                "attacker_beast": "",
+                "defender_beast": "",
+                "winner": "defender",
+                "rounds": [],
+                "result": "",
+            }
+
+        # 每一小战内部回合重新从 1 计数
+        rounds = []
+        for idx, log in enumerate(seg_logs, start=1):
+            rounds.append({
+                "round": idx,
+                "action": log.description,
+                "a_hp": log.attacker_hp_after,
+                "d_hp": log.defender_hp_after,
+            })
+
+        # 统计本场对战中每只幻兽的最终气血
+        # key = (player_id, beast_id) -> (beast_name, hp_after)
+        beast_state: Dict[Tuple[int, int], Tuple[str, int]] = {}
+        for log in seg_logs:
+            if log.attacker_beast_id != 0:
+                beast_state[(log.attacker_player_id, log.attacker_beast_id)] = (
+                    log.attacker_name,
+                    log.attacker_hp_after,
+                )
+            if log.defender_beast_id != 0:
+                beast_state[(log.defender_player_id, log.defender_beast_id)] = (
+                    log.defender_name,
+                    log.defender_hp_after,
+                )
+
+        # 默认使用整场战斗的胜负兜底
+        winner_player_id = pvp_result.winner_player_id
+        loser_player_id = (
+            attacker_player.player_id
+            if winner_player_id == defender_player.player_id
+            else defender_player.player_id
+        )
+        winner_beast_name = ""
+        loser_beast_name = ""
+        winner_hp = 0
+
+        keys = list(beast_state.keys())
+        if keys:
+            # 正常情况下这里有两只幻兽；如果只有一只，就简单复制一份避免下标错误
+            if len(keys) == 1:
+                keys = keys * 2
+            (p1, b1), (p2, b2) = keys[0], keys[1]
+            name1, hp1 = beast_state[(p1, b1)]
+            name2, hp2 = beast_state[(p2, b2)]
+
+            if hp1 > 0 and hp2 <= 0:
+                winner_player_id, loser_player_id = p1, p2
+                winner_beast_name, winner_hp = name1, hp1
+                loser_beast_name = name2
+            elif hp2 > 0 and hp1 <= 0:
+                winner_player_id, loser_player_id = p2, p1
+                winner_beast_name, winner_hp = name2, hp2
+                loser_beast_name = name1
+            elif hp1 != hp2:
+                # 双方都活着，谁血多谁赢（主要用于日志截断等极端情况）
+                if hp1 > hp2:
+                    winner_player_id, loser_player_id = p1, p2
+                    winner_beast_name, winner_hp = name1, hp1
+                    loser_beast_name = name2
+                else:
+                    winner_player_id, loser_player_id = p2, p1
+                    winner_beast_name, winner_hp = name2, hp2
+                    loser_beast_name = name1
+
+        winner_player_name = get_player_name(winner_player_id)
+        winner_flag = get_side_flag(winner_player_id)
+
+        if winner_beast_name and loser_beast_name:
+            if result_style == RESULT_STYLE_FALLEN:
+                result_text = (
+                    f"『{get_player_name(loser_player_id)}』的{loser_beast_name}阵亡，"
+                    f"『{winner_player_name}』的{winner_beast_name}剩余气血{winner_hp}"
+                )
+            else:
+                result_text = f"『{winner_player_name}』的{winner_beast_name}获胜，剩余气血{winner_hp}"
+        else:
+            result_text = f"『{winner_player_name}』获胜"
+
+        return {
+            "battle_num": battle_index,
+            "attacker_beast": "",
+            "defender_beast": "",
+            "winner": winner_flag,
+            "rounds": rounds,
+            "result": result_text,
+        }
+
+    battles = []
+    current_pair = None  # 当前这场小战参与的两只幻兽（ID 集合）
+    current_logs = []
+
+    for log in pvp_result.logs:
+        # 中毒等持续伤害（attacker_beast_id == 0）归入当前小战，不单独拆分
+        if log.attacker_beast_id == 0 and current_pair is not None:
+            current_logs.append(log)
+            continue
+
+        pair = frozenset({log.attacker_beast_id, log.defender_beast_id})
+
+        if current_pair is None:
+            current_pair = pair
+            current_logs.append(log)
+        elif pair == current_pair:
+            current_logs.append(log)
+        else:
+            # 一方幻兽阵亡，开始新的小战
+            battles.append(build_battle_segment(len(battles) + 1, current_logs))
+            current_pair = pair
+            current_logs = [log]
+
+    if current_logs:
+        battles.append(build_battle_segment(len(battles) + 1, current_logs))
+
+    is_victory = pvp_result.winner_player_id == attacker_player.player_id
+    attacker_wins = 1 if is_victory else 0
+    defender_wins = 1 - attacker_wins
+
+    return {
+        "is_victory": is_victory,
+        "attacker_wins": attacker_wins,
+        "defender_wins": defender_wins,
+        "battles": battles,
+    }
+
+
+# ===================== 紧凑二进制战报 =====================
+def encode_battle_report(
+    pvp_result: PvpBattleResult,
+    attacker_player: PvpPlayer,
+    defender_player: PvpPlayer,
+    result_style: str = RESULT_STYLE_WINNER,
+) -> bytes:
+    """编码紧凑战报（需要以 log_mode="compact" 运行的战斗结果；没有回合的结果也可以）"""
+    if pvp_result.logs and not pvp_result.compact_logs:
+        raise ValueError("编码战报需要 log_mode=compact 的战斗结果")
+
+    roster = {
+        "s": result_style,
+        "w": pvp_result.winner_player_id,
+        "l": pvp_result.loser_player_id,
+        "n": pvp_result.total_turns,
+        "p": [
+            [p.player_id, p.name, [[b.id, b.name] for b in p.beasts]]
+            for p in (attacker_player, defender_player)
+        ],
+    }
+    roster_bytes = json.dumps(roster, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    turns = b"".join(_TURN.pack(*c) for c in pvp_result.compact_logs)
+    return zlib.compress(_HEADER.pack(REPORT_VERSION, len(roster_bytes)) + roster_bytes + turns)
+
+
+def decode_battle_report(blob: bytes) -> Dict:
+    """紧凑战报 -> 前端战报结构（描述按当前技能配置重新生成）"""
+    result, attacker_player, defender_player, result_style = _decode(blob)
+    result.expand_logs(attacker_player, defender_player)
+    return build_battle_data(result, attacker_player, defender_player, result_style)
+
+
+def _decode(blob: bytes) -> Tuple[PvpBattleResult, PvpPlayer, PvpPlayer, str]:
+    raw = zlib.decompress(blob)
+    version, roster_len = _HEADER.unpack_from(raw)
+    if version != REPORT_VERSION:
+        raise ValueError(f"不支持的战报版本: {version}")
+    offset = _HEADER.size
+    roster = json.loads(raw[offset:offset + roster_len].decode("utf-8"))
+    offset += roster_len
+
+    attacker_player, defender_player = (_stub_player(*p) for p in roster["p"])
+    compact_logs: List[CompactAttack] = [
+        CompactAttack(*fields[:-1], bool(fields[-1])) for fields in _TURN.iter_unpack(raw[offset:])
+    ]
+    result = PvpBattleResult(
+        attacker_player_id=attacker_player.player_id,
+        defender_player_id=defender_player.player_id,
+        winner_player_id=roster["w"],
+        loser_player_id=roster["l"],
+        total_turns=roster["n"],
+        compact_logs=compact_logs,
+    )
+    return result, attacker_player, defender_player, roster["s"]
+
+
+def _stub_player(player_id: int, name: str, beasts: List) -> PvpPlayer:
+    # 还原描述只需要玩家/幻兽的 ID 与名称
+    return PvpPlayer(
+        player_id=player_id,
+        level=0,
+        name=name,
+        beasts=[
+            PvpBeast(
+                id=beast_id, name=beast_name, hp_max=0, hp_current=0,
+                physical_attack=0, magic_attack=0, physical_defense=0, magic_defense=0, speed=0,
+                attack_type="physical",
+            )
+            for beast_id, beast_name in beasts
+        ],
+    )
@@ -1,42 +1,32 @@
 from dataclasses import dataclass
-from typing import Iterable, List, Dict
-import json
-import os
+from typing import Iterable, List, Dict, Tuple
 import random
 
 from domain.entities.beast import Beast, BeastTemplate
+from domain.services.config_source import get_config, get_derived_config
 
 
 # ===================== 境界倍率配置加载 =====================
 def _load_realm_config() -> Dict:
-    """加载 configs/realm_multipliers.json 配置"""
-    config_path = os.path.join(
-        os.path.dirname(__file__), "..", "..", "configs", "realm_multipliers.json"
-    )
-    with open(config_path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    """configs/realm_multipliers.json（经 config_source 读取；Web 应用中文件变化后自动重新加载）"""
+    return get_config("realm_multipliers.json")
 
 
-_REALM_CONFIG = _load_realm_config()
-# 从低到高排列的境界列表
-REALM_ORDER: List[str] = _REALM_CONFIG["realms"]
-# 当最高境界为天界时的基础倍率
-BASE_MULTIPLIERS: Dict[str, float] = _REALM_CONFIG["base_multipliers"]
+def __getattr__(name: str):
+    # REALM_ORDER：从低到高排列的境界列表；BASE_MULTIPLIERS：当最高境界为天界时的基础倍率
+    # 每次访问都取当前配置，配置热更新后无需重启
+    if name == "REALM_ORDER":
+        return _load_realm_config()["realms"]
+    if name == "BASE_MULTIPLIERS":
+        return _load_realm_config()["base_multipliers"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # ===================== 成长率倍率配置加载 =====================
-def _load_growth_config() -> Dict[str, float]:
-    """加载 configs/growth_rate_multipliers.json 配置"""
-    config_path = os.path.join(
-        os.path.dirname(__file__), "..", "..", "configs", "growth_rate_multipliers.json"
-    )
-    with open(config_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    # 转换 key 为 int 方便查找
-    return {int(k): v for k, v in data["growth_score_to_multiplier"].items()}
-
-
-_GROWTH_MULTIPLIERS: Dict[int, float] = _load_growth_config()
+def _build_growth_table(data: Dict) -> Tuple[Dict[int, float], List[int]]:
+    # 转换 key 为 int 方便查找，并预先排好序
+    table = {int(k): v for k, v in data["growth_score_to_multiplier"].items()}
+    return table, sorted(table)
 
 
 def get_growth_multiplier(growth_score: int) -> float:
@@ -45,15 +35,15 @@ def get_growth_multiplier(growth_score: int) -> float:
     若评分不在配置中，返回最接近且不超过该评分的倍率；
     若评分低于最小值，返回最小倍率。
     """
-    if growth_score in _GROWTH_MULTIPLIERS:
-        return _GROWTH_MULTIPLIERS[growth_score]
+    multipliers, sorted_scores = get_derived_config("growth_rate_multipliers.json", _build_growth_table)
+    if growth_score in multipliers:
+        return multipliers[growth_score]
     # 找到不超过 growth_score 的最大 key
-    sorted_scores = sorted(_GROWTH_MULTIPLIERS.keys())
     for score in reversed(sorted_scores):
         if score <= growth_score:
-            return _GROWTH_MULTIPLIERS[score]
+            return multipliers[score]
     # 若都比 growth_score 大，返回最小倍率
-    return _GROWTH_MULTIPLIERS[sorted_scores[0]]
+    return multipliers[sorted_scores[0]]
 
 
 def calc_level1_speed_from_aptitude(speed_aptitude: int) -> int:
@@ -79,7 +69,7 @@ def get_beast_max_realm(template_realms: Iterable[str]) -> str:
         return "地界"
     # 按照 REALM_ORDER 的顺序找最后一个存在的境界
     max_realm = "地界"
-    for r in REALM_ORDER:
+    for r in _load_realm_config()["realms"]:
         if r in template_realms:
             max_realm = r
     return max_realm
@@ -193,11 +183,12 @@ def get_realm_multiplier(current_realm: str, max_realm: str) -> float:
     - 例如：最高境界为灵界时，灵界=1.0，地界=0.9
     - 若 current_realm 不在 REALM_ORDER 中，返回 1.0（容错）
     """
-    if current_realm not in REALM_ORDER or max_realm not in REALM_ORDER:
+    realms = _load_realm_config()["realms"]
+    if current_realm not in realms or max_realm not in realms:
         return 1.0
 
-    max_idx = REALM_ORDER.index(max_realm)
-    cur_idx = REALM_ORDER.index(current_realm)
+    max_idx = realms.index(max_realm)
+    cur_idx = realms.index(current_realm)
 
     if cur_idx > max_idx:
         cur_idx = max_idx
@@ -434,12 +425,8 @@ def _calc_star_pair(x: int, xmax: int) -> (int, int):
 
 def _load_beast_templates_raw():
     """加载原始的幻兽模板配置"""
-    config_path = os.path.join(
-        os.path.dirname(__file__), '..', '..', 'configs', 'beast_templates.json'
-    )
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = get_config("beast_templates.json")
         if isinstance(data, list):
             return data
         elif isinstance(data, dict) and 'templates' in data:
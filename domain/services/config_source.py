@@ -0,0 +1,61 @@
+"""领域层读取 configs/*.json 的入口
+
+领域层不依赖基础设施层：这里只定义读取配置的两个函数，具体来源由应用启动时注入。
+- 默认：直接读取 configs/ 下的文件，每个文件、每个派生结构只构建一次（脚本与单元测试使用）
+- Web 应用：bootstrap 调用 set_config_provider 换成配置注册表，
+  与其它层共享同一份冻结配置，并在文件变化后自动重新加载
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple
+
+ConfigGetter = Callable[[str], Any]
+DerivedConfigGetter = Callable[[str, Callable[[Any], Any]], Any]
+
+_CONFIG_DIR = Path(__file__).resolve().parents[2] / "configs"
+
+_lock = threading.Lock()
+_files: Dict[str, Any] = {}
+_derived: Dict[Tuple[str, Callable[[Any], Any]], Any] = {}
+
+
+def _read_config_file(name: str) -> Any:
+    with _lock:
+        if name not in _files:
+            with (_CONFIG_DIR / name).open("r", encoding="utf-8") as f:
+                _files[name] = json.load(f)
+        return _files[name]
+
+
+def _derive_once(name: str, builder: Callable[[Any], Any]) -> Any:
+    config = _read_config_file(name)
+    key = (name, builder)
+    with _lock:
+        if key not in _derived:
+            _derived[key] = builder(config)
+        return _derived[key]
+
+
+_get_config: ConfigGetter = _read_config_file
+_get_derived_config: DerivedConfigGetter = _derive_once
+
+
+def set_config_provider(get_config: ConfigGetter, get_derived_config: DerivedConfigGetter) -> None:
+    """替换配置来源（应用启动时调用一次）"""
+    global _get_config, _get_derived_config
+    _get_config = get_config
+    _get_derived_config = get_derived_config
+
+
+def get_config(name: str) -> Any:
+    """configs/<name> 的内容；调用方不要修改返回的对象"""
+    return _get_config(name)
+
+
+def get_derived_config(name: str, builder: Callable[[Any], Any]) -> Any:
+    """builder(configs/<name>) 的结果，配置不变时复用"""
+    return _get_derived_config(name, builder)
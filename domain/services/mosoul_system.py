@@ -5,7 +5,8 @@
 from __future__ import annotations
 
 import random
-from dataclasses import dataclass
+from bisect import bisect_right
+from dataclasses import dataclass, field, replace
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 import json
@@ -20,6 +21,7 @@ from domain.entities.mosoul import (
     GlobalPityCounter,
     get_mosoul_template,
     get_templates_by_grade,
+    _load_upgrade_config,
 )
 from domain.rules.mosoul_rules import validate_equip, check_equip_conflict
 from domain.services.beast_stats import StatBonus
@@ -294,7 +296,284 @@ class MoSoulHuntingService:
         return npc_config.get("cost", 0), npc_config.get("cost_type", "copper")
 
 
+# ===================== 一键猎魂 =====================
+# 猎魂师配置
+HUNTER_CONFIG = {
+    'amy': {'name': '艾米', 'cost': 8000, 'next': 'keke', 'unlock_rate': 50},
+    'keke': {'name': '科科', 'cost': 10000, 'next': 'boer', 'unlock_rate': 35},
+    'boer': {'name': '波尔', 'cost': 20000, 'next': 'wote', 'unlock_rate': 20},
+    'wote': {'name': '沃特', 'cost': 40000, 'next': 'kaiwen', 'unlock_rate': 5},
+    'kaiwen': {'name': '凯文', 'cost': 60000, 'next': None, 'unlock_rate': 0},
+}
+
+# 普通场魔魂概率（百分比）
+NORMAL_GRADE_WEIGHTS = {
+    'amy': {'waste_soul': 33.3, 'yellow_soul': 33.3, 'dark_soul': 33.4},
+    'keke': {'waste_soul': 30, 'yellow_soul': 35, 'dark_soul': 35},
+    'boer': {'waste_soul': 20, 'yellow_soul': 20, 'dark_soul': 20, 'earth_soul': 20},
+    'wote': {'waste_soul': 8, 'yellow_soul': 30, 'dark_soul': 30, 'earth_soul': 30},
+    'kaiwen': {'yellow_soul': 25, 'dark_soul': 25, 'earth_soul': 31},
+}
+
+# 高级场配置
+ADVANCED_HUNTER_CONFIG = {
+    'wote': {'name': '沃特', 'cost': 4, 'cost_type': 'fabao', 'next': 'kaiwen', 'unlock_rate': 10},
+    'kaiwen': {'name': '凯文', 'cost': 6, 'cost_type': 'fabao', 'next': None, 'unlock_rate': 0},
+}
+
+# 高级场魔魂概率
+ADVANCED_GRADE_WEIGHTS = {
+    'wote': {'earth_soul': 84, 'heaven_soul': 16},
+    'kaiwen': {'god_soul': 32, 'earth_soul': 32, 'heaven_soul': 35.1},
+}
+
+# 魔魂模板映射
+GRADE_TEMPLATES = {
+    'god_soul': [1],
+    'dragon_soul': [101, 102, 103],
+    'heaven_soul': [201, 202, 203, 204, 205, 206, 207, 208, 209, 210, 211, 212],
+    'earth_soul': [301, 302, 303, 304, 305, 306, 307, 308, 309, 310, 311, 312],
+    'dark_soul': [401, 402, 403, 404, 405, 406, 407, 408, 409, 410, 411, 412],
+    'yellow_soul': [501, 502, 503, 504, 505, 506, 507, 508, 509, 510, 511, 512],
+    'waste_soul': [901, 902, 903, 904, 905],
+}
+
+SOUL_CHARM_ITEM_ID = 6019
+NORMAL_HEAVEN_PITY_COPPER = 2_000_000
+ADV_PERSONAL_DRAGON_PITY = 5_000
+ADV_GLOBAL_DRAGON_PITY = 40_000
+NORMAL_HEAVEN_PITY_COUNTER_KEY = 'normal_heaven_pity'
+ADV_DRAGON_PITY_COUNTER_KEY = 'kevin_adv_pity'
+WASTE_SOUL_SELL_PRICE = 5000
+MAX_BATCH_HUNTS = 100
+
+
+@dataclass
+class BatchHuntSnapshot:
+    """一键猎魂的起始（或结束）状态：货币、储魂器、猎魂师解锁状态与保底计数"""
+    arena_type: str
+    gold: int
+    soul_charm: int
+    warehouse_count: int
+    warehouse_capacity: int
+    unlocked: Dict[str, bool] = field(default_factory=dict)  # {'keke_unlocked': True, ...}
+    global_copper_consumed: int = 0        # 普通场全服铜钱保底（天魂）
+    personal_soul_charm_consumed: int = 0  # 高级场个人追魂法宝保底（龙魂）
+    global_soul_charm_consumed: int = 0    # 高级场全服追魂法宝保底（龙魂）
+
+
+@dataclass
+class HuntRoll:
+    """单次猎魂结果；template_id 为 None 表示废魂（已自动售卖）"""
+    hunt_num: int
+    hunter_id: str
+    hunter_name: str
+    cost: int
+    next_hunter: Optional[str]
+    next_unlocked: bool
+    template_id: Optional[int] = None
+    sell_price: int = 0
+
+    @property
+    def is_waste(self) -> bool:
+        return self.template_id is None
+
+
+@dataclass
+class BatchHuntPlan:
+    """一键猎魂的完整结果，start/end 之差即需要落库的增量"""
+    start: BatchHuntSnapshot
+    end: BatchHuntSnapshot
+    rolls: List[HuntRoll] = field(default_factory=list)
+    stop_reason: Optional[str] = None
+    total_cost: int = 0
+    total_sell: int = 0
+    soul_ids: List[int] = field(default_factory=list)  # 落库后按 template_ids 顺序回填
+
+    @property
+    def gold_delta(self) -> int:
+        return self.end.gold - self.start.gold
+
+    @property
+    def soul_charm_spent(self) -> int:
+        return self.start.soul_charm - self.end.soul_charm
+
+    @property
+    def template_ids(self) -> List[int]:
+        return [r.template_id for r in self.rolls if r.template_id is not None]
+
+
+class MoSoulBatchHuntEngine:
+    """一键猎魂引擎
+
+    在内存中对快照连续猎魂（规则同单次猎魂：自动选择已解锁的最高级猎魂师，
+    铜钱 / 追魂法宝不足或储魂器已满时停止），不访问数据库；
+    调用方把返回计划中的新魔魂、货币增量与保底计数一次性写回。
+    """
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        self.rng = rng or random.Random()
+        self._template_grades: Dict[int, Optional[str]] = {}
+
+    def _template_grade(self, template_id: int) -> Optional[str]:
+        if template_id not in self._template_grades:
+            template = get_mosoul_template(int(template_id))
+            self._template_grades[template_id] = template.grade.value if template else None
+        return self._template_grades[template_id]
+
+    def roll(self, snapshot: BatchHuntSnapshot, count: int) -> BatchHuntPlan:
+        rng = self.rng
+        normal = snapshot.arena_type == 'normal'
+        if normal:
+            hunter_priority = ['kaiwen', 'wote', 'boer', 'keke', 'amy']
+            config, grade_weights = HUNTER_CONFIG, NORMAL_GRADE_WEIGHTS
+        else:
+            hunter_priority = ['kaiwen', 'wote']
+            config, grade_weights = ADVANCED_HUNTER_CONFIG, ADVANCED_GRADE_WEIGHTS
+
+        state = replace(snapshot, unlocked=dict(snapshot.unlocked))
+        plan = BatchHuntPlan(start=snapshot, end=state)
+
+        for hunt_num in range(1, count + 1):
+            if state.warehouse_count >= state.warehouse_capacity:
+                plan.stop_reason = f'储魂器已满（{state.warehouse_count}/{state.warehouse_capacity}）'
+                break
+
+            # 选择当前可用的最高级猎魂师
+            if normal:
+                hunter_id = next(h for h in hunter_priority if h == 'amy' or state.unlocked.get(f'{h}_unlocked', False))
+            else:
+                hunter_id = 'kaiwen' if state.unlocked.get('kaiwen_unlocked', False) else 'wote'
+            cfg = config[hunter_id]
+            cost = int(cfg['cost'])
+
+            force_grade = None
+            if normal:
+                if state.gold < cost:
+                    plan.stop_reason = '铜钱不足'
+                    break
+                state.gold -= cost
+                state.global_copper_consumed += cost
+                if state.global_copper_consumed >= NORMAL_HEAVEN_PITY_COPPER and hunter_id in ('wote', 'kaiwen'):
+                    state.global_copper_consumed = 0
+                    force_grade = 'heaven_soul'
+            else:
+                if state.soul_charm < cost:
+                    plan.stop_reason = '追魂法宝不足'
+                    break
+                state.soul_charm -= cost
+                state.personal_soul_charm_consumed += cost
+                state.global_soul_charm_consumed += cost
+                if state.personal_soul_charm_consumed >= ADV_PERSONAL_DRAGON_PITY:
+                    state.personal_soul_charm_consumed -= ADV_PERSONAL_DRAGON_PITY
+                    force_grade = 'dragon_soul'
+                if state.global_soul_charm_consumed >= ADV_GLOBAL_DRAGON_PITY:
+                    state.global_soul_charm_consumed -= ADV_GLOBAL_DRAGON_PITY
+                    force_grade = 'dragon_soul'
+            plan.total_cost += cost
+
+            # 点击后清除当前猎魂师的解锁状态（艾米/沃特始终可点击），并尝试解锁下一个
+            if (normal and hunter_id != 'amy') or (not normal and hunter_id == 'kaiwen'):
+                state.unlocked[f'{hunter_id}_unlocked'] = False
+            next_hunter = cfg.get('next')
+            next_unlocked = False
+            if next_hunter and cfg.get('unlock_rate', 0) > 0 and rng.random() * 100 < cfg['unlock_rate']:
+                state.unlocked[f'{next_hunter}_unlocked'] = True
+                next_unlocked = True
+
+            weights = grade_weights.get(hunter_id, {'yellow_soul': 100})
+            grade = rng.choices(list(weights.keys()), weights=list(weights.values()), k=1)[0]
+            if force_grade:
+                grade = force_grade
+            if normal and grade == 'dragon_soul':
+                grade = 'earth_soul'
+
+            template_id = rng.choice(GRADE_TEMPLATES.get(grade, [501]))
+            # 普通场兜底规则：最终模板不允许是龙魂；未触发保底时不允许是天魂
+            if normal:
+                template_grade = self._template_grade(template_id)
+                if template_grade == 'dragon_soul' or (grade != 'heaven_soul' and template_grade == 'heaven_soul'):
+                    template_id = rng.choice(GRADE_TEMPLATES.get('earth_soul', [301]))
+
+            hunt = HuntRoll(
+                hunt_num=hunt_num,
+                hunter_id=hunter_id,
+                hunter_name=cfg['name'],
+                cost=cost,
+                next_hunter=next_hunter,
+                next_unlocked=next_unlocked,
+            )
+            if grade == 'waste_soul':
+                # 废魂自动售卖
+                hunt.sell_price = WASTE_SOUL_SELL_PRICE
+                state.gold += WASTE_SOUL_SELL_PRICE
+                plan.total_sell += WASTE_SOUL_SELL_PRICE
+            else:
+                hunt.template_id = template_id
+                state.warehouse_count += 1
+            plan.rolls.append(hunt)
+
+        return plan
+
+
 # ===================== 升级服务 =====================
+MOSOUL_MAX_LEVEL = 10
+
+
+class MoSoulExpTable:
+    """魔魂经验表
+
+    按品质预计算从 1 级 0 经验到达各等级所需的累计经验，
+    吞噬任意数量材料后的等级用二分查找定位，不再逐级循环。
+    """
+
+    def __init__(self, config: Dict):
+        self.grade_exp_provide: Dict[str, int] = {
+            grade: int(exp or 0) for grade, exp in (config.get('grade_exp_provide') or {}).items()
+        }
+        # cumulative[grade][i]：到达 i+1 级所需累计经验；配置缺失的等级之后无法再升级
+        self.cumulative: Dict[str, List[int]] = {}
+        for grade, data in (config.get('upgrade_exp') or {}).items():
+            levels = (data or {}).get('levels') or {}
+            table = [0]
+            for level in range(1, MOSOUL_MAX_LEVEL):
+                required = int(levels.get(str(level), 0) or 0)
+                if required <= 0:
+                    break
+                table.append(table[-1] + required)
+            self.cumulative[grade] = table
+
+    @classmethod
+    def load(cls) -> "MoSoulExpTable":
+        return cls(_load_upgrade_config())
+
+    def exp_provide(self, grade: Optional[str]) -> int:
+        """该品质魔魂作为材料提供的经验"""
+        return self.grade_exp_provide.get(grade, 0)
+
+    def feed(self, grade: str, level: int, exp: int, add_exp: int) -> Tuple[int, int, int]:
+        """目标魔魂获得 add_exp 经验
+
+        Returns:
+            (新等级, 新经验, 实际吸收的经验)；满级后溢出的经验不计入吸收
+        """
+        level, exp, add_exp = int(level or 1), int(exp or 0), int(add_exp or 0)
+        if level >= MOSOUL_MAX_LEVEL:
+            return MOSOUL_MAX_LEVEL, exp, 0
+
+        table = self.cumulative.get(grade, [0])
+        if level > len(table):
+            return level, exp + add_exp, add_exp
+
+        position = table[level - 1] + exp
+        total = position + add_exp
+        if len(table) == MOSOUL_MAX_LEVEL and total >= table[-1]:
+            return MOSOUL_MAX_LEVEL, 0, max(0, min(add_exp, table[-1] - position))
+
+        new_level = bisect_right(table, total)
+        return new_level, total - table[new_level - 1], add_exp
+
+
 class MoSoulUpgradeService:
     """魔魂升级服务
 
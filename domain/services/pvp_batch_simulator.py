@@ -0,0 +1,167 @@
+"""PVP 批量蒙特卡洛模拟器（平衡性分析用）
+
+对同一组对阵（攻方阵容 vs 守方阵容）连续模拟成千上万场，统计：
+- 攻方胜率（含 95% 置信区间）
+- 回合数分布
+- 双方造成的总伤害分布
+
+每场都直接调用 `run_pvp_battle(..., log_mode=LOG_NONE, rng=rng)`，规则只有引擎一份：
+同一随机种子下与单场引擎的胜负、回合数和伤害完全一致。
+省下的开销来自不生成战报，以及每场只浅拷贝阵容（幻兽快照 + 状态效果列表），不做深拷贝。
+
+纯领域层模块，不依赖 Flask / MySQL。
+"""
+
+from __future__ import annotations
+
+import copy
+import math
+import random
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from domain.services.pvp_battle_engine import LOG_NONE, PvpBeast, PvpPlayer, run_pvp_battle
+
+
+@dataclass
+class FightOutcome:
+    """单场模拟结果"""
+
+    attacker_won: bool
+    turns: int
+    attacker_damage: int  # 攻方造成的总伤害（含反震/反击）
+    defender_damage: int
+    attacker_hp_left: int = 0  # 攻方全部幻兽剩余气血之和
+    defender_hp_left: int = 0
+
+
+@dataclass
+class MatchupStats:
+    """同一对阵多场模拟的汇总统计"""
+
+    fights: int = 0
+    attacker_wins: int = 0
+    turns: List[int] = field(default_factory=list)
+    attacker_damage: List[int] = field(default_factory=list)
+    defender_damage: List[int] = field(default_factory=list)
+
+    def add(self, outcome: FightOutcome) -> None:
+        self.fights += 1
+        self.attacker_wins += 1 if outcome.attacker_won else 0
+        self.turns.append(outcome.turns)
+        self.attacker_damage.append(outcome.attacker_damage)
+        self.defender_damage.append(outcome.defender_damage)
+
+    @property
+    def win_rate(self) -> float:
+        return self.attacker_wins / self.fights if self.fights else 0.0
+
+    def win_rate_interval(self, z: float = 1.96) -> Tuple[float, float]:
+        """攻方胜率的 Wilson 置信区间（默认 95%）"""
+        n = self.fights
+        if not n:
+            return 0.0, 1.0
+        p = self.win_rate
+        denom = 1 + z * z / n
+        center = (p + z * z / (2 * n)) / denom
+        half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+        return max(0.0, min(p, center - half)), min(1.0, max(p, center + half))
+
+    def turn_histogram(self) -> Dict[int, int]:
+        """{回合数: 场数}"""
+        return dict(sorted(Counter(self.turns).items()))
+
+    @staticmethod
+    def summarize(values: List[int]) -> Dict[str, float]:
+        """均值 / 标准差 / 最小 / 中位数 / P90 / 最大"""
+        if not values:
+            return {"mean": 0.0, "std": 0.0, "min": 0, "p50": 0, "p90": 0, "max": 0}
+        ordered = sorted(values)
+        n = len(ordered)
+        mean = sum(ordered) / n
+        var = sum((v - mean) ** 2 for v in ordered) / n
+        return {
+            "mean": mean,
+            "std": math.sqrt(var),
+            "min": ordered[0],
+            "p50": ordered[n // 2],
+            "p90": ordered[min(n - 1, int(n * 0.9))],
+            "max": ordered[-1],
+        }
+
+    def to_dict(self) -> Dict:
+        low, high = self.win_rate_interval()
+        return {
+            "fights": self.fights,
+            "attacker_wins": self.attacker_wins,
+            "win_rate": self.win_rate,
+            "win_rate_95": [low, high],
+            "turns": self.summarize(self.turns),
+            "attacker_damage": self.summarize(self.attacker_damage),
+            "defender_damage": self.summarize(self.defender_damage),
+        }
+
+
+class MatchupSimulator:
+    """同一对阵的批量模拟器
+
+    用法：
+        sim = MatchupSimulator(attacker_player, defender_player)
+        stats = sim.run(10000, seed=42)
+        print(stats.win_rate, stats.win_rate_interval())
+
+    传入的 PvpPlayer 只读，不会被修改。
+    """
+
+    def __init__(self, attacker: PvpPlayer, defender: PvpPlayer):
+        self.attacker = attacker
+        self.defender = defender
+
+    def run(self, fights: int, seed: Optional[int] = None) -> MatchupStats:
+        """模拟 fights 场，返回汇总统计"""
+        rng = random.Random(seed)
+        stats = MatchupStats()
+        for _ in range(fights):
+            stats.add(self.fight(rng))
+        return stats
+
+    def fight(self, rng: random.Random) -> FightOutcome:
+        """模拟一场（不生成战报）"""
+        attacker, defender = _fresh_player(self.attacker), _fresh_player(self.defender)
+        result = run_pvp_battle(attacker, defender, log_mode=LOG_NONE, rng=rng)
+        return FightOutcome(
+            attacker_won=attacker.first_alive_index() is not None and defender.first_alive_index() is None,
+            turns=result.total_turns,
+            attacker_damage=result.attacker_damage,
+            defender_damage=result.defender_damage,
+            attacker_hp_left=sum(b.hp_current for b in attacker.beasts),
+            defender_hp_left=sum(b.hp_current for b in defender.beasts),
+        )
+
+
+def simulate_matchup(
+    attacker: PvpPlayer,
+    defender: PvpPlayer,
+    fights: int = 10000,
+    seed: Optional[int] = None,
+) -> MatchupStats:
+    """便捷入口：模拟同一对阵 fights 场"""
+    return MatchupSimulator(attacker, defender).run(fights, seed=seed)
+
+
+def _fresh_beast(beast: PvpBeast) -> PvpBeast:
+    # 引擎只改气血、阵亡标记和状态效果（含效果对象本身），技能列表只读
+    fresh = copy.copy(beast)
+    fresh.status_effects = [copy.copy(e) for e in beast.status_effects]
+    return fresh
+
+
+def _fresh_player(player: PvpPlayer) -> PvpPlayer:
+    """每场使用的阵容副本"""
+    return PvpPlayer(
+        player_id=player.player_id,
+        level=player.level,
+        beasts=[_fresh_beast(b) for b in player.beasts],
+        name=player.name,
+    )
@@ -10,6 +10,10 @@
 - 战斗顺序：使用多级先手规则（速度 > 品质 > 星数总和 > 资质总和 > 属性总和，相同则随机）决定谁先出手。
 - 扣血公式：完全按照需求中给出的“攻防差 + 0.069~0.071 浮动 + 防御档位倍数 / 负数特别规则”实现。
 - 战报：以“每次攻击”为一回合记录，最多保留前 50 条攻击记录。
+- 战报模式（log_mode）：
+    - "full"：生成完整 AttackLog（含描述文本），默认；
+    - "compact"：只记录紧凑元组 CompactAttack，需要展示时再用 expand_compact_logs 还原为完整战报；
+    - "none"：只要胜负结果，不记录任何战报（闯塔/古战场等批量对战）。
 
 后续可以在此基础上继续接入技能、Buff/Debuff 等更复杂规则。
 """
@@ -17,11 +21,18 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import List, Literal, Optional
+from typing import TYPE_CHECKING, List, Literal, NamedTuple, Optional
 import random
 
+if TYPE_CHECKING:
+    from domain.services.skill_system import ResolvedSkillSet
+
 AttackType = Literal["physical", "magic"]
 
+LOG_FULL = "full"
+LOG_COMPACT = "compact"
+LOG_NONE = "none"
+
 
 @dataclass
 class StatusEffect:
@@ -88,6 +99,9 @@ class PvpBeast:
     immune_counter: bool = False      # 免疫反击/反震（偷袭技能）
     poison_resist: float = 0.0        # 毒抗（抗性增强技能）
 
+    # 预解析的技能集合：run_pvp_battle 开始时按 skills + attack_type 解析一次
+    skill_set: Optional["ResolvedSkillSet"] = field(default=None, repr=False, compare=False)
+
     def effective_speed(self) -> int:
         """考虑减速/加速等效果后的速度（目前只简单处理减速/加速）。"""
 
@@ -148,6 +162,26 @@ class AttackLog:
     description: str  # 用于前端展示的一整句描述
 
 
+class CompactAttack(NamedTuple):
+    """紧凑战报：单次攻击只记录还原描述所需的最少信息。
+
+    actor 为 0 表示攻方玩家出手，1 表示守方玩家出手；
+    *_index 为幻兽在各自 PvpPlayer.beasts 中的下标；技能用 skills.json 中的 skill_id 表示（0 = 普攻 / 未触发）。
+    """
+
+    turn: int
+    actor: int
+    attacker_index: int
+    defender_index: int
+    skill_id: int
+    damage: int
+    passive_skill_id: int = 0
+    reflect_damage: int = 0
+    attacker_hp_after: int = 0
+    defender_hp_after: int = 0
+    poison_resisted: bool = False
+
+
 @dataclass
 class PvpBattleResult:
     """整场玩家 vs 玩家 战斗结果。"""
@@ -160,6 +194,15 @@ class PvpBattleResult:
 
     total_turns: int
     logs: List[AttackLog] = field(default_factory=list)  # 最多 50 条
+    compact_logs: List[CompactAttack] = field(default_factory=list)  # log_mode="compact" 时填充
+    attacker_damage: int = 0  # 攻方造成的总伤害（含反震/反击）
+    defender_damage: int = 0
+
+    def expand_logs(self, attacker_player: PvpPlayer, defender_player: PvpPlayer) -> List[AttackLog]:
+        """按需将紧凑战报还原为完整 AttackLog（结果缓存到 self.logs）"""
+        if not self.logs and self.compact_logs:
+            self.logs = expand_compact_logs(self.compact_logs, attacker_player, defender_player)
+        return self.logs
 
 
 # ============================================================
@@ -214,7 +257,12 @@ def _is_low_rank_level(player_level: int) -> bool:
     return 20 <= player_level <= 39
 
 
-def calc_damage(attacker: PvpBeast, defender: PvpBeast, attacker_player_level: int) -> int:
+def calc_damage(
+    attacker: PvpBeast,
+    defender: PvpBeast,
+    attacker_player_level: int,
+    rng: Optional[random.Random] = None,
+) -> int:
     """按照需求文档计算一次攻击的扣血量。
 
     - 正常情况（攻减防 >= 0）:
@@ -225,12 +273,13 @@ def calc_damage(attacker: PvpBeast, defender: PvpBeast, attacker_player_level: i
 
     最终伤害向下取整，至少为 1。
     """
+    rng = rng or random
 
     diff, defense_value, _ = _pick_attack_and_defense(attacker, defender)
 
     # 攻 - 防 >= 0 的情况
     if diff >= 0:
-        rand_factor = random.uniform(0.069, 0.071)  # 浮点数随机
+        rand_factor = rng.uniform(0.069, 0.071)  # 浮点数随机
         mul = _defense_multiplier(defense_value)
         raw = diff * rand_factor * mul
         dmg = int(raw)
@@ -241,15 +290,15 @@ def calc_damage(attacker: PvpBeast, defender: PvpBeast, attacker_player_level: i
         base: float
 
         if d <= 1000:
-            base = random.randint(250, 300)
+            base = rng.randint(250, 300)
         elif d <= 2000:
-            base = random.randint(250, 300) * 0.7
+            base = rng.randint(250, 300) * 0.7
         elif d <= 3000:
-            base = random.randint(250, 300) * 0.5
+            base = rng.randint(250, 300) * 0.5
         elif d <= 4000:
-            base = random.randint(250, 300) * 0.3
+            base = rng.randint(250, 300) * 0.3
         else:
-            base = random.randint(20, 40)
+            base = rng.randint(20, 40)
 
         # 低阶玩家（黄阶/玄阶）再 *0.3
         if _is_low_rank_level(attacker_player_level):
@@ -265,7 +314,11 @@ def calc_damage(attacker: PvpBeast, defender: PvpBeast, attacker_player_level: i
 # ============================================================
 
 
-def _first_striker_is_attacker(attacker_beast: PvpBeast, defender_beast: PvpBeast) -> bool:
+def _first_striker_is_attacker(
+    attacker_beast: PvpBeast,
+    defender_beast: PvpBeast,
+    rng: Optional[random.Random] = None,
+) -> bool:
     """根据先手规则决定当前 1v1 中哪一方先手。
 
     返回 True 表示攻方先手，False 表示守方先手。
@@ -353,13 +406,15 @@ def _first_striker_is_attacker(attacker_beast: PvpBeast, defender_beast: PvpBeas
         return a_stat_sum > d_stat_sum
 
     # 6. 完全相同则随机
-    return bool(random.getrandbits(1))
+    return bool((rng or random).getrandbits(1))
 
 
 def run_pvp_battle(
     attacker_player: PvpPlayer,
     defender_player: PvpPlayer,
     max_log_turns: int = 50,
+    log_mode: str = LOG_FULL,
+    rng: Optional[random.Random] = None,
 ) -> PvpBattleResult:
     """执行一场完整的玩家 vs 玩家 幻兽战斗，并接入技能系统。
 
@@ -370,18 +425,34 @@ def run_pvp_battle(
     4. 判定被动技能（闪避/反震/反击）是否触发；
     5. 生成带技能名的战报文本；
     6. 当一方所有幻兽阵亡时，战斗结束；
-    7. 战报最多保留前 `max_log_turns` 条。
+    7. 战报最多保留前 `max_log_turns` 条，记录方式见 `log_mode`（full / compact / none）。
+
+    rng 为本场使用的随机数生成器；按种子复现时传入独立的 random.Random，
+    不要重置模块级 random（会影响同进程内的其它请求）。未传入时使用模块级 random。
     """
+    if log_mode not in (LOG_FULL, LOG_COMPACT, LOG_NONE):
+        raise ValueError(f"未知战报模式: {log_mode}")
+    rng = rng or random
 
     # 为避免循环依赖，这里在函数内部导入技能系统
     from domain.services.skill_system import (
-        try_trigger_active_skill,
-        try_trigger_passive_skill,
-        check_poison_resist,
+        get_skill_id,
+        resolve_skill_set,
+        resists_poison,
+        trigger_active_skill,
+        trigger_passive_skill,
     )
 
     logs: List[AttackLog] = []
+    compact_logs: List[CompactAttack] = []
+    if log_mode == LOG_NONE:
+        max_log_turns = 0
     turn = 0
+    damage_dealt = [0, 0]  # [攻方, 守方]
+
+    # 技能组合每场只解析一次，出手时直接使用预编译的技能表
+    for beast in attacker_player.beasts + defender_player.beasts:
+        beast.skill_set = resolve_skill_set(beast.skills, beast.attack_type)
 
     # 当前出战幻兽索引
     a_idx = attacker_player.first_alive_index()
@@ -394,7 +465,7 @@ def run_pvp_battle(
         # 当前这两只打到其中一只阵亡为止
         while a_beast.alive and d_beast.alive:
             # 使用先手规则决定本轮攻击顺序
-            attacker_first = _first_striker_is_attacker(a_beast, d_beast)
+            attacker_first = _first_striker_is_attacker(a_beast, d_beast, rng)
 
             if attacker_first:
                 order = [
@@ -414,16 +485,17 @@ def run_pvp_battle(
 
                 # 回合数 +1
                 turn += 1
+                actor = 0 if atk_player is attacker_player else 1
 
                 # 1. 结算攻击方身上的持续效果（占位，当前仅做回合数递减）
                 _tick_status_effects_before_action(atk_beast)
 
                 # 2. 主动技能判定（必杀/连击/破甲/毒攻等）
-                skill_result = try_trigger_active_skill(
-                    attacker_skills=atk_beast.skills,
-                    attack_type=atk_beast.attack_type,
+                skill_result = trigger_active_skill(
+                    atk_beast.skill_set,
                     defender_critical_resist=def_beast.critical_resist,
                     attacker_poison_enhance=atk_beast.poison_enhance,
+                    rng=rng,
                 )
 
                 is_normal_attack = not skill_result.triggered
@@ -433,14 +505,15 @@ def run_pvp_battle(
                 )
 
                 # 3. 被动技能判定（闪避/反震/反击）
-                passive_result = try_trigger_passive_skill(
-                    defender_skills=def_beast.skills,
+                passive_result = trigger_passive_skill(
+                    def_beast.skill_set,
                     is_normal_attack=is_normal_attack,
                     attacker_immune_counter=atk_beast.immune_counter,
+                    rng=rng,
                 )
 
                 # 4. 基础伤害
-                base_damage = calc_damage(atk_beast, def_beast, atk_player.level)
+                base_damage = calc_damage(atk_beast, def_beast, atk_player.level, rng)
                 final_damage = int(base_damage * damage_multiplier)
 
                 # 5. 闪避处理
@@ -460,6 +533,7 @@ def run_pvp_battle(
                     )
                     if def_beast.hp_current <= 0:
                         def_beast.is_dead = True
+                damage_dealt[actor] += final_damage
 
                 # 7. 吸血（高级/普通吸血）
                 if skill_result.lifesteal_ratio > 0 and actual_damage > 0:
@@ -483,50 +557,70 @@ def run_pvp_battle(
                     )
                     if atk_beast.hp_current <= 0:
                         atk_beast.is_dead = True
+                    damage_dealt[1 - actor] += reflect_damage
 
                 # 9. 技能附加效果（破甲/致盲/麻痹/迷惑/虚弱/毒攻等）
                 applied_effects = []
+                poison_resisted = False
                 for eff in skill_result.effects:
                     # 毒攻受抗性影响
                     if eff.effect_type == "poison":
-                        if check_poison_resist(def_beast.skills):
+                        if resists_poison(def_beast.skill_set, rng):
+                            poison_resisted = True
                             continue
                     _apply_or_refresh_effect(def_beast, eff)
                     applied_effects.append(eff)
 
-                # 10. 生成战报文本（只保留前 max_log_turns 条）
+                # 10. 记录战报（只保留前 max_log_turns 条）
                 if turn <= max_log_turns:
-                    description = _build_attack_description(
-                        turn=turn,
-                        atk_player=atk_player,
-                        atk_beast=atk_beast,
-                        def_player=def_player,
-                        def_beast=def_beast,
-                        skill_name=skill_name,
-                        damage=actual_damage,
-                        dodged=dodged,
-                        passive_result=passive_result,
-                        reflect_damage=reflect_damage,
-                        lifesteal_ratio=skill_result.lifesteal_ratio,
-                        applied_effects=applied_effects,
-                    )
-
-                    logs.append(
-                        AttackLog(
+                    if log_mode == LOG_COMPACT:
+                        compact_logs.append(
+                            CompactAttack(
+                                turn,
+                                actor,
+                                a_idx if actor == 0 else d_idx,
+                                d_idx if actor == 0 else a_idx,
+                                get_skill_id(skill_name) if skill_result.triggered else 0,
+                                actual_damage,
+                                get_skill_id(passive_result.skill_name) if passive_result.triggered else 0,
+                                reflect_damage,
+                                atk_beast.hp_current,
+                                def_beast.hp_current,
+                                poison_resisted,
+                            )
+                        )
+                    else:
+                        description = _build_attack_description(
                             turn=turn,
-                            attacker_player_id=atk_player.player_id,
-                            defender_player_id=def_player.player_id,
-                            attacker_beast_id=atk_beast.id,
-                            defender_beast_id=def_beast.id,
-                            attacker_name=atk_beast.name,
-                            defender_name=def_beast.name,
+                            atk_player=atk_player,
+                            atk_beast=atk_beast,
+                            def_player=def_player,
+                            def_beast=def_beast,
                             skill_name=skill_name,
                             damage=actual_damage,
-                            attacker_hp_after=atk_beast.hp_current,
-                            defender_hp_after=def_beast.hp_current,
-                            description=description,
+                            dodged=dodged,
+                            passive_result=passive_result,
+                            reflect_damage=reflect_damage,
+                            lifesteal_ratio=skill_result.lifesteal_ratio,
+                            applied_effects=applied_effects,
+                        )
+
+                        logs.append(
+                            AttackLog(
+                                turn=turn,
+                                attacker_player_id=atk_player.player_id,
+                                defender_player_id=def_player.player_id,
+                                attacker_beast_id=atk_beast.id,
+                                defender_beast_id=def_beast.id,
+                                attacker_name=atk_beast.name,
+                                defender_name=def_beast.name,
+                                skill_name=skill_name,
+                                damage=actual_damage,
+                                attacker_hp_after=atk_beast.hp_current,
+                                defender_hp_after=def_beast.hp_current,
+                                description=description,
+                            )
                         )
-                    )
 
                 # 若被攻击方阵亡，本小循环结束，换下一只幻兽
                 if not def_beast.alive:
@@ -562,8 +656,95 @@ def run_pvp_battle(
         loser_player_id=loser_id,
         total_turns=turn,
         logs=logs,
+        compact_logs=compact_logs,
+        attacker_damage=damage_dealt[0],
+        defender_damage=damage_dealt[1],
+    )
+
+
+def expand_compact_logs(
+    compact_logs: List[CompactAttack],
+    attacker_player: PvpPlayer,
+    defender_player: PvpPlayer,
+) -> List[AttackLog]:
+    """将紧凑战报还原为完整 AttackLog（描述文本与 log_mode="full" 时逐字一致）。
+
+    只用到玩家/幻兽的 ID 与名称，传入战斗结束后的 PvpPlayer 即可。
+    """
+    from domain.services.skill_system import (
+        PassiveSkillResult,
+        SkillEffect,
+        get_skill_info,
+        get_skill_name,
     )
 
+    players = (attacker_player, defender_player)
+    logs: List[AttackLog] = []
+    for c in compact_logs:
+        atk_player = players[c.actor]
+        def_player = players[1 - c.actor]
+        atk_beast = atk_player.beasts[c.attacker_index]
+        def_beast = def_player.beasts[c.defender_index]
+
+        skill_name = get_skill_name(c.skill_id)
+        lifesteal_ratio = 0.0
+        applied_effects = []
+        if c.skill_id:
+            for eff in (get_skill_info(skill_name) or {}).get("effects", []):
+                if eff["type"] == "lifesteal":
+                    lifesteal_ratio = eff["value"]
+                elif eff["type"] == "poison" and c.poison_resisted:
+                    continue
+                else:
+                    applied_effects.append(SkillEffect(
+                        effect_type=eff["type"],
+                        value=eff["value"],
+                        duration=eff.get("duration", 0),
+                        source_skill=skill_name,
+                    ))
+
+        passive_result = PassiveSkillResult()
+        if c.passive_skill_id:
+            passive_name = get_skill_name(c.passive_skill_id)
+            passive_result = PassiveSkillResult(
+                triggered=True,
+                skill_name=passive_name,
+                effect_type=(get_skill_info(passive_name) or {}).get("effect_type", ""),
+            )
+        dodged = passive_result.effect_type == "dodge"
+
+        description = _build_attack_description(
+            turn=c.turn,
+            atk_player=atk_player,
+            atk_beast=atk_beast,
+            def_player=def_player,
+            def_beast=def_beast,
+            skill_name=skill_name,
+            damage=c.damage,
+            dodged=dodged,
+            passive_result=passive_result,
+            reflect_damage=c.reflect_damage,
+            lifesteal_ratio=lifesteal_ratio,
+            applied_effects=applied_effects,
+        )
+        logs.append(
+            AttackLog(
+                turn=c.turn,
+                attacker_player_id=atk_player.player_id,
+                defender_player_id=def_player.player_id,
+                attacker_beast_id=atk_beast.id,
+                defender_beast_id=def_beast.id,
+                attacker_name=atk_beast.name,
+                defender_name=def_beast.name,
+                skill_name=skill_name,
+                damage=c.damage,
+                attacker_hp_after=c.attacker_hp_after,
+                defender_hp_after=c.defender_hp_after,
+                description=description,
+            )
+        )
+    return logs
+
 
 def _build_attack_description(
     *,
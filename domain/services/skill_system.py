@@ -11,33 +11,19 @@
 
 from __future__ import annotations
 
-import json
 import random
 from dataclasses import dataclass, field
-from pathlib import Path
 from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
 
+from domain.services.config_source import get_config
+
 if TYPE_CHECKING:
     from domain.services.pvp_battle_engine import PvpBeast
 
 
-# 加载技能配置
-_SKILL_CONFIG_PATH = Path(__file__).parent.parent.parent / "configs" / "skills.json"
-_SKILL_CONFIG: Dict = {}
-
-
-def _load_skill_config() -> Dict:
-    """加载技能配置文件"""
-    global _SKILL_CONFIG
-    if not _SKILL_CONFIG:
-        with open(_SKILL_CONFIG_PATH, "r", encoding="utf-8") as f:
-            _SKILL_CONFIG = json.load(f)
-    return _SKILL_CONFIG
-
-
 def get_skill_config() -> Dict:
-    """获取技能配置"""
-    return _load_skill_config()
+    """获取技能配置（configs/skills.json，经 config_source 读取；Web 应用中文件变化后自动重新加载）"""
+    return get_config("skills.json")
 
 
 @dataclass
@@ -69,41 +55,220 @@ class PassiveSkillResult:
     effect_value: float = 0.0  # 反震/反击比例
 
 
+# ============================================================
+# 技能表预编译
+#
+# skills.json 只在首次使用时编译一次：每个技能得到一个 CompiledSkill（含 skill_id），
+# 每只幻兽的技能组合（技能列表 + 攻击类型）再解析为 ResolvedSkillSet 并缓存，
+# 战斗中每次出手只需遍历已过滤好的主动/被动技能元组，不再扫描 JSON 字典。
+# ============================================================
+
+
+@dataclass(frozen=True)
+class CompiledSkill:
+    """编译后的单个技能（不可变，拷贝时共享同一实例）"""
+    skill_id: int
+    name: str
+    category: str             # active / passive / buff / debuff
+    tier: str = ""            # advanced / normal（负面技能为空）
+    info: Dict = field(default_factory=dict, compare=False)  # 原始配置（附加 category/tier）
+
+    # 主动技能
+    trigger_rate: float = 0.0
+    attack_type: str = "all"
+    is_critical: bool = False
+    is_poison_attack: bool = False          # 技能名含“毒攻”，受毒攻强化影响
+    trigger_result: Optional[SkillTriggerResult] = field(default=None, compare=False)
+
+    # 被动技能
+    effect_type: str = ""                   # dodge / reflect / counter
+    passive_result: Optional[PassiveSkillResult] = field(default=None, compare=False)
+
+    # 增益 / 负面技能
+    stat: str = ""
+    modifier: float = 0.0
+    special: str = ""
+    special_value: object = None
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+@dataclass(frozen=True)
+class ResolvedSkillSet:
+    """一只幻兽（技能列表 + 攻击类型）解析后的技能集合，战斗中直接使用"""
+    actives: Tuple[CompiledSkill, ...] = ()        # 已按攻击类型过滤，保持技能列表顺序
+    passives: Tuple[CompiledSkill, ...] = ()
+    poison_resist_rates: Tuple[float, ...] = ()
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+class SkillTable:
+    """skills.json 编译结果：技能名/ID 双向索引 + 技能组合解析缓存"""
+
+    def __init__(self, config: Dict):
+        self.config = config
+        self.by_name: Dict[str, CompiledSkill] = {}
+        self.by_id: Dict[int, CompiledSkill] = {}
+        self._resolved: Dict[Tuple[Tuple[str, ...], str], ResolvedSkillSet] = {}
+
+        skill_ids = config.get("skill_ids", {})
+        next_id = [max(skill_ids.values(), default=0)]
+
+        def intern(name: str) -> int:
+            if name in skill_ids:
+                return skill_ids[name]
+            next_id[0] += 1
+            return next_id[0]
+
+        # 与旧版 get_skill_info 的查找顺序一致：主动 > 被动 > 增益 > 负面，高级 > 普通
+        for tier in ("advanced", "normal"):
+            for name, raw in config.get("active_skills", {}).get(tier, {}).items():
+                self._add(self._compile_active(intern(name), name, tier, raw))
+        for tier in ("advanced", "normal"):
+            for name, raw in config.get("passive_skills", {}).get(tier, {}).items():
+                self._add(self._compile_passive(intern(name), name, tier, raw))
+        for tier in ("advanced", "normal"):
+            for name, raw in config.get("buff_skills", {}).get(tier, {}).items():
+                self._add(CompiledSkill(
+                    skill_id=intern(name), name=name, category="buff", tier=tier,
+                    info=dict(raw, category="buff", tier=tier),
+                    stat=raw.get("stat", ""), modifier=raw.get("modifier", 0.0),
+                    special=raw.get("special", ""), special_value=raw.get("value"),
+                ))
+        for name, raw in config.get("debuff_skills", {}).items():
+            self._add(CompiledSkill(
+                skill_id=intern(name), name=name, category="debuff",
+                info=dict(raw, category="debuff"),
+                stat=raw.get("stat", ""), modifier=raw.get("modifier", 0.0),
+            ))
+
+    def _add(self, skill: CompiledSkill) -> None:
+        # 同名技能出现在多个分类时保留先出现的（与旧版查找顺序一致）
+        if skill.name not in self.by_name:
+            self.by_name[skill.name] = skill
+            self.by_id[skill.skill_id] = skill
+
+    @staticmethod
+    def _compile_active(skill_id: int, name: str, tier: str, raw: Dict) -> CompiledSkill:
+        effects = []
+        lifesteal_ratio = 0.0
+        for eff in raw.get("effects", []):
+            if eff["type"] == "lifesteal":
+                lifesteal_ratio = eff["value"]
+            else:
+                effects.append(SkillEffect(
+                    effect_type=eff["type"],
+                    value=eff["value"],
+                    duration=eff.get("duration", 0),
+                    source_skill=name,
+                ))
+        is_critical = raw.get("is_critical", False)
+        return CompiledSkill(
+            skill_id=skill_id, name=name, category="active", tier=tier,
+            info=dict(raw, category="active", tier=tier),
+            trigger_rate=raw["trigger_rate"],
+            attack_type=raw.get("attack_type", "all"),
+            is_critical=is_critical,
+            is_poison_attack="毒攻" in name,
+            # 触发结果只读共享，避免每次出手分配对象
+            trigger_result=SkillTriggerResult(
+                triggered=True,
+                skill_name=name,
+                damage_multiplier=raw["damage_multiplier"],
+                effects=effects,
+                is_critical=is_critical,
+                lifesteal_ratio=lifesteal_ratio,
+            ),
+        )
+
+    @staticmethod
+    def _compile_passive(skill_id: int, name: str, tier: str, raw: Dict) -> CompiledSkill:
+        effect_type = raw["effect_type"]
+        effect_value = 0.0
+        if effect_type == "reflect":
+            effect_value = raw.get("reflect_ratio", 0.44)
+        elif effect_type == "counter":
+            effect_value = raw.get("counter_ratio", 0.75)
+        return CompiledSkill(
+            skill_id=skill_id, name=name, category="passive", tier=tier,
+            info=dict(raw, category="passive", tier=tier),
+            trigger_rate=raw["trigger_rate"],
+            effect_type=effect_type,
+            passive_result=PassiveSkillResult(
+                triggered=True,
+                skill_name=name,
+                effect_type=effect_type,
+                effect_value=effect_value,
+            ),
+        )
+
+    def resolve(self, skills, attack_type: str) -> ResolvedSkillSet:
+        """解析技能组合（结果缓存；重复技能保留，保证随机洗牌与旧实现一致）"""
+        key = (tuple(skills or ()), attack_type)
+        resolved = self._resolved.get(key)
+        if resolved is None:
+            actives, passives, poison_resist_rates = [], [], []
+            for name in key[0]:
+                skill = self.by_name.get(name)
+                if skill is None:
+                    continue
+                if skill.category == "active":
+                    if skill.attack_type == "all" or skill.attack_type == attack_type:
+                        actives.append(skill)
+                elif skill.category == "passive":
+                    passives.append(skill)
+                elif skill.category == "buff" and skill.special == "poison_resist":
+                    poison_resist_rates.append(skill.special_value)
+            resolved = ResolvedSkillSet(tuple(actives), tuple(passives), tuple(poison_resist_rates))
+            self._resolved[key] = resolved
+        return resolved
+
+
+_SKILL_TABLE: Optional[SkillTable] = None
+
+
+def get_skill_table() -> SkillTable:
+    """获取编译后的技能表（技能配置对象变化时自动重新编译）"""
+    global _SKILL_TABLE
+    config = get_skill_config()
+    table = _SKILL_TABLE
+    if table is None or table.config is not config:
+        table = _SKILL_TABLE = SkillTable(config)
+    return table
+
+
+def resolve_skill_set(skills, attack_type: str) -> ResolvedSkillSet:
+    """解析幻兽技能组合（每场战斗开始时调用一次即可）"""
+    return get_skill_table().resolve(skills, attack_type)
+
+
+def get_skill_id(skill_name: str) -> int:
+    """技能名 -> 技能ID（普攻或未知技能返回 0）"""
+    skill = get_skill_table().by_name.get(skill_name)
+    return skill.skill_id if skill else 0
+
+
+def get_skill_name(skill_id: int) -> str:
+    """技能ID -> 技能名（0 表示普攻）"""
+    if not skill_id:
+        return "普攻"
+    skill = get_skill_table().by_id.get(skill_id)
+    return skill.name if skill else ""
+
+
 def get_skill_info(skill_name: str) -> Optional[Dict]:
     """获取技能详细信息"""
-    config = get_skill_config()
-    
-    # 搜索主动技能
-    for tier in ["advanced", "normal"]:
-        if skill_name in config["active_skills"].get(tier, {}):
-            info = config["active_skills"][tier][skill_name].copy()
-            info["category"] = "active"
-            info["tier"] = tier
-            return info
-    
-    # 搜索被动技能
-    for tier in ["advanced", "normal"]:
-        if skill_name in config["passive_skills"].get(tier, {}):
-            info = config["passive_skills"][tier][skill_name].copy()
-            info["category"] = "passive"
-            info["tier"] = tier
-            return info
-    
-    # 搜索增益技能
-    for tier in ["advanced", "normal"]:
-        if skill_name in config["buff_skills"].get(tier, {}):
-            info = config["buff_skills"][tier][skill_name].copy()
-            info["category"] = "buff"
-            info["tier"] = tier
-            return info
-    
-    # 搜索负面技能
-    if skill_name in config["debuff_skills"]:
-        info = config["debuff_skills"][skill_name].copy()
-        info["category"] = "debuff"
-        return info
-    
-    return None
+    skill = get_skill_table().by_name.get(skill_name)
+    return dict(skill.info) if skill else None
 
 
 def classify_skills(skills: List[str]) -> Dict[str, List[str]]:
@@ -114,14 +279,11 @@ def classify_skills(skills: List[str]) -> Dict[str, List[str]]:
         "buff": [],
         "debuff": [],
     }
-    
+    by_name = get_skill_table().by_name
     for skill_name in skills:
-        info = get_skill_info(skill_name)
-        if info:
-            category = info.get("category", "")
-            if category in result:
-                result[category].append(skill_name)
-    
+        skill = by_name.get(skill_name)
+        if skill:
+            result[skill.category].append(skill_name)
     return result
 
 
@@ -146,7 +308,7 @@ def apply_buff_debuff_skills(
     Returns:
         (hp, physical_attack, magic_attack, physical_defense, magic_defense, speed, special_effects)
     """
-    config = get_skill_config()
+    by_name = get_skill_table().by_name
     
     # 属性修正系数（累加）
     modifiers = {
@@ -167,34 +329,31 @@ def apply_buff_debuff_skills(
     }
     
     for skill_name in skills:
-        # 检查增益技能
-        for tier in ["advanced", "normal"]:
-            if skill_name in config["buff_skills"].get(tier, {}):
-                buff = config["buff_skills"][tier][skill_name]
-                if "stat" in buff:
-                    stat = buff["stat"]
-                    if stat in modifiers:
-                        modifiers[stat] += buff["modifier"]
-                elif "special" in buff:
-                    special = buff["special"]
-                    if special in special_effects:
-                        if isinstance(special_effects[special], bool):
-                            special_effects[special] = buff["value"]
-                        else:
-                            special_effects[special] += buff["value"]
-        
-        # 检查负面技能
-        if skill_name in config["debuff_skills"]:
-            debuff = config["debuff_skills"][skill_name]
-            stat = debuff["stat"]
-            if stat == "attack":
+        skill = by_name.get(skill_name)
+        if skill is None:
+            continue
+
+        # 增益技能
+        if skill.category == "buff":
+            if skill.stat:
+                if skill.stat in modifiers:
+                    modifiers[skill.stat] += skill.modifier
+            elif skill.special in special_effects:
+                if isinstance(special_effects[skill.special], bool):
+                    special_effects[skill.special] = skill.special_value
+                else:
+                    special_effects[skill.special] += skill.special_value
+
+        # 负面技能
+        elif skill.category == "debuff":
+            if skill.stat == "attack":
                 # 根据攻击类型决定减哪个
                 if attack_type == "magic":
-                    modifiers["magic_attack"] += debuff["modifier"]
+                    modifiers["magic_attack"] += skill.modifier
                 else:
-                    modifiers["physical_attack"] += debuff["modifier"]
-            elif stat in modifiers:
-                modifiers[stat] += debuff["modifier"]
+                    modifiers["physical_attack"] += skill.modifier
+            elif skill.stat in modifiers:
+                modifiers[skill.stat] += skill.modifier
     
     # 计算最终属性
     final_hp = int(raw_hp * (1 + modifiers["hp"]))
@@ -215,6 +374,89 @@ def apply_buff_debuff_skills(
     )
 
 
+_NO_ACTIVE = SkillTriggerResult()
+_NO_PASSIVE = PassiveSkillResult()
+
+
+def trigger_active_skill(
+    skill_set: ResolvedSkillSet,
+    defender_critical_resist: float = 0.0,
+    attacker_poison_enhance: float = 0.0,
+    rng: Optional[random.Random] = None,
+) -> SkillTriggerResult:
+    """使用已解析的技能集合判定主动技能（战斗引擎每次出手调用）
+
+    返回的结果对象为只读共享实例，调用方不要修改。rng 未传入时使用模块级 random。
+    """
+    rng = rng or random
+    actives = skill_set.actives
+    if not actives:
+        return _NO_ACTIVE
+
+    # 随机打乱顺序，依次判定（只有 1 个技能时 shuffle 不消耗随机数，可直接跳过）
+    if len(actives) > 1:
+        actives = list(actives)
+        rng.shuffle(actives)
+
+    for skill in actives:
+        trigger_rate = skill.trigger_rate
+
+        # 毒攻强化
+        if skill.is_poison_attack and attacker_poison_enhance > 0:
+            trigger_rate += attacker_poison_enhance
+
+        # 必杀类技能受幸运影响
+        if skill.is_critical and defender_critical_resist > 0:
+            trigger_rate *= (1 - defender_critical_resist)
+
+        if rng.random() < trigger_rate:
+            return skill.trigger_result
+
+    return _NO_ACTIVE
+
+
+def trigger_passive_skill(
+    skill_set: ResolvedSkillSet,
+    is_normal_attack: bool,
+    attacker_immune_counter: bool = False,
+    rng: Optional[random.Random] = None,
+) -> PassiveSkillResult:
+    """使用已解析的技能集合判定被动技能（返回只读共享实例）"""
+    rng = rng or random
+    passives = skill_set.passives
+    if not passives:
+        return _NO_PASSIVE
+
+    if len(passives) > 1:
+        passives = list(passives)
+        rng.shuffle(passives)
+
+    for skill in passives:
+        effect_type = skill.effect_type
+
+        # 闪避只对普攻有效
+        if effect_type == "dodge" and not is_normal_attack:
+            continue
+
+        # 反击/反震受偷袭技能影响
+        if (effect_type == "reflect" or effect_type == "counter") and attacker_immune_counter:
+            continue
+
+        if rng.random() < skill.trigger_rate:
+            return skill.passive_result
+
+    return _NO_PASSIVE
+
+
+def resists_poison(skill_set: ResolvedSkillSet, rng: Optional[random.Random] = None) -> bool:
+    """使用已解析的技能集合判定是否免疫毒攻"""
+    rng = rng or random
+    for resist_rate in skill_set.poison_resist_rates:
+        if rng.random() < resist_rate:
+            return True
+    return False
+
+
 def try_trigger_active_skill(
     attacker_skills: List[str],
     attack_type: str,
@@ -233,64 +475,11 @@ def try_trigger_active_skill(
     Returns:
         SkillTriggerResult
     """
-    config = get_skill_config()
-    
-    # 收集所有主动技能
-    active_skills = []
-    for skill_name in attacker_skills:
-        for tier in ["advanced", "normal"]:
-            if skill_name in config["active_skills"].get(tier, {}):
-                skill_info = config["active_skills"][tier][skill_name]
-                # 检查攻击类型限制
-                skill_attack_type = skill_info.get("attack_type", "all")
-                if skill_attack_type == "all" or skill_attack_type == attack_type:
-                    active_skills.append((skill_name, skill_info))
-    
-    if not active_skills:
-        return SkillTriggerResult()
-    
-    # 随机打乱顺序，依次判定
-    random.shuffle(active_skills)
-    
-    for skill_name, skill_info in active_skills:
-        trigger_rate = skill_info["trigger_rate"]
-        
-        # 毒攻强化
-        if "毒攻" in skill_name and attacker_poison_enhance > 0:
-            trigger_rate += attacker_poison_enhance
-        
-        # 必杀类技能受幸运影响
-        is_critical = skill_info.get("is_critical", False)
-        if is_critical and defender_critical_resist > 0:
-            trigger_rate *= (1 - defender_critical_resist)
-        
-        # 判定是否触发
-        if random.random() < trigger_rate:
-            # 解析技能效果
-            effects = []
-            lifesteal_ratio = 0.0
-            
-            for eff in skill_info.get("effects", []):
-                if eff["type"] == "lifesteal":
-                    lifesteal_ratio = eff["value"]
-                else:
-                    effects.append(SkillEffect(
-                        effect_type=eff["type"],
-                        value=eff["value"],
-                        duration=eff.get("duration", 0),
-                        source_skill=skill_name,
-                    ))
-            
-            return SkillTriggerResult(
-                triggered=True,
-                skill_name=skill_name,
-                damage_multiplier=skill_info["damage_multiplier"],
-                effects=effects,
-                is_critical=is_critical,
-                lifesteal_ratio=lifesteal_ratio,
-            )
-    
-    return SkillTriggerResult()
+    return trigger_active_skill(
+        resolve_skill_set(attacker_skills, attack_type),
+        defender_critical_resist,
+        attacker_poison_enhance,
+    )
 
 
 def try_trigger_passive_skill(
@@ -309,51 +498,12 @@ def try_trigger_passive_skill(
     Returns:
         PassiveSkillResult
     """
-    config = get_skill_config()
-    
-    # 收集所有被动技能
-    passive_skills = []
-    for skill_name in defender_skills:
-        for tier in ["advanced", "normal"]:
-            if skill_name in config["passive_skills"].get(tier, {}):
-                skill_info = config["passive_skills"][tier][skill_name]
-                passive_skills.append((skill_name, skill_info))
-    
-    if not passive_skills:
-        return PassiveSkillResult()
-    
-    # 随机打乱顺序，依次判定（每回合只能触发一个）
-    random.shuffle(passive_skills)
-    
-    for skill_name, skill_info in passive_skills:
-        effect_type = skill_info["effect_type"]
-        
-        # 闪避只对普攻有效
-        if effect_type == "dodge" and not is_normal_attack:
-            continue
-        
-        # 反击/反震受偷袭技能影响
-        if effect_type in ("reflect", "counter") and attacker_immune_counter:
-            continue
-        
-        trigger_rate = skill_info["trigger_rate"]
-        
-        # 判定是否触发
-        if random.random() < trigger_rate:
-            effect_value = 0.0
-            if effect_type == "reflect":
-                effect_value = skill_info.get("reflect_ratio", 0.44)
-            elif effect_type == "counter":
-                effect_value = skill_info.get("counter_ratio", 0.75)
-            
-            return PassiveSkillResult(
-                triggered=True,
-                skill_name=skill_name,
-                effect_type=effect_type,
-                effect_value=effect_value,
-            )
-    
-    return PassiveSkillResult()
+    # 被动技能与攻击类型无关
+    return trigger_passive_skill(
+        resolve_skill_set(defender_skills, "all"),
+        is_normal_attack,
+        attacker_immune_counter,
+    )
 
 
 def check_poison_resist(defender_skills: List[str]) -> bool:
@@ -363,15 +513,4 @@ def check_poison_resist(defender_skills: List[str]) -> bool:
     Returns:
         True 表示免疫，不会中毒
     """
-    config = get_skill_config()
-    
-    for skill_name in defender_skills:
-        for tier in ["advanced", "normal"]:
-            if skill_name in config["buff_skills"].get(tier, {}):
-                buff = config["buff_skills"][tier][skill_name]
-                if buff.get("special") == "poison_resist":
-                    resist_rate = buff["value"]
-                    if random.random() < resist_rate:
-                        return True
-    
-    return False
+    return resists_poison(resolve_skill_set(defender_skills, "all"))
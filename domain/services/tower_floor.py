@@ -0,0 +1,120 @@
+"""闯塔每层的预编译数据：守塔幻兽属性块、PvpBeast 模板、扁平化奖励
+
+这些对象在配置加载时一次性生成，战斗中只读；需要参与战斗时用 fresh_beasts 复制一份。
+"""
+
+from dataclasses import dataclass, replace
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+from domain.entities.tower import TowerGuardian
+from domain.services.pvp_battle_engine import PvpBeast
+from domain.services.skill_system import apply_buff_debuff_skills
+
+
+class FloorReward(NamedTuple):
+    """某层通关奖励"""
+    gold: int
+    exp: int
+    items: Tuple
+
+
+class MilestoneReward(NamedTuple):
+    """里程碑奖励"""
+    gold: int
+    items: Tuple
+
+
+EMPTY_FLOOR_REWARD = FloorReward(0, 0, ())
+
+
+@dataclass(frozen=True)
+class GuardianFloor:
+    """某层守塔幻兽的预转换结果"""
+    level: int
+    stats: Tuple[TowerGuardian, ...]    # 守塔幻兽属性块
+    guardians: Tuple[Dict, ...]          # 前端展示用的守塔幻兽信息
+    beasts: Tuple[PvpBeast, ...]         # PvpBeast 模板，战斗前复制一份再使用
+
+
+def guardians_to_pvp_beasts(guardians: Iterable[TowerGuardian]) -> List[PvpBeast]:
+    """将守塔幻兽转换为 PvpBeast。当前暂不配置技能。"""
+    pvp_beasts: List[PvpBeast] = []
+    for g in guardians:
+        attack_type = "magic" if g.is_magic_type() else "physical"
+        # 守塔幻兽暂不使用技能，后续可在配置中增加 skills 字段再接入。
+        skills: List[str] = []
+
+        # 这里也走一遍 apply_buff_debuff_skills，便于未来给守塔幻兽加被动技能。
+        (
+            final_hp,
+            final_physical_attack,
+            final_magic_attack,
+            final_physical_defense,
+            final_magic_defense,
+            final_speed,
+            _special_effects,
+        ) = apply_buff_debuff_skills(
+            skills=skills,
+            attack_type=attack_type,
+            raw_hp=g.hp,
+            raw_physical_attack=g.physical_attack,
+            raw_magic_attack=g.magic_attack,
+            raw_physical_defense=g.physical_defense,
+            raw_magic_defense=g.magic_defense,
+            raw_speed=g.speed,
+        )
+
+        pvp_beasts.append(
+            PvpBeast(
+                id=id(g),  # 守塔幻兽没有全局ID，用内存id占位即可
+                name=g.name,
+                hp_max=final_hp,
+                hp_current=final_hp,
+                physical_attack=final_physical_attack,
+                magic_attack=final_magic_attack,
+                physical_defense=final_physical_defense,
+                magic_defense=final_magic_defense,
+                speed=final_speed,
+                grade=0,
+                hp_star=0,
+                attack_star=0,
+                physical_defense_star=0,
+                magic_defense_star=0,
+                speed_star=0,
+                hp_aptitude=0,
+                attack_aptitude=0,
+                physical_defense_aptitude=0,
+                magic_defense_aptitude=0,
+                speed_aptitude=0,
+                attack_type=attack_type,
+                skills=skills,
+            )
+        )
+    return pvp_beasts
+
+
+def build_guardian_floor(guardians: Iterable[TowerGuardian]) -> GuardianFloor:
+    stats = tuple(guardians)
+    return GuardianFloor(
+        level=stats[0].level if stats else 0,
+        stats=stats,
+        guardians=tuple(
+            {
+                "name": g.name,
+                "level": g.level,
+                "nature": g.nature,
+                "hp": g.hp,
+                "physical_attack": g.physical_attack,
+                "magic_attack": g.magic_attack,
+                "physical_defense": g.physical_defense,
+                "magic_defense": g.magic_defense,
+            }
+            for g in stats
+        ),
+        beasts=tuple(guardians_to_pvp_beasts(stats)),
+    )
+
+
+def fresh_beasts(templates: Iterable[PvpBeast]) -> List[PvpBeast]:
+    """复制一份满血、无状态的 PvpBeast，模板本身不被战斗修改"""
+    return [replace(b, hp_current=b.hp_max, is_dead=False, status_effects=[]) for b in templates]
@@ -0,0 +1,191 @@
+"""configs/ 目录下 JSON 配置的统一注册表
+
+- 每个文件只解析一次，解析结果冻结（只读 dict / list 子类）后在各模块间共享
+- 读取时按 check_interval 节流检查 mtime，文件变化后重新解析并整体替换；
+  正在使用旧对象的调用方不受影响，重新解析失败（如文件写了一半）时继续使用旧配置
+- derived() 在配置对象上缓存派生结构（查找表、预拼 SQL 等），配置替换后自动重建
+- stats() 给出每个文件的解析次数、耗时和命中次数，便于确认请求路径上不再解析 JSON
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CONFIG_DIR = Path(__file__).resolve().parents[2] / "configs"
+
+
+def _readonly(self, *args, **kwargs):
+    raise TypeError("配置对象是只读的，需要修改请先 copy.deepcopy()")
+
+
+class FrozenDict(dict):
+    """只读 dict：仍是 dict 子类，jsonify / isinstance / dict(...) 照常可用"""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    __ior__ = _readonly
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return {k: copy.deepcopy(v, memo) for k, v in self.items()}
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+
+class FrozenList(list):
+    """只读 list：仍是 list 子类，切片 / 拼接得到普通 list"""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = _readonly
+    append = extend = insert = pop = remove = clear = sort = reverse = _readonly
+    __iadd__ = __imul__ = _readonly
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return [copy.deepcopy(v, memo) for v in self]
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+
+def freeze(value: Any) -> Any:
+    """递归冻结 JSON 解析结果"""
+    if isinstance(value, dict):
+        return FrozenDict((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze(v) for v in value)
+    return value
+
+
+@dataclass(frozen=True)
+class _Entry:
+    data: Any
+    mtime: float
+    loaded_at: float       # time.time()
+    load_seconds: float    # 最近一次解析耗时
+    loads: int             # 累计解析次数
+
+
+class ConfigRegistry:
+    """按文件名（相对 configs/ 的路径，如 "shop.json"）读取配置"""
+
+    def __init__(
+        self,
+        config_dir: Path = CONFIG_DIR,
+        check_interval: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.config_dir = Path(config_dir)
+        self.check_interval = check_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: Dict[str, _Entry] = {}
+        self._checked_at: Dict[str, float] = {}
+        self._hits: Dict[str, int] = {}
+        self._derived: Dict[Tuple[str, Callable], Tuple[Any, Any]] = {}
+
+    def get(self, name: str) -> Any:
+        """获取冻结后的配置对象；文件不存在或首次解析失败时抛出异常"""
+        entry = self._entries.get(name)
+        now = self._clock()
+        if entry is None or now - self._checked_at.get(name, 0.0) >= self.check_interval:
+            entry = self._refresh(name, entry, now)
+        self._hits[name] = self._hits.get(name, 0) + 1
+        return entry.data
+
+    def derived(self, name: str, builder: Callable[[Any], Any]) -> Any:
+        """builder(配置对象) 的结果，配置对象替换后才重新计算"""
+        config = self.get(name)
+        key = (name, builder)
+        cached = self._derived.get(key)
+        if cached is not None and cached[0] is config:
+            return cached[1]
+        value = builder(config)
+        self._derived[key] = (config, value)
+        return value
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """下一次读取时强制检查 mtime（测试或运维手动刷新用）"""
+        with self._lock:
+            if name is None:
+                self._checked_at.clear()
+            else:
+                self._checked_at.pop(name, None)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """每个已加载文件的 mtime、最近加载时间、解析次数/耗时、命中次数"""
+        return {
+            name: {
+                "mtime": entry.mtime,
+                "loaded_at": entry.loaded_at,
+                "load_ms": round(entry.load_seconds * 1000, 3),
+                "loads": entry.loads,
+                "hits": self._hits.get(name, 0),
+            }
+            for name, entry in sorted(self._entries.items())
+        }
+
+    def _refresh(self, name: str, entry: Optional[_Entry], now: float) -> _Entry:
+        with self._lock:
+            current = self._entries.get(name)
+            if current is not entry and current is not None:
+                return current  # 其它线程刚刚重新加载过
+            self._checked_at[name] = now
+
+            path = self.config_dir / name
+            try:
+                mtime = path.stat().st_mtime
+            except OSError:
+                if current is None:
+                    raise
+                return current  # 文件暂时不可访问，保持现有配置
+            if current is not None and mtime == current.mtime:
+                return current
+
+            start = time.perf_counter()
+            try:
+                with path.open("r", encoding="utf-8") as f:
+                    data = freeze(json.load(f))
+            except (OSError, ValueError) as e:
+                if current is None:
+                    raise
+                logger.warning(f"[ConfigRegistry] 重新加载 {name} 失败，继续使用旧配置: {e}")
+                return current
+
+            new_entry = _Entry(
+                data=data,
+                mtime=mtime,
+                loaded_at=time.time(),
+                load_seconds=time.perf_counter() - start,
+                loads=(current.loads if current else 0) + 1,
+            )
+            self._entries[name] = new_entry
+            return new_entry
+
+
+config_registry = ConfigRegistry()
+
+
+def get_config(name: str) -> Any:
+    """从全局注册表读取 configs/<name>"""
+    return config_registry.get(name)
+
+
+def get_derived_config(name: str, builder: Callable[[Any], Any]) -> Any:
+    """从全局注册表读取 configs/<name> 的派生结构"""
+    return config_registry.derived(name, builder)
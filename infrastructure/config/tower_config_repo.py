@@ -1,10 +1,20 @@
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
+from dataclasses import dataclass
 from pathlib import Path
+import copy
 import json
+import threading
 
 from domain.entities.tower import TowerGuardian
 from domain.repositories.tower_repo import ITowerConfigRepo
 from domain.services.beast_stats import get_growth_multiplier
+from domain.services.tower_floor import (
+    EMPTY_FLOOR_REWARD,
+    FloorReward,
+    GuardianFloor,
+    MilestoneReward,
+    build_guardian_floor,
+)
 
 
 # 资质→属性系数（与 beast_stats.py 保持一致）
@@ -16,52 +26,100 @@ DEF_COEFF_LOW = 0.0391
 LEVEL_BONUS = 50
 
 
+@dataclass(frozen=True)
+class _TowerTables:
+    """一次配置加载的全部结果，重载时整体替换"""
+    tower_config: Dict
+    guardians_config: Dict
+    rewards_config: Dict
+    tongtian_beasts_config: Dict                              # 通天塔精确幻兽配置：floor -> config
+    guardian_floors: Dict[Tuple[str, int], GuardianFloor]     # (tower_type, floor) -> 守塔幻兽
+    floor_rewards: Dict[Tuple[str, int], FloorReward]         # (tower_type, floor) -> 通关奖励
+    milestones: Dict[Tuple[str, int], MilestoneReward]        # (tower_type, floor) -> 里程碑奖励
+
+
 class ConfigTowerRepo(ITowerConfigRepo):
-    """从配置文件读取闯塔配置"""
+    """从配置文件读取闯塔配置
+
+    加载时按 (tower_type, floor) 预编译每层的守塔幻兽、PvpBeast 模板和奖励，
+    战斗中的查询都是一次字典查找；reload() 构建完新表后整体替换，读者不会看到半新半旧的配置。
+    """
     
     def __init__(self):
-        self._tower_config: Dict = {}
-        self._guardians_config: Dict = {}
-        self._rewards_config: Dict = {}
-        self._tongtian_beasts_config: Dict = {}  # 通天塔精确幻兽配置
-        self._load()
+        self._reload_lock = threading.Lock()
+        self._tables = self._load()
     
-    def _load(self):
+    def reload(self) -> None:
+        """重新读取配置文件并重建预编译表"""
+        with self._reload_lock:
+            self._tables = self._load()
+    
+    def _load(self) -> _TowerTables:
         base_dir = Path(__file__).resolve().parents[2]
         
         # 加载塔配置
         config_path = base_dir / "configs" / "tower_config.json"
         with config_path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-            self._tower_config = data.get("towers", {})
+            tower_config = json.load(f).get("towers", {})
         
         # 加载守塔幻兽配置
         guardians_path = base_dir / "configs" / "tower_guardians.json"
         with guardians_path.open("r", encoding="utf-8") as f:
-            self._guardians_config = json.load(f)
+            guardians_config = json.load(f)
         
         # 加载奖励配置
         rewards_path = base_dir / "configs" / "tower_rewards.json"
         with rewards_path.open("r", encoding="utf-8") as f:
-            self._rewards_config = json.load(f)
+            rewards_config = json.load(f)
         
         # 加载通天塔精确幻兽配置
+        tongtian_beasts_config: Dict = {}
         tongtian_beasts_path = base_dir / "configs" / "tower_tongtian_beasts.json"
         if tongtian_beasts_path.exists():
             with tongtian_beasts_path.open("r", encoding="utf-8") as f:
                 data = json.load(f)
                 # 将 floors 列表转换为 floor -> config 的字典便于快速查找
-                self._tongtian_beasts_config = {
+                tongtian_beasts_config = {
                     floor_data["floor"]: floor_data
                     for floor_data in data.get("floors", [])
                 }
+        
+        guardian_floors: Dict[Tuple[str, int], GuardianFloor] = {}
+        floor_rewards: Dict[Tuple[str, int], FloorReward] = {}
+        milestones: Dict[Tuple[str, int], MilestoneReward] = {}
+        for tower_type, config in tower_config.items():
+            tower_rewards = rewards_config.get(tower_type, {})
+            for floor in range(1, int(config.get("max_floor", 120)) + 1):
+                key = (tower_type, floor)
+                guardian_floors[key] = build_guardian_floor(self._build_guardians(
+                    tower_config, guardians_config, tongtian_beasts_config, tower_type, floor
+                ))
+                floor_rewards[key] = self._build_floor_reward(tower_rewards, floor)
+            for item in tower_rewards.get("milestone_rewards", []):
+                milestones.setdefault(
+                    (tower_type, item["floor"]),
+                    MilestoneReward(item.get("gold", 0), tuple(item.get("items", []))),
+                )
+        
+        return _TowerTables(
+            tower_config=tower_config,
+            guardians_config=guardians_config,
+            rewards_config=rewards_config,
+            tongtian_beasts_config=tongtian_beasts_config,
+            guardian_floors=guardian_floors,
+            floor_rewards=floor_rewards,
+            milestones=milestones,
+        )
     
     def get_tower_config(self, tower_type: str) -> dict:
-        return self._tower_config.get(tower_type, {})
+        return self._tables.tower_config.get(tower_type, {})
     
     def get_guardian_count_for_floor(self, tower_type: str, floor: int) -> int:
         """获取某层需要的守塔幻兽数量"""
-        config = self.get_tower_config(tower_type)
+        return self._guardian_count(self.get_tower_config(tower_type), floor)
+    
+    @staticmethod
+    def _guardian_count(config: dict, floor: int) -> int:
         for item in config.get("guardian_count_by_floor", []):
             floor_range = item["floor_range"]
             if floor_range[0] <= floor <= floor_range[1]:
@@ -167,13 +225,34 @@ class ConfigTowerRepo(ITowerConfigRepo):
             magic_defense=magic_defense,
         )
     
+    def get_guardian_floor(self, tower_type: str, floor: int) -> GuardianFloor:
+        """获取某层预编译的守塔幻兽（属性块 + PvpBeast 模板），只读"""
+        tables = self._tables
+        guardian_floor = tables.guardian_floors.get((tower_type, floor))
+        if guardian_floor is None:
+            # 超出 max_floor 的层不预编译，按需现算
+            guardian_floor = build_guardian_floor(self._build_guardians(
+                tables.tower_config, tables.guardians_config, tables.tongtian_beasts_config, tower_type, floor
+            ))
+        return guardian_floor
+    
     def get_guardians_for_floor(self, tower_type: str, floor: int) -> List[TowerGuardian]:
         """获取某层的守塔幻兽列表"""
+        return list(self.get_guardian_floor(tower_type, floor).stats)
+    
+    def _build_guardians(
+        self,
+        tower_config: Dict,
+        guardians_config: Dict,
+        tongtian_beasts_config: Dict,
+        tower_type: str,
+        floor: int,
+    ) -> List[TowerGuardian]:
         guardians = []
         
         # 优先使用通天塔精确配置
-        if tower_type == "tongtian" and floor in self._tongtian_beasts_config:
-            floor_config = self._tongtian_beasts_config[floor]
+        if tower_type == "tongtian" and floor in tongtian_beasts_config:
+            floor_config = tongtian_beasts_config[floor]
             beasts = floor_config.get("beasts", [])
             for beast_config in beasts:
                 guardian = self._create_guardian_from_beast_config(beast_config, floor)
@@ -181,9 +260,9 @@ class ConfigTowerRepo(ITowerConfigRepo):
             return guardians
         
         # Fallback: 使用原有的模板+层级成长方式
-        count = self.get_guardian_count_for_floor(tower_type, floor)
+        count = self._guardian_count(tower_config.get(tower_type, {}), floor)
         
-        tower_guardians = self._guardians_config.get(tower_type, [])
+        tower_guardians = guardians_config.get(tower_type, [])
         
         # 找到对应层范围的配置
         guardian_templates = []
@@ -227,39 +306,39 @@ class ConfigTowerRepo(ITowerConfigRepo):
         
         return guardians
     
+    def get_floor_reward_entry(self, tower_type: str, floor: int) -> FloorReward:
+        """获取某层的奖励（只读元组）"""
+        return self._tables.floor_rewards.get((tower_type, floor)) or self._build_floor_reward(
+            self._tables.rewards_config.get(tower_type, {}), floor
+        )
+    
+    def get_milestone_entry(self, tower_type: str, floor: int) -> Optional[MilestoneReward]:
+        """获取里程碑奖励（只读元组，没有则为 None）"""
+        return self._tables.milestones.get((tower_type, floor))
+    
     def get_floor_rewards(self, tower_type: str, floor: int) -> dict:
-        """获取某层的奖励"""
-        tower_rewards = self._rewards_config.get(tower_type, {})
-        floor_rewards = tower_rewards.get("floor_rewards", [])
-        
-        for config in floor_rewards:
-            floor_range = config["floor_range"]
-            if floor_range[0] <= floor <= floor_range[1]:
-                return {
-                    "gold": config.get("gold", 0),
-                    "exp": config.get("exp", 0),
-                    "items": config.get("items", []),
-                }
-        
-        return {"gold": 0, "exp": 0, "items": []}
+        """获取某层的奖励（调用方可以修改返回的字典）"""
+        reward = self.get_floor_reward_entry(tower_type, floor)
+        return {"gold": reward.gold, "exp": reward.exp, "items": copy.deepcopy(list(reward.items))}
     
     def get_milestone_reward(self, tower_type: str, floor: int) -> Optional[dict]:
         """获取里程碑奖励（如果有）"""
-        tower_rewards = self._rewards_config.get(tower_type, {})
-        milestone_rewards = tower_rewards.get("milestone_rewards", [])
-        
-        for config in milestone_rewards:
-            if config["floor"] == floor:
-                return {
-                    "gold": config.get("gold", 0),
-                    "items": config.get("items", []),
-                }
-        
-        return None
+        milestone = self.get_milestone_entry(tower_type, floor)
+        if milestone is None:
+            return None
+        return {"gold": milestone.gold, "items": copy.deepcopy(list(milestone.items))}
+    
+    @staticmethod
+    def _build_floor_reward(tower_rewards: dict, floor: int) -> FloorReward:
+        for config in tower_rewards.get("floor_rewards", []):
+            floor_range = config["floor_range"]
+            if floor_range[0] <= floor <= floor_range[1]:
+                return FloorReward(config.get("gold", 0), config.get("exp", 0), tuple(config.get("items", [])))
+        return EMPTY_FLOOR_REWARD
     
     def get_special_reward_config(self, tower_type: str, floor: int = 0) -> Optional[dict]:
         """获取特殊奖励配置（每N层奖励）"""
-        tower_rewards = self._rewards_config.get(tower_type, {})
+        tower_rewards = self._tables.rewards_config.get(tower_type, {})
         
         # 先检查是否有按层范围的配置（如龙纹塔）
         floor_configs = tower_rewards.get("special_rewards_by_floor", [])
@@ -281,7 +360,7 @@ class ConfigTowerRepo(ITowerConfigRepo):
     
     def get_spirit_drop_config(self, tower_type: str) -> Optional[dict]:
         """获取战灵掉落配置"""
-        tower_rewards = self._rewards_config.get(tower_type, {})
+        tower_rewards = self._tables.rewards_config.get(tower_type, {})
         return tower_rewards.get("spirit_drop", None)
     
     def is_spirit_drop_floor(self, tower_type: str, floor: int) -> bool:
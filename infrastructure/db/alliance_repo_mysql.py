@@ -1,6 +1,6 @@
 import json
 from datetime import datetime
-from typing import List, Optional, Dict, Tuple
+from typing import Callable, List, Optional, Dict, Tuple
 from domain.entities.alliance import (
     Alliance,
     AllianceMember,
@@ -23,9 +23,16 @@ from domain.entities.alliance_battle import (
     AllianceLandBattleDuel,
 )
 from domain.repositories.alliance_repo import IAllianceRepo
-from infrastructure.db.connection import execute_query, execute_update, execute_insert
+from infrastructure.db.connection import execute_query, execute_update, execute_insert, execute_many
 
 class MySQLAllianceRepo(IAllianceRepo):
+    def __init__(self):
+        self._war_score_listeners: List[Callable[[int, str, int], None]] = []
+
+    def add_war_score_listener(self, listener: Callable[[int, str, int], None]) -> None:
+        """注册战功变化监听（如战功榜增量更新），在 increment_alliance_war_score 写库后调用"""
+        self._war_score_listeners.append(listener)
+
     def create_alliance(self, alliance: Alliance) -> int:
         sql = """
             INSERT INTO alliances (
@@ -69,15 +76,8 @@ class MySQLAllianceRepo(IAllianceRepo):
             return None
         return self._map_row_to_alliance(rows[0])
 
-    def list_alliances(self, keyword: Optional[str], limit: int, offset: int) -> List[Dict]:
-        kw = (keyword or "").strip()
-        where_sql = ""
-        params: Tuple = ()
-        if kw:
-            where_sql = "WHERE a.name LIKE %s"
-            params = (f"%{kw}%",)
-
-        sql = f"""
+    def load_alliance_directory(self) -> List[Dict]:
+        sql = """
             SELECT
                 a.id,
                 a.name,
@@ -91,22 +91,8 @@ class MySQLAllianceRepo(IAllianceRepo):
                 FROM alliance_members
                 GROUP BY alliance_id
             ) m ON m.alliance_id = a.id
-            {where_sql}
-            ORDER BY a.level DESC, a.id DESC
-            LIMIT %s OFFSET %s
-        """
-        rows = execute_query(sql, params + (int(limit), int(offset)))
-        return list(rows or [])
-
-    def count_alliances(self, keyword: Optional[str]) -> int:
-        kw = (keyword or "").strip()
-        if kw:
-            rows = execute_query("SELECT COUNT(1) AS cnt FROM alliances WHERE name LIKE %s", (f"%{kw}%",))
-        else:
-            rows = execute_query("SELECT COUNT(1) AS cnt FROM alliances", ())
-        if not rows:
-            return 0
-        return int(rows[0].get("cnt", 0) or 0)
+        """
+        return list(execute_query(sql) or [])
 
     def count_members(self, alliance_id: int) -> int:
         rows = execute_query("SELECT COUNT(1) AS cnt FROM alliance_members WHERE alliance_id = %s", (alliance_id,))
@@ -713,50 +699,17 @@ class MySQLAllianceRepo(IAllianceRepo):
                 updated_at = CURRENT_TIMESTAMP
         """
         execute_update(sql, (alliance_id, season_key, delta))
+        for listener in self._war_score_listeners:
+            listener(alliance_id, season_key, delta)
 
-    def list_alliance_war_leaderboard(self, since: datetime, limit: int, offset: int) -> List[Dict]:
-        sql = """
-            SELECT a.id, a.name, a.level, 
-                   COALESCE(SUM(r.cost), 0) as total_merit
-            FROM alliances a
-            JOIN alliance_land_registration r ON a.id = r.alliance_id
-            WHERE r.registration_time >= %s
-            GROUP BY a.id, a.name, a.level
-            ORDER BY total_merit DESC
-            LIMIT %s OFFSET %s
-        """
-        return execute_query(sql, (since, limit, offset))
-
-    def count_alliance_war_leaderboard(self, since: datetime) -> int:
+    def load_alliance_war_scores(self, season_key: str) -> List[Dict]:
         sql = """
-            SELECT COUNT(DISTINCT alliance_id) as cnt
-            FROM alliance_land_registration
-            WHERE registration_time >= %s
+            SELECT s.alliance_id, s.score, a.name, a.level
+            FROM alliance_war_scores s
+            JOIN alliances a ON a.id = s.alliance_id
+            WHERE s.season_key = %s
         """
-        rows = execute_query(sql, (since,))
-        return rows[0]['cnt'] if rows else 0
-
-    def get_alliance_war_leaderboard_entry(self, alliance_id: int, since: datetime) -> Optional[Dict]:
-        sql = """
-            WITH Leaderboard AS (
-                SELECT a.id, a.name, a.level,
-                       COALESCE(SUM(r.cost), 0) as total_merit
-                FROM alliances a
-                JOIN alliance_land_registration r ON a.id = r.alliance_id
-                WHERE r.registration_time >= %s
-                GROUP BY a.id, a.name, a.level
-            ),
-        """
-        rows = execute_query(sql, (season_key, alliance_id))
-        if not rows:
-            return None
-        row = rows[0]
-        return {
-            "rank": row["rank"],
-            "alliance_id": row["alliance_id"],
-            "alliance_name": row["name"],
-            "score": row["score"],
-        }
+        return execute_query(sql, (season_key,)) or []
 
     # === 土地报名 ===
     def get_land_registration(self, alliance_id: int, land_id: int) -> Optional[AllianceRegistration]:
@@ -808,6 +761,20 @@ class MySQLAllianceRepo(IAllianceRepo):
         rows = execute_query(sql, (registration_id,))
         return [self._map_army_signup(row) for row in rows]
 
+    def list_army_signups_by_registrations(
+        self, registration_ids: List[int]
+    ) -> List[AllianceArmySignup]:
+        if not registration_ids:
+            return []
+        sql = f"""
+            SELECT id, registration_id, alliance_id, army, user_id, signup_order, hp_state, status, created_at
+            FROM alliance_army_signups
+            WHERE registration_id IN ({', '.join(['%s'] * len(registration_ids))})
+            ORDER BY registration_id ASC, signup_order ASC, id ASC
+        """
+        rows = execute_query(sql, tuple(registration_ids))
+        return [self._map_army_signup(row) for row in rows]
+
     def update_army_signup_state(self, signup_id: int, status: int, hp_state: Optional[dict]) -> None:
         sql = """
             UPDATE alliance_army_signups
@@ -818,6 +785,24 @@ class MySQLAllianceRepo(IAllianceRepo):
         hp_json = json.dumps(hp_state, ensure_ascii=False) if hp_state else None
         execute_update(sql, (status, hp_json, signup_id))
 
+    def update_army_signup_states(self, signups: List[AllianceArmySignup]) -> None:
+        if not signups:
+            return
+        status_cases, hp_cases, params_status, params_hp = [], [], [], []
+        for signup in signups:
+            status_cases.append("WHEN %s THEN %s")
+            params_status.extend((signup.id, signup.status))
+            hp_cases.append("WHEN %s THEN %s")
+            hp_json = json.dumps(signup.hp_state, ensure_ascii=False) if signup.hp_state else None
+            params_hp.extend((signup.id, hp_json))
+        sql = f"""
+            UPDATE alliance_army_signups
+            SET status = CASE id {' '.join(status_cases)} END,
+                hp_state = CASE id {' '.join(hp_cases)} END
+            WHERE id IN ({', '.join(['%s'] * len(signups))})
+        """
+        execute_update(sql, tuple(params_status + params_hp + [s.id for s in signups]))
+
     # === 土地战斗 ===
     def create_land_battle(self, battle: AllianceLandBattle) -> int:
         sql = """
@@ -892,6 +877,32 @@ class MySQLAllianceRepo(IAllianceRepo):
             return None
         return self._map_land_battle(rows[0])
 
+    def list_active_battles_by_land(self, land_id: int) -> List[AllianceLandBattle]:
+        sql = """
+            SELECT id, land_id, left_registration_id, right_registration_id, phase, current_round, started_at, finished_at
+            FROM alliance_land_battle
+            WHERE land_id = %s AND phase IN (0, 1)
+            ORDER BY id ASC
+        """
+        rows = execute_query(sql, (land_id,))
+        return [self._map_land_battle(row) for row in rows]
+
+    def update_land_battles(self, battles: List[AllianceLandBattle]) -> None:
+        if not battles:
+            return
+        sets, params = [], []
+        for column in ("phase", "current_round", "started_at", "finished_at"):
+            sets.append(f"{column} = CASE id {' '.join(['WHEN %s THEN %s'] * len(battles))} END")
+            for battle in battles:
+                params.extend((battle.id, getattr(battle, column)))
+        sql = f"""
+            UPDATE alliance_land_battle
+            SET {', '.join(sets)}
+            WHERE id IN ({', '.join(['%s'] * len(battles))})
+        """
+        params.extend(battle.id for battle in battles)
+        execute_update(sql, tuple(params))
+
     def list_alliance_battles(self, alliance_id: int) -> List[AllianceLandBattle]:
         sql = """
             SELECT b.id,
@@ -961,6 +972,51 @@ class MySQLAllianceRepo(IAllianceRepo):
             ),
         )
 
+    def add_battle_rounds(self, rounds: List[AllianceLandBattleRound]) -> None:
+        if not rounds:
+            return
+        sql = """
+            INSERT INTO alliance_land_battle_round (
+                battle_id, round_no, left_alive, right_alive, status, started_at, finished_at
+            ) VALUES (%s, %s, %s, %s, %s, %s, %s)
+        """
+        execute_many(
+            sql,
+            [
+                (r.battle_id, r.round_no, r.left_alive, r.right_alive, r.status, r.started_at, r.finished_at)
+                for r in rounds
+            ],
+        )
+        # 多行 INSERT 不返回各行 ID，按 (battle_id, round_no) 读回
+        battle_ids = sorted({r.battle_id for r in rounds})
+        id_sql = f"""
+            SELECT id, battle_id, round_no
+            FROM alliance_land_battle_round
+            WHERE battle_id IN ({', '.join(['%s'] * len(battle_ids))})
+        """
+        ids = {
+            (row["battle_id"], row["round_no"]): row["id"]
+            for row in execute_query(id_sql, tuple(battle_ids))
+        }
+        for r in rounds:
+            r.id = ids.get((r.battle_id, r.round_no))
+
+    def update_battle_rounds(self, rounds: List[AllianceLandBattleRound]) -> None:
+        if not rounds:
+            return
+        sets, params = [], []
+        for column in ("left_alive", "right_alive", "status", "finished_at"):
+            sets.append(f"{column} = CASE id {' '.join(['WHEN %s THEN %s'] * len(rounds))} END")
+            for r in rounds:
+                params.extend((r.id, getattr(r, column)))
+        sql = f"""
+            UPDATE alliance_land_battle_round
+            SET {', '.join(sets)}
+            WHERE id IN ({', '.join(['%s'] * len(rounds))})
+        """
+        params.extend(r.id for r in rounds)
+        execute_update(sql, tuple(params))
+
     def list_battle_rounds(self, battle_id: int) -> List[AllianceLandBattleRound]:
         sql = """
             SELECT id, battle_id, round_no, left_alive, right_alive, status, started_at, finished_at
@@ -992,20 +1048,35 @@ class MySQLAllianceRepo(IAllianceRepo):
                 round_id, attacker_signup_id, defender_signup_id, attacker_result, log_json, created_at
             ) VALUES (%s, %s, %s, %s, %s, %s)
         """
-        for duel in duels:
-            log_json = json.dumps(duel.log_data or {}, ensure_ascii=False)
-            new_id = execute_insert(
-                sql,
+        # 一条多行 INSERT
+        execute_many(
+            sql,
+            [
                 (
                     duel.round_id,
                     duel.attacker_signup_id,
                     duel.defender_signup_id,
                     duel.attacker_result,
-                    log_json,
+                    json.dumps(duel.log_data or {}, ensure_ascii=False),
                     duel.created_at or None,
-                ),
-            )
-            duel.id = new_id
+                )
+                for duel in duels
+            ],
+        )
+        # 多行 INSERT 不返回各行 ID，按 (round_id, attacker_signup_id, defender_signup_id) 读回；
+        # 同一回合内两名报名至多交手一次
+        round_ids = sorted({d.round_id for d in duels})
+        id_sql = f"""
+            SELECT id, round_id, attacker_signup_id, defender_signup_id
+            FROM alliance_land_battle_duel
+            WHERE round_id IN ({', '.join(['%s'] * len(round_ids))})
+        """
+        ids = {
+            (row["round_id"], row["attacker_signup_id"], row["defender_signup_id"]): row["id"]
+            for row in execute_query(id_sql, tuple(round_ids))
+        }
+        for duel in duels:
+            duel.id = ids.get((duel.round_id, duel.attacker_signup_id, duel.defender_signup_id))
 
     def list_duels_by_round(self, round_id: int) -> List[AllianceLandBattleDuel]:
         sql = """
@@ -7,9 +7,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional, Dict
+from typing import Callable, List, Optional, Dict
 import json
 
+from domain.services.battle_report import decode_battle_report
 from infrastructure.db.connection import execute_query, execute_insert
 
 
@@ -46,6 +47,19 @@ class ArenaBattleLog:
 class MySQLArenaBattleRepo:
     """擂台战斗记录仓库"""
 
+    # 列表查询只取对阵信息，不读战报列
+    LIST_COLUMNS = (
+        "id, arena_type, rank_name, challenger_id, challenger_name, "
+        "champion_id, champion_name, is_challenger_win, created_at"
+    )
+
+    def __init__(self):
+        self._save_listeners: List[Callable[[ArenaBattleLog], None]] = []
+
+    def add_save_listener(self, listener: Callable[[ArenaBattleLog], None]) -> None:
+        """注册写入监听（如动态信息流），在 save_battle 写库后调用，战报内容不随记录传递"""
+        self._save_listeners.append(listener)
+
     def save_battle(
         self,
         *,
@@ -56,20 +70,24 @@ class MySQLArenaBattleRepo:
         champion_id: int,
         champion_name: str,
         is_challenger_win: bool,
-        battle_data: Dict,
+        battle_data: Optional[Dict] = None,
+        battle_report: Optional[bytes] = None,
     ) -> int:
-        """保存一条擂台战报，返回自增ID。"""
+        """保存一条擂台战报，返回自增ID。
+
+        优先传紧凑战报 battle_report（此时 battle_data 列留空），读取时再还原。
+        """
 
         sql = """
             INSERT INTO arena_battle_log (
                 arena_type, rank_name,
                 challenger_id, challenger_name,
                 champion_id, champion_name,
-                is_challenger_win, battle_data
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                is_challenger_win, battle_data, battle_report
+            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
         """
-        battle_json = json.dumps(battle_data, ensure_ascii=False)
-        return execute_insert(
+        battle_json = None if battle_report is not None else json.dumps(battle_data or {}, ensure_ascii=False)
+        battle_id = execute_insert(
             sql,
             (
                 arena_type,
@@ -80,16 +98,35 @@ class MySQLArenaBattleRepo:
                 champion_name,
                 1 if is_challenger_win else 0,
                 battle_json,
+                battle_report,
             ),
         )
+        if self._save_listeners:
+            log = ArenaBattleLog(
+                id=battle_id,
+                arena_type=arena_type,
+                rank_name=rank_name,
+                challenger_id=challenger_id,
+                challenger_name=challenger_name,
+                champion_id=champion_id,
+                champion_name=champion_name,
+                is_challenger_win=bool(is_challenger_win),
+                battle_data={},
+                created_at=datetime.now().replace(microsecond=0),
+            )
+            for listener in self._save_listeners:
+                listener(log)
+        return battle_id
 
     def _row_to_log(self, row) -> ArenaBattleLog:
         data: Dict = {}
-        if row.get("battle_data"):
-            try:
+        try:
+            if row.get("battle_report"):
+                data = decode_battle_report(row["battle_report"])
+            elif row.get("battle_data"):
                 data = json.loads(row["battle_data"])
-            except Exception:
-                data = {}
+        except Exception:
+            data = {}
         return ArenaBattleLog(
             id=row["id"],
             arena_type=row["arena_type"],
@@ -109,7 +146,7 @@ class MySQLArenaBattleRepo:
             SELECT id, arena_type, rank_name,
                    challenger_id, challenger_name,
                    champion_id, champion_name,
-                   is_challenger_win, battle_data, created_at
+                   is_challenger_win, battle_data, battle_report, created_at
             FROM arena_battle_log
             WHERE id = %s
         """
@@ -118,45 +155,52 @@ class MySQLArenaBattleRepo:
             return None
         return self._row_to_log(rows[0])
 
-    def get_recent_battles(self, arena_type: Optional[str] = None, limit: int = 20) -> List[ArenaBattleLog]:
-        """获取最近的战报列表（全服动态）。"""
-        if arena_type:
-            sql = """
-                SELECT id, arena_type, rank_name,
-                       challenger_id, challenger_name,
-                       champion_id, champion_name,
-                       is_challenger_win, battle_data, created_at
-                FROM arena_battle_log
-                WHERE arena_type = %s
-                ORDER BY created_at DESC
-                LIMIT %s
-            """
-            rows = execute_query(sql, (arena_type, limit))
-        else:
-            sql = """
-                SELECT id, arena_type, rank_name,
-                       challenger_id, challenger_name,
-                       champion_id, champion_name,
-                       is_challenger_win, battle_data, created_at
-                FROM arena_battle_log
-                ORDER BY created_at DESC
-                LIMIT %s
-            """
-            rows = execute_query(sql, (limit,))
+    def get_recent_battles(
+        self,
+        arena_type: Optional[str] = None,
+        limit: int = 20,
+        before_id: Optional[int] = None,
+    ) -> List[ArenaBattleLog]:
+        """获取最近的战报列表（全服动态，按 ID 倒序；before_id 用于翻到更早的一页）。
 
+        列表不读取战报内容，battle_data 为空。
+        """
+        where, params = [], []
+        if arena_type:
+            where.append("arena_type = %s")
+            params.append(arena_type)
+        if before_id is not None:
+            where.append("id < %s")
+            params.append(before_id)
+        sql = f"""
+            SELECT {self.LIST_COLUMNS}
+            FROM arena_battle_log
+            {"WHERE " + " AND ".join(where) if where else ""}
+            ORDER BY id DESC
+            LIMIT %s
+        """
+        rows = execute_query(sql, (*params, limit))
         return [self._row_to_log(row) for row in rows]
 
-    def get_user_battles(self, user_id: int, limit: int = 20) -> List[ArenaBattleLog]:
-        """获取与某玩家相关的战报（个人动态）。"""
-        sql = """
-            SELECT id, arena_type, rank_name,
-                   challenger_id, challenger_name,
-                   champion_id, champion_name,
-                   is_challenger_win, battle_data, created_at
-            FROM arena_battle_log
-            WHERE challenger_id = %s OR champion_id = %s
-            ORDER BY created_at DESC
+    def get_user_battles(self, user_id: int, limit: int = 20, before_id: Optional[int] = None) -> List[ArenaBattleLog]:
+        """获取与某玩家相关的战报（个人动态，按 ID 倒序；before_id 用于翻页）。
+
+        挑战者 / 擂主两条索引各取一页再合并，避免 OR 条件退化为全表排序。
+        列表不读取战报内容，battle_data 为空。
+        """
+        bound = "AND id < %s" if before_id is not None else ""
+        bound_params = (before_id,) if before_id is not None else ()
+        sql = f"""
+            SELECT * FROM (
+                (SELECT {self.LIST_COLUMNS} FROM arena_battle_log
+                 WHERE challenger_id = %s {bound} ORDER BY id DESC LIMIT %s)
+                UNION
+                (SELECT {self.LIST_COLUMNS} FROM arena_battle_log
+                 WHERE champion_id = %s {bound} ORDER BY id DESC LIMIT %s)
+            ) AS t
+            ORDER BY id DESC
             LIMIT %s
         """
-        rows = execute_query(sql, (user_id, user_id, limit))
+        params = (user_id, *bound_params, limit, user_id, *bound_params, limit, limit)
+        rows = execute_query(sql, params)
         return [self._row_to_log(row) for row in rows]
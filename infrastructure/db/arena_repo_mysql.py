@@ -0,0 +1,86 @@
+"""
+MySQL版擂台仓库：擂台行加锁读取，挑战次数与道具消耗使用条件更新
+"""
+from typing import Optional
+
+from domain.entities.arena import ArenaSlot
+from infrastructure.db.connection import execute_query, execute_update
+
+
+class MySQLArenaRepo:
+    """擂台状态与挑战消耗"""
+
+    def lock_arena(self, rank_name: str, arena_type: str) -> Optional[ArenaSlot]:
+        rows = execute_query(
+            """SELECT rank_name, arena_type, champion_user_id, champion_nickname,
+                      consecutive_wins, prize_pool
+               FROM arena WHERE rank_name = %s AND arena_type = %s
+               FOR UPDATE""",
+            (rank_name, arena_type),
+        )
+        if not rows:
+            return None
+        row = rows[0]
+        return ArenaSlot(
+            rank_name=row["rank_name"],
+            arena_type=row["arena_type"],
+            champion_user_id=row.get("champion_user_id"),
+            champion_nickname=row.get("champion_nickname"),
+            consecutive_wins=int(row.get("consecutive_wins") or 0),
+            prize_pool=int(row.get("prize_pool") or 0),
+        )
+
+    def save_arena(self, slot: ArenaSlot) -> None:
+        execute_update(
+            """UPDATE arena SET champion_user_id = %s, champion_nickname = %s,
+                      consecutive_wins = %s, prize_pool = %s, last_battle_time = NOW()
+               WHERE rank_name = %s AND arena_type = %s""",
+            (
+                slot.champion_user_id,
+                slot.champion_nickname,
+                slot.consecutive_wins,
+                slot.prize_pool,
+                slot.rank_name,
+                slot.arena_type,
+            ),
+        )
+
+    def take_daily_challenge(self, user_id: int, daily_limit: int) -> bool:
+        if daily_limit <= 0:
+            return False
+        # 影响行数：1 = 新插入，2 = 已有行且 +1，0 = 已达上限未修改
+        affected = execute_update(
+            """INSERT INTO arena_daily_challenge (user_id, challenge_date, challenge_count)
+               VALUES (%s, CURDATE(), 1)
+               ON DUPLICATE KEY UPDATE challenge_count = IF(
+                   challenge_count < %s, challenge_count + 1, challenge_count)""",
+            (user_id, daily_limit),
+        )
+        return affected > 0
+
+    def consume_item(self, user_id: int, item_id: int, quantity: int = 1) -> bool:
+        affected = execute_update(
+            """UPDATE player_inventory SET quantity = quantity - %s
+               WHERE user_id = %s AND item_id = %s AND is_temporary = 0 AND quantity >= %s
+               ORDER BY id LIMIT 1""",
+            (quantity, user_id, item_id, quantity),
+        )
+        return affected > 0
+
+    def grant_item(self, user_id: int, item_id: int, quantity: int) -> None:
+        if quantity <= 0:
+            return
+        execute_update(
+            """INSERT INTO player_inventory (user_id, item_id, quantity, is_temporary)
+               VALUES (%s, %s, %s, 0)
+               ON DUPLICATE KEY UPDATE quantity = quantity + %s""",
+            (user_id, item_id, quantity, quantity),
+        )
+
+    def add_success(self, user_id: int, rank_name: str) -> None:
+        execute_update(
+            """INSERT INTO arena_stats (user_id, rank_name, success_count)
+               VALUES (%s, %s, 1)
+               ON DUPLICATE KEY UPDATE success_count = success_count + 1""",
+            (user_id, rank_name),
+        )
@@ -6,7 +6,8 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from infrastructure.db.connection import execute_insert, execute_query
+from domain.services.battle_report import decode_battle_report
+from infrastructure.db.connection import execute_insert, execute_many, execute_query
 
 
 @dataclass
@@ -50,6 +51,21 @@ class BattlefieldBattleLog:
 class MySQLBattlefieldBattleRepo:
     """Repository for battlefield_battle_log table."""
 
+    INSERT_SQL = (
+        "INSERT INTO battlefield_battle_log ("
+        "battlefield_type, period, round_num, match_num, "
+        "first_user_id, first_user_name, second_user_id, second_user_name, "
+        "first_user_team, second_user_team, is_first_win, result_label, battle_data, battle_report"
+        ") VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"
+    )
+
+    # 列表查询只取对阵信息，不读战报列
+    LIST_COLUMNS = (
+        "id, battlefield_type, period, round_num, match_num, "
+        "first_user_id, first_user_name, second_user_id, second_user_name, "
+        "first_user_team, second_user_team, is_first_win, result_label, created_at"
+    )
+
     def save_battle(
         self,
         *,
@@ -65,17 +81,60 @@ class MySQLBattlefieldBattleRepo:
         second_user_team: Optional[str],
         is_first_win: bool,
         result_label: str,
-        battle_data: Dict[str, Any],
+        battle_data: Optional[Dict[str, Any]] = None,
+        battle_report: Optional[bytes] = None,
     ) -> int:
-        """Insert a battlefield battle log and return its ID."""
-        sql = (
-            "INSERT INTO battlefield_battle_log ("
-            "battlefield_type, period, round_num, match_num, "
-            "first_user_id, first_user_name, second_user_id, second_user_name, "
-            "first_user_team, second_user_team, is_first_win, result_label, battle_data"
-            ") VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"
+        """Insert a battlefield battle log and return its ID.
+
+        Pass either the compact `battle_report` (preferred) or a rendered `battle_data` dict.
+        """
+        params = self._battle_params(
+            battlefield_type=battlefield_type,
+            period=period,
+            round_num=round_num,
+            match_num=match_num,
+            first_user_id=first_user_id,
+            first_user_name=first_user_name,
+            second_user_id=second_user_id,
+            second_user_name=second_user_name,
+            first_user_team=first_user_team,
+            second_user_team=second_user_team,
+            is_first_win=is_first_win,
+            result_label=result_label,
+            battle_data=battle_data,
+            battle_report=battle_report,
         )
-        params = (
+        return execute_insert(self.INSERT_SQL, params)
+
+    def save_battles(self, battles: List[Dict[str, Any]]) -> int:
+        """Bulk insert battle logs (one multi-row INSERT).
+
+        Each item takes the same keyword fields as `save_battle`.
+        Returns the number of inserted rows.
+        """
+        if not battles:
+            return 0
+        return execute_many(self.INSERT_SQL, [self._battle_params(**b) for b in battles])
+
+    @staticmethod
+    def _battle_params(
+        *,
+        battlefield_type: str,
+        period: int,
+        round_num: int,
+        match_num: int,
+        first_user_id: int,
+        first_user_name: str,
+        second_user_id: int,
+        second_user_name: str,
+        first_user_team: Optional[str],
+        second_user_team: Optional[str],
+        is_first_win: bool,
+        result_label: str,
+        battle_data: Optional[Dict[str, Any]] = None,
+        battle_report: Optional[bytes] = None,
+    ) -> tuple:
+        return (
             battlefield_type,
             period,
             round_num,
@@ -88,20 +147,23 @@ class MySQLBattlefieldBattleRepo:
             second_user_team,
             1 if is_first_win else 0,
             result_label,
-            json.dumps(battle_data, ensure_ascii=False),
+            None if battle_report is not None else json.dumps(battle_data or {}, ensure_ascii=False),
+            battle_report,
         )
-        return execute_insert(sql, params)
 
     # ---------- Query helpers ----------
 
     def _row_to_log(self, row: Dict[str, Any]) -> BattlefieldBattleLog:
         battle_data: Dict[str, Any] = {}
+        raw_report = row.get("battle_report")
         raw_data = row.get("battle_data")
-        if raw_data:
-            try:
+        try:
+            if raw_report:
+                battle_data = decode_battle_report(raw_report)
+            elif raw_data:
                 battle_data = json.loads(raw_data)
-            except Exception:
-                battle_data = {}
+        except Exception:
+            battle_data = {}
 
         created_at = row.get("created_at")
 
@@ -148,7 +210,8 @@ class MySQLBattlefieldBattleRepo:
     ) -> List[BattlefieldBattleLog]:
         """Get all matches for a battlefield type & period, ordered by round/match.
 
-        If period is None, use the latest one.
+        If period is None, use the latest one. Battle reports are not loaded (`battle_data` is empty);
+        use `get_by_id` for the full report.
         """
         if period is None:
             period = self.get_latest_period(battlefield_type)
@@ -156,7 +219,7 @@ class MySQLBattlefieldBattleRepo:
                 return []
 
         rows = execute_query(
-            "SELECT * FROM battlefield_battle_log WHERE battlefield_type = %s AND period = %s "
+            f"SELECT {self.LIST_COLUMNS} FROM battlefield_battle_log WHERE battlefield_type = %s AND period = %s "
             "ORDER BY round_num ASC, match_num ASC, id ASC",
             (battlefield_type, period),
         )
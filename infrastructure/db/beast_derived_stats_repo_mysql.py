@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Tuple
+
+from infrastructure.db.connection import execute_many, execute_query, execute_update
+
+
+class MySQLBeastDerivedStatsRepo:
+    """幻兽派生属性缓存（beast_id -> (stats_stamp, total_power)）"""
+
+    TABLE = "player_beast_derived_stats"
+
+    def __init__(self):
+        self._ensure_table()
+
+    def _ensure_table(self) -> None:
+        execute_update(
+            f"""
+            CREATE TABLE IF NOT EXISTS {self.TABLE} (
+                beast_id INT PRIMARY KEY,
+                stats_stamp CHAR(40) NOT NULL,
+                total_power INT NOT NULL DEFAULT 0,
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+            """
+        )
+
+    def get_by_beast_ids(self, beast_ids: Iterable[int]) -> Dict[int, Tuple[str, int]]:
+        ids = sorted({int(i) for i in beast_ids if i})
+        if not ids:
+            return {}
+        placeholders = ",".join(["%s"] * len(ids))
+        rows = execute_query(
+            f"SELECT beast_id, stats_stamp, total_power FROM {self.TABLE} WHERE beast_id IN ({placeholders})",
+            tuple(ids),
+        )
+        return {
+            int(r["beast_id"]): (str(r["stats_stamp"]), int(r["total_power"] or 0))
+            for r in rows or []
+        }
+
+    def upsert_many(self, entries: List[Tuple[int, str, int]]) -> int:
+        """批量写入 (beast_id, stats_stamp, total_power)"""
+        if not entries:
+            return 0
+        return execute_many(
+            f"""
+            INSERT INTO {self.TABLE} (beast_id, stats_stamp, total_power)
+            VALUES (%s, %s, %s)
+            ON DUPLICATE KEY UPDATE stats_stamp = VALUES(stats_stamp), total_power = VALUES(total_power)
+            """,
+            [(int(b), str(s), int(p)) for b, s, p in entries],
+        )
+
+    def delete_by_beast_ids(self, beast_ids: Iterable[int]) -> int:
+        ids = sorted({int(i) for i in beast_ids if i})
+        if not ids:
+            return 0
+        placeholders = ",".join(["%s"] * len(ids))
+        return execute_update(
+            f"DELETE FROM {self.TABLE} WHERE beast_id IN ({placeholders})",
+            tuple(ids),
+        )
@@ -1,7 +1,7 @@
 """
 MySQL版战骨仓库
 """
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from domain.entities.bone import BeastBone
 from domain.repositories.bone_repo import IBoneRepo
@@ -43,6 +43,21 @@ class MySQLBoneRepo(IBoneRepo):
         rows = execute_query(sql, (beast_id,))
         return [self._row_to_bone(row) for row in rows]
 
+    def get_by_beast_ids(self, beast_ids: List[int]) -> Dict[int, List[BeastBone]]:
+        """批量获取多只幻兽装备的战骨（单条 IN 查询）"""
+        result: Dict[int, List[BeastBone]] = {bid: [] for bid in beast_ids}
+        if not beast_ids:
+            return result
+        placeholders = ",".join(["%s"] * len(result))
+        sql = f"""
+            SELECT id, user_id, beast_id, template_id, slot, level, stage,
+                   hp_flat, attack_flat, physical_defense_flat, magic_defense_flat, speed_flat
+            FROM beast_bone WHERE beast_id IN ({placeholders})
+        """
+        for row in execute_query(sql, tuple(result.keys())):
+            result[row['beast_id']].append(self._row_to_bone(row))
+        return result
+
     def save(self, bone: BeastBone) -> None:
         """保存战骨（新增或更新）"""
         if bone.id is None:
@@ -1,9 +1,20 @@
 """
 MySQL数据库连接配置
+
+所有 SQL 通过进程内连接池执行，execute_* 与 get_connection 的用法保持不变：
+get_connection() 返回的连接调用 close() 时归还给连接池而不是真正断开。
+在 unit_of_work.transaction() 内执行时，所有语句共用事务连接，由事务统一提交。
 """
+import os
+import threading
+from contextlib import contextmanager
+
 import pymysql
 from pymysql.cursors import DictCursor
 
+from infrastructure.db.connection_pool import ConnectionPool
+from infrastructure.db.unit_of_work import current_unit_of_work
+
 
 # 数据库配置
 DB_CONFIG = {
@@ -17,41 +28,94 @@ DB_CONFIG = {
 }
 
 
-def get_connection():
-    """获取数据库连接"""
+# 连接池配置（时间单位：秒）
+POOL_CONFIG = {
+    'min_size': 2,                  # 预热/常驻的最小连接数
+    'max_size': 20,                 # 最大连接数
+    'max_lifetime': 3600,           # 单连接最大存活时间，需小于MySQL wait_timeout
+    'idle_timeout': 300,            # 超出 min_size 的空闲连接回收时间
+    'health_check_interval': 30,    # 空闲超过该时间的连接借出前先 ping
+    'checkout_timeout': 10,         # 池满时最长等待时间
+}
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def create_raw_connection():
+    """创建一个不经过连接池的原始连接"""
     return pymysql.connect(**DB_CONFIG)
 
 
-def execute_query(sql: str, params: tuple = None) -> list:
-    """执行查询，返回结果列表"""
-    conn = get_connection()
+def get_pool() -> ConnectionPool:
+    """获取当前进程的连接池（fork 出的子进程会重建自己的连接池）"""
+    global _pool, _pool_pid
+    pid = os.getpid()
+    if _pool is None or _pool_pid != pid:
+        with _pool_lock:
+            if _pool is None or _pool_pid != pid:
+                _pool = ConnectionPool(create_raw_connection, **POOL_CONFIG)
+                _pool_pid = pid
+    return _pool
+
+
+def get_pool_stats() -> dict:
+    """获取连接池统计指标（借出次数、等待/超时次数、峰值占用等）"""
+    return get_pool().stats()
+
+
+def get_connection():
+    """获取数据库连接（来自连接池，close() 时归还；事务内返回事务连接）"""
+    uow = current_unit_of_work()
+    if uow is not None:
+        return uow.shared_connection()
+    return get_pool().acquire()
+
+
+@contextmanager
+def _cursor(commit: bool):
+    """借出游标：事务内复用事务连接且不提交，否则单条语句自动提交"""
+    uow = current_unit_of_work()
+    if uow is not None:
+        uow.statements += 1
+        with uow.connection.cursor() as cursor:
+            yield cursor
+        return
+
+    conn = get_pool().acquire()
     try:
         with conn.cursor() as cursor:
-            cursor.execute(sql, params)
-            return cursor.fetchall()
+            yield cursor
+            if commit:
+                conn.commit()
     finally:
         conn.close()
 
 
+def execute_query(sql: str, params: tuple = None) -> list:
+    """执行查询，返回结果列表"""
+    with _cursor(commit=False) as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
 def execute_update(sql: str, params: tuple = None) -> int:
     """执行更新，返回影响行数"""
-    conn = get_connection()
-    try:
-        with conn.cursor() as cursor:
-            result = cursor.execute(sql, params)
-            conn.commit()
-            return result
-    finally:
-        conn.close()
+    with _cursor(commit=True) as cursor:
+        return cursor.execute(sql, params)
 
 
 def execute_insert(sql: str, params: tuple = None) -> int:
     """执行插入，返回自增ID"""
-    conn = get_connection()
-    try:
-        with conn.cursor() as cursor:
-            cursor.execute(sql, params)
-            conn.commit()
-            return cursor.lastrowid
-    finally:
-        conn.close()
+    with _cursor(commit=True) as cursor:
+        cursor.execute(sql, params)
+        return cursor.lastrowid
+
+
+def execute_many(sql: str, seq_params: list) -> int:
+    """批量执行同一条语句（如多行 INSERT），返回影响行数"""
+    if not seq_params:
+        return 0
+    with _cursor(commit=True) as cursor:
+        return cursor.executemany(sql, seq_params)
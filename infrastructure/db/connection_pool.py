@@ -0,0 +1,327 @@
+"""
+MySQL连接池
+
+职责：
+- 线程安全地复用数据库连接，避免每条SQL都重新做TCP握手和认证
+- 支持最小/最大连接数、借出时健康检查（ping）、最大存活时间回收
+- 统计池耗尽（等待/超时）等指标，便于观察高峰期连接压力
+
+不依赖具体驱动：通过 connect 工厂函数创建原始连接，
+原始连接需提供 ping / rollback / close 方法（pymysql.Connection 满足）。
+"""
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Callable, List, Optional
+
+
+class PoolExhaustedError(Exception):
+    """连接池已耗尽且等待超时"""
+    pass
+
+
+@dataclass
+class PoolStats:
+    """连接池统计指标"""
+    created: int = 0                  # 累计新建连接数
+    closed: int = 0                   # 累计关闭连接数
+    checkouts: int = 0                # 累计借出次数
+    waits: int = 0                    # 借出时因池满而等待的次数
+    timeouts: int = 0                 # 等待超时（池耗尽）次数
+    wait_time_total: float = 0.0      # 累计等待时长（秒）
+    health_check_failures: int = 0    # 借出时健康检查失败次数
+    recycled: int = 0                 # 超过最大存活时间被回收的连接数
+    peak_in_use: int = 0              # 同时借出的连接数峰值
+
+
+class _PoolEntry:
+    """池内连接及其时间戳"""
+
+    __slots__ = ("raw", "created_at", "last_used_at")
+
+    def __init__(self, raw):
+        now = time.monotonic()
+        self.raw = raw
+        self.created_at = now
+        self.last_used_at = now
+
+
+class PooledConnection:
+    """借出的连接代理
+
+    与原始连接用法一致（cursor / commit / rollback ...），
+    区别在于 close() 不会真正断开，而是归还给连接池。
+    """
+
+    def __init__(self, pool: "ConnectionPool", entry: _PoolEntry):
+        self._pool = pool
+        self._entry = entry
+
+    def __getattr__(self, name):
+        entry = self.__dict__.get("_entry")
+        if entry is None:
+            raise AttributeError(f"连接已归还，无法访问属性 {name}")
+        return getattr(entry.raw, name)
+
+    @property
+    def raw(self):
+        """原始驱动连接"""
+        return self._entry.raw if self._entry else None
+
+    def close(self) -> None:
+        """归还连接（重复调用无副作用）"""
+        entry, self._entry = self._entry, None
+        if entry is not None:
+            self._pool._release(entry)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class ConnectionPool:
+    """线程安全的数据库连接池"""
+
+    def __init__(
+        self,
+        connect: Callable[[], object],
+        min_size: int = 2,
+        max_size: int = 20,
+        max_lifetime: float = 3600,
+        idle_timeout: float = 300,
+        health_check_interval: float = 30,
+        checkout_timeout: float = 10,
+    ):
+        """
+        Args:
+            connect: 创建原始连接的工厂函数
+            min_size: 最小连接数（首次借出时预热，空闲回收时保留）
+            max_size: 最大连接数（含已借出的）
+            max_lifetime: 单个连接最大存活秒数，超过后在借出/归还时回收
+            idle_timeout: 超出 min_size 的空闲连接在空闲多少秒后关闭
+            health_check_interval: 空闲超过该秒数的连接在借出前先 ping，0 表示每次都检查
+            checkout_timeout: 池满时最长等待秒数，超时抛出 PoolExhaustedError
+        """
+        if max_size < 1:
+            raise ValueError("max_size 必须 >= 1")
+        self._connect = connect
+        self.min_size = max(0, min(min_size, max_size))
+        self.max_size = max_size
+        self.max_lifetime = max_lifetime
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.checkout_timeout = checkout_timeout
+
+        self._cond = threading.Condition(threading.Lock())
+        self._idle: List[_PoolEntry] = []  # 栈：末尾为最近归还的连接
+        self._total = 0                    # 已创建且未关闭的连接数（含预留名额）
+        self._in_use = 0
+        self._warmed = False
+        self._closed = False
+        self._stats = PoolStats()
+
+    # ------------------------------------------------------------
+    # 对外接口
+    # ------------------------------------------------------------
+
+    def acquire(self, timeout: Optional[float] = None) -> PooledConnection:
+        """借出一个连接，池满时最多等待 timeout 秒"""
+        if not self._warmed:
+            self._warmup()
+
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        wait_started = None
+        exhausted = False
+        entry = None
+        stale: List[_PoolEntry] = []
+
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("连接池已关闭")
+            while True:
+                stale.extend(self._pop_idle_expired_locked())
+                if self._idle:
+                    entry = self._idle.pop()
+                    break
+                if self._total < self.max_size:
+                    self._total += 1  # 先占名额，锁外再建连接
+                    break
+
+                now = time.monotonic()
+                if wait_started is None:
+                    wait_started = now
+                    self._stats.waits += 1
+                remaining = deadline - now
+                if remaining <= 0:
+                    self._stats.timeouts += 1
+                    exhausted = True
+                    break
+                self._cond.wait(remaining)
+
+            if wait_started is not None:
+                self._stats.wait_time_total += time.monotonic() - wait_started
+            if not exhausted:
+                self._in_use += 1
+                self._stats.checkouts += 1
+                if self._in_use > self._stats.peak_in_use:
+                    self._stats.peak_in_use = self._in_use
+
+        self._close_entries(stale)
+        if exhausted:
+            raise PoolExhaustedError(
+                f"数据库连接池已耗尽（max_size={self.max_size}，等待 {timeout}s 超时）"
+            )
+
+        try:
+            if entry is not None:
+                entry = self._validate(entry)
+            if entry is None:
+                entry = self._new_entry()
+        except Exception:
+            with self._cond:
+                self._total -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+        return PooledConnection(self, entry)
+
+    def stats(self) -> dict:
+        """返回统计指标快照"""
+        with self._cond:
+            data = asdict(self._stats)
+            data.update(
+                in_use=self._in_use,
+                idle=len(self._idle),
+                total=self._total,
+                min_size=self.min_size,
+                max_size=self.max_size,
+            )
+        return data
+
+    def close_all(self) -> None:
+        """关闭池中所有空闲连接，并拒绝后续借出"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._total -= len(idle)
+            self._cond.notify_all()
+        self._close_entries(idle)
+
+    # ------------------------------------------------------------
+    # 内部实现
+    # ------------------------------------------------------------
+
+    def _warmup(self) -> None:
+        """预热到 min_size 个连接（失败不影响正常借出）"""
+        with self._cond:
+            if self._warmed:
+                return
+            self._warmed = True
+            need = max(0, self.min_size - self._total)
+            self._total += need
+        created: List[_PoolEntry] = []
+        try:
+            for _ in range(need):
+                created.append(self._new_entry())
+        except Exception:
+            pass
+        with self._cond:
+            self._total -= need - len(created)
+            self._idle.extend(created)
+            self._cond.notify_all()
+
+    def _new_entry(self) -> _PoolEntry:
+        raw = self._connect()
+        with self._cond:
+            self._stats.created += 1
+        return _PoolEntry(raw)
+
+    def _validate(self, entry: _PoolEntry) -> Optional[_PoolEntry]:
+        """借出前检查：超龄则回收，空闲过久则 ping；不可用时返回 None"""
+        now = time.monotonic()
+        if self.max_lifetime and now - entry.created_at >= self.max_lifetime:
+            self._discard(entry, recycled=True)
+            return None
+        if now - entry.last_used_at >= self.health_check_interval:
+            try:
+                entry.raw.ping(reconnect=False)
+            except Exception:
+                with self._cond:
+                    self._stats.health_check_failures += 1
+                self._discard(entry)
+                return None
+        return entry
+
+    def _release(self, entry: _PoolEntry) -> None:
+        """归还连接：回滚未提交事务，超龄或异常的连接直接关闭"""
+        reusable = not self._closed
+        if reusable and self.max_lifetime and time.monotonic() - entry.created_at >= self.max_lifetime:
+            reusable = False
+            with self._cond:
+                self._stats.recycled += 1
+        if reusable:
+            try:
+                # 结束可能遗留的事务，避免下一个使用者读到旧快照
+                entry.raw.rollback()
+            except Exception:
+                reusable = False
+
+        with self._cond:
+            self._in_use -= 1
+            if reusable:
+                entry.last_used_at = time.monotonic()
+                self._idle.append(entry)
+            else:
+                self._total -= 1
+            self._cond.notify()
+
+        if not reusable:
+            self._close_raw(entry)
+
+    def _discard(self, entry: _PoolEntry, recycled: bool = False) -> None:
+        """关闭一个已借出名额对应的旧连接，但保留名额给新连接"""
+        if recycled:
+            with self._cond:
+                self._stats.recycled += 1
+        self._close_raw(entry)
+
+    def _pop_idle_expired_locked(self) -> List[_PoolEntry]:
+        """取出超龄或空闲过久（超出 min_size 部分）的连接，需持锁调用"""
+        now = time.monotonic()
+        expired: List[_PoolEntry] = []
+        keep: List[_PoolEntry] = []
+        surplus = len(self._idle) - self.min_size
+        # 栈底是最久未用的连接
+        for entry in self._idle:
+            too_old = self.max_lifetime and now - entry.created_at >= self.max_lifetime
+            too_idle = surplus > 0 and self.idle_timeout and now - entry.last_used_at >= self.idle_timeout
+            if too_old or too_idle:
+                expired.append(entry)
+                surplus -= 1
+                if too_old:
+                    self._stats.recycled += 1
+            else:
+                keep.append(entry)
+        if expired:
+            self._idle = keep
+            self._total -= len(expired)
+        return expired
+
+    def _close_entries(self, entries: List[_PoolEntry]) -> None:
+        for entry in entries:
+            self._close_raw(entry)
+
+    def _close_raw(self, entry: _PoolEntry) -> None:
+        try:
+            entry.raw.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._stats.closed += 1
@@ -1,36 +1,53 @@
-from typing import Optional
+from typing import Dict, List, Optional
 
-from domain.entities.immortalize_pool import ImmortalizePool
+from domain.entities.immortalize_pool import FormationGrant, ImmortalizePool
 from domain.repositories.immortalize_pool_repo import IImmortalizePoolRepo
 from infrastructure.db.connection import execute_query, execute_update
 
 
+_POOL_COLUMNS = """
+    user_id, pool_level, current_exp, formation_level,
+    formation_started_at, formation_ends_at, formation_last_grant_at,
+    created_at, updated_at
+"""
+
+
+def _row_to_pool(row: Dict) -> ImmortalizePool:
+    return ImmortalizePool(
+        user_id=row["user_id"],
+        pool_level=row["pool_level"],
+        current_exp=row["current_exp"],
+        formation_level=row.get("formation_level", 0),
+        formation_started_at=row.get("formation_started_at"),
+        formation_ends_at=row.get("formation_ends_at"),
+        formation_last_grant_at=row.get("formation_last_grant_at"),
+        created_at=row.get("created_at"),
+        updated_at=row.get("updated_at"),
+    )
+
+
 class MySQLImmortalizePoolRepo(IImmortalizePoolRepo):
     """玩家化仙池 MySQL 仓库"""
 
     def get_by_user_id(self, user_id: int) -> Optional[ImmortalizePool]:
-        sql = """
-            SELECT user_id, pool_level, current_exp, formation_level,
-                   formation_started_at, formation_ends_at, formation_last_grant_at,
-                   created_at, updated_at
+        sql = f"""
+            SELECT {_POOL_COLUMNS}
             FROM player_immortalize_pool
             WHERE user_id = %s
         """
         rows = execute_query(sql, (user_id,))
         if not rows:
             return None
-        row = rows[0]
-        return ImmortalizePool(
-            user_id=row["user_id"],
-            pool_level=row["pool_level"],
-            current_exp=row["current_exp"],
-            formation_level=row.get("formation_level", 0),
-            formation_started_at=row.get("formation_started_at"),
-            formation_ends_at=row.get("formation_ends_at"),
-            formation_last_grant_at=row.get("formation_last_grant_at"),
-            created_at=row.get("created_at"),
-            updated_at=row.get("updated_at"),
-        )
+        return _row_to_pool(rows[0])
+
+    def get_active_formations(self) -> List[ImmortalizePool]:
+        sql = f"""
+            SELECT {_POOL_COLUMNS}
+            FROM player_immortalize_pool
+            WHERE formation_started_at IS NOT NULL
+              AND formation_ends_at > NOW()
+        """
+        return [_row_to_pool(row) for row in execute_query(sql) or []]
 
     def upsert(self, pool: ImmortalizePool) -> ImmortalizePool:
         sql = """
@@ -61,3 +78,42 @@ class MySQLImmortalizePoolRepo(IImmortalizePoolRepo):
             ),
         )
         return pool
+
+    def apply_formation_grants(self, grants: List[FormationGrant], chunk_size: int = 500) -> int:
+        """每块一条 UPDATE ... CASE user_id，经验以增量写回（不覆盖结算期间玩家自己的注入/消耗）
+
+        每行以 formation_last_grant_at <=> 结算时读到的值 作为比较条件，
+        两个进程同时结算或重试与上一次运行重叠时，快照已过期的行不会被更新，同一时段不会重复发放。
+        """
+        updated = 0
+        for offset in range(0, len(grants), max(1, chunk_size)):
+            chunk = grants[offset:offset + chunk_size]
+            exp_cases, exp_params = [], []
+            for g in chunk:
+                if g.exp_added > 0:
+                    exp_cases.append("WHEN %s THEN LEAST(current_exp + %s, %s)")
+                    exp_params.extend((g.user_id, g.exp_added, g.capacity))
+
+            sets, params = [], []
+            if exp_cases:
+                sets.append(f"current_exp = CASE user_id {' '.join(exp_cases)} ELSE current_exp END")
+                params.extend(exp_params)
+            for column in (
+                "formation_level", "formation_started_at", "formation_ends_at", "formation_last_grant_at",
+            ):
+                sets.append(f"{column} = CASE user_id {' '.join(['WHEN %s THEN %s'] * len(chunk))} END")
+                for g in chunk:
+                    params.extend((g.user_id, getattr(g, column)))
+            sets.append("updated_at = CURRENT_TIMESTAMP")
+
+            sql = f"""
+                UPDATE player_immortalize_pool
+                SET {', '.join(sets)}
+                WHERE user_id IN ({', '.join(['%s'] * len(chunk))})
+                  AND formation_last_grant_at <=> CASE user_id {' '.join(['WHEN %s THEN %s'] * len(chunk))} END
+            """
+            params.extend(g.user_id for g in chunk)
+            for g in chunk:
+                params.extend((g.user_id, g.expected_last_grant_at))
+            updated += execute_update(sql, tuple(params)) or 0
+        return updated
@@ -5,7 +5,7 @@ from typing import List, Optional
 from datetime import datetime
 from domain.entities.item import InventoryItem, PlayerBag
 from domain.repositories.inventory_repo import IInventoryRepo
-from infrastructure.db.connection import execute_query, execute_update, execute_insert
+from infrastructure.db.connection import execute_query, execute_update, execute_insert, execute_many
 
 
 class MySQLInventoryRepo(IInventoryRepo):
@@ -113,6 +113,36 @@ class MySQLInventoryRepo(IInventoryRepo):
             """
             execute_update(sql, (inv_item.quantity, int(inv_item.is_temporary), inv_item.id))
     
+    def save_many(self, inv_items: List[InventoryItem]) -> None:
+        """批量保存背包物品：已有格子合并为一条 UPDATE，新格子合并为一条多行 INSERT（新格子不回填 id）"""
+        updates = [inv for inv in inv_items if inv.id is not None]
+        inserts = [inv for inv in inv_items if inv.id is None]
+        if updates:
+            cases = " ".join(["WHEN %s THEN %s"] * len(updates))
+            placeholders = ", ".join(["%s"] * len(updates))
+            sql = f"""
+                UPDATE player_inventory
+                SET quantity = CASE id {cases} END,
+                    is_temporary = CASE id {cases} END
+                WHERE id IN ({placeholders})
+            """
+            params = [v for inv in updates for v in (inv.id, inv.quantity)]
+            params += [v for inv in updates for v in (inv.id, int(inv.is_temporary))]
+            params += [inv.id for inv in updates]
+            execute_update(sql, tuple(params))
+        if inserts:
+            now = datetime.now()
+            execute_many(
+                """
+                INSERT INTO player_inventory (user_id, item_id, quantity, is_temporary, created_at)
+                VALUES (%s, %s, %s, %s, %s)
+                """,
+                [
+                    (inv.user_id, inv.item_id, inv.quantity, int(inv.is_temporary), inv.created_at or now)
+                    for inv in inserts
+                ],
+            )
+
     def delete(self, inv_item_id: int) -> None:
         """删除背包物品（数量为0时）"""
         sql = "DELETE FROM player_inventory WHERE id = %s"
@@ -0,0 +1,31 @@
+"""
+MySQL版排行榜数据源：每次对账各表只扫描一遍
+"""
+from typing import Any, Dict, List
+
+from infrastructure.db.connection import execute_query
+
+
+class MySQLLeaderboardRepo:
+    """排行榜对账用的全量读取"""
+
+    def load_players(self) -> List[Dict[str, Any]]:
+        return execute_query("SELECT user_id, nickname, level, exp FROM player") or []
+
+    def load_arena_success(self) -> List[Dict[str, Any]]:
+        sql = """
+            SELECT s.user_id, s.rank_name, SUM(s.success_count) AS success_count
+            FROM arena_stats s
+            JOIN player p ON s.user_id = p.user_id
+            GROUP BY s.user_id, s.rank_name
+        """
+        return execute_query(sql) or []
+
+    def load_tower_floors(self, tower_type: str) -> List[Dict[str, Any]]:
+        sql = """
+            SELECT t.user_id, t.max_floor_record AS max_floor
+            FROM tower_state t
+            JOIN player p ON t.user_id = p.user_id
+            WHERE t.tower_type = %s
+        """
+        return execute_query(sql, (tower_type,)) or []
@@ -2,9 +2,12 @@
 魔魂仓库 - MySQL实现
 """
 from typing import List, Optional, Dict
-from infrastructure.db.connection import get_connection
+from infrastructure.db.connection import get_connection, execute_query, execute_update
 from domain.entities.mosoul import MoSoul, MoSoulGrade, BeastMoSoulSlot, SoulStorage, HuntingState, GlobalPityCounter
-from domain.repositories.mosoul_repo import IMoSoulRepo, ISoulStorageRepo, IBeastMoSoulRepo, IHuntingStateRepo, IGlobalPityRepo
+from domain.repositories.mosoul_repo import (
+    IMoSoulRepo, ISoulStorageRepo, IBeastMoSoulRepo, IHuntingStateRepo, IGlobalPityRepo, IMoSoulBatchHuntRepo,
+)
+from domain.services.mosoul_system import NORMAL_HEAVEN_PITY_COPPER, NORMAL_HEAVEN_PITY_COUNTER_KEY
 
 
 def get_mosoul_by_id(mosoul_id: int) -> Optional[Dict]:
@@ -49,6 +52,23 @@ def get_mosouls_by_beast(beast_id: int) -> List[Dict]:
         conn.close()
 
 
+def get_mosouls_by_beasts(beast_ids: List[int]) -> List[Dict]:
+    """批量获取多只幻兽已装备的魔魂"""
+    if not beast_ids:
+        return []
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            format_strings = ','.join(['%s'] * len(beast_ids))
+            cursor.execute(
+                f"SELECT * FROM player_mosoul WHERE beast_id IN ({format_strings}) ORDER BY id",
+                tuple(beast_ids)
+            )
+            return cursor.fetchall()
+    finally:
+        conn.close()
+
+
 def get_unequipped_mosouls(user_id: int) -> List[Dict]:
     """获取玩家未装备的魔魂（储魂器中的）"""
     conn = get_connection()
@@ -214,10 +234,20 @@ class MySQLMoSoulRepo(IMoSoulRepo):
         rows = get_mosouls_by_user(user_id)
         return [self._row_to_entity(row) for row in rows]
 
+    def get_unequipped_by_user_id(self, user_id: int) -> List[MoSoul]:
+        rows = get_unequipped_mosouls(user_id)
+        return [self._row_to_entity(row) for row in rows]
+
     def get_equipped_by_beast_id(self, beast_id: int) -> List[MoSoul]:
         rows = get_mosouls_by_beast(beast_id)
         return [self._row_to_entity(row) for row in rows]
 
+    def get_equipped_by_beast_ids(self, beast_ids: List[int]) -> Dict[int, List[MoSoul]]:
+        result: Dict[int, List[MoSoul]] = {bid: [] for bid in beast_ids}
+        for row in get_mosouls_by_beasts(list(result.keys())):
+            result[row['beast_id']].append(self._row_to_entity(row))
+        return result
+
     def save(self, soul: MoSoul) -> MoSoul:
         if soul.id:
             update_mosoul(soul.id, soul.level, soul.exp, soul.beast_id)
@@ -268,6 +298,33 @@ class MySQLBeastMoSoulRepo(IBeastMoSoulRepo):
             equipped_souls=equipped_souls
         )
 
+    def get_by_beast_ids(self, beast_ids: List[int]) -> Dict[int, BeastMoSoulSlot]:
+        """批量获取槽位：魔魂与幻兽等级各一条 IN 查询"""
+        beast_ids = list(dict.fromkeys(beast_ids))
+        if not beast_ids:
+            return {}
+        souls_by_beast = self.mosoul_repo.get_equipped_by_beast_ids(beast_ids)
+        conn = get_connection()
+        try:
+            with conn.cursor() as cursor:
+                format_strings = ','.join(['%s'] * len(beast_ids))
+                cursor.execute(
+                    f"SELECT id, level FROM player_beast WHERE id IN ({format_strings})",
+                    tuple(beast_ids)
+                )
+                levels = {row['id']: row['level'] for row in cursor.fetchall()}
+        finally:
+            conn.close()
+
+        return {
+            bid: BeastMoSoulSlot(
+                beast_id=bid,
+                beast_level=levels.get(bid, 1),
+                equipped_souls=souls_by_beast.get(bid, []),
+            )
+            for bid in beast_ids
+        }
+
     def get_by_user_id(self, user_id: int) -> List[BeastMoSoulSlot]:
         # 获取该玩家所有幻兽ID
         conn = get_connection()
@@ -458,3 +515,155 @@ class MySQLGlobalPityRepo(IGlobalPityRepo):
                 conn.commit()
         finally:
             conn.close()
+
+
+_hunting_tables_ready = False
+
+
+def ensure_hunting_tables() -> None:
+    """建立猎魂状态 / 全服保底表并初始化保底计数行（含 DDL，须在事务外调用）"""
+    global _hunting_tables_ready
+    if _hunting_tables_ready:
+        return
+
+    execute_update(
+        """
+        CREATE TABLE IF NOT EXISTS mosoul_hunting_state (
+            user_id BIGINT UNSIGNED PRIMARY KEY,
+            field_type VARCHAR(20) NOT NULL DEFAULT 'normal',
+            normal_available_npcs JSON NOT NULL DEFAULT ('["amy"]'),
+            advanced_available_npcs JSON NOT NULL DEFAULT ('["wote"]'),
+            soul_charm_consumed BIGINT UNSIGNED NOT NULL DEFAULT 0,
+            copper_consumed BIGINT UNSIGNED NOT NULL DEFAULT 0,
+            updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+        """
+    )
+
+    execute_update(
+        """
+        CREATE TABLE IF NOT EXISTS mosoul_global_pity (
+            counter_key VARCHAR(50) PRIMARY KEY,
+            count INT UNSIGNED NOT NULL DEFAULT 0,
+            pity_threshold INT UNSIGNED NOT NULL DEFAULT 40000,
+            soul_charm_consumed_global BIGINT UNSIGNED NOT NULL DEFAULT 0,
+            copper_consumed_global BIGINT UNSIGNED NOT NULL DEFAULT 0,
+            updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+        """
+    )
+
+    try:
+        execute_update(
+            """
+            ALTER TABLE mosoul_global_pity
+            ADD COLUMN copper_consumed_global BIGINT UNSIGNED NOT NULL DEFAULT 0
+            """
+        )
+    except Exception:
+        pass
+
+    try:
+        execute_update(
+            """
+            INSERT INTO mosoul_global_pity (counter_key, count, pity_threshold, soul_charm_consumed_global, copper_consumed_global)
+            VALUES ('kevin_adv_pity', 0, 40000, 0, 0)
+            ON DUPLICATE KEY UPDATE counter_key = VALUES(counter_key)
+            """
+        )
+        execute_update(
+            """
+            INSERT INTO mosoul_global_pity (counter_key, count, pity_threshold, soul_charm_consumed_global, copper_consumed_global)
+            VALUES (%s, 0, %s, 0, 0)
+            ON DUPLICATE KEY UPDATE counter_key = VALUES(counter_key)
+            """,
+            (NORMAL_HEAVEN_PITY_COUNTER_KEY, NORMAL_HEAVEN_PITY_COPPER),
+        )
+    except Exception:
+        execute_update(
+            """
+            INSERT INTO mosoul_global_pity (counter_key, count, pity_threshold, soul_charm_consumed_global)
+            VALUES ('kevin_adv_pity', 0, 40000, 0)
+            ON DUPLICATE KEY UPDATE counter_key = VALUES(counter_key)
+            """
+        )
+
+    _hunting_tables_ready = True
+
+
+class MySQLMoSoulBatchHuntRepo(IMoSoulBatchHuntRepo):
+    """一键猎魂落库：保底计数加行锁读取，新魔魂一条多行 INSERT
+
+    各方法应在同一事务内调用；调用前先执行 ensure_hunting_tables()（DDL 会隐式提交事务）。
+    """
+
+    def count_unequipped(self, user_id: int) -> int:
+        rows = execute_query(
+            "SELECT COUNT(*) AS cnt FROM player_mosoul WHERE user_id = %s AND beast_id IS NULL",
+            (user_id,),
+        )
+        return int(rows[0]['cnt']) if rows else 0
+
+    def lock_personal_consumed(self, user_id: int) -> tuple[int, int]:
+        execute_update(
+            """
+            INSERT IGNORE INTO mosoul_hunting_state (user_id, field_type, normal_available_npcs, advanced_available_npcs, soul_charm_consumed, copper_consumed)
+            VALUES (%s, 'normal', '["amy"]', '["wote"]', 0, 0)
+            """,
+            (user_id,),
+        )
+        rows = execute_query(
+            "SELECT soul_charm_consumed, copper_consumed FROM mosoul_hunting_state WHERE user_id = %s FOR UPDATE",
+            (user_id,),
+        )
+        row = rows[0] if rows else {}
+        return int(row.get('soul_charm_consumed', 0) or 0), int(row.get('copper_consumed', 0) or 0)
+
+    def save_personal_consumed(self, user_id: int, soul_charm_consumed: int, copper_consumed: int) -> None:
+        execute_update(
+            "UPDATE mosoul_hunting_state SET soul_charm_consumed = %s, copper_consumed = %s WHERE user_id = %s",
+            (int(soul_charm_consumed), int(copper_consumed), user_id),
+        )
+
+    def lock_global_consumed(self, counter_key: str) -> tuple[int, int]:
+        rows = execute_query(
+            """
+            SELECT soul_charm_consumed_global, copper_consumed_global
+            FROM mosoul_global_pity WHERE counter_key = %s FOR UPDATE
+            """,
+            (counter_key,),
+        )
+        row = rows[0] if rows else {}
+        return int(row.get('soul_charm_consumed_global', 0) or 0), int(row.get('copper_consumed_global', 0) or 0)
+
+    def save_global_consumed(self, counter_key: str, soul_charm_consumed: int, copper_consumed: int) -> None:
+        execute_update(
+            """
+            UPDATE mosoul_global_pity
+            SET soul_charm_consumed_global = %s, copper_consumed_global = %s
+            WHERE counter_key = %s
+            """,
+            (int(soul_charm_consumed), int(copper_consumed), counter_key),
+        )
+
+    def create_mosouls(self, user_id: int, template_ids: List[int]) -> List[int]:
+        if not template_ids:
+            return []
+        conn = get_connection()
+        try:
+            with conn.cursor() as cursor:
+                cursor.executemany(
+                    "INSERT INTO player_mosoul (user_id, template_id, level, exp) VALUES (%s, %s, 1, 0)",
+                    [(user_id, int(t)) for t in template_ids],
+                )
+                first_id = cursor.lastrowid
+                # 多行 INSERT 的自增 ID 不保证连续，按本事务可见的新行回读
+                cursor.execute(
+                    "SELECT id FROM player_mosoul WHERE user_id = %s AND id >= %s ORDER BY id LIMIT %s",
+                    (user_id, first_id, len(template_ids)),
+                )
+                ids = [row['id'] for row in cursor.fetchall()]
+                conn.commit()
+                return ids
+        finally:
+            conn.close()
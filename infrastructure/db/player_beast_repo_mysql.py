@@ -2,7 +2,7 @@
 MySQL版玩家幻兽仓库
 """
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 import json
 
 from infrastructure.db.connection import execute_query, execute_update, execute_insert
@@ -129,6 +129,21 @@ class MySQLPlayerBeastRepo:
         rows = execute_query(sql, (user_id,))
         return [PlayerBeastData(**row) for row in rows]
 
+    def get_team_beasts_by_users(self, user_ids: List[int]) -> Dict[int, List[PlayerBeastData]]:
+        """批量获取多名玩家的战斗队幻兽（单条 IN 查询），返回 {user_id: [幻兽]}"""
+        result: Dict[int, List[PlayerBeastData]] = {uid: [] for uid in user_ids}
+        if not result:
+            return result
+        placeholders = ",".join(["%s"] * len(result))
+        sql = f"""
+            SELECT * FROM player_beast
+            WHERE user_id IN ({placeholders}) AND is_in_team = 1
+            ORDER BY user_id ASC, team_position ASC
+        """
+        for row in execute_query(sql, tuple(result.keys())):
+            result[row['user_id']].append(PlayerBeastData(**row))
+        return result
+
     def get_by_id(self, beast_id: int) -> Optional[PlayerBeastData]:
         """根据ID获取幻兽"""
         sql = "SELECT * FROM player_beast WHERE id = %s"
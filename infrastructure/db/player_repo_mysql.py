@@ -1,7 +1,7 @@
 """
 MySQL版玩家仓库
 """
-from typing import List, Optional
+from typing import Callable, List, Optional
 from datetime import datetime, timedelta
 from domain.entities.player import Player, ZhenyaoFloor
 from domain.repositories.player_repo import IPlayerRepo, IZhenyaoRepo
@@ -10,6 +10,17 @@ from infrastructure.db.connection import execute_query, execute_update, execute_
 
 class MySQLPlayerRepo(IPlayerRepo):
     """MySQL版玩家存储"""
+
+    def __init__(self):
+        self._save_listeners: List[Callable[[Player], None]] = []
+
+    def add_save_listener(self, listener: Callable[[Player], None]) -> None:
+        """注册存档监听（如排行榜增量更新），在 save/create 写库后调用"""
+        self._save_listeners.append(listener)
+
+    def _notify_saved(self, player: Player) -> None:
+        for listener in self._save_listeners:
+            listener(player)
     
     def get_by_id(self, user_id: int) -> Optional[Player]:
         """获取玩家信息"""
@@ -138,6 +149,7 @@ class MySQLPlayerRepo(IPlayerRepo):
             player.cultivation_start_time, player.cultivation_duration, player.cultivation_area, player.cultivation_dungeon,
             player.user_id
         ))
+        self._notify_saved(player)
     
     def create(self, player: Player) -> None:
         """创建新玩家"""
@@ -149,6 +161,7 @@ class MySQLPlayerRepo(IPlayerRepo):
             player.user_id, player.nickname, player.level, player.exp, player.gold, player.silver_diamond, player.yuanbao, player.dice,
             player.location, player.vip_level, player.vip_exp
         ))
+        self._notify_saved(player)
     
     def create_with_auth(self, username: str, password: str, player: Player) -> Optional[int]:
         """创建带账号密码的新玩家，返回user_id"""
@@ -301,8 +314,12 @@ def get_player_by_id(user_id: int) -> Optional[dict]:
     return None
 
 
-def update_gold(user_id: int, delta: int) -> bool:
-    """更新玩家铜钱（增加或减少）"""
-    sql = "UPDATE player SET gold = gold + %s WHERE user_id = %s"
-    affected = execute_update(sql, (delta, user_id))
+def update_gold(user_id: int, delta: int, min_balance: Optional[int] = None) -> bool:
+    """更新玩家铜钱（增加或减少）；传 min_balance 时更新后余额低于它则不更新并返回 False"""
+    if min_balance is None:
+        sql = "UPDATE player SET gold = gold + %s WHERE user_id = %s"
+        affected = execute_update(sql, (delta, user_id))
+    else:
+        sql = "UPDATE player SET gold = gold + %s WHERE user_id = %s AND gold + %s >= %s"
+        affected = execute_update(sql, (delta, user_id, delta, min_balance))
     return affected > 0
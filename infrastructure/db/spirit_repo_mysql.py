@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from domain.entities.spirit import Spirit, SpiritLine
 from domain.repositories.spirit_repo import ISpiritRepo
@@ -29,6 +29,17 @@ class MySQLSpiritRepo(ISpiritRepo):
         rows = execute_query(sql, (beast_id,))
         return [self._row_to_spirit(r) for r in rows]
 
+    def get_by_beast_ids(self, beast_ids: List[int]) -> Dict[int, List[Spirit]]:
+        """批量获取多只幻兽装备的战灵（单条 IN 查询）"""
+        result: Dict[int, List[Spirit]] = {bid: [] for bid in beast_ids}
+        if not beast_ids:
+            return result
+        placeholders = ",".join(["%s"] * len(result))
+        sql = f"SELECT * FROM {self.TABLE_NAME} WHERE beast_id IN ({placeholders}) ORDER BY id DESC"
+        for r in execute_query(sql, tuple(result.keys())):
+            result[r["beast_id"]].append(self._row_to_spirit(r))
+        return result
+
     def save(self, spirit: Spirit) -> None:
         lines = list(spirit.lines or [])
         while len(lines) < 3:
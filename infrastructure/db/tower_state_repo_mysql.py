@@ -1,7 +1,7 @@
 """
 MySQL版闯塔状态仓库
 """
-from typing import Optional
+from typing import Callable, List, Optional
 from datetime import date
 
 from domain.entities.tower import TowerState
@@ -11,6 +11,13 @@ from infrastructure.db.connection import execute_query, execute_update
 
 class MySQLTowerStateRepo(ITowerStateRepo):
     """MySQL版闯塔状态存储"""
+
+    def __init__(self):
+        self._save_listeners: List[Callable[[TowerState], None]] = []
+
+    def add_save_listener(self, listener: Callable[[TowerState], None]) -> None:
+        """注册存档监听（如通天塔排行榜增量更新），在 save 写库后调用"""
+        self._save_listeners.append(listener)
     
     def get_by_user_id(self, user_id: int, tower_type: str) -> Optional[TowerState]:
         """获取用户的闯塔状态"""
@@ -58,3 +65,5 @@ class MySQLTowerStateRepo(ITowerStateRepo):
             state.today_count,
             state.last_challenge_date,
         ))
+        for listener in self._save_listeners:
+            listener(state)
@@ -0,0 +1,145 @@
+"""
+数据库工作单元（请求级事务）
+
+用法：
+    from infrastructure.db.unit_of_work import transaction
+
+    with transaction():
+        repo_a.save(...)
+        repo_b.update(...)
+    # 退出时统一 COMMIT；块内抛出异常则整体 ROLLBACK
+
+在事务上下文内，execute_query / execute_update / execute_insert 以及
+get_connection() 都会复用同一个连接，且不再逐条提交，
+因此所有基于 infrastructure.db.connection 的 MySQL 仓库无需改动即可加入事务。
+
+- 嵌套调用 transaction() 会并入最外层事务，只有最外层负责提交/回滚。
+- 连接在第一次执行 SQL 时才借出，未执行 SQL 的事务不占用连接。
+- on_commit() 注册的回调在提交成功后执行（适合刷新缓存等副作用）；
+  after_commit() 在事务外调用时立即执行，供事务内外都会调用的缓存更新使用。
+"""
+from __future__ import annotations
+
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, List, Optional
+
+
+_current: ContextVar[Optional["UnitOfWork"]] = ContextVar("db_unit_of_work", default=None)
+
+
+class UnitOfWork:
+    """一次业务操作内共享的数据库连接与事务"""
+
+    def __init__(self):
+        self._conn = None
+        self._after_commit: List[Callable[[], None]] = []
+        self.statements = 0  # 本事务内执行的SQL条数
+
+    @property
+    def connection(self):
+        """事务连接（首次访问时从连接池借出）"""
+        if self._conn is None:
+            from infrastructure.db.connection import get_pool
+            self._conn = get_pool().acquire()
+        return self._conn
+
+    def shared_connection(self) -> "_SharedConnection":
+        """供 get_connection() 调用方使用的连接视图：commit/close 交由事务统一处理"""
+        return _SharedConnection(self)
+
+    def on_commit(self, callback: Callable[[], None]) -> None:
+        """注册提交成功后执行的回调"""
+        self._after_commit.append(callback)
+
+    def _commit(self) -> None:
+        if self._conn is not None:
+            self._conn.commit()
+
+    def _rollback(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.rollback()
+            except Exception:
+                pass
+        self._after_commit.clear()
+
+    def _close(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            conn.close()
+
+    def _run_after_commit(self) -> None:
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            callback()
+
+
+class _SharedConnection:
+    """事务内 get_connection() 返回的连接
+
+    旧代码习惯 `conn.commit(); conn.close()`，这里都改为空操作，
+    由最外层 transaction() 统一提交并归还连接。
+    """
+
+    def __init__(self, uow: UnitOfWork):
+        self._uow = uow
+
+    def __getattr__(self, name):
+        return getattr(self._uow.connection, name)
+
+    def cursor(self, *args, **kwargs):
+        self._uow.statements += 1
+        return self._uow.connection.cursor(*args, **kwargs)
+
+    def commit(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def current_unit_of_work() -> Optional[UnitOfWork]:
+    """当前上下文中的工作单元，没有事务时返回 None"""
+    return _current.get()
+
+
+def after_commit(callback: Callable[[], None]) -> None:
+    """处于事务中则在提交成功后执行 callback（回滚则丢弃），否则立即执行"""
+    uow = _current.get()
+    if uow is not None:
+        uow.on_commit(callback)
+    else:
+        callback()
+
+
+@contextmanager
+def transaction() -> Iterator[UnitOfWork]:
+    """开启（或加入已有的）数据库事务"""
+    outer = _current.get()
+    if outer is not None:
+        yield outer
+        return
+
+    uow = UnitOfWork()
+    token = _current.set(uow)
+    try:
+        yield uow
+        uow._commit()
+    except BaseException:
+        uow._rollback()
+        raise
+    finally:
+        _current.reset(token)
+        uow._close()
+    uow._run_after_commit()
+
+
+def transactional(func):
+    """装饰器：整个函数在一个事务内执行"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with transaction():
+            return func(*args, **kwargs)
+    return wrapper
@@ -1,11 +1,12 @@
 """
 镇妖战斗记录仓库 - MySQL实现
 """
-from typing import List, Optional
+from typing import Callable, List, Optional
 from dataclasses import dataclass
 from datetime import datetime
 import json
 
+from domain.services.battle_report import decode_battle_report
 from infrastructure.db.connection import execute_query, execute_insert, execute_update
 
 
@@ -40,6 +41,19 @@ class ZhenyaoBattleLog:
 
 class MySQLZhenyaoBattleRepo:
     """镇妖战斗记录仓库"""
+
+    # 列表查询只取对阵信息，不读战报列
+    LIST_COLUMNS = (
+        "id, floor, attacker_id, attacker_name, defender_id, defender_name, "
+        "is_success, remaining_seconds, created_at"
+    )
+
+    def __init__(self):
+        self._save_listeners: List[Callable[[ZhenyaoBattleLog], None]] = []
+
+    def add_save_listener(self, listener: Callable[[ZhenyaoBattleLog], None]) -> None:
+        """注册写入监听（如动态信息流），在 save_battle 写库后调用，战报内容不随记录传递"""
+        self._save_listeners.append(listener)
     
     def save_battle(
         self,
@@ -50,115 +64,109 @@ class MySQLZhenyaoBattleRepo:
         defender_name: str,
         is_success: bool,
         remaining_seconds: int,
-        battle_data: dict
+        battle_data: Optional[dict] = None,
+        battle_report: Optional[bytes] = None,
     ) -> int:
-        """保存战斗记录，返回记录ID"""
+        """保存战斗记录，返回记录ID
+
+        优先传紧凑战报 battle_report（此时 battle_data 列留空），读取时再还原。
+        """
         sql = """
             INSERT INTO zhenyao_battle_log 
             (floor, attacker_id, attacker_name, defender_id, defender_name, 
-             is_success, remaining_seconds, battle_data)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+             is_success, remaining_seconds, battle_data, battle_report)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
         """
-        battle_json = json.dumps(battle_data, ensure_ascii=False)
-        return execute_insert(sql, (
+        battle_json = None if battle_report is not None else json.dumps(battle_data or {}, ensure_ascii=False)
+        battle_id = execute_insert(sql, (
             floor, attacker_id, attacker_name, defender_id, defender_name,
-            1 if is_success else 0, remaining_seconds, battle_json
+            1 if is_success else 0, remaining_seconds, battle_json, battle_report
         ))
+        if self._save_listeners:
+            log = ZhenyaoBattleLog(
+                id=battle_id,
+                floor=floor,
+                attacker_id=attacker_id,
+                attacker_name=attacker_name,
+                defender_id=defender_id,
+                defender_name=defender_name,
+                is_success=bool(is_success),
+                remaining_seconds=remaining_seconds,
+                battle_data={},
+                created_at=datetime.now().replace(microsecond=0),
+            )
+            for listener in self._save_listeners:
+                listener(log)
+        return battle_id
+    
+    def _row_to_log(self, row) -> ZhenyaoBattleLog:
+        battle_data = {}
+        try:
+            if row.get('battle_report'):
+                battle_data = decode_battle_report(row['battle_report'])
+            elif row.get('battle_data'):
+                battle_data = json.loads(row['battle_data'])
+        except Exception:
+            battle_data = {}
+        return ZhenyaoBattleLog(
+            id=row['id'],
+            floor=row['floor'],
+            attacker_id=row['attacker_id'],
+            attacker_name=row['attacker_name'],
+            defender_id=row['defender_id'],
+            defender_name=row['defender_name'],
+            is_success=bool(row['is_success']),
+            remaining_seconds=row['remaining_seconds'],
+            battle_data=battle_data,
+            created_at=row['created_at'],
+        )
     
     def get_by_id(self, battle_id: int) -> Optional[ZhenyaoBattleLog]:
         """根据ID获取战斗记录"""
         sql = """
             SELECT id, floor, attacker_id, attacker_name, defender_id, defender_name,
-                   is_success, remaining_seconds, battle_data, created_at
+                   is_success, remaining_seconds, battle_data, battle_report, created_at
             FROM zhenyao_battle_log WHERE id = %s
         """
         rows = execute_query(sql, (battle_id,))
         if rows:
-            row = rows[0]
-            battle_data = {}
-            if row['battle_data']:
-                try:
-                    battle_data = json.loads(row['battle_data'])
-                except:
-                    pass
-            return ZhenyaoBattleLog(
-                id=row['id'],
-                floor=row['floor'],
-                attacker_id=row['attacker_id'],
-                attacker_name=row['attacker_name'],
-                defender_id=row['defender_id'],
-                defender_name=row['defender_name'],
-                is_success=bool(row['is_success']),
-                remaining_seconds=row['remaining_seconds'],
-                battle_data=battle_data,
-                created_at=row['created_at'],
-            )
+            return self._row_to_log(rows[0])
         return None
     
-    def get_recent_battles(self, limit: int = 20) -> List[ZhenyaoBattleLog]:
-        """获取最近的战斗记录（全服动态）"""
-        sql = """
-            SELECT id, floor, attacker_id, attacker_name, defender_id, defender_name,
-                   is_success, remaining_seconds, battle_data, created_at
-            FROM zhenyao_battle_log 
-            ORDER BY created_at DESC
+    def get_recent_battles(self, limit: int = 20, before_id: Optional[int] = None) -> List[ZhenyaoBattleLog]:
+        """获取最近的战斗记录（全服动态，按 ID 倒序，不读取战报内容；before_id 用于翻页）"""
+        bound = "WHERE id < %s" if before_id is not None else ""
+        bound_params = (before_id,) if before_id is not None else ()
+        sql = f"""
+            SELECT {self.LIST_COLUMNS}
+            FROM zhenyao_battle_log {bound}
+            ORDER BY id DESC
             LIMIT %s
         """
-        rows = execute_query(sql, (limit,))
-        result = []
-        for row in rows:
-            battle_data = {}
-            if row['battle_data']:
-                try:
-                    battle_data = json.loads(row['battle_data'])
-                except:
-                    pass
-            result.append(ZhenyaoBattleLog(
-                id=row['id'],
-                floor=row['floor'],
-                attacker_id=row['attacker_id'],
-                attacker_name=row['attacker_name'],
-                defender_id=row['defender_id'],
-                defender_name=row['defender_name'],
-                is_success=bool(row['is_success']),
-                remaining_seconds=row['remaining_seconds'],
-                battle_data=battle_data,
-                created_at=row['created_at'],
-            ))
-        return result
+        rows = execute_query(sql, (*bound_params, limit))
+        return [self._row_to_log(row) for row in rows]
     
-    def get_user_battles(self, user_id: int, limit: int = 20) -> List[ZhenyaoBattleLog]:
-        """获取某玩家相关的战斗记录（个人动态）"""
-        sql = """
-            SELECT id, floor, attacker_id, attacker_name, defender_id, defender_name,
-                   is_success, remaining_seconds, battle_data, created_at
-            FROM zhenyao_battle_log 
-            WHERE attacker_id = %s OR defender_id = %s
-            ORDER BY created_at DESC
+    def get_user_battles(self, user_id: int, limit: int = 20, before_id: Optional[int] = None) -> List[ZhenyaoBattleLog]:
+        """获取某玩家相关的战斗记录（个人动态，按 ID 倒序，不读取战报内容；before_id 用于翻页）
+
+        挑战者 / 被挑战者两条索引各取一页再合并，避免 OR 条件退化为全表排序。
+        """
+        bound = "AND id < %s" if before_id is not None else ""
+        bound_params = (before_id,) if before_id is not None else ()
+        sql = f"""
+            SELECT * FROM (
+                (SELECT {self.LIST_COLUMNS} FROM zhenyao_battle_log
+                 WHERE attacker_id = %s {bound} ORDER BY id DESC LIMIT %s)
+                UNION
+                (SELECT {self.LIST_COLUMNS} FROM zhenyao_battle_log
+                 WHERE defender_id = %s {bound} ORDER BY id DESC LIMIT %s)
+            ) AS t
+            ORDER BY id DESC
             LIMIT %s
         """
-        rows = execute_query(sql, (user_id, user_id, limit))
-        result = []
-        for row in rows:
-            battle_data = {}
-            if row['battle_data']:
-                try:
-                    battle_data = json.loads(row['battle_data'])
-                except:
-                    pass
-            result.append(ZhenyaoBattleLog(
-                id=row['id'],
-                floor=row['floor'],
-                attacker_id=row['attacker_id'],
-                attacker_name=row['attacker_name'],
-                defender_id=row['defender_id'],
-                defender_name=row['defender_name'],
-                is_success=bool(row['is_success']),
-                remaining_seconds=row['remaining_seconds'],
-                battle_data=battle_data,
-                created_at=row['created_at'],
-            ))
-        return result
+        params = (user_id, *bound_params, limit, user_id, *bound_params, limit, limit)
+        rows = execute_query(sql, params)
+        return [self._row_to_log(row) for row in rows]
 
 
 class MySQLZhenyaoDailyCountRepo:
@@ -20,6 +20,13 @@ class InMemoryBoneRepo(IBoneRepo):
     def get_by_beast_id(self, beast_id: int) -> List[BeastBone]:
         return [b for b in self._data.values() if b.beast_id == beast_id]
 
+    def get_by_beast_ids(self, beast_ids: List[int]) -> Dict[int, List[BeastBone]]:
+        result: Dict[int, List[BeastBone]] = {bid: [] for bid in beast_ids}
+        for b in self._data.values():
+            if b.beast_id in result:
+                result[b.beast_id].append(b)
+        return result
+
     def save(self, bone: BeastBone) -> None:
         if bone.id is None:
             bone.id = self._next_id
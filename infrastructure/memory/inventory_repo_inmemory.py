@@ -34,6 +34,10 @@ class InMemoryInventoryRepo(IInventoryRepo):
             self._next_id += 1
         self._data[inv_item.id] = inv_item
 
+    def save_many(self, inv_items: List[InventoryItem]) -> None:
+        for inv in inv_items:
+            self.save(inv)
+
     def delete(self, inv_item_id: int) -> None:
         if inv_item_id in self._data:
             del self._data[inv_item_id]
\ No newline at end of file
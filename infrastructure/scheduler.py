@@ -4,66 +4,117 @@
 职责：
 - 每日 00:05 自动触发猛虎战场和飞鹤战场开赛
 - 防止同一天重复开赛（检查当日是否已有战报）
-- 每分钟自动增加所有玩家的活力值（受VIP等级上限限制）
+- 每分钟自动增加所有玩家的活力值（受VIP等级上限限制；ENERGY_REGEN_MODE=lazy 时关闭）
+- 联盟战开战时间（周三、周六 20:00）为每块土地配对，之后每隔几分钟为各土地推进一回合
 """
 
 from __future__ import annotations
 
 import logging
-import json
-from datetime import date
-from typing import Optional
-from pathlib import Path
+import multiprocessing
+import os
+import time
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Optional, Tuple
 
 from apscheduler.schedulers.background import BackgroundScheduler
 
+from infrastructure.config.registry import get_derived_config
 from infrastructure.db.connection import execute_query, execute_update
 from infrastructure.db.player_repo_mysql import MySQLPlayerRepo
 from infrastructure.db.player_beast_repo_mysql import MySQLPlayerBeastRepo
 from infrastructure.db.immortalize_pool_repo_mysql import MySQLImmortalizePoolRepo
 
 from infrastructure.db.battlefield_repo_mysql import MySQLBattlefieldBattleRepo
+from infrastructure.db.spirit_repo_mysql import MySQLSpiritRepo
+from infrastructure.db.bone_repo_mysql import MySQLBoneRepo
+from infrastructure.db.mosoul_repo_mysql import MySQLMoSoulRepo, MySQLBeastMoSoulRepo
 from application.services.battlefield_service import BattlefieldService
+from application.services.beast_pvp_service import BeastPvpService
 from application.services.immortalize_pool_service import ImmortalizePoolService
+from application.services.alliance_service import AllianceService
+
+if TYPE_CHECKING:
+    from application.services.alliance_battle_service import AllianceBattleService
 
 logger = logging.getLogger(__name__)
 
 _scheduler: Optional[BackgroundScheduler] = None
 
 
+# 活力恢复模式（两种模式速率与上限相同：每分钟 +1，直到VIP活力上限）：
+# - "job"（默认）：每分钟由调度器统一为所有未满的玩家 +1，并为所有玩家记下恢复时间，读取时不再重复补算
+# - "lazy"：不注册定时任务，读取玩家时由 Player.recover_energy 按 last_energy_recovery_time 补算
+ENERGY_REGEN_MODE = os.environ.get("ENERGY_REGEN_MODE", "job").strip().lower()
+
+# 参与定时恢复的VIP等级范围（与配置缺省值 100 对应）
+_ENERGY_VIP_LEVELS = range(11)
+_DEFAULT_ENERGY_MAX = 100
+
+# 单次恢复任务超过该耗时（秒）记 warning
+_ENERGY_REGEN_SLOW_SECONDS = 1.0
+
+# 化仙阵批量结算：每条 UPDATE 覆盖的化仙池数；单次结算超过该耗时（秒）记 warning
+_IMMORTALIZE_SETTLE_CHUNK = 500
+_IMMORTALIZE_SETTLE_SLOW_SECONDS = 5.0
+
+
+def _vip_energy_max_map(data: dict) -> dict:
+    return {
+        lv_data.get("level", 0): lv_data.get("privileges", {}).get("vitality_max", 100)
+        for lv_data in data.get("vip_levels", [])
+    }
+
+
 def _load_vip_energy_max_config() -> dict:
-    """加载VIP活力上限配置"""
-    base_dir = Path(__file__).resolve().parents[1]
-    config_path = base_dir / "configs" / "vip_privileges.json"
-    energy_max_map = {}
+    """VIP等级 -> 活力上限（配置注册表共享，vip_privileges.json 变化后自动重建）"""
+    try:
+        return get_derived_config("vip_privileges.json", _vip_energy_max_map)
+    except Exception as e:
+        logger.warning(f"[Scheduler] 加载VIP配置失败: {e}")
+        return {}
+
+
+def _compile_energy_regen_statement(data: dict) -> Tuple[str, tuple]:
+    """按VIP上限表拼出单条 UPDATE：一次扫描，未满的行 +1，满的行只记恢复时间
+
+    满活力的玩家也要跟着记时间，否则消耗后读取时会按很久以前的时间戳一次补满。
+    第一个参数为本次恢复时间，由调用方在执行时补上。
+    """
+    vip_energy_map = _vip_energy_max_map(data)
+    caps = [(lv, int(vip_energy_map.get(lv, _DEFAULT_ENERGY_MAX))) for lv in _ENERGY_VIP_LEVELS]
+
+    case_sql = "CASE vip_level " + " ".join("WHEN %s THEN %s" for _ in caps) + " END"
+    case_params = tuple(v for pair in caps for v in pair)
+    levels_sql = ", ".join(["%s"] * len(caps))
+    sql = f"""
+        UPDATE player
+        SET last_energy_recovery_time = %s,
+            energy = CASE WHEN energy < {case_sql} THEN energy + 1 ELSE energy END
+        WHERE vip_level IN ({levels_sql})
+    """
+    params = case_params + tuple(lv for lv, _ in caps)
+    return sql, params
+
+
+def _build_energy_regen_statement() -> Tuple[str, tuple]:
+    """当前配置对应的活力恢复语句（配置不变时复用同一条）"""
     try:
-        with config_path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-        for lv_data in data.get("vip_levels", []):
-            level = lv_data.get("level", 0)
-            vitality_max = lv_data.get("privileges", {}).get("vitality_max", 100)
-            energy_max_map[level] = vitality_max
+        return get_derived_config("vip_privileges.json", _compile_energy_regen_statement)
     except Exception as e:
         logger.warning(f"[Scheduler] 加载VIP配置失败: {e}")
-    return energy_max_map
+        return _compile_energy_regen_statement({})
 
 
 def _run_energy_regen():
     """每分钟自动增加所有玩家的活力值"""
-    logger.debug("[Scheduler] 执行活力值自动恢复任务")
-    
-    vip_energy_map = _load_vip_energy_max_config()
-    
-    for vip_level in range(11):
-        energy_max = vip_energy_map.get(vip_level, 100)
-        execute_update(
-            """
-            UPDATE player 
-            SET energy = LEAST(energy + 1, %s) 
-            WHERE vip_level = %s AND energy < %s
-            """,
-            (energy_max, vip_level, energy_max),
-        )
+    sql, params = _build_energy_regen_statement()
+    started = time.perf_counter()
+    affected = execute_update(sql, (datetime.now(),) + params)
+    elapsed = time.perf_counter() - started
+
+    log = logger.warning if elapsed >= _ENERGY_REGEN_SLOW_SECONDS else logger.debug
+    log("[Scheduler] 活力值自动恢复: 更新 %s 名玩家, 耗时 %.1fms", affected, elapsed * 1000)
 
 
 def _has_today_battle_log(battlefield_type: str) -> bool:
@@ -90,6 +141,11 @@ def _run_daily_battlefield():
     service = BattlefieldService(
         player_repo=player_repo,
         player_beast_repo=beast_repo,
+        beast_pvp_service=BeastPvpService(
+            spirit_repo=MySQLSpiritRepo(),
+            bone_repo=MySQLBoneRepo(),
+            mosoul_repo=MySQLBeastMoSoulRepo(mosoul_repo=MySQLMoSoulRepo()),
+        ),
         battle_repo=battle_repo,
     )
 
@@ -99,7 +155,9 @@ def _run_daily_battlefield():
             continue
 
         try:
-            result = service.run_tournament(bf_type)
+            # 每轮对局分发到多进程并行模拟（结果只取决于随机种子，与进程数无关）；
+            # 进程池以 spawn 方式启动子进程，不会 fork 调度线程所在的多线程进程
+            result = service.run_tournament(bf_type, max_workers=os.cpu_count())
             if result.get("ok"):
                 logger.info(
                     f"[Scheduler] {bf_type} 战场开赛成功，期数={result.get('period')}, "
@@ -114,49 +172,73 @@ def _run_daily_battlefield():
 
 
 def _run_immortalize_formation():
-    """每小时结算化仙阵收益"""
+    """每小时结算化仙阵收益（一次读出全部运行中的化仙阵，分块批量写回）"""
     logger.debug("[Scheduler] 执行化仙阵经验结算任务")
-    rows = execute_query(
-        """
-        SELECT user_id
-        FROM player_immortalize_pool
-        WHERE formation_started_at IS NOT NULL
-          AND formation_ends_at > NOW()
-        """
+    service = ImmortalizePoolService(
+        pool_repo=MySQLImmortalizePoolRepo(),
+        player_repo=MySQLPlayerRepo(),
     )
-    if not rows:
+    stats = service.settle_formations(chunk_size=_IMMORTALIZE_SETTLE_CHUNK)
+    if not stats["pools"]:
         return
 
-    pool_repo = MySQLImmortalizePoolRepo()
-    player_repo = MySQLPlayerRepo()
-    service = ImmortalizePoolService(
-        pool_repo=pool_repo,
-        player_repo=player_repo,
+    log = logger.warning if stats["total_ms"] >= _IMMORTALIZE_SETTLE_SLOW_SECONDS * 1000 else logger.info
+    log(
+        "[Scheduler] 化仙阵结算: 运行中 %s, 发放 %s (经验 %s, 结束 %s, 失败 %s), "
+        "写回 %s 行/%s 块 (影响 %s), 读取 %.1fms 计算 %.1fms 写入 %.1fms 共 %.1fms",
+        stats["pools"], stats["granted"], stats["total_exp"], stats["finished"], stats["failed"],
+        stats["rows_written"], stats["chunks"], stats["rows_updated"],
+        stats["load_ms"], stats["compute_ms"], stats["write_ms"], stats["total_ms"],
     )
 
-    for row in rows:
-        user_id = row.get("user_id")
-        if not user_id:
-            continue
+
+def _run_alliance_land_war(battle_service: "AllianceBattleService"):
+    """联盟战开战：逐块土地锁定报名并配对；回合由 _run_alliance_war_round 按间隔推进
+
+    使用 Web 进程中的同一个 AllianceBattleService，结算后的战况缓存直接供查询接口使用。
+    """
+    logger.info("[Scheduler] 开始执行联盟土地战配对任务")
+    for land_id in AllianceService.WAR_LANDS:
+        try:
+            paired = battle_service.lock_and_pair_land(land_id)
+            if paired.get("ok"):
+                logger.info(f"[Scheduler] 土地 {land_id} 配对完成: 战斗 {len(paired.get('battles', []))} 场")
+            else:
+                logger.info(f"[Scheduler] 土地 {land_id} 未配对: {paired.get('error')}")
+        except Exception as e:
+            logger.exception(f"[Scheduler] 土地 {land_id} 配对异常: {e}")
+
+
+def _run_alliance_war_round(battle_service: "AllianceBattleService"):
+    """为每块有进行中战斗的土地推进一回合（同一土地的各场战斗在一个事务内批量写入）
+
+    在调度线程内串行模拟，不启动进程池。
+    """
+    for land_id in AllianceService.WAR_LANDS:
         try:
-            result = service.grant_formation_exp_for_user(user_id)
-            if result and result.get("total_added"):
+            result = battle_service.resolve_land(land_id, max_rounds=1)
+            if result.get("ok"):
                 logger.info(
-                    "[Scheduler] 化仙阵结算: user=%s, hours=%s, exp=%s, finished=%s",
-                    user_id,
-                    result.get("hours_processed"),
-                    result.get("total_added"),
-                    result.get("finished"),
+                    f"[Scheduler] 土地 {land_id} 推进一回合: 战斗 {result.get('battle_count')} 场, "
+                    f"对战 {result.get('duel_count')} 次, 跳过 {result.get('skipped_battle_ids')}"
                 )
-        except Exception as exc:
-            logger.exception("[Scheduler] 化仙阵结算失败 user=%s: %s", user_id, exc)
+            else:
+                logger.debug(f"[Scheduler] 土地 {land_id} 无需推进: {result.get('error')}")
+        except Exception as e:
+            logger.exception(f"[Scheduler] 土地 {land_id} 推进回合异常: {e}")
+
 
+def start_scheduler(alliance_battle_service: Optional["AllianceBattleService"] = None):
+    """启动后台调度器（应在应用启动时调用一次）
 
-def start_scheduler():
-    """启动后台调度器（应在应用启动时调用一次）"""
+    传入 alliance_battle_service 时注册联盟土地战的开战任务。
+    """
     global _scheduler
     if _scheduler is not None:
         return  # 已启动
+    if multiprocessing.parent_process() is not None:
+        # 进程池子进程（spawn 会重新导入 __main__，即 app.py）不启动调度器
+        return
 
     _scheduler = BackgroundScheduler(daemon=True)
     # 每天 00:05 触发
@@ -168,14 +250,15 @@ def start_scheduler():
         id="daily_battlefield",
         replace_existing=True,
     )
-    # 每分钟增加活力值
-    _scheduler.add_job(
-        _run_energy_regen,
-        trigger="interval",
-        minutes=1,
-        id="energy_regen",
-        replace_existing=True,
-    )
+    # 每分钟增加活力值（lazy 模式下由读取时补算，不注册任务）
+    if ENERGY_REGEN_MODE != "lazy":
+        _scheduler.add_job(
+            _run_energy_regen,
+            trigger="interval",
+            minutes=1,
+            id="energy_regen",
+            replace_existing=True,
+        )
     # 每小时化仙阵结算
     _scheduler.add_job(
         _run_immortalize_formation,
@@ -184,8 +267,29 @@ def start_scheduler():
         id="immortalize_formation",
         replace_existing=True,
     )
+    # 联盟战开战时间为各土地配对（APScheduler 的 day_of_week 与 datetime.weekday 一致，0=周一），
+    # 之后按固定间隔逐回合推进，客户端的战况推送随回合更新
+    if alliance_battle_service is not None:
+        _scheduler.add_job(
+            _run_alliance_land_war,
+            trigger="cron",
+            day_of_week=",".join(str(day) for day in AllianceService.WAR_START_WEEKDAYS),
+            hour=AllianceService.WAR_START_HOUR,
+            minute=AllianceService.WAR_START_MINUTE,
+            args=[alliance_battle_service],
+            id="alliance_land_war",
+            replace_existing=True,
+        )
+        _scheduler.add_job(
+            _run_alliance_war_round,
+            trigger="interval",
+            minutes=AllianceService.WAR_ROUND_INTERVAL_MINUTES,
+            args=[alliance_battle_service],
+            id="alliance_war_round",
+            replace_existing=True,
+        )
     _scheduler.start()
-    logger.info("[Scheduler] 后台调度器已启动，每日 00:05 自动开赛，每分钟活力+1")
+    logger.info("[Scheduler] 后台调度器已启动，每日 00:05 自动开赛，活力恢复模式=%s", ENERGY_REGEN_MODE)
 
 
 def shutdown_scheduler():
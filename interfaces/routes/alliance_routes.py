@@ -467,6 +467,33 @@ def get_war_live_feed():
     return jsonify(result), status
 
 
+def _feed_poll_args():
+    """长轮询参数：since_id 为上次返回的 cursor，wait 为没有新事件时的最长等待秒数"""
+    try:
+        since_id = int(request.args["since_id"])
+    except (KeyError, TypeError, ValueError):
+        since_id = None
+
+    try:
+        wait = float(request.args.get("wait", 0))
+    except (TypeError, ValueError):
+        wait = 0.0
+
+    return since_id, wait
+
+
+@alliance_bp.get('/war/live-feed/poll')
+def poll_war_live_feed():
+    user_id = get_current_user_id()
+    if not user_id:
+        return jsonify({"ok": False, "error": "请先登录"}), 401
+
+    since_id, wait = _feed_poll_args()
+    result = services.alliance_service.poll_war_live_feed(user_id, since_id, wait)
+    status = 200 if result.get("ok") else 400
+    return jsonify(result), status
+
+
 @alliance_bp.get('/war/land/<int:land_id>')
 def get_war_land_detail(land_id: int):
     user_id = get_current_user_id()
@@ -531,6 +558,16 @@ def get_chat_messages():
     result = services.alliance_service.get_chat_messages(user_id)
     return jsonify(result)
 
+@alliance_bp.get('/chat/poll')
+def poll_chat_messages():
+    user_id = get_current_user_id()
+    if not user_id:
+        return jsonify({"ok": False, "error": "请先登录"}), 401
+
+    since_id, wait = _feed_poll_args()
+    result = services.alliance_service.poll_chat_messages(user_id, since_id, wait)
+    return jsonify(result)
+
 @alliance_bp.post('/chat/send')
 def send_chat_message():
     user_id = get_current_user_id()
@@ -72,26 +72,27 @@ def get_beast_list():
     storage_capacity = storage_summary.get("capacity", 0)
     storage_count = storage_summary.get("count", 0)
     
+    # 跳过寄存在幻兽室中的幻兽
+    visible_beasts = [b for b in all_beasts if b.id not in stored_beast_ids_set]
+
+    # 属性和战力走派生属性缓存，仅在等级/装备等变化后重算
+    powers = services.beast_stats_cache.resolve_powers(
+        visible_beasts,
+        calc_stats=_calc_beast_stats,
+        calc_power=_calc_total_combat_power_with_equipment,
+    )
+
     # 分离战斗队和非战斗队
     team_beasts = []
     other_beasts = []
     
-    for beast in all_beasts:
-        # 跳过寄存在幻兽室中的幻兽
-        if beast.id in stored_beast_ids_set:
-            continue
-
-        # 重新计算属性和战力
-        beast = _calc_beast_stats(beast)
-        services.player_beast_repo.update_beast(beast)
-        total_power = _calc_total_combat_power_with_equipment(beast)
-        
+    for beast in visible_beasts:
         beast_data = {
             "id": beast.id,
             "name": beast.name,
             "realm": beast.realm,
             "level": beast.level,
-            "power": total_power,
+            "power": powers[beast.id],
             "inTeam": beast.is_in_team == 1,
             "teamPosition": beast.team_position,
             # 详细属性
@@ -148,18 +149,20 @@ def get_battle_team():
     
     beasts = services.player_beast_repo.get_team_beasts(user_id)
     
-    # 重新计算每只幻兽的属性和战力
+    # 属性和战力走派生属性缓存，仅在等级/装备等变化后重算
+    powers = services.beast_stats_cache.resolve_powers(
+        beasts,
+        calc_stats=_calc_beast_stats,
+        calc_power=_calc_total_combat_power_with_equipment,
+    )
     result_beasts = []
     for b in beasts:
-        b = _calc_beast_stats(b)
-        services.player_beast_repo.update_beast(b)
-        total_power = _calc_total_combat_power_with_equipment(b)
         result_beasts.append({
             "id": b.id,
             "name": b.name,
             "realm": b.realm,
             "level": b.level,
-            "power": total_power,
+            "power": powers[b.id],
             "teamPosition": b.team_position,
         })
     
@@ -885,6 +888,7 @@ def release_beast(beast_id: int):
     success = services.player_beast_repo.delete_beast(beast_id, user_id)
     if not success:
         return jsonify({"ok": False, "error": "放生失败"})
+    services.beast_stats_cache.invalidate(beast_id)
     
     return jsonify({
         "ok": True,
@@ -992,6 +996,7 @@ def add_beast_exp():
     
     # 保存到数据库
     services.player_beast_repo.update_beast(beast)
+    services.beast_stats_cache.invalidate(beast.id)
     
     # 获取下一级所需经验
     exp_to_next = exp_map.get(str(beast.level), 0) if beast.level < max_level else 0
@@ -1087,6 +1092,7 @@ def add_beast_exp_from_pool():
     
     # 保存到数据库
     services.player_beast_repo.update_beast(beast)
+    services.beast_stats_cache.invalidate(beast.id)
     
     exp_to_next = exp_map.get(str(beast.level), 0) if beast.level < max_level else 0
     
@@ -1254,6 +1260,7 @@ def evolve_beast():
     
     # 保存到数据库
     services.player_beast_repo.update_beast(beast)
+    services.beast_stats_cache.invalidate(beast.id)
     
     # 返回更新后的幻兽信息
     beast_dict = beast.to_dict()
@@ -1353,6 +1360,7 @@ def rebirth_beast():
 
     beast = _calc_beast_stats(beast)
     services.player_beast_repo.update_beast(beast)
+    services.beast_stats_cache.invalidate(beast.id)
 
     return jsonify({
         "ok": True,
@@ -519,6 +519,8 @@ def unequip_all_bones(beast_id: int):
             bone.beast_id = None
             services.bone_repo.save(bone)
             count += 1
+    if count:
+        services.beast_stats_cache.invalidate(beast_id)
     
     return jsonify({
         "ok": True,
@@ -6,11 +6,10 @@ from flask import Blueprint, request, jsonify, session
 from interfaces.web_api.bootstrap import services
 from application.services.cultivation_service import CultivationError
 from domain.rules.cultivation_rules import load_cultivation_config
-import os
-import json
 from datetime import datetime
 import math
 from infrastructure.db.connection import execute_query, execute_update
+from infrastructure.config.registry import get_config
 import logging
 
 cultivation_bp = Blueprint('cultivation', __name__, url_prefix='/api/cultivation')
@@ -23,9 +22,7 @@ def get_current_user_id() -> int:
 
 
 def _load_maps_config():
-    config_path = os.path.join(os.path.dirname(__file__), '../../configs/maps.json')
-    with open(config_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return get_config("maps.json")
 
 
 def _find_city_index(maps: list, city_name: str) -> int:
@@ -10,6 +10,7 @@ from flask import Blueprint, request, jsonify, session
 
 from application.services.auth_service import is_test_mode
 from interfaces.web_api.bootstrap import services
+from infrastructure.config.registry import config_registry
 from infrastructure.db.connection import execute_update
 
 
@@ -57,3 +58,12 @@ def grant_prestige():
         "added": amount,
         "status": status,
     })
+
+
+@dev_bp.get("/config-stats")
+def config_stats():
+    """配置注册表统计：每个配置文件的解析次数/耗时、最近加载时间和命中次数"""
+    if not is_test_mode():
+        return jsonify({"ok": False, "error": "dev api disabled"}), 404
+
+    return jsonify({"ok": True, "configs": config_registry.stats()})
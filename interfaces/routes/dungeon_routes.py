@@ -1,13 +1,12 @@
 from flask import Blueprint, request, jsonify, session
 from infrastructure.db.connection import execute_query, execute_update, get_connection
+from infrastructure.config.registry import get_config
 from interfaces.web_api.bootstrap import services
 from domain.services.pvp_battle_engine import PvpPlayer, PvpBeast, run_pvp_battle
 from domain.services.skill_system import apply_buff_debuff_skills
 from infrastructure.config.bone_system_config import get_bone_system_config
 from application.services.inventory_service import InventoryError
-import json
 import random
-import os
 from datetime import date
 from datetime import datetime
 import math
@@ -37,9 +36,7 @@ def generate_floor_event_type(floor):
         return 'mystery_chest'
 
 def load_dungeon_beasts_config():
-    config_path = os.path.join(os.path.dirname(__file__), '../../configs/dungeon_beasts.json')
-    with open(config_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return get_config("dungeon_beasts.json")
 
 def get_dungeon_by_name(dungeon_name):
     config = load_dungeon_beasts_config()
@@ -54,9 +51,7 @@ def get_current_user_id() -> int:
 
 
 def _load_maps_config():
-    config_path = os.path.join(os.path.dirname(__file__), '../../configs/maps.json')
-    with open(config_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return get_config("maps.json")
 
 
 def _find_city_index(maps: list, city_name: str) -> int:
@@ -423,9 +418,7 @@ def use_dice_bag():
 
 
 def load_dungeon_config():
-    config_path = os.path.join(os.path.dirname(__file__), '../../configs/dungeon_config.json')
-    with open(config_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return get_config("dungeon_config.json")
 
 @dungeon_bp.route('/progress', methods=['GET'])
 def get_progress():
@@ -529,9 +522,7 @@ def get_progress():
 
 
 def load_vip_privileges():
-    config_path = os.path.join(os.path.dirname(__file__), '../../configs/vip_privileges.json')
-    with open(config_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return get_config("vip_privileges.json")
 
 
 @dungeon_bp.route('/reset', methods=['POST'])
@@ -3,10 +3,9 @@
 
 import math
 from datetime import datetime
-import json
-import os
 from flask import Blueprint, request, jsonify, session
 from infrastructure.db.connection import execute_query, execute_update
+from infrastructure.config.registry import get_config
 
 map_bp = Blueprint('map', __name__, url_prefix='/api/map')
 
@@ -15,9 +14,7 @@ MOVE_COOLDOWN_SECONDS = 60
 
 
 def load_maps_config():
-    config_path = os.path.join(os.path.dirname(__file__), '../../configs/maps.json')
-    with open(config_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return get_config("maps.json")
 
 
 def get_current_user_id() -> int:
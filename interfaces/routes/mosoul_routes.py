@@ -5,12 +5,26 @@ import json
 from pathlib import Path
 
 from flask import Blueprint, jsonify, request, session
+from interfaces.web_api.bootstrap import services
+from application.services.mosoul_feed_service import MoSoulFeedError
 
 from domain.entities.mosoul import MoSoul, MoSoulGrade, get_mosoul_template
 from infrastructure.db import mosoul_repo_mysql as mosoul_repo
 from infrastructure.db import player_beast_repo_mysql as beast_repo
 from infrastructure.db.connection import execute_query, execute_update
 from domain.services.beast_stats import calc_max_mosoul_slots
+from domain.services.mosoul_system import (
+    ADV_GLOBAL_DRAGON_PITY,
+    ADV_PERSONAL_DRAGON_PITY,
+    ADVANCED_GRADE_WEIGHTS,
+    ADVANCED_HUNTER_CONFIG,
+    GRADE_TEMPLATES,
+    HUNTER_CONFIG,
+    NORMAL_GRADE_WEIGHTS,
+    NORMAL_HEAVEN_PITY_COPPER,
+    NORMAL_HEAVEN_PITY_COUNTER_KEY,
+    SOUL_CHARM_ITEM_ID,
+)
 
 mosoul_bp = Blueprint('mosoul', __name__, url_prefix='/api/mosoul')
 
@@ -142,6 +156,7 @@ def ensure_mosoul_level(mosoul_row: dict) -> dict:
         )
         if levels_gained > 0:
             mosoul_repo.update_mosoul(mosoul_row['id'], level=new_level, exp=new_exp)
+            services.beast_stats_cache.invalidate(mosoul_row.get('beast_id'))
             # 更新内存中的行数据
             mosoul_row['level'] = new_level
             mosoul_row['exp'] = new_exp
@@ -417,6 +432,7 @@ def equip_mosoul(mosoul_id: int):
             return jsonify({'ok': False, 'error': '该槽位已装备魔魂，请先取下'}), 400
 
     mosoul_repo.equip_mosoul_with_slot(mosoul_id, beast_id, slot_index)
+    services.beast_stats_cache.invalidate(beast_id)
     return jsonify({'ok': True, 'message': '装备成功'})
 
 
@@ -431,6 +447,7 @@ def unequip_mosoul(mosoul_id: int):
         return jsonify({'ok': False, 'error': '魔魂不存在'})
 
     mosoul_repo.unequip_mosoul(mosoul_id)
+    services.beast_stats_cache.invalidate(row.get('beast_id'))
     return jsonify({'ok': True, 'message': '卸下成功'})
 
 
@@ -474,6 +491,7 @@ def consume_mosoul(material_mosoul_id: int):
 
     mosoul_repo.update_mosoul(target_id, level=new_level, exp=new_exp)
     mosoul_repo.delete_mosoul(material_mosoul_id)
+    services.beast_stats_cache.invalidate(target_row.get('beast_id'))
 
     is_max = new_level >= 10
     return jsonify({
@@ -499,200 +517,27 @@ def consume_mosoul_batch():
     if not target_id:
         return jsonify({'ok': False, 'error': '缺少目标魔魂'})
 
-    target_row = mosoul_repo.get_mosoul_by_id(target_id)
-    if not target_row or int(target_row.get('user_id', 0) or 0) != int(user_id):
-        return jsonify({'ok': False, 'error': '目标魔魂不存在'})
-
-    target_detail = mosoul_to_detail(target_row)
-    if not target_detail:
-        return jsonify({'ok': False, 'error': '目标魔魂数据异常'})
-
-    all_rows = mosoul_repo.get_unequipped_mosouls(user_id)
-
-    materials = []
-    for r in all_rows:
-        if int(r.get('id', 0) or 0) == target_id:
-            continue
-        d = mosoul_to_detail(r)
-        if not d:
-            continue
-        if grade_filter and d.get('grade') != grade_filter:
-            continue
-        materials.append((r, d))
-
-    if not materials:
-        return jsonify({'ok': False, 'error': '没有可吞噬的材料魔魂'})
-
-    total_exp = sum(_get_grade_exp_provide(d.get('grade')) for (_, d) in materials)
-
-    old_level = int(target_row.get('level', 1) or 1)
-    old_exp = int(target_row.get('exp', 0) or 0)
-    new_level, new_exp, _ = _calc_level_and_exp(target_detail.get('grade'), old_level, old_exp, total_exp)
-
-    exp_used = 0
-    if old_level < 10:
-        needed = 0
-        lvl = old_level
-        exp_cur = old_exp
-        remaining = total_exp
-        while remaining > 0 and lvl < 10:
-            required = _get_exp_required_for_level(target_detail.get('grade'), lvl)
-            if required <= 0:
-                break
-            need = max(0, required - exp_cur)
-            if remaining >= need:
-                exp_used += need
-                remaining -= need
-                exp_cur = 0
-                lvl += 1
-            else:
-                exp_used += remaining
-                remaining = 0
-                exp_cur += remaining
-        if new_level < 10:
-            exp_used = min(total_exp, exp_used + max(0, new_exp - old_exp))
-
-    exp_wasted = max(0, total_exp - exp_used)
-
-    mosoul_repo.update_mosoul(target_id, level=new_level, exp=new_exp)
-    for (r, _) in materials:
-        mosoul_repo.delete_mosoul(int(r.get('id')))
+    try:
+        result = services.mosoul_feed_service.consume_all(user_id, target_id, grade_filter)
+    except MoSoulFeedError as e:
+        return jsonify({'ok': False, 'error': str(e)})
+    services.beast_stats_cache.invalidate(result.beast_id)
 
     return jsonify({
         'ok': True,
-        'message': f'一键噬魂成功，吞噬{len(materials)}个材料魔魂',
-        'consumed_count': len(materials),
-        'exp_total': total_exp,
-        'exp_used': exp_used,
-        'exp_wasted': exp_wasted,
-        'before_level': old_level,
-        'after_level': new_level,
+        'message': f'一键噬魂成功，吞噬{result.consumed_count}个材料魔魂',
+        'consumed_count': result.consumed_count,
+        'exp_total': result.exp_total,
+        'exp_used': result.exp_used,
+        'exp_wasted': result.exp_wasted,
+        'before_level': result.before_level,
+        'after_level': result.after_level,
     })
 
 
-# ========== 猎魂系统配置 ==========
-# 猎魂师配置
-HUNTER_CONFIG = {
-    'amy': {'name': '艾米', 'cost': 8000, 'next': 'keke', 'unlock_rate': 50},
-    'keke': {'name': '科科', 'cost': 10000, 'next': 'boer', 'unlock_rate': 35},
-    'boer': {'name': '波尔', 'cost': 20000, 'next': 'wote', 'unlock_rate': 20},
-    'wote': {'name': '沃特', 'cost': 40000, 'next': 'kaiwen', 'unlock_rate': 5},
-    'kaiwen': {'name': '凯文', 'cost': 60000, 'next': None, 'unlock_rate': 0},
-}
-
-# 普通场魔魂概率（百分比）
-NORMAL_GRADE_WEIGHTS = {
-    'amy': {'waste_soul': 33.3, 'yellow_soul': 33.3, 'dark_soul': 33.4},
-    'keke': {'waste_soul': 30, 'yellow_soul': 35, 'dark_soul': 35},
-    'boer': {'waste_soul': 20, 'yellow_soul': 20, 'dark_soul': 20, 'earth_soul': 20},
-    'wote': {'waste_soul': 8, 'yellow_soul': 30, 'dark_soul': 30, 'earth_soul': 30},
-    'kaiwen': {'yellow_soul': 25, 'dark_soul': 25, 'earth_soul': 31},
-}
-
-# 高级场配置
-ADVANCED_HUNTER_CONFIG = {
-    'wote': {'name': '沃特', 'cost': 4, 'cost_type': 'fabao', 'next': 'kaiwen', 'unlock_rate': 10},
-    'kaiwen': {'name': '凯文', 'cost': 6, 'cost_type': 'fabao', 'next': None, 'unlock_rate': 0},
-}
-
-# 高级场魔魂概率
-ADVANCED_GRADE_WEIGHTS = {
-    'wote': {'earth_soul': 84, 'heaven_soul': 16},
-    'kaiwen': {'god_soul': 32, 'earth_soul': 32, 'heaven_soul': 35.1},
-}
-
-# 魔魂模板映射
-GRADE_TEMPLATES = {
-    'god_soul': [1],
-    'dragon_soul': [101, 102, 103],
-    'heaven_soul': [201, 202, 203, 204, 205, 206, 207, 208, 209, 210, 211, 212],
-    'earth_soul': [301, 302, 303, 304, 305, 306, 307, 308, 309, 310, 311, 312],
-    'dark_soul': [401, 402, 403, 404, 405, 406, 407, 408, 409, 410, 411, 412],
-    'yellow_soul': [501, 502, 503, 504, 505, 506, 507, 508, 509, 510, 511, 512],
-    'waste_soul': [901, 902, 903, 904, 905],
-}
-
-SOUL_CHARM_ITEM_ID = 6019
-NORMAL_HEAVEN_PITY_COPPER = 2_000_000
-ADV_PERSONAL_DRAGON_PITY = 5_000
-ADV_GLOBAL_DRAGON_PITY = 40_000
-NORMAL_HEAVEN_PITY_COUNTER_KEY = 'normal_heaven_pity'
-
-_hunting_tables_ready = False
-
-
-def _ensure_hunting_tables() -> None:
-    global _hunting_tables_ready
-    if _hunting_tables_ready:
-        return
-
-    execute_update(
-        """
-        CREATE TABLE IF NOT EXISTS mosoul_hunting_state (
-            user_id BIGINT UNSIGNED PRIMARY KEY,
-            field_type VARCHAR(20) NOT NULL DEFAULT 'normal',
-            normal_available_npcs JSON NOT NULL DEFAULT ('["amy"]'),
-            advanced_available_npcs JSON NOT NULL DEFAULT ('["wote"]'),
-            soul_charm_consumed BIGINT UNSIGNED NOT NULL DEFAULT 0,
-            copper_consumed BIGINT UNSIGNED NOT NULL DEFAULT 0,
-            updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
-        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
-        """
-    )
-
-    execute_update(
-        """
-        CREATE TABLE IF NOT EXISTS mosoul_global_pity (
-            counter_key VARCHAR(50) PRIMARY KEY,
-            count INT UNSIGNED NOT NULL DEFAULT 0,
-            pity_threshold INT UNSIGNED NOT NULL DEFAULT 40000,
-            soul_charm_consumed_global BIGINT UNSIGNED NOT NULL DEFAULT 0,
-            copper_consumed_global BIGINT UNSIGNED NOT NULL DEFAULT 0,
-            updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
-        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
-        """
-    )
-
-    try:
-        execute_update(
-            """
-            ALTER TABLE mosoul_global_pity
-            ADD COLUMN copper_consumed_global BIGINT UNSIGNED NOT NULL DEFAULT 0
-            """
-        )
-    except Exception:
-        pass
-
-    try:
-        execute_update(
-            """
-            INSERT INTO mosoul_global_pity (counter_key, count, pity_threshold, soul_charm_consumed_global, copper_consumed_global)
-            VALUES ('kevin_adv_pity', 0, 40000, 0, 0)
-            ON DUPLICATE KEY UPDATE counter_key = VALUES(counter_key)
-            """
-        )
-        execute_update(
-            """
-            INSERT INTO mosoul_global_pity (counter_key, count, pity_threshold, soul_charm_consumed_global, copper_consumed_global)
-            VALUES (%s, 0, %s, 0, 0)
-            ON DUPLICATE KEY UPDATE counter_key = VALUES(counter_key)
-            """,
-            (NORMAL_HEAVEN_PITY_COUNTER_KEY, NORMAL_HEAVEN_PITY_COPPER),
-        )
-    except Exception:
-        execute_update(
-            """
-            INSERT INTO mosoul_global_pity (counter_key, count, pity_threshold, soul_charm_consumed_global)
-            VALUES ('kevin_adv_pity', 0, 40000, 0)
-            ON DUPLICATE KEY UPDATE counter_key = VALUES(counter_key)
-            """
-        )
-
-    _hunting_tables_ready = True
-
-
+# ========== 猎魂系统 ==========
 def _get_personal_consumed(user_id: int) -> tuple[int, int]:
-    _ensure_hunting_tables()
+    mosoul_repo.ensure_hunting_tables()
     rows = execute_query(
         "SELECT soul_charm_consumed, copper_consumed FROM mosoul_hunting_state WHERE user_id = %s",
         (user_id,),
@@ -711,7 +556,7 @@ def _get_personal_consumed(user_id: int) -> tuple[int, int]:
 
 
 def _save_personal_consumed(user_id: int, soul_charm_consumed: int, copper_consumed: int) -> None:
-    _ensure_hunting_tables()
+    mosoul_repo.ensure_hunting_tables()
     execute_update(
         """
         INSERT INTO mosoul_hunting_state (user_id, field_type, normal_available_npcs, advanced_available_npcs, soul_charm_consumed, copper_consumed)
@@ -725,7 +570,7 @@ def _save_personal_consumed(user_id: int, soul_charm_consumed: int, copper_consu
 
 
 def _get_global_soul_charm_consumed(counter_key: str = 'kevin_adv_pity') -> int:
-    _ensure_hunting_tables()
+    mosoul_repo.ensure_hunting_tables()
     rows = execute_query(
         "SELECT soul_charm_consumed_global FROM mosoul_global_pity WHERE counter_key = %s",
         (counter_key,),
@@ -736,7 +581,7 @@ def _get_global_soul_charm_consumed(counter_key: str = 'kevin_adv_pity') -> int:
 
 
 def _save_global_soul_charm_consumed(consumed: int, counter_key: str = 'kevin_adv_pity') -> None:
-    _ensure_hunting_tables()
+    mosoul_repo.ensure_hunting_tables()
     execute_update(
         """
         INSERT INTO mosoul_global_pity (counter_key, count, pity_threshold, soul_charm_consumed_global)
@@ -748,7 +593,7 @@ def _save_global_soul_charm_consumed(consumed: int, counter_key: str = 'kevin_ad
 
 
 def _get_global_copper_consumed(counter_key: str = NORMAL_HEAVEN_PITY_COUNTER_KEY) -> int:
-    _ensure_hunting_tables()
+    mosoul_repo.ensure_hunting_tables()
     rows = execute_query(
         "SELECT copper_consumed_global FROM mosoul_global_pity WHERE counter_key = %s",
         (counter_key,),
@@ -759,7 +604,7 @@ def _get_global_copper_consumed(counter_key: str = NORMAL_HEAVEN_PITY_COUNTER_KE
 
 
 def _save_global_copper_consumed(consumed: int, counter_key: str = NORMAL_HEAVEN_PITY_COUNTER_KEY) -> None:
-    _ensure_hunting_tables()
+    mosoul_repo.ensure_hunting_tables()
     execute_update(
         """
         INSERT INTO mosoul_global_pity (counter_key, count, pity_threshold, soul_charm_consumed_global, copper_consumed_global)
@@ -1027,261 +872,97 @@ def do_hunting():
 
 @mosoul_bp.post('/hunting/batch-hunt')
 def batch_hunting():
-    """一键猎魂：自动执行10次猎魂
-    
+    """一键猎魂：默认连续猎魂10次（count 可选，最多 MAX_BATCH_HUNTS 次）
+
     规则：
-    - 自动执行最多10次猎魂
-    - 材料不足时自动停止
+    - 材料不足或储魂器已满时自动停止
     - 解锁更高级猎魂师后自动切换到更高级的
+    - 整批猎魂在内存中完成，新魔魂、货币与保底计数一次性写回
     """
     user_id = get_current_user_id()
     if not user_id:
         return jsonify({'ok': False, 'error': '请先登录'})
-    
+
     data = request.get_json() or {}
     arena_type = data.get('arenaType', 'normal')
-    max_hunts = 10
-    
-    from infrastructure.db import player_repo_mysql as player_repo
-    from interfaces.web_api.bootstrap import services
-    import random
-    
-    # 获取玩家铜钱
-    player = player_repo.get_player_by_id(user_id)
-    gold = player.get('gold', 0) if player else 0
+    try:
+        count = int(data.get('count', 10))
+    except (TypeError, ValueError):
+        count = 10
 
-    soul_charm = services.inventory_service.get_item_count(user_id, SOUL_CHARM_ITEM_ID, include_temp=True)
+    from application.services.inventory_service import InventoryError
+    from application.services.mosoul_hunt_service import MoSoulHuntError
 
-    warehouse_capacity = get_soul_container_capacity(0)
-    warehouse_count = len(mosoul_repo.get_unequipped_mosouls(user_id))
-    if warehouse_count >= warehouse_capacity:
-        return jsonify({
-            'ok': True,
-            'message': f'一键猎魂完成，共猎魂0次',
-            'results': [{
-                'hunt_num': 1,
-                'stopped': True,
-                'reason': f'储魂器已满（{warehouse_count}/{warehouse_capacity}）',
-            }],
-            'summary': {
-                'total_hunts': 0,
-                'total_cost': 0,
-                'total_sell': 0,
-                'net_cost': 0,
-                'obtained_count': 0,
-                'grade_summary': {},
-                'cost_type': 'copper' if arena_type == 'normal' else 'soul_charm',
-            },
-            'remaining_gold': gold,
-            'remaining_soul_charm': soul_charm,
-        })
-    
-    # 获取当前猎魂状态
     state_key = f'hunting_state_{arena_type}'
-    hunting_state = session.get(state_key, {})
-    
-    # 定义猎魂师优先级（从高到低）
-    if arena_type == 'normal':
-        hunter_priority = ['kaiwen', 'wote', 'boer', 'keke', 'amy']
-        config = HUNTER_CONFIG
-        grade_weights = NORMAL_GRADE_WEIGHTS
-    else:
-        hunter_priority = ['kaiwen', 'wote']
-        config = ADVANCED_HUNTER_CONFIG
-        grade_weights = ADVANCED_GRADE_WEIGHTS
-    
-    results = []
-    total_cost = 0
-    total_sell = 0
-    obtained_mosouls = []
-    
-    for hunt_num in range(max_hunts):
-        force_heaven = False
-        force_dragon = False
-
-        if warehouse_count >= warehouse_capacity:
-            results.append({
-                'hunt_num': hunt_num + 1,
-                'stopped': True,
-                'reason': f'储魂器已满（{warehouse_count}/{warehouse_capacity}）',
-            })
-            break
-
-        # 选择当前可用的最高级猎魂师
-        current_hunter = None
-        for hid in hunter_priority:
-            if arena_type == 'normal':
-                if hid == 'amy' or hunting_state.get(f'{hid}_unlocked', False):
-                    current_hunter = hid
-                    break
-            else:
-                if hid == 'wote' or hunting_state.get('kaiwen_unlocked', False):
-                    current_hunter = hid
-                    break
-        
-        if not current_hunter:
-            current_hunter = 'amy' if arena_type == 'normal' else 'wote'
-        
-        cfg = config[current_hunter]
-        
-        # 计算费用
-        if arena_type == 'normal':
-            cost = int(cfg['cost'])
-            if gold < cost:
-                results.append({
-                    'hunt_num': hunt_num + 1,
-                    'stopped': True,
-                    'reason': '铜钱不足',
-                })
-                break
-
-            player_repo.update_gold(user_id, -cost)
-            gold -= cost
-            total_cost += cost
-
-            global_copper_consumed = _get_global_copper_consumed(NORMAL_HEAVEN_PITY_COUNTER_KEY)
-            global_copper_consumed += int(cost)
-            force_heaven = False
-            if global_copper_consumed >= NORMAL_HEAVEN_PITY_COPPER and current_hunter in ('wote', 'kaiwen'):
-                global_copper_consumed = 0
-                force_heaven = True
-            _save_global_copper_consumed(global_copper_consumed, NORMAL_HEAVEN_PITY_COUNTER_KEY)
-        else:
-            cost = int(cfg['cost'])
-            if soul_charm < cost:
-                results.append({
-                    'hunt_num': hunt_num + 1,
-                    'stopped': True,
-                    'reason': '追魂法宝不足',
-                })
-                break
-
-            services.inventory_service.remove_item(user_id, SOUL_CHARM_ITEM_ID, cost)
-            soul_charm -= cost
-            total_cost += cost
-
-            soul_charm_consumed, copper_consumed = _get_personal_consumed(user_id)
-            soul_charm_consumed += int(cost)
-
-            global_consumed = _get_global_soul_charm_consumed('kevin_adv_pity')
-            global_consumed += int(cost)
-
-            force_dragon = False
-            if soul_charm_consumed >= ADV_PERSONAL_DRAGON_PITY:
-                soul_charm_consumed -= ADV_PERSONAL_DRAGON_PITY
-                force_dragon = True
-
-            if global_consumed >= ADV_GLOBAL_DRAGON_PITY:
-                global_consumed -= ADV_GLOBAL_DRAGON_PITY
-                force_dragon = True
-
-            _save_personal_consumed(user_id, soul_charm_consumed, copper_consumed)
-            _save_global_soul_charm_consumed(global_consumed, 'kevin_adv_pity')
-        
-        # 点击后清除当前猎魂师的解锁状态（除了艾米/沃特）
-        if arena_type == 'normal' and current_hunter != 'amy':
-            hunting_state[f'{current_hunter}_unlocked'] = False
-        elif arena_type != 'normal' and current_hunter == 'kaiwen':
-            hunting_state['kaiwen_unlocked'] = False
-        
-        # 尝试解锁下一个猎魂师
-        next_hunter = cfg.get('next')
-        next_unlocked = False
-        if next_hunter and cfg.get('unlock_rate', 0) > 0:
-            if random.random() * 100 < cfg['unlock_rate']:
-                if arena_type == 'normal':
-                    hunting_state[f'{next_hunter}_unlocked'] = True
-                else:
-                    hunting_state['kaiwen_unlocked'] = True
-                next_unlocked = True
-        
-        # 随机魔魂
-        weights = grade_weights.get(current_hunter, {'yellow_soul': 100})
-
-        grades = list(weights.keys())
-        probs = list(weights.values())
-        chosen_grade = random.choices(grades, weights=probs, k=1)[0]
-
-        if arena_type == 'normal' and force_heaven:
-            chosen_grade = 'heaven_soul'
+    try:
+        plan = services.mosoul_hunt_service.batch_hunt(
+            user_id,
+            arena_type,
+            unlocked=session.get(state_key, {}),
+            count=count,
+            warehouse_capacity=get_soul_container_capacity(0),
+        )
+    except (MoSoulHuntError, InventoryError) as e:
+        return jsonify({'ok': False, 'error': str(e)})
 
-        if arena_type == 'normal' and chosen_grade == 'dragon_soul':
-            chosen_grade = 'earth_soul'
+    # 保存状态
+    session[state_key] = plan.end.unlocked
 
-        if arena_type != 'normal' and force_dragon:
-            chosen_grade = 'dragon_soul'
-        
-        # 随机选择模板
-        templates = GRADE_TEMPLATES.get(chosen_grade, [501])
-        template_id = random.choice(templates)
-
-        # 普通场兜底规则：最终模板不允许是龙魂；未触发保底时不允许是天魂
-        if arena_type == 'normal':
-            template = get_mosoul_template(int(template_id))
-            if template and template.grade.value == 'dragon_soul':
-                template_id = random.choice(GRADE_TEMPLATES.get('earth_soul', [301]))
-            elif chosen_grade != 'heaven_soul' and template and template.grade.value == 'heaven_soul':
-                template_id = random.choice(GRADE_TEMPLATES.get('earth_soul', [301]))
-        
+    results = []
+    obtained_mosouls = []
+    soul_ids = iter(plan.soul_ids)
+    for hunt in plan.rolls:
         hunt_result = {
-            'hunt_num': hunt_num + 1,
-            'hunter': cfg['name'],
-            'hunter_id': current_hunter,
-            'cost': cost,
-            'next_unlocked': next_unlocked,
-            'next_hunter': next_hunter,
+            'hunt_num': hunt.hunt_num,
+            'hunter': hunt.hunter_name,
+            'hunter_id': hunt.hunter_id,
+            'cost': hunt.cost,
+            'next_unlocked': hunt.next_unlocked,
+            'next_hunter': hunt.next_hunter,
+            'is_waste': hunt.is_waste,
+            'mosoul': None,
         }
-        
-        # 废魂自动售卖
-        if chosen_grade == 'waste_soul':
-            sell_price = 5000
-            player_repo.update_gold(user_id, sell_price)
-            gold += sell_price
-            total_sell += sell_price
-            hunt_result['is_waste'] = True
-            hunt_result['sell_price'] = sell_price
-            hunt_result['mosoul'] = None
+        if hunt.is_waste:
+            hunt_result['sell_price'] = hunt.sell_price
         else:
-            # 创建魔魂
-            mosoul_id = mosoul_repo.create_mosoul(user_id, template_id, level=1)
-            mosoul_row = mosoul_repo.get_mosoul_by_id(mosoul_id)
-            mosoul_detail = mosoul_to_detail(mosoul_row) if mosoul_row else None
-
-            warehouse_count += 1
-            
-            hunt_result['is_waste'] = False
+            mosoul_detail = mosoul_to_detail({
+                'id': next(soul_ids, None),
+                'template_id': hunt.template_id,
+                'level': 1,
+                'exp': 0,
+                'beast_id': None,
+            })
             hunt_result['mosoul'] = mosoul_detail
             if mosoul_detail:
                 obtained_mosouls.append(mosoul_detail)
-        
         results.append(hunt_result)
-    
-    # 保存状态
-    session[state_key] = hunting_state
-    
+    if plan.stop_reason:
+        results.append({
+            'hunt_num': len(plan.rolls) + 1,
+            'stopped': True,
+            'reason': plan.stop_reason,
+        })
+
     # 统计获得的魔魂按品质分组
     grade_summary = {}
     for m in obtained_mosouls:
-        grade = m['grade_name']
-        if grade not in grade_summary:
-            grade_summary[grade] = 0
-        grade_summary[grade] += 1
-    
+        grade_summary[m['grade_name']] = grade_summary.get(m['grade_name'], 0) + 1
+
     return jsonify({
         'ok': True,
-        'message': f'一键猎魂完成，共猎魂{len(results)}次',
+        'message': f'一键猎魂完成，共猎魂{len(plan.rolls)}次',
         'results': results,
         'summary': {
-            'total_hunts': len(results),
-            'total_cost': total_cost,
-            'total_sell': total_sell,
-            'net_cost': (total_cost - total_sell) if arena_type == 'normal' else total_cost,
+            'total_hunts': len(plan.rolls),
+            'total_cost': plan.total_cost,
+            'total_sell': plan.total_sell,
+            'net_cost': (plan.total_cost - plan.total_sell) if arena_type == 'normal' else plan.total_cost,
             'obtained_count': len(obtained_mosouls),
             'grade_summary': grade_summary,
             'cost_type': 'copper' if arena_type == 'normal' else 'soul_charm',
         },
-        'remaining_gold': gold,
-        'remaining_soul_charm': soul_charm,
+        'remaining_gold': plan.end.gold,
+        'remaining_soul_charm': plan.end.soul_charm,
     })
 
 
@@ -1309,6 +990,7 @@ def grant_mosoul():
     # 如果指定了幻兽，直接装备
     if beast_id:
         mosoul_repo.equip_mosoul(mosoul_id, beast_id)
+        services.beast_stats_cache.invalidate(beast_id)
     
     return jsonify({
         'ok': True,
@@ -1,11 +1,10 @@
 # interfaces/routes/pay_routes.py
 """支付充值路由 - 充值宝石"""
 
-import json
-import os
 from datetime import datetime
 from flask import Blueprint, request, jsonify, session, redirect
 from infrastructure.db.connection import execute_query, execute_update
+from infrastructure.config.registry import get_config
 
 pay_bp = Blueprint('pay', __name__, url_prefix='/api/pay')
 
@@ -16,22 +15,12 @@ def get_current_user_id() -> int:
 
 def load_recharge_products():
     """加载充值商品配置"""
-    config_path = os.path.join(
-        os.path.dirname(__file__), 
-        '..', '..', 'configs', 'recharge_products.json'
-    )
-    with open(config_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return get_config("recharge_products.json")
 
 
 def load_vip_privileges():
     """加载VIP配置"""
-    config_path = os.path.join(
-        os.path.dirname(__file__), 
-        '..', '..', 'configs', 'vip_privileges.json'
-    )
-    with open(config_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return get_config("vip_privileges.json")
 
 
 def calc_vip_level(diamond_spent: int) -> int:
@@ -103,9 +103,7 @@ def get_player_profile():
         pass
     
     # 获取玩家动态
-    from infrastructure.db.zhenyao_battle_repo_mysql import MySQLZhenyaoBattleRepo
-    battle_repo = MySQLZhenyaoBattleRepo()
-    logs = battle_repo.get_user_battles(target_id, limit=10)
+    logs = services.battle_feed_service.get_zhenyao_battles(user_id=target_id, limit=10)
     dynamics = []
     for log in logs:
         time_str = log.created_at.strftime("%m-%d %H:%M") if log.created_at else ""
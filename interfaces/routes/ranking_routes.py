@@ -3,6 +3,7 @@
 
 from flask import Blueprint, request, jsonify, session
 from infrastructure.db.connection import execute_query
+from interfaces.web_api.bootstrap import services
 
 ranking_bp = Blueprint('ranking', __name__, url_prefix='/api/ranking')
 
@@ -44,26 +45,10 @@ def get_ranking_list():
     total = 0
     my_rank = None
     
+    # 等级/擂台/通天塔榜走进程内物化榜单：分页与“我的名次”均为二分查找
     if ranking_type == 'level':
-        sql = """
-            SELECT user_id as userId, nickname, level, exp
-            FROM player
-            ORDER BY level DESC, exp DESC
-            LIMIT %s OFFSET %s
-        """
-        rows = execute_query(sql, (size, offset))
-        total_rows = execute_query("SELECT COUNT(*) as total FROM player")
-        total = total_rows[0]['total'] if total_rows else 0
-        
-        if user_id:
-            rank_rows = execute_query(
-                """SELECT COUNT(*) + 1 as rank FROM player p1
-                   WHERE p1.level > (SELECT level FROM player WHERE user_id = %s)
-                   OR (p1.level = (SELECT level FROM player WHERE user_id = %s) 
-                       AND p1.exp > (SELECT exp FROM player WHERE user_id = %s))""",
-                (user_id, user_id, user_id)
-            )
-            my_rank = rank_rows[0]['rank'] if rank_rows else None
+        result = services.leaderboard_service.get_level_page(page, size, user_id)
+        rows, total, my_rank = result["list"], result["total"], result["myRank"]
     
     elif ranking_type == 'power':
         sql = """
@@ -82,49 +67,15 @@ def get_ranking_list():
     elif ranking_type == 'arena':
         filter_rank = request.args.get('rank')
         if not filter_rank and user_id:
-            level_rows = execute_query("SELECT level FROM player WHERE user_id = %s", (user_id,))
-            level_val = level_rows[0]['level'] if level_rows else 1
+            level_val = services.leaderboard_service.get_player_level(user_id) or 1
             filter_rank, _ = get_player_rank(level_val)
 
-        if filter_rank:
-            sql = """
-                SELECT s.user_id as userId, p.nickname, p.level, SUM(s.success_count) as successCount, %s as rankName
-                FROM arena_stats s
-                JOIN player p ON s.user_id = p.user_id
-                WHERE s.rank_name = %s
-                GROUP BY s.user_id, p.nickname, p.level
-                ORDER BY successCount DESC
-                LIMIT %s OFFSET %s
-            """
-            rows = execute_query(sql, (filter_rank, filter_rank, size, offset))
-            total_rows = execute_query("SELECT COUNT(DISTINCT user_id) as total FROM arena_stats WHERE rank_name = %s", (filter_rank,))
-        else:
-            sql = """
-                SELECT s.user_id as userId, p.nickname, p.level, SUM(s.success_count) as successCount, '全部擂台' as rankName
-                FROM arena_stats s
-                JOIN player p ON s.user_id = p.user_id
-                GROUP BY s.user_id, p.nickname, p.level
-                ORDER BY successCount DESC
-                LIMIT %s OFFSET %s
-            """
-            rows = execute_query(sql, (size, offset))
-            total_rows = execute_query("SELECT COUNT(DISTINCT user_id) as total FROM arena_stats")
-        
-        total = total_rows[0]['total'] if total_rows else 0
+        result = services.leaderboard_service.get_arena_page(page, size, user_id, rank_name=filter_rank)
+        rows, total, my_rank = result["list"], result["total"], result["myRank"]
     
     elif ranking_type == 'tower':
-        sql = """
-            SELECT p.user_id as userId, p.nickname, p.level, t.max_floor as maxFloor
-            FROM player p
-            JOIN tower_state t ON p.user_id = t.user_id AND t.tower_type = 'tongtian'
-            ORDER BY t.max_floor DESC
-            LIMIT %s OFFSET %s
-        """
-        rows = execute_query(sql, (size, offset))
-        total_rows = execute_query(
-            "SELECT COUNT(*) as total FROM tower_state WHERE tower_type = 'tongtian'"
-        )
-        total = total_rows[0]['total'] if total_rows else 0
+        result = services.leaderboard_service.get_tower_page(page, size, user_id)
+        rows, total, my_rank = result["list"], result["total"], result["myRank"]
     
     return jsonify({
         "ok": True,
@@ -1,10 +1,9 @@
 # interfaces/routes/shop_routes.py
 """商城系统路由"""
 
-import json
-import os
 from flask import Blueprint, request, jsonify, session
 from infrastructure.db.connection import execute_query, execute_update
+from infrastructure.config.registry import get_config
 from datetime import date
 
 shop_bp = Blueprint('shop', __name__, url_prefix='/api/shop')
@@ -16,12 +15,7 @@ def get_current_user_id() -> int:
 
 def load_shop_config():
     """加载商城配置"""
-    config_path = os.path.join(
-        os.path.dirname(__file__), 
-        '..', '..', 'configs', 'shop.json'
-    )
-    with open(config_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return get_config("shop.json")
 
 
 @shop_bp.get("/categories")
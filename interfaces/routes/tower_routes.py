@@ -445,15 +445,20 @@ def challenge_zhenyao_floor():
 
 @tower_bp.get("/zhenyao/dynamics")
 def get_zhenyao_dynamics():
-    """获取镇妖动态"""
+    """获取镇妖动态（下一页传 before_id=nextBeforeId）"""
     user_id = get_current_user_id()
     dynamic_type = request.args.get("type", "all")
     limit = int(request.args.get("limit", 20))
+    before_id = request.args.get("before_id", type=int)
     
     dynamics = services.zhenyao_service.get_dynamics(
-        user_id=user_id, dynamic_type=dynamic_type, limit=limit
+        user_id=user_id, dynamic_type=dynamic_type, limit=limit, before_id=before_id
     )
-    return jsonify({"ok": True, "dynamics": dynamics})
+    return jsonify({
+        "ok": True,
+        "dynamics": dynamics,
+        "nextBeforeId": dynamics[-1]["id"] if len(dynamics) == limit else None,
+    })
 
 
 @tower_bp.get("/zhenyao/battle/<int:battle_id>")
@@ -1,11 +1,10 @@
 # interfaces/routes/vip_routes.py
 """VIP特权路由"""
 
-import json
-import os
 from datetime import datetime, date
 from flask import Blueprint, request, jsonify, session
 from infrastructure.db.connection import execute_query, execute_update
+from infrastructure.config.registry import get_config
 
 vip_bp = Blueprint('vip', __name__, url_prefix='/api/vip')
 
@@ -16,12 +15,7 @@ def get_current_user_id() -> int:
 
 def load_vip_privileges():
     """加载VIP配置"""
-    config_path = os.path.join(
-        os.path.dirname(__file__), 
-        '..', '..', 'configs', 'vip_privileges.json'
-    )
-    with open(config_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return get_config("vip_privileges.json")
 
 
 @vip_bp.get('/info')
@@ -430,11 +430,13 @@ def get_teleport_count():
 
 
 # ===== 启动后台调度器（每日 00:05 自动开赛） =====
+import multiprocessing
 import os
-# 仅在主进程启动调度器，避免多 worker 重复触发
-if os.environ.get("WERKZEUG_RUN_MAIN") == "true" or not app.debug:
+# 仅在主进程启动调度器，避免多 worker 重复触发；
+# 古战场 / 土地战的进程池以 spawn 启动子进程，会重新导入本模块，子进程中同样跳过
+if multiprocessing.parent_process() is None and (os.environ.get("WERKZEUG_RUN_MAIN") == "true" or not app.debug):
     from infrastructure.scheduler import start_scheduler
-    start_scheduler()
+    start_scheduler(alliance_battle_service=services.alliance_battle_service)
 
 
 if __name__ == '__main__':
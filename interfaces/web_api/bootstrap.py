@@ -5,6 +5,8 @@
 """
 
 from domain.entities.player import Player
+from domain.services import config_source
+from infrastructure.config.registry import get_config, get_derived_config
 from infrastructure.memory.player_repo_inmemory import InMemoryPlayerRepo
 from infrastructure.config.monster_repo_from_config import ConfigMonsterRepo
 from infrastructure.config.map_repo_from_config import ConfigMapRepo
@@ -20,7 +22,10 @@ from infrastructure.db.player_repo_mysql import MySQLPlayerRepo, MySQLZhenyaoRep
 from infrastructure.db.bone_repo_mysql import MySQLBoneRepo
 from infrastructure.db.spirit_repo_mysql import MySQLSpiritRepo
 from infrastructure.db.spirit_account_repo_mysql import MySQLSpiritAccountRepo
-from infrastructure.db.mosoul_repo_mysql import MySQLMoSoulRepo, MySQLBeastMoSoulRepo
+from infrastructure.db.mosoul_repo_mysql import (
+    MySQLMoSoulRepo, MySQLBeastMoSoulRepo, MySQLMoSoulBatchHuntRepo, ensure_hunting_tables,
+)
+from infrastructure.db import player_repo_mysql
 from infrastructure.db.alliance_repo_mysql import MySQLAllianceRepo
 from infrastructure.db.task_reward_repo_mysql import MySQLTaskRewardRepo
 from infrastructure.db.daily_activity_repo_mysql import MySQLDailyActivityRepo
@@ -30,6 +35,11 @@ from infrastructure.db.month_card_repo_mysql import MySQLMonthCardRepo
 from infrastructure.db.immortalize_pool_repo_mysql import MySQLImmortalizePoolRepo
 from infrastructure.db.player_effect_repo_mysql import MySQLPlayerEffectRepo
 from infrastructure.db.player_gift_claim_repo_mysql import MySQLPlayerGiftClaimRepo
+from infrastructure.db.beast_derived_stats_repo_mysql import MySQLBeastDerivedStatsRepo
+from infrastructure.db.leaderboard_repo_mysql import MySQLLeaderboardRepo
+from infrastructure.db.arena_battle_repo_mysql import MySQLArenaBattleRepo
+from infrastructure.db.arena_repo_mysql import MySQLArenaRepo
+from infrastructure.db.zhenyao_battle_repo_mysql import MySQLZhenyaoBattleRepo
 from infrastructure.memory.beast_repo_inmemory import InMemoryBeastRepo
 
 from application.services.battle_service import BattleService
@@ -37,6 +47,14 @@ from application.services.signin_service import SigninService
 from application.services.map_service import MapService
 from application.services.inventory_service import InventoryService
 from application.services.beast_service import BeastService
+from application.services.beast_stats_cache_service import BeastStatsCacheService
+from application.services.leaderboard_service import LeaderboardService
+from application.services.alliance_war_leaderboard_service import AllianceWarLeaderboardService
+from application.services.alliance_feed_service import AllianceFeedHub
+from application.services.battle_feed_service import BattleFeedService
+from application.services.arena_service import ArenaService
+from application.services.mosoul_hunt_service import MoSoulBatchHuntService
+from application.services.mosoul_feed_service import MoSoulFeedService
 from application.services.bone_service import BoneService
 from application.services.spirit_service import SpiritService
 from application.services.drop_service import DropService
@@ -60,6 +78,10 @@ from application.services.home_gift_service import HomeGiftService
 from infrastructure.config.immortalize_config import ImmortalizeConfig
 
 
+# 领域层配置改由配置注册表提供（共享冻结对象 + 文件变化后热更新）
+config_source.set_config_provider(get_config, get_derived_config)
+
+
 class ServiceContainer:
     """服务容器，管理所有服务实例"""
     
@@ -91,6 +113,7 @@ class ServiceContainer:
         self.immortalize_config = ImmortalizeConfig()
         self.player_effect_repo = MySQLPlayerEffectRepo()
         self.player_gift_claim_repo = MySQLPlayerGiftClaimRepo()
+        self.beast_derived_stats_repo = MySQLBeastDerivedStatsRepo()
 
         # 战灵仓库
         self.spirit_repo = MySQLSpiritRepo()
@@ -103,6 +126,21 @@ class ServiceContainer:
         self.mosoul_repo = MySQLMoSoulRepo()
         self.beast_mosoul_repo = MySQLBeastMoSoulRepo(mosoul_repo=self.mosoul_repo)
         
+        # 排行榜：玩家/通天塔存档时增量更新
+        self.leaderboard_service = LeaderboardService(repo=MySQLLeaderboardRepo())
+        self.player_repo.add_save_listener(self.leaderboard_service.on_player_saved)
+        self.tower_state_repo.add_save_listener(self.leaderboard_service.on_tower_state_saved)
+
+        # 擂台 / 镇妖动态：战报写库后追加到进程内信息流
+        self.arena_battle_repo = MySQLArenaBattleRepo()
+        self.zhenyao_battle_repo = MySQLZhenyaoBattleRepo()
+        self.battle_feed_service = BattleFeedService(
+            arena_repo=self.arena_battle_repo,
+            zhenyao_repo=self.zhenyao_battle_repo,
+        )
+        self.arena_battle_repo.add_save_listener(self.battle_feed_service.on_arena_battle_saved)
+        self.zhenyao_battle_repo.add_save_listener(self.battle_feed_service.on_zhenyao_battle_saved)
+
         # 服务层
         self.beast_service = BeastService(
             template_repo=self.beast_template_repo, 
@@ -115,11 +153,16 @@ class ServiceContainer:
             beast_service=self.beast_service,
             player_effect_repo=self.player_effect_repo,
         )
+        self.beast_stats_cache = BeastStatsCacheService(
+            cache_repo=self.beast_derived_stats_repo,
+            player_beast_repo=self.player_beast_repo,
+        )
         self.bone_service = BoneService(
             bone_repo=self.bone_repo,
             bone_template_repo=self.bone_template_repo,
             inventory_service=self.inventory_service,
             player_repo=self.player_repo,
+            beast_stats_cache=self.beast_stats_cache,
         )
         self.spirit_service = SpiritService(
             spirit_repo=self.spirit_repo,
@@ -128,6 +171,7 @@ class ServiceContainer:
             player_repo=self.player_repo,
             tower_state_repo=self.tower_state_repo,
             player_beast_repo=self.player_beast_repo,
+            beast_stats_cache=self.beast_stats_cache,
         )
         self.drop_service = DropService(
             item_repo=self.item_repo, 
@@ -162,6 +206,8 @@ class ServiceContainer:
             player_repo=self.player_repo,
             zhenyao_repo=self.zhenyao_repo,
             tower_state_repo=self.tower_state_repo,
+            battle_repo=self.zhenyao_battle_repo,
+            battle_feed=self.battle_feed_service,
             bone_repo=self.bone_repo,
             spirit_repo=self.spirit_repo,
             beast_pvp_service=self.beast_pvp_service,
@@ -174,16 +220,37 @@ class ServiceContainer:
             inventory_service=self.inventory_service,
             tower_state_repo=self.tower_state_repo,
         )
+        self.arena_service = ArenaService(
+            arena_repo=MySQLArenaRepo(),
+            battle_repo=self.arena_battle_repo,
+            player_beast_repo=self.player_beast_repo,
+            beast_pvp_service=self.beast_pvp_service,
+            leaderboard_service=self.leaderboard_service,
+        )
+        self.mosoul_hunt_service = MoSoulBatchHuntService(
+            hunt_repo=MySQLMoSoulBatchHuntRepo(),
+            inventory_service=self.inventory_service,
+            player_repo=player_repo_mysql,
+            ensure_tables=ensure_hunting_tables,
+        )
+        self.mosoul_feed_service = MoSoulFeedService(mosoul_repo=self.mosoul_repo)
         self.battlefield_service = BattlefieldService(
             player_repo=self.player_repo,
             player_beast_repo=self.player_beast_repo,
             beast_pvp_service=self.beast_pvp_service,
         )
+        # 联盟战功榜：战功写库后增量更新
+        self.alliance_war_leaderboard = AllianceWarLeaderboardService(alliance_repo=self.alliance_repo)
+        self.alliance_repo.add_war_score_listener(self.alliance_war_leaderboard.on_war_score)
+        # 联盟聊天 / 战况长轮询推送：发言与战斗进度写入后入队
+        self.alliance_feed = AllianceFeedHub()
         self.alliance_service = AllianceService(
             alliance_repo=self.alliance_repo,
             player_repo=self.player_repo,
             inventory_service=self.inventory_service,
             beast_repo=self.player_beast_repo,
+            war_leaderboard=self.alliance_war_leaderboard,
+            feed=self.alliance_feed,
         )
         self.alliance_battle_service = AllianceBattleService(
             alliance_repo=self.alliance_repo,
@@ -191,6 +258,7 @@ class ServiceContainer:
             player_beast_repo=self.player_beast_repo,
             beast_pvp_service=self.beast_pvp_service,
         )
+        self.alliance_battle_service.add_progress_listener(self.alliance_service.on_battle_progress)
         self.task_reward_service = TaskRewardService(
             reward_repo=self.task_reward_repo,
             player_repo=self.player_repo,
@@ -0,0 +1,130 @@
+"""战报存储基准：JSON 战报 vs 紧凑二进制战报的单条体积、写入吞吐与详情读取耗时。
+
+对比两种方式（同一批对局、相同随机种子）：
+- json：full 模式记录日志 -> 渲染 battle_data（每回合一整句描述）-> json.dumps，即改造之前写入 battle_data 列的内容
+- compact：compact 模式记录回合流 -> encode_battle_report（幻兽名单 + 定长回合记录，zlib 压缩），写入 battle_report 列
+
+写入吞吐按“模拟 + 生成入库内容”计时；读取按“入库内容 -> 前端 battle_data”计时。
+两种方式读取出来的 battle_data 逐字一致。数据全部在内存中，不需要 MySQL。
+
+运行示例（项目根目录）：
+    python scripts/bench_battle_report_storage.py
+    python scripts/bench_battle_report_storage.py --battles 2000 --team-size 5
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from application.services.beast_pvp_service import BeastPvpService
+from domain.services.battle_report import build_battle_data, decode_battle_report, encode_battle_report
+from domain.services.pvp_battle_engine import LOG_COMPACT, LOG_FULL, PvpPlayer, run_pvp_battle
+
+SKILL_SETS = [
+    ["高级必杀", "高级连击"],
+    ["高级反击", "高级闪避"],
+    ["高级毒攻", "高级吸血"],
+    ["高级反震", "高级破甲"],
+]
+
+
+class EmptyEquipmentRepo:
+    def get_by_beast_ids(self, beast_ids):
+        return {}
+
+
+def make_beast(beast_id):
+    return SimpleNamespace(
+        id=beast_id,
+        name=f"幻兽{beast_id}",
+        nature="法攻型" if beast_id % 2 else "物攻型",
+        hp=3000 + (beast_id * 37) % 900,
+        physical_attack=900 + (beast_id * 53) % 300,
+        magic_attack=900 + (beast_id * 71) % 300,
+        physical_defense=500 + (beast_id * 13) % 200,
+        magic_defense=500 + (beast_id * 17) % 200,
+        speed=200 + (beast_id * 29) % 100,
+        grade=1,
+        skills=SKILL_SETS[beast_id % len(SKILL_SETS)],
+    )
+
+
+def make_matches(count, team_size):
+    pvp = BeastPvpService(EmptyEquipmentRepo(), EmptyEquipmentRepo(), EmptyEquipmentRepo())
+    rng = random.Random(2024)
+    matches = []
+    for i in range(count):
+        first = [make_beast(rng.randint(1, 5000)) for _ in range(team_size)]
+        second = [make_beast(rng.randint(1, 5000)) for _ in range(team_size)]
+        matches.append((i, pvp, first, second))
+    return matches
+
+
+def players(pvp, first, second):
+    return (
+        PvpPlayer(player_id=1, level=40, beasts=pvp.to_pvp_beasts(first), name="先手玩家"),
+        PvpPlayer(player_id=2, level=40, beasts=pvp.to_pvp_beasts(second), name="后手玩家"),
+    )
+
+
+def write_json(match):
+    seed, pvp, first, second = match
+    a, b = players(pvp, first, second)
+    random.seed(seed)
+    result = run_pvp_battle(a, b, max_log_turns=50, log_mode=LOG_FULL)
+    return json.dumps(build_battle_data(result, a, b), ensure_ascii=False).encode("utf-8")
+
+
+def write_compact(match):
+    seed, pvp, first, second = match
+    a, b = players(pvp, first, second)
+    random.seed(seed)
+    result = run_pvp_battle(a, b, max_log_turns=50, log_mode=LOG_COMPACT)
+    return encode_battle_report(result, a, b)
+
+
+def read_json(payload):
+    return json.loads(payload)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--battles", type=int, default=500, help="对局数")
+    parser.add_argument("--team-size", type=int, default=3, help="每方出战幻兽数")
+    args = parser.parse_args()
+
+    matches = make_matches(args.battles, args.team_size)
+
+    stats = {}
+    decoded = {}
+    for label, write, read in (("json", write_json, read_json), ("compact", write_compact, decode_battle_report)):
+        start = time.perf_counter()
+        payloads = [write(m) for m in matches]
+        write_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        decoded[label] = [read(p) for p in payloads]
+        read_seconds = time.perf_counter() - start
+
+        size = sum(len(p) for p in payloads)
+        stats[label] = (size / len(payloads), len(payloads) / write_seconds, read_seconds / len(payloads))
+
+    assert decoded["json"] == decoded["compact"], "解码后的战报不一致"
+
+    base_size, base_rate, _ = stats["json"]
+    print(f"对局: {args.battles}  每方 {args.team_size} 只幻兽")
+    for label, (avg_size, rate, read_per) in stats.items():
+        print(
+            f"{label:<8} {avg_size:9.0f} B/场 ({base_size / avg_size:5.1f}x)  "
+            f"写入 {rate:8.0f} 场/s ({rate / base_rate:4.2f}x)  详情读取 {read_per * 1e6:7.1f} us/场"
+        )
+
+
+if __name__ == "__main__":
+    main()
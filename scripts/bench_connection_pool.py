@@ -0,0 +1,148 @@
+"""连接池基准测试：对比每条SQL新建连接 与 使用连接池 的单请求耗时。
+
+模拟一次 /api/beast/list 请求：连续执行 N 条查询。
+默认使用替身连接（用 sleep 模拟建连握手与查询往返），无需数据库；
+加 --real 时连接本地 MySQL（使用 infrastructure/db/connection.py 中的 DB_CONFIG）。
+
+运行示例（项目根目录）：
+    python scripts/bench_connection_pool.py
+    python scripts/bench_connection_pool.py --requests 200 --queries 30 --threads 8
+    python scripts/bench_connection_pool.py --real --requests 50
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from infrastructure.db.connection_pool import ConnectionPool
+
+
+class _FakeCursor:
+    def __init__(self, query_latency: float):
+        self.query_latency = query_latency
+
+    def execute(self, sql, params=None):
+        time.sleep(self.query_latency)
+        return 1
+
+    def fetchall(self):
+        return [{"1": 1}]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakeConnection:
+    """替身连接：建连时 sleep 模拟 TCP + 认证握手"""
+
+    def __init__(self, connect_latency: float, query_latency: float):
+        time.sleep(connect_latency)
+        self.query_latency = query_latency
+
+    def cursor(self):
+        return _FakeCursor(self.query_latency)
+
+    def ping(self, reconnect=False):
+        time.sleep(self.query_latency)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def _run_query(conn) -> None:
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT 1")
+        cursor.fetchall()
+
+
+def _one_request(get_conn, queries: int) -> float:
+    """执行一次模拟请求，返回耗时（毫秒）"""
+    start = time.perf_counter()
+    for _ in range(queries):
+        conn = get_conn()
+        try:
+            _run_query(conn)
+        finally:
+            conn.close()
+    return (time.perf_counter() - start) * 1000
+
+
+def _bench(get_conn, requests: int, queries: int, threads: int) -> list:
+    latencies = []
+    lock = threading.Lock()
+    per_thread = max(1, requests // threads)
+
+    def worker():
+        local = [_one_request(get_conn, queries) for _ in range(per_thread)]
+        with lock:
+            latencies.extend(local)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return latencies
+
+
+def _report(title: str, latencies: list) -> float:
+    latencies = sorted(latencies)
+    p50 = statistics.median(latencies)
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    print(f"{title:<12} 请求数={len(latencies):<5} 平均={statistics.mean(latencies):8.2f}ms "
+          f"p50={p50:8.2f}ms p95={p95:8.2f}ms")
+    return statistics.mean(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="连接池基准测试")
+    parser.add_argument("--requests", type=int, default=100, help="模拟请求总数")
+    parser.add_argument("--queries", type=int, default=30, help="每个请求的SQL条数")
+    parser.add_argument("--threads", type=int, default=4, help="并发线程数")
+    parser.add_argument("--connect-ms", type=float, default=3.0, help="替身连接的建连耗时（毫秒）")
+    parser.add_argument("--query-ms", type=float, default=0.2, help="替身连接的查询耗时（毫秒）")
+    parser.add_argument("--real", action="store_true", help="连接本地 MySQL 而不是替身")
+    args = parser.parse_args()
+
+    if args.real:
+        from infrastructure.db.connection import create_raw_connection, POOL_CONFIG
+        connect = create_raw_connection
+        pool_kwargs = dict(POOL_CONFIG)
+    else:
+        connect_latency = args.connect_ms / 1000
+        query_latency = args.query_ms / 1000
+
+        def connect():
+            return FakeConnection(connect_latency, query_latency)
+
+        pool_kwargs = {"min_size": 2, "max_size": max(2, args.threads)}
+
+    print(f"模式={'MySQL' if args.real else '替身连接'} 请求数={args.requests} "
+          f"每请求SQL={args.queries} 并发={args.threads}")
+
+    no_pool = _report("无连接池", _bench(connect, args.requests, args.queries, args.threads))
+
+    pool = ConnectionPool(connect, **pool_kwargs)
+    pooled = _report("连接池", _bench(pool.acquire, args.requests, args.queries, args.threads))
+    pool.close_all()
+
+    print(f"加速比: {no_pool / pooled:.1f}x")
+    print(f"连接池统计: {pool.stats()}")
+
+
+if __name__ == "__main__":
+    main()
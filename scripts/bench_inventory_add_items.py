@@ -0,0 +1,141 @@
+"""背包批量发放基准：20 种物品的奖励包，逐个 add_item vs add_items 的 SQL 往返次数与耗时。
+
+对比两种方式（相同初始背包、相同奖励包）：
+- add_item：每种物品查一次已有格子，每个格子单独保存，每开一个新格子查询一次背包容量和已用格子数
+- add_items：背包与容量各读取一次，在内存中规划堆叠与溢出，已有格子一条 UPDATE、新格子一条多行 INSERT
+
+背包数据在内存中，每条 SQL 按 --rtt-ms 模拟一次数据库往返，不需要 MySQL。两种方式的最终背包逐格一致。
+
+运行示例（项目根目录）：
+    python scripts/bench_inventory_add_items.py
+    python scripts/bench_inventory_add_items.py --bundles 200 --rtt-ms 1 --capacity 40
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from application.services.inventory_service import InventoryService
+from domain.entities.item import InventoryItem, Item, PlayerBag
+from infrastructure.memory.inventory_repo_inmemory import InMemoryInventoryRepo
+
+BUNDLE_SIZE = 20
+
+
+class RoundTripRepo(InMemoryInventoryRepo):
+    """内存背包，每条 SQL 计一次往返并 sleep rtt 秒"""
+
+    def __init__(self, capacity, rtt):
+        super().__init__()
+        self.capacity = capacity
+        self.rtt = rtt
+        self.statements = 0
+
+    def _round_trip(self, count=1):
+        self.statements += count
+        if self.rtt:
+            time.sleep(self.rtt * count)
+
+    def get_by_user_id(self, user_id, include_temp=True):
+        self._round_trip()
+        return super().get_by_user_id(user_id, include_temp)
+
+    def find_all_items(self, user_id, item_id, is_temporary=False):
+        self._round_trip()
+        return super().find_all_items(user_id, item_id, is_temporary)
+
+    def save(self, inv_item):
+        self._round_trip()
+        super().save(inv_item)
+
+    def save_many(self, inv_items):
+        has_updates = any(inv.id is not None for inv in inv_items)
+        has_inserts = any(inv.id is None for inv in inv_items)
+        self._round_trip(int(has_updates) + int(has_inserts))
+        for inv in inv_items:
+            super().save(inv)
+
+    def get_slot_count(self, user_id, is_temporary=False):
+        self._round_trip()
+        return sum(1 for inv in self._data.values() if inv.user_id == user_id and inv.is_temporary == is_temporary)
+
+    def get_bag_info(self, user_id):
+        self._round_trip()
+        return PlayerBag(user_id=user_id, capacity=self.capacity)
+
+
+class ItemRepo:
+    def __init__(self, count):
+        self.items = {i: Item(id=i, name=f"物品{i}") for i in range(1, count + 1)}
+
+    def get_by_id(self, item_id):
+        return self.items.get(item_id)
+
+
+def make_cases(bundles, capacity, seed=2024):
+    rng = random.Random(seed)
+    item_count = BUNDLE_SIZE * 3
+    cases = []
+    for _ in range(bundles):
+        seed_items = [
+            (rng.randint(1, item_count), rng.randint(1, 99), False)
+            for _ in range(rng.randint(capacity // 2, capacity))
+        ]
+        bundle = [(item_id, rng.randint(1, 150)) for item_id in rng.sample(range(1, item_count + 1), BUNDLE_SIZE)]
+        cases.append((seed_items, bundle))
+    return ItemRepo(item_count), cases
+
+
+def run(mode, item_repo, cases, capacity, rtt):
+    statements = 0
+    elapsed = 0.0
+    states = []
+    for seed_items, bundle in cases:
+        repo = RoundTripRepo(capacity, rtt=0)
+        for item_id, quantity, is_temp in seed_items:
+            repo.save(InventoryItem(user_id=1, item_id=item_id, quantity=quantity, is_temporary=is_temp))
+        repo.statements, repo.rtt = 0, rtt
+        service = InventoryService(item_repo, repo)
+
+        start = time.perf_counter()
+        if mode == "add_item":
+            for item_id, quantity in bundle:
+                service.add_item(1, item_id, quantity)
+        else:
+            service.add_items(1, bundle)
+        elapsed += time.perf_counter() - start
+
+        statements += repo.statements
+        states.append(Counter((inv.item_id, inv.quantity, inv.is_temporary) for inv in repo.get_by_user_id(1)))
+    return statements / len(cases), elapsed / len(cases), states
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bundles", type=int, default=100, help="奖励包数量（每包 20 种物品）")
+    parser.add_argument("--capacity", type=int, default=60, help="背包格子数（初始已用一半到全部）")
+    parser.add_argument("--rtt-ms", type=float, default=0.3, help="模拟的单条 SQL 往返耗时（毫秒）")
+    args = parser.parse_args()
+
+    item_repo, cases = make_cases(args.bundles, args.capacity)
+    rtt = args.rtt_ms / 1000
+
+    results = {mode: run(mode, item_repo, cases, args.capacity, rtt) for mode in ("add_item", "add_items")}
+    assert results["add_item"][2] == results["add_items"][2], "两种方式的最终背包不一致"
+
+    base_statements, base_elapsed, _ = results["add_item"]
+    print(f"奖励包: {args.bundles} 个 × {BUNDLE_SIZE} 种物品  背包 {args.capacity} 格  往返 {args.rtt_ms} ms")
+    for mode, (statements, elapsed, _) in results.items():
+        print(
+            f"{mode:<10} {statements:7.1f} 条SQL/包 ({base_statements / statements:5.1f}x)  "
+            f"{elapsed * 1000:8.2f} ms/包 ({base_elapsed / elapsed:5.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
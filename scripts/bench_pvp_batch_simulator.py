@@ -0,0 +1,85 @@
+"""PVP 批量模拟基准测试：对比逐场调用 run_pvp_battle 与 MatchupSimulator 的吞吐。
+
+两者使用同一组 3v3 阵容、同一个引擎；逐场调用每场深拷贝阵容并生成战报，
+批量模拟器每场只浅拷贝阵容，并以 LOG_NONE 模式运行、不生成战报。
+
+运行示例（项目根目录）：
+    python scripts/bench_pvp_batch_simulator.py
+    python scripts/bench_pvp_batch_simulator.py --fights 20000
+"""
+
+import argparse
+import copy
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from domain.services.pvp_battle_engine import PvpBeast, PvpPlayer, run_pvp_battle
+from domain.services.pvp_batch_simulator import MatchupSimulator
+
+
+def _beast(beast_id, attack_type, skills, hp=6000, speed=400, **extra):
+    stats = dict(
+        id=beast_id, name=f"beast-{beast_id}", hp_max=hp, hp_current=hp,
+        physical_attack=2600, magic_attack=2500, physical_defense=1500, magic_defense=1400,
+        speed=speed, attack_type=attack_type, skills=skills,
+    )
+    stats.update(extra)
+    return PvpBeast(**stats)
+
+
+def build_matchup():
+    attacker = PvpPlayer(player_id=1, level=45, name="攻方", beasts=[
+        _beast(11, "physical", ["高级必杀", "高级破甲", "高级反击"], speed=420),
+        _beast(12, "magic", ["高级吸血", "高级麻痹", "毒攻", "高级闪避"], hp=5000),
+        _beast(13, "physical", ["连击", "偷袭", "反震"], physical_attack=1200),
+    ])
+    defender = PvpPlayer(player_id=2, level=45, name="守方", beasts=[
+        _beast(21, "magic", ["高级雷击", "高级反震", "闪避"], hp=8000, critical_resist=0.5),
+        _beast(22, "physical", ["高级冲撞", "抗性增强", "高级反击"], hp=8000, poison_resist=0.5),
+        _beast(23, "physical", ["高级虚弱"], speed=420),
+    ])
+    return attacker, defender
+
+
+def bench_scalar(attacker, defender, fights, max_log_turns):
+    random.seed(1)
+    wins = 0
+    start = time.perf_counter()
+    for _ in range(fights):
+        result = run_pvp_battle(copy.deepcopy(attacker), copy.deepcopy(defender), max_log_turns=max_log_turns)
+        wins += result.winner_player_id == attacker.player_id
+    return time.perf_counter() - start, wins / fights
+
+
+def bench_batch(attacker, defender, fights):
+    start = time.perf_counter()
+    stats = MatchupSimulator(attacker, defender).run(fights, seed=1)
+    return time.perf_counter() - start, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fights", type=int, default=5000, help="每种方式模拟的场数")
+    parser.add_argument("--log-turns", type=int, default=50, help="单场引擎保留的战报条数")
+    args = parser.parse_args()
+
+    attacker, defender = build_matchup()
+    scalar_time, scalar_rate = bench_scalar(attacker, defender, args.fights, args.log_turns)
+    batch_time, stats = bench_batch(attacker, defender, args.fights)
+    low, high = stats.win_rate_interval()
+
+    print(f"场数: {args.fights}")
+    print(f"run_pvp_battle 逐场:  {scalar_time:.2f}s  ({args.fights / scalar_time:,.0f} 场/秒)  胜率 {scalar_rate:.3f}")
+    print(f"MatchupSimulator:     {batch_time:.2f}s  ({args.fights / batch_time:,.0f} 场/秒)  "
+          f"胜率 {stats.win_rate:.3f}  95%区间 [{low:.3f}, {high:.3f}]")
+    print(f"加速比: {scalar_time / batch_time:.1f}x")
+    turns = stats.summarize(stats.turns)
+    print(f"回合数: 均值 {turns['mean']:.1f}  P50 {turns['p50']}  P90 {turns['p90']}  最大 {turns['max']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""技能判定微基准：10 万次出手的主动 + 被动 + 毒抗判定耗时。
+
+对比三种方式：
+- legacy：每次出手扫描 skills.json 字典、重建候选列表（预编译之前的实现，保留在本脚本中仅作对照）
+- by-name：try_trigger_active_skill / try_trigger_passive_skill（按技能名调用，内部命中解析缓存）
+- resolved：战斗引擎的方式，每场战斗解析一次 ResolvedSkillSet，出手时直接判定
+
+三种方式在相同随机种子下的触发结果完全一致。
+
+运行示例（项目根目录）：
+    python scripts/bench_skill_lookup.py
+    python scripts/bench_skill_lookup.py --attacks 500000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from domain.services.skill_system import (
+    get_skill_config,
+    resolve_skill_set,
+    resists_poison,
+    trigger_active_skill,
+    trigger_passive_skill,
+    try_trigger_active_skill,
+    try_trigger_passive_skill,
+    check_poison_resist,
+)
+
+ATTACKER_SKILLS = ["高级必杀", "高级连击", "高级毒攻", "高级吸血", "高级反击", "体魄", "高级强力"]
+DEFENDER_SKILLS = ["高级闪避", "高级反震", "反击", "抗性增强", "高级防御", "弱点敏捷"]
+
+
+def _legacy_active(skills, attack_type, critical_resist, poison_enhance):
+    config = get_skill_config()
+    candidates = []
+    for name in skills:
+        for tier in ["advanced", "normal"]:
+            if name in config["active_skills"].get(tier, {}):
+                info = config["active_skills"][tier][name]
+                if info.get("attack_type", "all") in ("all", attack_type):
+                    candidates.append((name, info))
+    if not candidates:
+        return ""
+    random.shuffle(candidates)
+    for name, info in candidates:
+        rate = info["trigger_rate"]
+        if "毒攻" in name and poison_enhance > 0:
+            rate += poison_enhance
+        if info.get("is_critical", False) and critical_resist > 0:
+            rate *= (1 - critical_resist)
+        if random.random() < rate:
+            return name
+    return ""
+
+
+def _legacy_passive(skills, is_normal_attack, immune_counter):
+    config = get_skill_config()
+    candidates = []
+    for name in skills:
+        for tier in ["advanced", "normal"]:
+            if name in config["passive_skills"].get(tier, {}):
+                candidates.append((name, config["passive_skills"][tier][name]))
+    if not candidates:
+        return ""
+    random.shuffle(candidates)
+    for name, info in candidates:
+        effect_type = info["effect_type"]
+        if effect_type == "dodge" and not is_normal_attack:
+            continue
+        if effect_type in ("reflect", "counter") and immune_counter:
+            continue
+        if random.random() < info["trigger_rate"]:
+            return name
+    return ""
+
+
+def _legacy_poison_resist(skills):
+    config = get_skill_config()
+    for name in skills:
+        for tier in ["advanced", "normal"]:
+            if name in config["buff_skills"].get(tier, {}):
+                buff = config["buff_skills"][tier][name]
+                if buff.get("special") == "poison_resist" and random.random() < buff["value"]:
+                    return True
+    return False
+
+
+def run_legacy(attacks):
+    fired = []
+    for _ in range(attacks):
+        active = _legacy_active(ATTACKER_SKILLS, "physical", 0.5, 0.05)
+        passive = _legacy_passive(DEFENDER_SKILLS, not active, False)
+        resisted = _legacy_poison_resist(DEFENDER_SKILLS) if active == "高级毒攻" else False
+        fired.append((active, passive, resisted))
+    return fired
+
+
+def run_by_name(attacks):
+    fired = []
+    for _ in range(attacks):
+        active = try_trigger_active_skill(ATTACKER_SKILLS, "physical", 0.5, 0.05)
+        passive = try_trigger_passive_skill(DEFENDER_SKILLS, not active.triggered, False)
+        resisted = check_poison_resist(DEFENDER_SKILLS) if active.skill_name == "高级毒攻" else False
+        fired.append((active.skill_name, passive.skill_name, resisted))
+    return fired
+
+
+def run_resolved(attacks):
+    atk_set = resolve_skill_set(ATTACKER_SKILLS, "physical")
+    def_set = resolve_skill_set(DEFENDER_SKILLS, "physical")
+    fired = []
+    for _ in range(attacks):
+        active = trigger_active_skill(atk_set, 0.5, 0.05)
+        passive = trigger_passive_skill(def_set, not active.triggered, False)
+        resisted = resists_poison(def_set) if active.skill_name == "高级毒攻" else False
+        fired.append((active.skill_name, passive.skill_name, resisted))
+    return fired
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--attacks", type=int, default=100_000, help="模拟出手次数")
+    args = parser.parse_args()
+
+    results = {}
+    timings = {}
+    for label, fn in (("legacy", run_legacy), ("by-name", run_by_name), ("resolved", run_resolved)):
+        random.seed(2024)
+        start = time.perf_counter()
+        results[label] = fn(args.attacks)
+        timings[label] = time.perf_counter() - start
+
+    assert results["legacy"] == results["by-name"] == results["resolved"], "触发结果不一致"
+
+    base = timings["legacy"]
+    print(f"出手次数: {args.attacks:,}")
+    for label, elapsed in timings.items():
+        print(f"{label:<9} {elapsed:6.3f}s  {args.attacks / elapsed:>12,.0f} 次/秒  {base / elapsed:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
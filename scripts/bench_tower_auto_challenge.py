@@ -0,0 +1,118 @@
+"""自动闯塔基准：120 层通天塔一次性闯关的耗时、玩家查询次数与战报体积。
+
+对比两种方式：
+- legacy：逐层读取守塔幻兽、逐层调用 battle_one_floor（每层查询玩家、重建 PvpBeast、记录完整战报），
+  即流水线改造之前 auto_challenge 的做法，保留在本脚本中仅作对照
+- pipeline：auto_challenge，玩家与队伍只解析一次，守塔幻兽模板按层缓存，只有最后一层记录详细战报
+
+两种方式在相同随机种子下的闯关结果完全一致。数据全部在内存中，不需要 MySQL。
+
+运行示例（项目根目录）：
+    python scripts/bench_tower_auto_challenge.py
+    python scripts/bench_tower_auto_challenge.py --runs 50 --scale 1
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from application.services.tower_service import PlayerBeast, TowerBattleService
+from domain.entities.tower import TowerState
+from infrastructure.config.tower_config_repo import ConfigTowerRepo
+
+TOWER_TYPE = "tongtian"
+
+
+class MemoryStateRepo:
+    def get_by_user_id(self, user_id, tower_type):
+        return TowerState(user_id=user_id, tower_type=tower_type)
+
+    def save(self, state):
+        pass
+
+
+class CountingPlayerRepo:
+    def __init__(self):
+        self.calls = 0
+
+    def get_by_id(self, user_id):
+        self.calls += 1
+        return SimpleNamespace(level=80, nickname="基准玩家", vip_level=0, yuanbao=0)
+
+
+def make_team(scale):
+    return [
+        PlayerBeast(
+            id=i, name=f"兽{i}", realm="天界", level=80,
+            hp=int(20000 * scale), attack=int(5000 * scale), defense=int(2500 * scale), speed=500,
+            nature="法系" if i % 2 else "物系", skills=["高级必杀", "高级连击", "高级反击"],
+        )
+        for i in range(1, 6)
+    ]
+
+
+def run_legacy(service, team, max_floor, rng):
+    battles = []
+    for floor in range(1, max_floor + 1):
+        guardians = service.config_repo.get_guardians_for_floor(TOWER_TYPE, floor)
+        battle = service.battle_one_floor(1, TOWER_TYPE, team, guardians, floor, rng=rng)
+        battles.append(battle)
+        if not battle.is_victory:
+            break
+        if service.config_repo.should_give_special_reward(TOWER_TYPE, floor):
+            service.roll_special_reward(TOWER_TYPE, floor)
+        service.roll_spirit_drop(TOWER_TYPE, floor)
+    return battles
+
+
+def run_pipeline(service, team, max_floor, rng):
+    return service.auto_challenge(1, TOWER_TYPE, team, use_buff=False, rng=rng).battles
+
+
+def payload_bytes(battles):
+    return len(json.dumps([b.to_detail_dict() for b in battles], ensure_ascii=False).encode("utf-8"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20, help="每种方式闯塔次数")
+    parser.add_argument("--scale", type=float, default=3.0, help="队伍属性倍率（3 可通关 120 层）")
+    args = parser.parse_args()
+
+    config_repo = ConfigTowerRepo()
+    max_floor = config_repo.get_tower_config(TOWER_TYPE).get("max_floor", 120)
+    team = make_team(args.scale)
+
+    stats = {}
+    outcomes = {}
+    for label, fn in (("legacy", run_legacy), ("pipeline", run_pipeline)):
+        players = CountingPlayerRepo()
+        service = TowerBattleService(MemoryStateRepo(), config_repo, None, players)
+        random.seed(2024)  # 奖励掉落
+        rng = random.Random(2024)  # 各层战斗
+        start = time.perf_counter()
+        for _ in range(args.runs):
+            battles = fn(service, team, max_floor, rng)
+        elapsed = time.perf_counter() - start
+        outcomes[label] = [(b.floor, b.is_victory) for b in battles]
+        stats[label] = (elapsed / args.runs, players.calls / args.runs, payload_bytes(battles))
+
+    assert outcomes["legacy"] == outcomes["pipeline"], "闯关结果不一致"
+
+    base = stats["legacy"][0]
+    print(f"层数: {len(outcomes['pipeline'])}/{max_floor}  每种方式 {args.runs} 次")
+    for label, (per_run, calls, size) in stats.items():
+        print(
+            f"{label:<9} {per_run * 1000:8.2f} ms/次  get_by_id {calls:5.0f} 次/闯塔  "
+            f"战报 {size / 1024:8.1f} KB  {base / per_run:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
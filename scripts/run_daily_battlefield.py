@@ -23,7 +23,11 @@ from infrastructure.db.connection import execute_query
 from infrastructure.db.player_beast_repo_mysql import MySQLPlayerBeastRepo
 from infrastructure.db.player_repo_mysql import MySQLPlayerRepo
 from infrastructure.db.battlefield_repo_mysql import MySQLBattlefieldBattleRepo
+from infrastructure.db.spirit_repo_mysql import MySQLSpiritRepo
+from infrastructure.db.bone_repo_mysql import MySQLBoneRepo
+from infrastructure.db.mosoul_repo_mysql import MySQLMoSoulRepo, MySQLBeastMoSoulRepo
 from application.services.battlefield_service import BattlefieldService
+from application.services.beast_pvp_service import BeastPvpService
 
 # 与接口保持一致的时间窗口（小时，24h）
 FIGHT_START_HOUR = 0
@@ -68,18 +72,23 @@ def _run_once(battlefield_type: str) -> None:
     service = BattlefieldService(
         player_repo=player_repo,
         player_beast_repo=beast_repo,
+        beast_pvp_service=BeastPvpService(
+            spirit_repo=MySQLSpiritRepo(),
+            bone_repo=MySQLBoneRepo(),
+            mosoul_repo=MySQLBeastMoSoulRepo(mosoul_repo=MySQLMoSoulRepo()),
+        ),
         battle_repo=battle_repo,
     )
 
     print(f"[{battlefield_type}] 开始运行淘汰赛...")
-    result = service.run_tournament(battlefield_type)
+    result = service.run_tournament(battlefield_type, max_workers=os.cpu_count())
     if not result.get("ok"):
         raise RuntimeError(f"[{battlefield_type}] 开赛失败: {result}")
 
     print(
         f"[{battlefield_type}] 完成：period={result['period']}, "
         f"players={result['total_players']}, rounds={result['total_rounds']}, "
-        f"champion={result['champion_name']}({result['champion_id']})"
+        f"champion={result['champion_name']}({result['champion_id']}), seed={result['seed']}"
     )
 
 
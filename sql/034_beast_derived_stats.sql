@@ -0,0 +1,9 @@
+-- 幻兽派生属性缓存：幻兽列表/战斗队直接读取装备加成后的总战力
+-- stats_stamp 为等级/境界/资质/成长/属性类型等基础输入的摘要，不一致即视为失效；
+-- 战灵/战骨/魔魂的穿戴、卸下、洗练等由业务代码直接删除对应缓存行。
+CREATE TABLE IF NOT EXISTS player_beast_derived_stats (
+    beast_id INT PRIMARY KEY COMMENT '玩家幻兽ID',
+    stats_stamp CHAR(40) NOT NULL COMMENT '基础输入版本摘要',
+    total_power INT NOT NULL DEFAULT 0 COMMENT '含装备加成的总战力',
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='幻兽派生属性缓存';
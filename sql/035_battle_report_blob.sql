@@ -0,0 +1,16 @@
+-- 镇妖 / 擂台 / 古战场战报改为紧凑二进制格式存储
+-- battle_report：幻兽名单 + 回合流（技能用 skill_id），zlib 压缩，读取详情时还原描述文本；
+-- 新战报只写 battle_report，battle_data 留空；旧战报仍从 battle_data(JSON) 读取。
+-- 注意：如果字段已存在会报错，可忽略
+
+ALTER TABLE zhenyao_battle_log
+    MODIFY COLUMN battle_data TEXT NULL COMMENT '战斗详情(JSON，旧格式)',
+    ADD COLUMN battle_report MEDIUMBLOB NULL COMMENT '紧凑战报' AFTER battle_data;
+
+ALTER TABLE arena_battle_log
+    MODIFY COLUMN battle_data TEXT NULL COMMENT '战斗详情(JSON，旧格式)',
+    ADD COLUMN battle_report MEDIUMBLOB NULL COMMENT '紧凑战报' AFTER battle_data;
+
+ALTER TABLE battlefield_battle_log
+    MODIFY COLUMN battle_data TEXT NULL COMMENT '战斗详情(JSON，旧格式)',
+    ADD COLUMN battle_report MEDIUMBLOB NULL COMMENT '紧凑战报' AFTER battle_data;
@@ -0,0 +1,6 @@
+-- 擂台动态按场次 + ID 倒序翻页（before_id 游标）所需索引
+-- 个人动态按 challenger_id / champion_id 各自的二级索引（隐含主键 id）分别取页再合并，无需新索引
+-- 注意：如果索引已存在会报错，可忽略
+
+ALTER TABLE arena_battle_log
+    ADD INDEX idx_type_id (arena_type, id);
@@ -0,0 +1,6 @@
+-- 联盟战功榜按赛季（season_key）整块读取对账所需索引
+-- 原唯一键 (alliance_id, season_key) 无法按赛季检索
+-- 注意：如果索引已存在会报错，可忽略
+
+ALTER TABLE alliance_war_scores
+    ADD INDEX idx_season (season_key);
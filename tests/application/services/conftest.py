@@ -0,0 +1,213 @@
+"""应用服务测试共用的假仓储与构造函数
+
+联盟土地战（逐回合推进 / 整块结算）的测试共用同一套内存仓储；
+各测试文件只保留自己的报名、编制与断言。
+"""
+
+import copy
+import json
+from collections import Counter
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from application.services.alliance_battle_service import AllianceBattleService
+from application.services.beast_pvp_service import BeastPvpService
+from domain.entities.alliance_registration import STATUS_CONFIRMED, AllianceRegistration
+
+
+class FakeAllianceRepo:
+    """联盟土地战用到的仓储方法；逐条查询 / 写入的方法都计数，便于断言整块结算只走批量方法"""
+
+    def __init__(self, registrations, assignments):
+        self.registrations = {r.id: r for r in registrations}
+        self.assignments = assignments
+        self.battles, self.rounds, self.signups, self.duels = {}, {}, {}, []
+        self.calls = Counter()
+        self.scores = Counter()
+
+    # 报名与编制
+    def list_land_registrations_by_land(self, land_id, statuses=None):
+        return [copy.copy(r) for r in self.registrations.values()
+                if r.land_id == land_id and (statuses is None or r.status in statuses)]
+
+    def get_land_registration_by_id(self, registration_id):
+        self.calls["get_land_registration_by_id"] += 1
+        return copy.copy(self.registrations.get(registration_id))
+
+    def save_land_registration(self, registration):
+        self.registrations[registration.id] = copy.copy(registration)
+        return registration.id
+
+    def get_army_assignments(self, alliance_id):
+        return [a for a in self.assignments if a.alliance_id == alliance_id]
+
+    # 战斗
+    def create_land_battle(self, battle):
+        battle.id = len(self.battles) + 1
+        self.battles[battle.id] = copy.copy(battle)
+        return battle.id
+
+    def get_land_battle_by_id(self, battle_id):
+        self.calls["get_land_battle_by_id"] += 1
+        return copy.copy(self.battles.get(battle_id))
+
+    def list_active_battles_by_land(self, land_id):
+        return [copy.copy(b) for b in self.battles.values() if b.land_id == land_id and b.phase < 2]
+
+    def update_land_battle(self, battle):
+        self.calls["update_land_battle"] += 1
+        self.battles[battle.id] = copy.copy(battle)
+
+    def update_land_battles(self, battles):
+        self.calls["update_land_battles"] += 1
+        for battle in battles:
+            self.battles[battle.id] = copy.copy(battle)
+
+    # 回合
+    def create_battle_round(self, battle_round):
+        battle_round.id = len(self.rounds) + 100
+        self.rounds[battle_round.id] = copy.copy(battle_round)
+        return battle_round.id
+
+    def add_battle_rounds(self, rounds):
+        self.calls["add_battle_rounds"] += 1
+        for battle_round in rounds:
+            self.create_battle_round(battle_round)
+
+    def update_battle_round(self, battle_round):
+        self.calls["update_battle_round"] += 1
+        self.rounds[battle_round.id] = copy.copy(battle_round)
+
+    def update_battle_rounds(self, rounds):
+        self.calls["update_battle_rounds"] += 1
+        for battle_round in rounds:
+            self.rounds[battle_round.id] = copy.copy(battle_round)
+
+    def get_battle_round_by_id(self, round_id):
+        return copy.copy(self.rounds.get(round_id))
+
+    def list_battle_rounds(self, battle_id):
+        return [copy.copy(r) for r in sorted(self.rounds.values(), key=lambda r: r.round_no)
+                if r.battle_id == battle_id]
+
+    # 出战报名
+    def add_army_signups(self, signups):
+        for signup in signups:
+            signup.id = len(self.signups) + 1000
+            self.signups[signup.id] = copy.deepcopy(signup)
+
+    def list_army_signups(self, registration_id):
+        self.calls["list_army_signups"] += 1
+        rows = [s for s in self.signups.values() if s.registration_id == registration_id]
+        return [copy.deepcopy(s) for s in sorted(rows, key=lambda s: (s.signup_order, s.id))]
+
+    def list_army_signups_by_registrations(self, registration_ids):
+        self.calls["list_army_signups_by_registrations"] += 1
+        rows = [s for s in self.signups.values() if s.registration_id in registration_ids]
+        return [copy.deepcopy(s) for s in sorted(rows, key=lambda s: (s.registration_id, s.signup_order, s.id))]
+
+    def update_army_signup_state(self, signup_id, status, hp_state):
+        self.calls["update_army_signup_state"] += 1
+
+    def update_army_signup_states(self, signups):
+        self.calls["update_army_signup_states"] += 1
+        for signup in signups:
+            stored = self.signups[signup.id]
+            stored.status, stored.hp_state = signup.status, copy.deepcopy(signup.hp_state)
+
+    # 对战与战功
+    def add_battle_duels(self, duels):
+        self.calls["add_battle_duels"] += 1
+        for duel in duels:
+            duel.id = len(self.duels) + 5000
+            stored = copy.deepcopy(duel)
+            stored.log_data = json.loads(json.dumps(duel.log_data, ensure_ascii=False))  # 与 JSON 列读回一致
+            self.duels.append(stored)
+
+    def list_duels_by_round(self, round_id):
+        return [copy.deepcopy(d) for d in self.duels if d.round_id == round_id]
+
+    def increment_alliance_war_score(self, alliance_id, season_key, delta):
+        self.scores[alliance_id] += delta
+
+
+class CountingPlayerRepo:
+    def __init__(self):
+        self.calls = 0
+
+    def get_by_id(self, user_id):
+        self.calls += 1
+        return SimpleNamespace(user_id=user_id, level=60, nickname=f"p{user_id}")
+
+
+class CountingBeastRepo:
+    def __init__(self):
+        self.batch_calls = []
+
+    def get_team_beasts(self, user_id):
+        raise AssertionError("阵容应批量加载")
+
+    def get_team_beasts_by_users(self, user_ids):
+        self.batch_calls.append(list(user_ids))
+        return {uid: [_make_beast(uid * 10 + i) for i in range(2)] for uid in user_ids}
+
+
+class EmptyEquipmentRepo:
+    def get_by_beast_ids(self, beast_ids):
+        return {}
+
+
+def _make_beast(beast_id):
+    return SimpleNamespace(
+        id=beast_id,
+        name=f"beast-{beast_id}",
+        nature="法攻型" if beast_id % 2 else "物攻型",
+        hp=3000 + (beast_id * 37) % 900,
+        physical_attack=900 + (beast_id * 53) % 300,
+        magic_attack=900 + (beast_id * 71) % 300,
+        physical_defense=500 + (beast_id * 13) % 200,
+        magic_defense=500 + (beast_id * 17) % 200,
+        speed=200 + (beast_id * 29) % 100,
+        grade=1,
+        skills=[],
+    )
+
+
+def _make_registration(reg_id, alliance_id, land_id=7):
+    now = datetime(2026, 5, 1)
+    return AllianceRegistration(
+        id=reg_id, alliance_id=alliance_id, land_id=land_id, army="dragon",
+        status=STATUS_CONFIRMED, cost=0, registration_time=now, created_at=now,
+    )
+
+
+@pytest.fixture(scope="session")
+def make_registration():
+    """make_registration(reg_id, alliance_id, land_id=7) -> 已确认的龙军团报名"""
+    return _make_registration
+
+
+@pytest.fixture(scope="session")
+def alliance_land_env():
+    """alliance_land_env(registrations, assignments) -> (repo, players, beasts, make_service)
+
+    make_service 每次返回一个新的 AllianceBattleService（模拟另一个进程），共用同一组仓储。
+    """
+
+    def build(registrations, assignments):
+        repo = FakeAllianceRepo(registrations, assignments)
+        players, beasts = CountingPlayerRepo(), CountingBeastRepo()
+
+        def make_service():
+            return AllianceBattleService(
+                alliance_repo=repo,
+                player_repo=players,
+                player_beast_repo=beasts,
+                beast_pvp_service=BeastPvpService(EmptyEquipmentRepo(), EmptyEquipmentRepo(), EmptyEquipmentRepo()),
+            )
+
+        return repo, players, beasts, make_service
+
+    return build
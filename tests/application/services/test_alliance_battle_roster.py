@@ -0,0 +1,113 @@
+"""联盟土地战：配对时一次构建阵容，对战之间在内存中保留气血，回合结束时一次写回报名状态；
+其它进程推进后重建阵容，未打完的战斗不会一直占用缓存
+
+运行方式（项目根目录）：
+    python -m pytest tests/application/services/test_alliance_battle_roster.py -vv
+"""
+
+import pytest
+
+from application.services import alliance_battle_service
+from application.services.alliance_battle_service import SIGNUP_STATUS_ELIMINATED
+from domain.entities.alliance import AllianceArmyAssignment
+from domain.entities.alliance_registration import (
+    STATUS_CONFIRMED,
+    STATUS_ELIMINATED,
+    STATUS_VICTOR,
+)
+
+
+@pytest.fixture
+def setup(make_registration, alliance_land_env):
+    registrations = [make_registration(1, 11), make_registration(2, 22)]
+    assignments = [AllianceArmyAssignment(alliance_id=11, user_id=uid, army="dragon") for uid in range(1, 6)]
+    assignments += [AllianceArmyAssignment(alliance_id=22, user_id=uid, army="dragon") for uid in range(6, 10)]
+    return alliance_land_env(registrations, assignments)
+
+
+def advance_to_end(service, battle_id):
+    results = []
+    while True:
+        result = service.advance_round(battle_id)
+        assert result["ok"]
+        results.append(result)
+        if result["battle_finished"]:
+            return results
+
+
+def test_roster_built_once_and_hp_carried(setup):
+    repo, players, beasts, make_service = setup
+    service = make_service()
+
+    paired = service.lock_and_pair_land(7, seed=3)
+    battle_id = paired["battles"][0]["battle_id"]
+    assert players.calls == 9 and len(beasts.batch_calls) == 1
+
+    results = advance_to_end(service, battle_id)
+
+    assert players.calls == 9 and len(beasts.batch_calls) == 1
+    assert repo.calls["update_army_signup_state"] == 0
+    assert repo.calls["update_army_signup_states"] == len(results)
+    assert repo.calls["add_battle_duels"] == len(results)
+    assert {d.round_id for d in repo.duels} <= set(repo.rounds)
+    assert all(d.round_id for d in repo.duels)
+
+    signups = list(repo.signups.values())
+    eliminated = [s for s in signups if s.status == SIGNUP_STATUS_ELIMINATED]
+    survivors = [s for s in signups if s.status != SIGNUP_STATUS_ELIMINATED]
+    assert eliminated and survivors
+    # 落败方的幻兽全部阵亡，胜者带着战后气血继续作战
+    assert all(b["hp"] == 0 for s in eliminated for b in s.hp_state["beasts"])
+    assert all(any(b["hp"] > 0 for b in s.hp_state["beasts"]) for s in survivors if s.hp_state)
+
+    statuses = {r.alliance_id: r.status for r in repo.registrations.values()}
+    assert sorted(statuses.values()) == [STATUS_ELIMINATED, STATUS_VICTOR]
+    assert battle_id not in service._rosters
+
+
+def test_cold_cache_rebuilds_roster_from_stored_state(setup):
+    repo, players, beasts, make_service = setup
+    battle_id = make_service().lock_and_pair_land(7, seed=5)["battles"][0]["battle_id"]
+
+    # 其他进程推进：阵容缓存为空，按库中的报名一次性重建
+    other = make_service()
+    advance_to_end(other, battle_id)
+
+    assert len(beasts.batch_calls) == 2 and sorted(beasts.batch_calls[1]) == list(range(1, 10))
+    assert players.calls == 18
+    assert repo.calls["update_army_signup_state"] == 0
+
+
+def test_warm_roster_is_rebuilt_after_another_worker_advances(setup):
+    repo, _, beasts, make_service = setup
+    service = make_service()
+    battle = repo.get_land_battle_by_id(service.lock_and_pair_land(7, seed=5)["battles"][0]["battle_id"])
+    signups = list(repo.signups.values())
+    assert service._get_roster(battle, 1, signups) is service._rosters[battle.id].players
+    assert len(beasts.batch_calls) == 1
+
+    # 另一进程打完第 1 回合并写回气血：本进程缓存的仍是开战时的满血阵容
+    for signup in signups:
+        signup.hp_state = {"beasts": [{"id": signup.user_id * 10 + i, "hp": 1} for i in range(2)]}
+    roster = service._get_roster(battle, 2, signups)
+
+    assert len(beasts.batch_calls) == 2
+    assert {b.hp_current for p in roster.values() for b in p.beasts} == {1}
+    assert service._rosters[battle.id].round_no == 2
+
+
+def test_rosters_of_unfinished_battles_are_evicted(setup, monkeypatch):
+    repo, _, _, make_service = setup
+    monkeypatch.setattr(alliance_battle_service, "ROSTER_CACHE_LIMIT", 2)
+    service = make_service()
+
+    first = service.lock_and_pair_land(7, seed=5)["battles"][0]["battle_id"]
+    for reg in repo.registrations.values():
+        reg.status = STATUS_CONFIRMED
+    # 重新配对同一块土地：上一场未打完的战斗不再保留阵容
+    second = service.lock_and_pair_land(7, seed=5)["battles"][0]["battle_id"]
+    assert list(service._rosters) == [second] and first != second
+
+    for battle_id in (101, 102):
+        service._cache_roster(battle_id, land_id=8, round_no=1, players={})
+    assert list(service._rosters) == [101, 102]
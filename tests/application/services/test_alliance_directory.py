@@ -0,0 +1,162 @@
+"""联盟列表物化视图：排序/分页与原 SQL 一致、n-gram 名称搜索与 LIKE 一致、成员数增量维护
+
+运行方式（项目根目录）：
+    python -m pytest tests/application/services/test_alliance_directory.py -vv
+"""
+
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from application.services.alliance_directory_service import (
+    AllianceDirectory,
+    AllianceDirectoryEntry,
+    AllianceDirectoryService,
+)
+from application.services.alliance_service import AllianceService
+from infrastructure.db import unit_of_work
+
+CHARS = "青龙白虎朱雀玄武天下第一盟Ab"
+
+
+def make_entries(seed, count=300):
+    rng = random.Random(seed)
+    return [
+        AllianceDirectoryEntry(
+            id=aid,
+            name="".join(rng.choice(CHARS) for _ in range(rng.randint(1, 6))),
+            level=rng.randint(1, 5),
+            leader_id=aid * 10,
+            notice="",
+            member_count=rng.randint(0, 30),
+        )
+        for aid in range(1, count + 1)
+    ]
+
+
+def reference(entries, keyword, offset, size):
+    """原 SQL：WHERE name LIKE '%kw%' ORDER BY level DESC, id DESC LIMIT size OFFSET offset"""
+    kw = (keyword or "").strip().casefold()
+    rows = [e for e in entries if kw in e.name.casefold()]
+    rows.sort(key=lambda e: (-e.level, -e.id))
+    return [e.id for e in rows[offset:offset + size]], len(rows)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_pages_and_search_match_sql(seed):
+    entries = make_entries(seed)
+    directory = AllianceDirectory(entries)
+    rng = random.Random(seed)
+    keywords = [None, "", "  ", "龙", "ab", "AB", "青龙", "天下第", "不存在", "龙龙龙"]
+    keywords += ["".join(rng.choice(CHARS) for _ in range(rng.randint(1, 3))) for _ in range(30)]
+
+    for keyword in keywords:
+        for offset, size in ((0, 10), (10, 10), (290, 50)):
+            rows, total = directory.page(keyword, offset, size)
+            assert ([e.id for e in rows], total) == reference(entries, keyword, offset, size), keyword
+
+
+def test_upsert_and_remove_keep_order_and_index():
+    entries = make_entries(7, count=40)
+    directory = AllianceDirectory(entries)
+    first = directory.page(None, 0, 1)[0][0]
+
+    renamed = AllianceDirectoryEntry(**vars(first))
+    renamed.name, renamed.level = "麒麟", 1
+    directory.upsert(renamed)
+    entries = [renamed if e.id == first.id else e for e in entries]
+
+    assert directory.page("麒麟", 0, 10)[0] == [renamed]
+    assert first.id not in [e.id for e in directory.page(first.name, 0, 100)[0]]
+    assert [e.id for e in directory.page(None, 0, 100)[0]] == reference(entries, None, 0, 100)[0]
+
+    directory.remove(renamed.id)
+    assert directory.page("麒麟", 0, 10) == ([], 0) and len(directory) == 39
+
+
+class FakeAllianceRepo:
+    def __init__(self):
+        self.rows = [
+            {"id": 1, "name": "青龙会", "level": 2, "notice": "", "leader_id": 10, "member_count": 2},
+            {"id": 2, "name": "白虎堂", "level": 3, "notice": "招人", "leader_id": 20, "member_count": 1},
+        ]
+        self.loads = 0
+
+    def load_alliance_directory(self):
+        self.loads += 1
+        return [dict(r) for r in self.rows]
+
+    def get_member(self, user_id):
+        return None
+
+    def get_alliance_by_id(self, alliance_id):
+        return next((SimpleNamespace(id=r["id"], level=r["level"]) for r in self.rows if r["id"] == alliance_id), None)
+
+    def count_members(self, alliance_id):
+        return next(r["member_count"] for r in self.rows if r["id"] == alliance_id)
+
+    def add_member(self, member):
+        next(r for r in self.rows if r["id"] == member.alliance_id)["member_count"] += 1
+
+    def add_activity(self, activity):
+        pass
+
+
+class FakePlayerRepo:
+    def get_by_id(self, user_id):
+        return SimpleNamespace(user_id=user_id, nickname=f"p{user_id}", level=30)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_service():
+    repo, clock = FakeAllianceRepo(), FakeClock()
+    directory = AllianceDirectoryService(repo, reconcile_interval=60, clock=clock)
+    service = AllianceService(
+        alliance_repo=repo, player_repo=FakePlayerRepo(), inventory_service=None, beast_repo=None,
+        directory=directory,
+    )
+    return service, directory, repo, clock
+
+
+def test_list_alliances_served_from_directory_with_maintained_counts():
+    service, directory, repo, _ = make_service()
+
+    result = service.list_alliances(99, page=1, size=10)
+    assert [(a["id"], a["member_count"], a["notice"]) for a in result["alliances"]] == [(2, 1, "招人"), (1, 2, "")]
+    assert result["total"] == 2 and result["alliances"][0]["member_capacity"] > 1
+
+    assert service.join_alliance(99, 1)["ok"]
+    with unit_of_work.transaction():
+        directory.record_level(1, 5)
+        directory.record_renamed(1, "青龙大会")
+        assert directory.page(None, 0, 10)[0][0]["id"] == 2
+    rows, total = directory.page("大会", 0, 10)
+    assert total == 1 and rows[0]["id"] == 1 and rows[0]["member_count"] == 3 and rows[0]["level"] == 5
+    assert directory.page("青龙会", 0, 10) == ([], 0)
+
+    directory.record_alliance_created(3, "朱雀", leader_id=30)
+    directory.record_member_delta(3, 1)
+    assert service.list_alliances(99, keyword="朱", size=10)["alliances"][0]["member_count"] == 1
+    assert repo.loads == 1
+
+
+def test_periodic_reconcile_picks_up_external_writes():
+    _, directory, repo, clock = make_service()
+    directory.page(None, 0, 10)
+
+    repo.rows.append({"id": 4, "name": "玄武", "level": 1, "notice": "", "leader_id": 40, "member_count": 1})
+    directory.record_member_delta(4, 1)  # 本进程未见过该联盟，忽略
+    clock.now = 30
+    assert directory.page(None, 0, 10)[1] == 2
+
+    clock.now = 61
+    assert directory.page("玄武", 0, 10)[0][0]["member_count"] == 1
+    assert repo.loads == 2
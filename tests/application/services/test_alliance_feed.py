@@ -0,0 +1,194 @@
+"""联盟聊天 / 战况长轮询：游标增量、提交后入队、阻塞等待只被本队列的发布唤醒、游标失效返回完整数据、定期合并其它进程写入
+
+运行方式（项目根目录）：
+    python -m pytest tests/application/services/test_alliance_feed.py -vv
+"""
+
+import threading
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+from application.services.alliance_feed_service import TOPIC_CHAT, TOPIC_WAR, AllianceFeedHub
+from application.services.alliance_service import AllianceService
+from domain.entities.alliance import AllianceChatMessage
+from domain.entities.alliance_battle import AllianceLandBattle
+from domain.entities.alliance_registration import STATUS_IN_BATTLE, STATUS_VICTOR, AllianceRegistration
+from infrastructure.db import unit_of_work
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_poll_returns_only_events_after_cursor():
+    hub = AllianceFeedHub(capacity=3)
+    hub.publish(1, TOPIC_WAR, {"n": 0})  # 尚无人拉取，直接丢弃
+
+    first = hub.poll(1, TOPIC_WAR, None)
+    assert first.reset and first.events == []
+
+    hub.publish(1, TOPIC_WAR, {"n": 1})
+    hub.publish(2, TOPIC_WAR, {"n": 9})
+    delta = hub.poll(1, TOPIC_WAR, first.cursor)
+    assert not delta.reset and delta.events == [{"n": 1}]
+    assert hub.poll(1, TOPIC_WAR, delta.cursor).events == []
+
+    try:
+        with unit_of_work.transaction():
+            hub.publish(1, TOPIC_WAR, {"n": 2})
+            raise RuntimeError("rollback")
+    except RuntimeError:
+        pass
+    with unit_of_work.transaction():
+        hub.publish(1, TOPIC_WAR, {"n": 3})
+        assert hub.poll(1, TOPIC_WAR, delta.cursor).events == []
+    assert hub.poll(1, TOPIC_WAR, delta.cursor).events == [{"n": 3}]
+
+    # 落后超过队列容量、或来自其它进程的游标，整体重置
+    for n in range(4, 8):
+        hub.publish(1, TOPIC_WAR, {"n": n})
+    stale = hub.poll(1, TOPIC_WAR, delta.cursor)
+    assert stale.reset and [e["n"] for e in stale.events] == [5, 6, 7]
+    assert hub.poll(1, TOPIC_WAR, stale.cursor + 10**9).reset
+
+
+def test_waiting_poll_is_woken_by_publish():
+    hub = AllianceFeedHub()
+    cursor = hub.poll(1, TOPIC_CHAT, None).cursor
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(hub.poll(1, TOPIC_CHAT, cursor, wait=5)))
+
+    started = time.monotonic()
+    waiter.start()
+    time.sleep(0.05)
+    hub.publish(1, TOPIC_CHAT, {"id": 1})
+    waiter.join(2)
+
+    assert results and results[0].events == [{"id": 1}]
+    assert time.monotonic() - started < 2
+    assert hub.poll(1, TOPIC_CHAT, results[0].cursor, wait=0.05).events == []
+
+
+def test_publish_wakes_only_waiters_of_that_channel():
+    hub = AllianceFeedHub()
+    woken = []
+
+    class RecordingCondition(threading.Condition):
+        def notify_all(self):
+            woken.append(self.key)
+            super().notify_all()
+
+    for key in ((1, TOPIC_CHAT), (2, TOPIC_CHAT), (1, TOPIC_WAR)):
+        hub.poll(*key, None)
+        channel = hub._channels[key]
+        channel.changed = RecordingCondition(hub._lock)
+        channel.changed.key = key
+
+    hub.publish(2, TOPIC_CHAT, {"id": 1})
+    hub.publish(1, TOPIC_WAR, {"n": 1})
+    hub.publish(3, TOPIC_CHAT, {"id": 2})  # 无人拉取的联盟
+    assert woken == [(2, TOPIC_CHAT), (1, TOPIC_WAR)]
+
+
+class FakeAllianceRepo:
+    def __init__(self):
+        self.messages = []
+        self.chat_reads = 0
+        self.alliance_lookups = 0
+
+    def get_member(self, user_id):
+        return SimpleNamespace(user_id=user_id, alliance_id=user_id // 100, nickname=f"p{user_id}")
+
+    def add_chat_message(self, message):
+        message.id = len(self.messages) + 1
+        message.created_at = datetime(2026, 5, 1, 12, 0, message.id)
+        self.messages.append(message)
+        return message.id
+
+    def get_chat_messages(self, alliance_id, limit=50):
+        self.chat_reads += 1
+        return [m for m in self.messages if m.alliance_id == alliance_id][-limit:]
+
+    def get_alliance_by_id(self, alliance_id):
+        self.alliance_lookups += 1
+        return SimpleNamespace(id=alliance_id, name=f"盟{alliance_id}")
+
+
+def make_service():
+    repo, clock = FakeAllianceRepo(), FakeClock()
+    hub = AllianceFeedHub(sync_interval=30, clock=clock)
+    service = AllianceService(
+        alliance_repo=repo, player_repo=None, inventory_service=None, beast_repo=None, feed=hub,
+    )
+    return service, repo, clock
+
+
+def test_chat_delivers_deltas_and_merges_external_writes():
+    service, repo, clock = make_service()
+    service.send_chat_message(101, "早")  # 联盟 1 尚未建立队列，只写库
+
+    first = service.poll_chat_messages(102, None)
+    assert first["reset"] and [m["content"] for m in first["messages"]] == ["早"]
+    assert first["messages"][0]["nickname"] == "p101" and first["messages"][0]["created_at"] == "12:00:01"
+
+    assert service.send_chat_message(103, " 开战 ")["ok"]
+    service.send_chat_message(201, "别的联盟")
+    delta = service.poll_chat_messages(102, first["cursor"], wait=1)
+    assert not delta["reset"] and [(m["id"], m["content"]) for m in delta["messages"]] == [(2, "开战")]
+    assert [m["id"] for m in service.get_chat_messages(101)["messages"]] == [1, 2]
+
+    # 其它进程写入的消息：到期合并一次，已入队的消息不重复
+    repo.add_chat_message(AllianceChatMessage(alliance_id=1, user_id=104, content="外部"))
+    assert service.poll_chat_messages(102, delta["cursor"])["messages"] == []
+    clock.now = 31
+    merged = service.poll_chat_messages(102, delta["cursor"])
+    assert [m["id"] for m in merged["messages"]] == [4]
+    assert repo.chat_reads == 2
+
+
+def make_battle(phase, current_round, left_status, right_status):
+    battle = AllianceLandBattle(
+        id=5, land_id=1, left_registration_id=11, right_registration_id=22,
+        phase=phase, current_round=current_round, started_at=None, finished_at=None,
+    )
+    now = datetime(2026, 5, 1)
+    left, right = (
+        AllianceRegistration(
+            id=reg_id, alliance_id=alliance_id, land_id=1, army="dragon",
+            status=status, cost=0, registration_time=now, created_at=now,
+        )
+        for reg_id, alliance_id, status in ((11, 1, left_status), (22, 2, right_status))
+    )
+    return battle, left, right
+
+
+def test_battle_progress_is_pushed_only_to_watching_alliances():
+    service, repo, _ = make_service()
+    service.on_battle_progress(*make_battle(0, 1, STATUS_IN_BATTLE, STATUS_IN_BATTLE))
+    assert repo.alliance_lookups == 0
+
+    cursor = service.feed.poll(2, TOPIC_WAR, None).cursor  # 联盟 2 开始拉取战况
+
+    service.on_battle_progress(*make_battle(1, 2, STATUS_IN_BATTLE, STATUS_IN_BATTLE))
+    service.on_battle_progress(*make_battle(2, 3, STATUS_IN_BATTLE, STATUS_VICTOR))
+
+    result = service.poll_war_live_feed(201, cursor)
+    assert result["ok"] and not result["data"]["reset"]
+    assert result["data"]["battles"] == [
+        {
+            "battle_id": 5,
+            "land_id": 1,
+            "land_name": "林中空地1号土地",
+            "opponent_alliance_name": "盟1",
+            "phase": 2,
+            "current_round": 3,
+            "result": "胜利",
+        }
+    ]
+    assert repo.alliance_lookups == 2
+    assert not service.feed.is_open(1, TOPIC_WAR)
@@ -0,0 +1,166 @@
+"""联盟土地战整块结算：同一阵容快照下串行与进程池结果一致，回合/对战/报名状态批量写回，战况从缓存返回；
+调度器开战时只配对，之后按间隔逐回合推进
+
+运行方式（项目根目录）：
+    python -m pytest tests/application/services/test_alliance_land_resolve.py -vv
+"""
+
+import random
+
+import pytest
+
+from domain.entities.alliance import AllianceArmyAssignment
+from infrastructure import scheduler
+from domain.entities.alliance_registration import (
+    STATUS_CONFIRMED,
+    STATUS_ELIMINATED,
+    STATUS_VICTOR,
+)
+
+LAND_ID = 7
+
+
+@pytest.fixture(scope="module")
+def paired_service(make_registration, alliance_land_env):
+    """每次调用返回一块新配对好的土地（4 个联盟、2 场战斗）"""
+
+    def pair():
+        alliance_ids = [11, 22, 33, 44]
+        registrations = [make_registration(i + 1, aid, LAND_ID) for i, aid in enumerate(alliance_ids)]
+        assignments = [
+            AllianceArmyAssignment(alliance_id=aid, user_id=aid * 10 + n, army="dragon")
+            for aid in alliance_ids
+            for n in range(3 + aid % 3)
+        ]
+        repo, _, _, make_service = alliance_land_env(registrations, assignments)
+        service = make_service()
+        assert len(service.lock_and_pair_land(LAND_ID, seed=1)["battles"]) == 2
+        return repo, service
+
+    return pair
+
+
+@pytest.fixture(scope="module")
+def make_cold_service(alliance_land_env):
+    """同一仓储上的新进程：没有任何缓存，全部查库"""
+
+    def build(repo):
+        _, _, _, make_service = alliance_land_env([], [])
+        service = make_service()
+        service.alliance_repo = repo
+        return service
+
+    return build
+
+
+def outcome_of(repo):
+    duels = [(d.round_id, d.attacker_signup_id, d.defender_signup_id, d.attacker_result, d.log_data)
+             for d in repo.duels]
+    signups = {s.id: (s.status, s.hp_state) for s in repo.signups.values()}
+    statuses = {r.id: r.status for r in repo.registrations.values()}
+    return duels, signups, statuses
+
+
+def alive_counts(result):
+    return [
+        [(r["round_no"], r["left_alive"], r["right_alive"]) for r in battle["rounds"]]
+        for battle in result["overview"]["battles"]
+    ]
+
+
+@pytest.fixture(scope="module")
+def resolved(paired_service):
+    repo, service = paired_service()
+    result = service.resolve_land(LAND_ID, seed=42)
+    return repo, service, result
+
+
+def test_resolves_every_battle_with_bulk_writes(resolved):
+    repo, service, result = resolved
+
+    assert result["ok"] and result["battle_count"] == 2 and result["skipped_battle_ids"] == []
+    assert result["duel_count"] == len(repo.duels) > 0
+    assert all(b.phase == 2 and b.finished_at for b in repo.battles.values())
+    assert all(r.status == 1 and r.finished_at for r in repo.rounds.values())
+    assert {d.round_id for d in repo.duels} <= set(repo.rounds)
+    for name in ("list_army_signups_by_registrations", "update_battle_rounds", "add_battle_rounds",
+                 "add_battle_duels", "update_army_signup_states", "update_land_battles"):
+        assert repo.calls[name] == 1, name
+    for name in ("get_land_battle_by_id", "get_land_registration_by_id", "list_army_signups",
+                 "update_battle_round", "update_army_signup_state", "update_land_battle"):
+        assert repo.calls[name] == 0, name
+
+    statuses = sorted(r.status for r in repo.registrations.values())
+    assert statuses == [STATUS_ELIMINATED, STATUS_ELIMINATED, STATUS_VICTOR, STATUS_VICTOR]
+    assert sum(repo.scores.values()) == 2
+    assert service._rosters == {}
+
+
+def test_parallel_matches_serial(resolved, paired_service):
+    serial_repo, _, serial_result = resolved
+    repo, service = paired_service()
+
+    result = service.resolve_land(LAND_ID, seed=42, max_workers=2)
+
+    assert outcome_of(repo) == outcome_of(serial_repo)
+    assert alive_counts(result) == alive_counts(serial_result)
+
+
+def test_overview_and_duels_served_from_cache(resolved, make_cold_service):
+    repo, service, result = resolved
+
+    overview = service.get_land_battle_overview(LAND_ID)
+    assert overview is result["overview"]
+    assert [b["phase"] for b in overview["battles"]] == [2, 2]
+
+    battle = overview["battle"]
+    last_round = battle["rounds"][-1]
+    by_id = service.get_round_duels(round_id=last_round["round_id"])
+    by_no = service.get_round_duels(battle_id=battle["battle_id"], round_no=last_round["round_no"])
+    assert by_id is by_no and by_id["ok"]
+    assert len(by_id["duels"]) == sum(1 for d in repo.duels if d.round_id == last_round["round_id"])
+
+    # 缓存的对战详情与冷启动进程查库得到的逐字一致（包括对战 ID）
+    cold = make_cold_service(repo)
+    for r in battle["rounds"]:
+        cached = service.get_round_duels(round_id=r["round_id"])
+        assert all(d["duel_id"] for d in cached["duels"])
+        assert cold.get_round_duels(round_id=r["round_id"]) == cached
+
+    # 重新配对后丢弃该土地的战况缓存
+    for registration in repo.registrations.values():
+        registration.status = STATUS_CONFIRMED
+    assert service.lock_and_pair_land(LAND_ID, seed=2)["ok"]
+    assert LAND_ID not in service._land_overviews
+
+
+def test_serial_resolve_leaves_module_random_untouched(paired_service):
+    repo, service = paired_service()
+
+    random.seed(7)
+    expected = random.Random(7).random()
+    service.resolve_land(LAND_ID, seed=3)
+
+    assert random.random() == expected
+
+
+def test_war_start_only_pairs_and_each_tick_plays_one_round(make_registration, alliance_land_env, monkeypatch):
+    monkeypatch.setattr(scheduler.AllianceService, "WAR_LANDS", {LAND_ID: {}})
+    registrations = [make_registration(i + 1, aid, LAND_ID) for i, aid in enumerate([11, 22])]
+    assignments = [AllianceArmyAssignment(alliance_id=aid, user_id=aid * 10 + n, army="dragon")
+                   for aid in (11, 22) for n in range(3)]
+    repo, _, _, make_service = alliance_land_env(registrations, assignments)
+    service = make_service()
+
+    scheduler._run_alliance_land_war(service)
+    assert len(repo.battles) == 1 and repo.duels == []
+    assert [r.status for r in repo.rounds.values()] == [0]  # 开战后战况从第 1 回合开始，尚未结算
+
+    ticks = 0
+    while any(b.phase < 2 for b in repo.battles.values()):
+        played_before = sum(r.status == 1 for r in repo.rounds.values())
+        scheduler._run_alliance_war_round(service)
+        assert sum(r.status == 1 for r in repo.rounds.values()) == played_before + 1
+        ticks += 1
+        assert ticks <= len(assignments)
+    assert repo.duels and sorted(r.status for r in repo.registrations.values()) == [STATUS_ELIMINATED, STATUS_VICTOR]
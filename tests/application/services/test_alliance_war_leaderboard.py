@@ -0,0 +1,138 @@
+"""联盟战功榜：按赛季一次读取、战功增量更新（事务提交后生效）、同分名次、定期对账
+
+运行方式（项目根目录）：
+    python -m pytest tests/application/services/test_alliance_war_leaderboard.py -vv
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+from application.services.alliance_service import AllianceService
+from application.services.alliance_war_leaderboard_service import AllianceWarLeaderboardService
+from infrastructure.db import unit_of_work
+
+SEASON = datetime.utcnow().strftime("%Y-%m")
+
+
+class FakeAllianceRepo:
+    def __init__(self):
+        self.scores = {
+            SEASON: {1: 3, 2: 5, 3: 3, 4: 0},
+            "2000-01": {1: 9},
+        }
+        self.names = {1: "青龙", 2: "白虎", 3: "朱雀", 4: "玄武", 5: "麒麟"}
+        self.loads = []
+        self.lookups = 0
+        self.listeners = []
+
+    def load_alliance_war_scores(self, season_key):
+        self.loads.append(season_key)
+        return [
+            {"alliance_id": aid, "score": score, "name": self.names[aid], "level": 1}
+            for aid, score in self.scores.get(season_key, {}).items()
+        ]
+
+    def increment_alliance_war_score(self, alliance_id, season_key, delta=1):
+        season = self.scores.setdefault(season_key, {})
+        season[alliance_id] = season.get(alliance_id, 0) + delta
+        for listener in self.listeners:
+            listener(alliance_id, season_key, delta)
+
+    def get_alliance_by_id(self, alliance_id):
+        self.lookups += 1
+        return SimpleNamespace(id=alliance_id, name=self.names[alliance_id])
+
+    def get_member(self, user_id):
+        return SimpleNamespace(user_id=user_id, alliance_id=3)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_board():
+    repo, clock = FakeAllianceRepo(), FakeClock()
+    board = AllianceWarLeaderboardService(repo, reconcile_interval=60, clock=clock)
+    repo.listeners.append(board.on_war_score)
+    return board, repo, clock
+
+
+def summary(page):
+    return [(r["rank"], r["alliance_id"], r["score"]) for r in page["list"]]
+
+
+def test_pages_share_rank_on_ties_and_load_each_season_once():
+    board, repo, _ = make_board()
+
+    page = board.get_page(SEASON, 1, 3)
+    assert summary(page) == [(1, 2, 5), (2, 1, 3), (2, 3, 3)] and page["total"] == 4
+    assert page["list"][0]["alliance_name"] == "白虎"
+    assert summary(board.get_page(SEASON, 2, 3)) == [(4, 4, 0)]
+    assert board.get_entry(SEASON, 3)["rank"] == 2
+    assert board.get_entry(SEASON, 5) is None
+
+    assert summary(board.get_page("2000-01", 1, 10)) == [(1, 1, 9)]
+    assert repo.loads == [SEASON, "2000-01"]
+
+
+def test_increments_apply_after_commit_and_new_alliances_join():
+    board, repo, _ = make_board()
+    board.get_page(SEASON, 1, 10)
+
+    try:
+        with unit_of_work.transaction():
+            repo.increment_alliance_war_score(3, SEASON, 2)
+            assert board.get_entry(SEASON, 3)["rank"] == 2
+            raise RuntimeError("rollback")
+    except RuntimeError:
+        pass
+    assert board.get_entry(SEASON, 3)["score"] == 3
+
+    with unit_of_work.transaction():
+        repo.increment_alliance_war_score(3, SEASON, 2)
+    assert board.get_entry(SEASON, 3) == {"rank": 1, "alliance_id": 3, "alliance_name": "朱雀", "score": 5}
+    assert board.get_entry(SEASON, 2)["rank"] == 1
+
+    # 报名写入 0 分记录：新联盟直接上榜，名称按需查询一次
+    repo.increment_alliance_war_score(5, SEASON, 0)
+    assert board.get_entry(SEASON, 5) == {"rank": 4, "alliance_id": 5, "alliance_name": "麒麟", "score": 0}
+    assert board.get_page(SEASON, 1, 10)["total"] == 5
+    assert repo.lookups == 1
+
+    # 未加载的赛季不维护，查询时全量读取
+    repo.increment_alliance_war_score(2, "2000-02", 1)
+    assert summary(board.get_page("2000-02", 1, 10)) == [(1, 2, 1)]
+    assert repo.loads == [SEASON, "2000-02"]
+
+
+def test_periodic_reconcile_picks_up_external_writes():
+    board, repo, clock = make_board()
+    board.get_page(SEASON, 1, 10)
+
+    repo.scores[SEASON][4] = 7  # 其他进程写入，未经监听
+    clock.now = 30
+    assert board.get_entry(SEASON, 4)["score"] == 0
+
+    clock.now = 61
+    assert board.get_entry(SEASON, 4)["rank"] == 1
+    assert repo.loads == [SEASON, SEASON]
+
+
+def test_war_ranking_reads_from_board():
+    board, repo, _ = make_board()
+    service = AllianceService(
+        alliance_repo=repo, player_repo=None, inventory_service=None, beast_repo=None, war_leaderboard=board,
+    )
+
+    result = service.get_war_ranking(user_id=1, page=1, size=2)
+
+    data = result["data"]
+    assert result["ok"] and data["season"] == SEASON and data["total"] == 4
+    assert [(r["rank"], r["allianceId"], r["allianceName"], r["score"]) for r in data["ranking"]] == [
+        (1, 2, "白虎", 5), (2, 1, "青龙", 3),
+    ]
+    assert data["myRank"] == {"rank": 2, "allianceId": 3, "allianceName": "朱雀", "score": 3}
@@ -0,0 +1,246 @@
+"""擂台占领 / 挑战：同一擂台并发排队、次数与捕捉球原子扣除、回滚不残留、奖池守恒
+
+运行方式（项目根目录）：
+    python -m pytest tests/application/services/test_arena_service.py -vv
+"""
+
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from application.services.arena_service import (
+    ARENA_BALL_GOLD,
+    ARENA_BALL_NORMAL,
+    ARENA_MAX_WINS,
+    ArenaService,
+)
+from application.services.beast_pvp_service import BeastPvpService
+from domain.entities.arena import ArenaSlot
+from infrastructure.db import unit_of_work
+
+
+class FakeArenaRepo:
+    """模拟 MySQL：单条语句原子，写入立即生效，事务回滚时按撤销日志恢复
+
+    lock_arena 不加行锁，若服务层没有把同一擂台的事务串行化，读-改-写会互相覆盖，奖池守恒随即被破坏。
+    """
+
+    def __init__(self, slots, inventory):
+        self.slots = {(s.rank_name, s.arena_type): s for s in slots}
+        self.inventory = dict(inventory)  # (user_id, item_id) -> quantity
+        self.daily = Counter()
+        self.success = Counter()
+        self._mutex = threading.Lock()
+        self._undo = {}
+
+    def _log_undo(self, undo):
+        uow = unit_of_work.current_unit_of_work()
+        self._undo.setdefault(id(uow), []).append(undo)
+        uow.on_commit(lambda: self._undo.pop(id(uow), None))
+
+    def rollback(self, uow):
+        with self._mutex:
+            for undo in reversed(self._undo.pop(id(uow), [])):
+                undo()
+
+    def lock_arena(self, rank_name, arena_type):
+        slot = self.slots.get((rank_name, arena_type))
+        time.sleep(0.0005)  # 放大读-改-写窗口
+        return None if slot is None else ArenaSlot(**vars(slot))
+
+    def save_arena(self, slot):
+        with self._mutex:
+            key = (slot.rank_name, slot.arena_type)
+            old = self.slots[key]
+            self.slots[key] = ArenaSlot(**vars(slot))
+            self._log_undo(lambda: self.slots.__setitem__(key, old))
+
+    def take_daily_challenge(self, user_id, daily_limit):
+        with self._mutex:
+            if self.daily[user_id] >= daily_limit:
+                return False
+            self.daily[user_id] += 1
+            self._log_undo(lambda: self.daily.__setitem__(user_id, self.daily[user_id] - 1))
+            return True
+
+    def consume_item(self, user_id, item_id, quantity=1):
+        with self._mutex:
+            key = (user_id, item_id)
+            if self.inventory.get(key, 0) < quantity:
+                return False
+            self.inventory[key] -= quantity
+            self._log_undo(lambda: self.inventory.__setitem__(key, self.inventory[key] + quantity))
+            return True
+
+    def grant_item(self, user_id, item_id, quantity):
+        with self._mutex:
+            key = (user_id, item_id)
+            self.inventory[key] = self.inventory.get(key, 0) + quantity
+            self._log_undo(lambda: self.inventory.__setitem__(key, self.inventory[key] - quantity))
+
+    def add_success(self, user_id, rank_name):
+        with self._mutex:
+            self.success[(user_id, rank_name)] += 1
+
+
+class FakeBattleRepo:
+    def __init__(self):
+        self.logs = []
+        self._mutex = threading.Lock()
+
+    def save_battle(self, **log):
+        with self._mutex:
+            self.logs.append(log)
+            return len(self.logs)
+
+
+class FakeBeastRepo:
+    def get_team_beasts(self, user_id):
+        time.sleep(0.0005)
+        return [make_beast(user_id * 10 + i) for i in range(2)]
+
+
+class FakeLeaderboard:
+    def __init__(self):
+        self.successes = []
+
+    def record_arena_success(self, user_id, rank_name):
+        self.successes.append((user_id, rank_name))
+
+    def get_player_level(self, user_id):
+        return 55
+
+
+class EmptyEquipmentRepo:
+    def get_by_beast_ids(self, beast_ids):
+        return {}
+
+
+def make_beast(beast_id):
+    return SimpleNamespace(
+        id=beast_id,
+        name=f"beast-{beast_id}",
+        nature="法攻型" if beast_id % 2 else "物攻型",
+        hp=3000 + (beast_id * 37) % 900,
+        physical_attack=900 + (beast_id * 53) % 300,
+        magic_attack=900 + (beast_id * 71) % 300,
+        physical_defense=500 + (beast_id * 13) % 200,
+        magic_defense=500 + (beast_id * 17) % 200,
+        speed=200 + (beast_id * 29) % 100,
+        grade=1,
+        skills=["高级必杀"] if beast_id % 3 == 0 else ["高级反击"],
+    )
+
+
+@pytest.fixture
+def make_service(monkeypatch):
+    repos = []
+    original_rollback = unit_of_work.UnitOfWork._rollback
+
+    def rollback(uow):
+        original_rollback(uow)
+        for repo in repos:
+            repo.rollback(uow)
+
+    monkeypatch.setattr(unit_of_work.UnitOfWork, "_rollback", rollback)
+
+    def factory(slots, inventory):
+        arena_repo, battle_repo, leaderboard = FakeArenaRepo(slots, inventory), FakeBattleRepo(), FakeLeaderboard()
+        repos.append(arena_repo)
+        service = ArenaService(
+            arena_repo=arena_repo,
+            battle_repo=battle_repo,
+            player_beast_repo=FakeBeastRepo(),
+            beast_pvp_service=BeastPvpService(EmptyEquipmentRepo(), EmptyEquipmentRepo(), EmptyEquipmentRepo()),
+            leaderboard_service=leaderboard,
+        )
+        return service, arena_repo, battle_repo, leaderboard
+
+    return factory
+
+
+def replay(initial, logs):
+    """按战报顺序重放擂台状态"""
+    slot = ArenaSlot(**vars(initial))
+    for log in logs:
+        assert slot.champion_user_id == log["champion_id"]
+        slot.prize_pool += 1
+        if log["is_challenger_win"]:
+            slot.crown(log["challenger_id"], log["challenger_name"])
+            slot.prize_pool = 0
+        elif slot.consecutive_wins + 1 >= ARENA_MAX_WINS:
+            slot.vacate()
+            slot.prize_pool = 0
+        else:
+            slot.consecutive_wins += 1
+    return slot
+
+
+def test_concurrent_challenges_stay_consistent(make_service):
+    normal = ArenaSlot("天阶", "normal", champion_user_id=100, champion_nickname="擂主甲", prize_pool=3)
+    gold = ArenaSlot("天阶", "gold", champion_user_id=200, champion_nickname="擂主乙", prize_pool=0)
+    users = range(1, 31)
+    inventory = {(uid, ARENA_BALL_NORMAL): 2 for uid in users}
+    inventory.update({(uid, ARENA_BALL_GOLD): 1 for uid in users})
+    service, repo, battles, leaderboard = make_service([normal, gold], inventory)
+    initial_normal, initial_gold = ArenaSlot(**vars(normal)), ArenaSlot(**vars(gold))
+    daily_limit = 2
+
+    # 每人并发发起 3 次普通场 + 2 次黄金场挑战，次数上限跨场次共享
+    requests = [(uid, "normal") for uid in users for _ in range(3)] + [(uid, "gold") for uid in users for _ in range(2)]
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        results = list(pool.map(
+            lambda req: (req, service.challenge(req[0], f"p{req[0]}", 55, "天阶", req[1], daily_limit)),
+            requests,
+        ))
+
+    accepted = Counter(uid for (uid, _), r in results if r["ok"])
+    assert sum(accepted.values()) == len(battles.logs)
+    for uid in users:
+        assert repo.daily[uid] == accepted[uid] <= daily_limit
+    assert all(q >= 0 for q in repo.inventory.values())
+    assert {r.get("error") for _, r in results if not r["ok"]} <= {
+        "今日挑战次数已用完（2次/天）", "捕捉球不足", "强力捕捉球不足", "不能挑战自己", "擂台无擂主，请选择占领",
+    }
+
+    for initial, ball in ((initial_normal, ARENA_BALL_NORMAL), (initial_gold, ARENA_BALL_GOLD)):
+        final = repo.slots[(initial.rank_name, initial.arena_type)]
+        logs = [log for log in battles.logs if log["arena_type"] == initial.arena_type]
+        assert vars(replay(initial, logs)) == vars(final)
+        total = sum(q for (_, item), q in repo.inventory.items() if item == ball)
+        initial_total = sum(q for (_, item), q in inventory.items() if item == ball)
+        assert total + final.prize_pool == initial_total + initial.prize_pool
+    assert [s for s in leaderboard.successes] == [
+        (uid, rank) for (uid, rank), n in repo.success.items() for _ in range(n)
+    ]
+
+
+def test_rejected_challenge_rolls_back_daily_count(make_service):
+    slot = ArenaSlot("天阶", "normal", champion_user_id=100, champion_nickname="擂主")
+    service, repo, battles, _ = make_service([slot], {(1, ARENA_BALL_NORMAL): 0})
+
+    result = service.challenge(1, "p1", 55, "天阶", "normal", daily_limit=5)
+
+    assert result == {"ok": False, "error": "捕捉球不足"}
+    assert repo.daily[1] == 0 and battles.logs == []
+    assert service.challenge(100, "擂主", 55, "天阶", "normal", 5)["error"] == "不能挑战自己"
+    assert service.challenge(1, "p1", 55, "地阶", "normal", 5)["error"] == "擂台不存在"
+
+
+def test_concurrent_occupy_has_single_winner(make_service):
+    slot = ArenaSlot("玄阶", "gold", prize_pool=4)
+    inventory = {(uid, ARENA_BALL_GOLD): 1 for uid in range(1, 21)}
+    service, repo, _, _ = make_service([slot], inventory)
+
+    with ThreadPoolExecutor(max_workers=20) as pool:
+        results = list(pool.map(lambda uid: service.occupy(uid, f"p{uid}", "玄阶", "gold"), range(1, 21)))
+
+    winners = [uid for uid, r in zip(range(1, 21), results) if r["ok"]]
+    final = repo.slots[("玄阶", "gold")]
+    assert len(winners) == 1 and final.champion_user_id == winners[0]
+    assert final.prize_pool == 5
+    assert sum(repo.inventory.values()) == 19
@@ -0,0 +1,198 @@
+"""擂台 / 镇妖动态信息流：最新一页不查库、before_id 翻页与直接查库一致、事务提交后才可见、加载不持锁
+
+运行方式（项目根目录）：
+    python -m pytest tests/application/services/test_battle_feed_service.py -vv
+"""
+
+import threading
+from dataclasses import replace
+from datetime import datetime
+
+from application.services.battle_feed_service import BattleFeedService, FeedRing
+from infrastructure.db import unit_of_work
+from infrastructure.db.arena_battle_repo_mysql import ArenaBattleLog
+from infrastructure.db.zhenyao_battle_repo_mysql import ZhenyaoBattleLog
+
+
+class FakeArenaRepo:
+    def __init__(self):
+        self.rows = []
+        self.queries = 0
+        self.listeners = []
+
+    def add_save_listener(self, listener):
+        self.listeners.append(listener)
+
+    def save(self, challenger_id, champion_id, arena_type="normal"):
+        log = ArenaBattleLog(
+            id=len(self.rows) + 1, arena_type=arena_type, rank_name="天阶",
+            challenger_id=challenger_id, challenger_name=f"p{challenger_id}",
+            champion_id=champion_id, champion_name=f"p{champion_id}",
+            is_challenger_win=True, battle_data={}, created_at=datetime(2024, 1, 1),
+        )
+        self.rows.append(log)
+        for listener in self.listeners:
+            listener(log)
+        return log
+
+    def _select(self, match, limit, before_id):
+        self.queries += 1
+        rows = [r for r in reversed(self.rows) if match(r) and (before_id is None or r.id < before_id)]
+        return rows[:limit]
+
+    def get_recent_battles(self, arena_type=None, limit=20, before_id=None):
+        return self._select(lambda r: not arena_type or r.arena_type == arena_type, limit, before_id)
+
+    def get_user_battles(self, user_id, limit=20, before_id=None):
+        return self._select(lambda r: user_id in (r.challenger_id, r.champion_id), limit, before_id)
+
+
+class FakeZhenyaoRepo:
+    def __init__(self):
+        self.rows = []
+        self.queries = 0
+
+    def get_recent_battles(self, limit=20, before_id=None):
+        self.queries += 1
+        return [r for r in reversed(self.rows) if before_id is None or r.id < before_id][:limit]
+
+    def get_user_battles(self, user_id, limit=20, before_id=None):
+        self.queries += 1
+        return [
+            r for r in reversed(self.rows)
+            if user_id in (r.attacker_id, r.defender_id) and (before_id is None or r.id < before_id)
+        ][:limit]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_service(capacity=50):
+    arena, zhenyao, clock = FakeArenaRepo(), FakeZhenyaoRepo(), FakeClock()
+    service = BattleFeedService(arena, zhenyao, capacity=capacity, max_user_feeds=2, reload_interval=60, clock=clock)
+    arena.add_save_listener(service.on_arena_battle_saved)
+    return service, arena, zhenyao, clock
+
+
+def ids(rows):
+    return [r.id for r in rows]
+
+
+def test_latest_pages_are_served_from_memory():
+    service, arena, _, _ = make_service()
+    for i in range(30):
+        arena.save(challenger_id=i % 5, champion_id=9, arena_type="gold" if i % 3 else "normal")
+
+    assert ids(service.get_arena_battles(limit=20)) == list(range(30, 10, -1))
+    assert ids(service.get_arena_battles(arena_type="normal", limit=5)) == [28, 25, 22, 19, 16]
+    queries = arena.queries
+
+    new = arena.save(challenger_id=1, champion_id=9)
+    for _ in range(10):
+        assert service.get_arena_battles(limit=20)[0] is new
+        assert service.get_arena_battles(user_id=9, limit=20)[0] is new
+    assert ids(service.get_arena_battles(arena_type="gold", limit=3)) == [30, 29, 27]
+    assert arena.queries == queries + 2  # 只有个人流、黄金场流各首次加载一次
+    assert service.stats()["hits"] >= 20
+
+
+def test_keyset_pages_match_direct_queries_across_the_ring_boundary():
+    service, arena, _, _ = make_service(capacity=25)
+    for i in range(70):
+        arena.save(challenger_id=i % 4, champion_id=4 + i % 3)
+
+    for kwargs, direct in (
+        ({}, lambda b: arena.get_recent_battles(limit=10, before_id=b)),
+        ({"user_id": 5}, lambda b: arena.get_user_battles(5, limit=10, before_id=b)),
+    ):
+        before_id, seen = None, []
+        while True:
+            page = service.get_arena_battles(before_id=before_id, limit=10, **kwargs)
+            assert ids(page) == ids(direct(before_id))
+            if len(page) < 10:
+                break
+            seen += ids(page)
+            before_id = page[-1].id
+        assert len(seen) == len(set(seen))
+
+
+def test_feed_updates_after_commit_only():
+    service, arena, _, _ = make_service()
+    arena.save(challenger_id=1, champion_id=2)
+    assert ids(service.get_arena_battles()) == [1]
+
+    try:
+        with unit_of_work.transaction():
+            arena.save(challenger_id=1, champion_id=2)
+            assert ids(service.get_arena_battles()) == [1]
+            raise RuntimeError("rollback")
+    except RuntimeError:
+        arena.rows.pop()
+    assert ids(service.get_arena_battles()) == [1]
+
+    with unit_of_work.transaction():
+        arena.save(challenger_id=1, champion_id=2)
+    assert ids(service.get_arena_battles()) == [2, 1]
+
+
+def test_zhenyao_feed_reloads_periodically_and_bounds_user_feeds():
+    service, _, zhenyao, clock = make_service()
+    zhenyao.rows = [
+        ZhenyaoBattleLog(
+            id=i, floor=i, attacker_id=i % 4, attacker_name="a", defender_id=9, defender_name="d",
+            is_success=bool(i % 2), remaining_seconds=60, battle_data={}, created_at=None,
+        )
+        for i in range(1, 11)
+    ]
+    assert ids(service.get_zhenyao_battles(limit=3)) == [10, 9, 8]
+    for uid in (1, 2, 3):
+        service.get_zhenyao_battles(user_id=uid)
+    assert service.stats()["zhenyao_user_feeds"] == 2
+
+    zhenyao.rows.append(replace(zhenyao.rows[0], id=11))
+    clock.now = 30
+    assert ids(service.get_zhenyao_battles(limit=1)) == [10]
+    clock.now = 61
+    assert ids(service.get_zhenyao_battles(limit=1)) == [11]
+
+
+def test_loads_run_outside_the_lock_and_keep_newer_results():
+    service, arena, _, clock = make_service()
+    arena.save(challenger_id=1, champion_id=2)
+    select = arena.get_recent_battles
+    concurrent = []
+
+    def load_while_others_write(arena_type=None, limit=20, before_id=None):
+        rows = select(arena_type, limit, before_id)
+        if len(arena.rows) == 1:
+            arena.save(challenger_id=3, champion_id=4)  # 查询之后才提交的战报
+        elif clock.now == 61:
+            # 另一线程在本次加载期间刷新同一条流：不被锁阻塞，且它的结果更新
+            clock.now = 62
+            arena.rows.append(replace(arena.rows[0], id=3))  # 其它进程写入，只有重新加载才能看到
+            worker = threading.Thread(target=lambda: concurrent.append(ids(service.get_arena_battles())))
+            worker.start()
+            worker.join(2)
+        return rows
+
+    arena.get_recent_battles = load_while_others_write
+    assert ids(service.get_arena_battles()) == [2, 1]
+
+    clock.now = 61
+    assert ids(service.get_arena_battles()) == [3, 2, 1]
+    assert concurrent == [[3, 2, 1]]
+    assert arena.queries == 3
+    assert ids(service.get_arena_battles()) == [3, 2, 1] and arena.queries == 3
+
+
+def test_ring_keeps_id_order_for_late_commits():
+    ring = FeedRing(3, [], 0.0)
+    for i in (5, 7, 6, 7, 4):
+        ring.add(ArenaBattleLog(i, "normal", "", 0, "", 0, "", False, {}, None))
+    assert ids(ring.page(None, 3)) == [7, 6, 5]
+    assert ring.page(5, 3) is None
@@ -0,0 +1,154 @@
+"""古战场淘汰赛：批量预加载、按轮批量写战报、并行模拟结果可复现
+
+运行方式（项目根目录）：
+    python -m pytest tests/application/services/test_battlefield_service.py -vv
+"""
+
+import multiprocessing
+import random
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from application.services import battlefield_service as bf_module
+from application.services.battlefield_service import BattlefieldParticipant, BattlefieldService
+from application.services.beast_pvp_service import BeastPvpService
+
+
+class EmptyEquipmentRepo:
+    def get_by_beast_ids(self, beast_ids):
+        return {}
+
+
+class FakeBeastRepo:
+    def __init__(self, teams):
+        self.teams = teams
+        self.batch_calls = 0
+
+    def get_team_beasts_by_users(self, user_ids):
+        self.batch_calls += 1
+        return {uid: self.teams.get(uid, []) for uid in user_ids}
+
+    def get_team_beasts(self, user_id):
+        raise AssertionError("出战幻兽应批量预加载")
+
+
+class FakeBattleRepo:
+    def __init__(self):
+        self.rounds = []
+
+    def get_latest_period(self, battlefield_type):
+        return 7
+
+    def save_battles(self, battles):
+        self.rounds.append(list(battles))
+        return len(battles)
+
+
+def make_beast(beast_id, user_id):
+    return SimpleNamespace(
+        id=beast_id,
+        name=f"beast-{beast_id}",
+        nature="法攻型" if beast_id % 2 else "物攻型",
+        hp=3000 + (beast_id * 37) % 900,
+        physical_attack=900 + (beast_id * 53) % 300,
+        magic_attack=900 + (beast_id * 71) % 300,
+        physical_defense=500 + (beast_id * 13) % 200,
+        magic_defense=500 + (beast_id * 17) % 200,
+        speed=200 + (beast_id * 29) % 100,
+        grade=1,
+        skills=["高级必杀", "高级连击"] if beast_id % 3 == 0 else ["高级反击"],
+    )
+
+
+@pytest.fixture
+def make_service(monkeypatch):
+    monkeypatch.setattr(bf_module, "execute_update", lambda *args, **kwargs: 0)
+
+    def factory():
+        # 玩家 9 没有出战幻兽，直接判负
+        teams = {
+            uid: [make_beast(uid * 10 + i, uid) for i in range(3)]
+            for uid in range(1, 12) if uid != 9
+        }
+        beast_repo = FakeBeastRepo(teams)
+        battle_repo = FakeBattleRepo()
+        service = BattlefieldService(
+            player_repo=None,
+            player_beast_repo=beast_repo,
+            beast_pvp_service=BeastPvpService(EmptyEquipmentRepo(), EmptyEquipmentRepo(), EmptyEquipmentRepo()),
+            battle_repo=battle_repo,
+        )
+        participants = [BattlefieldParticipant(user_id=uid, nickname=f"p{uid}", level=30) for uid in range(1, 12)]
+        monkeypatch.setattr(service, "_get_participants_for_type", lambda t: [
+            BattlefieldParticipant(user_id=p.user_id, nickname=p.nickname, level=p.level) for p in participants
+        ])
+        return service, beast_repo, battle_repo
+
+    return factory
+
+
+def test_same_seed_reproduces_whole_tournament(make_service):
+    service_a, beast_repo, battle_repo_a = make_service()
+    service_b, _, battle_repo_b = make_service()
+
+    result_a = service_a.run_tournament("tiger", seed=20240601)
+    result_b = service_b.run_tournament("tiger", seed=20240601)
+
+    assert result_a == result_b
+    assert result_a["period"] == 8
+    assert battle_repo_a.rounds == battle_repo_b.rounds
+    assert beast_repo.batch_calls == 1
+
+
+def test_rounds_are_bulk_saved_once_each(make_service):
+    service, _, battle_repo = make_service()
+
+    result = service.run_tournament("tiger", seed=1)
+
+    # 11 人：6 -> 3 -> 2 -> 1，共 4 轮、10 场
+    assert result["total_rounds"] == len(battle_repo.rounds) == 4
+    assert [len(r) for r in battle_repo.rounds] == [5, 3, 1, 1]
+    for round_logs in battle_repo.rounds:
+        assert [log["match_num"] for log in round_logs] == list(range(1, len(round_logs) + 1))
+    losers_without_team = [
+        log for r in battle_repo.rounds for log in r
+        if 9 in (log["first_user_id"], log["second_user_id"])
+    ]
+    for log in losers_without_team:
+        assert log["is_first_win"] == (log["second_user_id"] == 9)
+
+
+def test_process_pool_matches_in_process_simulation(make_service):
+    service_serial, _, serial_repo = make_service()
+    service_parallel, _, parallel_repo = make_service()
+
+    serial = service_serial.run_tournament("crane", seed=42)
+    parallel = service_parallel.run_tournament("crane", seed=42, max_workers=2)
+
+    assert serial == parallel
+    assert serial_repo.rounds == parallel_repo.rounds
+
+
+def test_serial_run_leaves_module_random_untouched(make_service):
+    service, _, _ = make_service()
+
+    random.seed(7)
+    expected = random.Random(7).random()
+    service.run_tournament("tiger", seed=3)
+
+    assert random.random() == expected
+
+
+def _start_scheduler_in_worker():
+    from infrastructure import scheduler
+
+    scheduler.start_scheduler()
+    return scheduler._scheduler is not None
+
+
+def test_spawned_pool_worker_does_not_start_scheduler():
+    # 进程池子进程会重新导入 app.py 并走到 start_scheduler，不能再起一套定时任务
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        assert pool.submit(_start_scheduler_in_worker).result(timeout=60) is False
@@ -0,0 +1,150 @@
+"""幻兽PVP转换服务：批量加载装备与逐只加载结果一致
+
+运行方式（项目根目录）：
+    python -m pytest tests/application/services/test_beast_pvp_service.py -vv
+"""
+
+from types import SimpleNamespace
+
+from application.services.beast_pvp_service import BeastPvpService
+from domain.entities.bone import BeastBone
+from domain.entities.mosoul import MoSoul, BeastMoSoulSlot
+from domain.entities.spirit import Spirit, SpiritLine
+
+
+class SingleSpiritRepo:
+    """只提供逐只查询接口的战灵仓库"""
+    def __init__(self, spirits):
+        self.spirits = spirits
+        self.calls = 0
+
+    def get_by_beast_id(self, beast_id):
+        self.calls += 1
+        return [s for s in self.spirits if s.beast_id == beast_id]
+
+
+class BatchSpiritRepo(SingleSpiritRepo):
+    def get_by_beast_ids(self, beast_ids):
+        self.calls += 1
+        return {bid: [s for s in self.spirits if s.beast_id == bid] for bid in beast_ids}
+
+
+class SingleBoneRepo:
+    def __init__(self, bones):
+        self.bones = bones
+        self.calls = 0
+
+    def get_by_beast_id(self, beast_id):
+        self.calls += 1
+        return [b for b in self.bones if b.beast_id == beast_id]
+
+
+class BatchBoneRepo(SingleBoneRepo):
+    def get_by_beast_ids(self, beast_ids):
+        self.calls += 1
+        return {bid: [b for b in self.bones if b.beast_id == bid] for bid in beast_ids}
+
+
+class SingleMoSoulRepo:
+    def __init__(self, souls):
+        self.souls = souls
+        self.calls = 0
+
+    def get_by_beast_id(self, beast_id):
+        self.calls += 1
+        return BeastMoSoulSlot(
+            beast_id=beast_id,
+            beast_level=60,
+            equipped_souls=[s for s in self.souls if s.beast_id == beast_id],
+        )
+
+
+class BatchMoSoulRepo(SingleMoSoulRepo):
+    def get_by_beast_ids(self, beast_ids):
+        self.calls += 1
+        return {
+            bid: BeastMoSoulSlot(
+                beast_id=bid,
+                beast_level=60,
+                equipped_souls=[s for s in self.souls if s.beast_id == bid],
+            )
+            for bid in beast_ids
+        }
+
+
+class BrokenRepo:
+    def get_by_beast_ids(self, beast_ids):
+        raise RuntimeError("db down")
+
+
+def make_beast(beast_id, nature="物攻型", skills=None):
+    return SimpleNamespace(
+        id=beast_id,
+        name=f"beast-{beast_id}",
+        nature=nature,
+        hp=5000 + beast_id,
+        physical_attack=1200,
+        magic_attack=1100,
+        physical_defense=900,
+        magic_defense=800,
+        speed=300 + beast_id,
+        grade=1,
+        skills=skills or [],
+    )
+
+
+def make_fixtures():
+    spirits = [
+        Spirit(id=1, user_id=1, beast_id=1, lines=[
+            SpiritLine("hp_pct", 500, unlocked=True),
+            SpiritLine("attack_pct", 300, unlocked=True),
+            SpiritLine("speed_pct", 200, unlocked=False),
+        ]),
+        Spirit(id=2, user_id=2, beast_id=3, lines=[SpiritLine("magic_defense_pct", 800, unlocked=True)]),
+    ]
+    bones = [
+        BeastBone(id=1, user_id=1, beast_id=1, slot="头骨", level=5, stage=1),
+        BeastBone(id=2, user_id=1, beast_id=2, slot="腿骨", level=10, stage=2),
+    ]
+    souls = [
+        MoSoul(id=1, user_id=1, template_id=101, level=3, beast_id=2),
+        MoSoul(id=2, user_id=2, template_id=1, level=5, beast_id=3),
+    ]
+    beasts = [
+        make_beast(1, skills=["高级必杀"]),
+        make_beast(2, nature="法攻型"),
+        make_beast(3),
+        make_beast(4),
+    ]
+    return spirits, bones, souls, beasts
+
+
+def test_batched_conversion_matches_per_beast_conversion():
+    spirits, bones, souls, beasts = make_fixtures()
+    single = BeastPvpService(SingleSpiritRepo(spirits), SingleBoneRepo(bones), SingleMoSoulRepo(souls))
+    batched = BeastPvpService(BatchSpiritRepo(spirits), BatchBoneRepo(bones), BatchMoSoulRepo(souls))
+
+    expected = [single.to_pvp_beast(b) for b in beasts]
+    actual = batched.to_pvp_beasts(beasts)
+
+    assert actual == expected
+
+
+def test_team_conversion_uses_one_query_per_table():
+    spirits, bones, souls, beasts = make_fixtures()
+    spirit_repo, bone_repo, mosoul_repo = BatchSpiritRepo(spirits), BatchBoneRepo(bones), BatchMoSoulRepo(souls)
+    service = BeastPvpService(spirit_repo, bone_repo, mosoul_repo)
+
+    teams = service.to_pvp_teams({10: beasts[:2], 20: beasts[2:]})
+
+    assert [b.id for b in teams[10]] == [1, 2]
+    assert [b.id for b in teams[20]] == [3, 4]
+    assert (spirit_repo.calls, bone_repo.calls, mosoul_repo.calls) == (1, 1, 1)
+
+
+def test_failed_batch_load_is_treated_as_no_equipment():
+    _, _, _, beasts = make_fixtures()
+    service = BeastPvpService(BrokenRepo(), BrokenRepo(), BrokenRepo())
+    bare = BeastPvpService(SingleSpiritRepo([]), SingleBoneRepo([]), SingleMoSoulRepo([]))
+
+    assert service.to_pvp_beasts(beasts) == [bare.to_pvp_beast(b) for b in beasts]
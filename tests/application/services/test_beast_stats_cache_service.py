@@ -0,0 +1,109 @@
+"""幻兽派生属性缓存：命中跳过重算、只在真实变化时回写、失效后重算
+
+运行方式（项目根目录）：
+    python -m pytest tests/application/services/test_beast_stats_cache_service.py -vv
+"""
+
+from infrastructure.db.player_beast_repo_mysql import PlayerBeastData
+from application.services.beast_stats_cache_service import BeastStatsCacheService
+
+
+class FakeCacheRepo:
+    def __init__(self):
+        self.rows = {}
+        self.upserts = []
+
+    def get_by_beast_ids(self, beast_ids):
+        return {bid: self.rows[bid] for bid in beast_ids if bid in self.rows}
+
+    def upsert_many(self, entries):
+        self.upserts.append(list(entries))
+        for beast_id, stamp, power in entries:
+            self.rows[beast_id] = (stamp, power)
+        return len(entries)
+
+    def delete_by_beast_ids(self, beast_ids):
+        for bid in beast_ids:
+            self.rows.pop(bid, None)
+        return len(beast_ids)
+
+
+class FakeBeastRepo:
+    def __init__(self):
+        self.updated = []
+
+    def update_beast(self, beast):
+        self.updated.append(beast.id)
+
+
+class Calculator:
+    """模拟 _calc_beast_stats / _calc_total_combat_power_with_equipment"""
+
+    def __init__(self):
+        self.stats_calls = []
+        self.power_calls = []
+        self.equipment_bonus = 0
+
+    def calc_stats(self, beast):
+        self.stats_calls.append(beast.id)
+        beast.hp = beast.level * 100
+        beast.combat_power = beast.level * 10
+        return beast
+
+    def calc_power(self, beast):
+        self.power_calls.append(beast.id)
+        return beast.combat_power + self.equipment_bonus
+
+
+def make_beast(beast_id, level=10):
+    return PlayerBeastData(id=beast_id, name="白虎", realm="地界", level=level, nature="物系普攻", growth_rate=840)
+
+
+def resolve(service, calc, beasts):
+    return service.resolve_powers(beasts, calc_stats=calc.calc_stats, calc_power=calc.calc_power)
+
+
+def test_hit_skips_recalculation_and_writes():
+    cache, beasts_repo, calc = FakeCacheRepo(), FakeBeastRepo(), Calculator()
+    service = BeastStatsCacheService(cache, beasts_repo)
+
+    assert resolve(service, calc, [make_beast(1), make_beast(2, level=20)]) == {1: 100, 2: 200}
+    assert beasts_repo.updated == [1, 2] and len(cache.upserts) == 1
+
+    # 幻兽表里已是最新属性，再次读取时全部命中
+    reloaded = [make_beast(1), make_beast(2, level=20)]
+    for b in reloaded:
+        calc.calc_stats(b)
+    calc.stats_calls.clear()
+    calc.power_calls.clear()
+
+    assert resolve(service, calc, reloaded) == {1: 100, 2: 200}
+    assert calc.stats_calls == [] and calc.power_calls == []
+    assert beasts_repo.updated == [1, 2] and len(cache.upserts) == 1
+
+
+def test_level_change_invalidates_by_stamp_and_unchanged_stats_are_not_rewritten():
+    cache, beasts_repo, calc = FakeCacheRepo(), FakeBeastRepo(), Calculator()
+    service = BeastStatsCacheService(cache, beasts_repo)
+    beast = calc.calc_stats(make_beast(1))
+    resolve(service, calc, [beast])
+    assert beasts_repo.updated == []  # 属性未变化，不回写
+
+    leveled = calc.calc_stats(make_beast(1, level=11))
+    leveled.hp = 0  # 模拟升级后尚未重算的旧属性
+    assert resolve(service, calc, [leveled]) == {1: 110}
+    assert beasts_repo.updated == [1]
+
+
+def test_equipment_change_requires_explicit_invalidation():
+    cache, beasts_repo, calc = FakeCacheRepo(), FakeBeastRepo(), Calculator()
+    service = BeastStatsCacheService(cache, beasts_repo)
+    beast = calc.calc_stats(make_beast(1))
+    resolve(service, calc, [beast])
+
+    calc.equipment_bonus = 50
+    assert resolve(service, calc, [beast]) == {1: 100}
+
+    service.invalidate(1, None)
+    assert resolve(service, calc, [beast]) == {1: 150}
+    assert beasts_repo.updated == []
@@ -0,0 +1,136 @@
+"""化仙阵批量结算：与逐个玩家结算结果一致，一次读取、按块批量写回
+
+运行方式（项目根目录）：
+    python -m pytest tests/application/services/test_immortalize_formation_settle.py -vv
+"""
+
+import random
+from dataclasses import replace
+from datetime import datetime, timedelta
+
+import pytest
+
+from application.services.immortalize_pool_service import ImmortalizePoolService
+from domain.entities.immortalize_pool import ImmortalizePool
+
+NOW = datetime(2026, 3, 1, 12, 30, 0)
+
+
+class FakePoolRepo:
+    def __init__(self, pools):
+        self.pools = {p.user_id: replace(p) for p in pools}
+        self.upserts = 0
+        self.chunks = []
+
+    def get_by_user_id(self, user_id):
+        pool = self.pools.get(user_id)
+        return replace(pool) if pool else None
+
+    def get_active_formations(self):
+        return [replace(p) for p in self.pools.values() if p.formation_started_at is not None]
+
+    def upsert(self, pool):
+        self.upserts += 1
+        self.pools[pool.user_id] = replace(pool)
+        return pool
+
+    def apply_formation_grants(self, grants, chunk_size=500):
+        for offset in range(0, len(grants), chunk_size):
+            chunk = grants[offset:offset + chunk_size]
+            self.chunks.append(len(chunk))
+            for g in chunk:
+                pool = self.pools[g.user_id]
+                if pool.formation_last_grant_at != g.expected_last_grant_at:
+                    continue  # 与 MySQL 的 <=> 比较条件一致：快照过期则不更新
+                if g.exp_added > 0:
+                    pool.current_exp = min(pool.current_exp + g.exp_added, g.capacity)
+                pool.formation_level = g.formation_level
+                pool.formation_started_at = g.formation_started_at
+                pool.formation_ends_at = g.formation_ends_at
+                pool.formation_last_grant_at = g.formation_last_grant_at
+        return len(grants)
+
+
+def make_pools(seed, count=300):
+    rng = random.Random(seed)
+    pools = []
+    for user_id in range(1, count + 1):
+        level = rng.randint(1, 10)
+        pool = ImmortalizePool(user_id=user_id, pool_level=level, current_exp=rng.randint(0, 3_000_000))
+        if rng.random() < 0.9:
+            start = NOW - timedelta(minutes=rng.randint(0, 6 * 60))
+            pool.formation_level = rng.choice([0, level, max(1, level - 1)])
+            pool.formation_started_at = start
+            pool.formation_ends_at = start + timedelta(hours=4)
+            pool.formation_last_grant_at = rng.choice([
+                None, start, start + timedelta(hours=rng.randint(0, 4)),
+            ])
+        pools.append(pool)
+    return pools
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_bulk_settlement_matches_per_user(seed):
+    pools = make_pools(seed)
+    per_user_repo = FakePoolRepo(pools)
+    per_user = ImmortalizePoolService(pool_repo=per_user_repo, player_repo=None)
+    expected_exp = 0
+    for pool in pools:
+        result = per_user.grant_formation_exp_for_user(pool.user_id, now=NOW)
+        expected_exp += result["total_added"] if result else 0
+
+    bulk_repo = FakePoolRepo(pools)
+    bulk = ImmortalizePoolService(pool_repo=bulk_repo, player_repo=None)
+    stats = bulk.settle_formations(now=NOW, chunk_size=40)
+
+    assert bulk_repo.pools == per_user_repo.pools
+    assert stats["total_exp"] == expected_exp > 0
+    assert stats["pools"] == sum(1 for p in pools if p.formation_started_at is not None)
+    assert bulk_repo.upserts == 0
+    assert bulk_repo.chunks == [40] * (stats["rows_written"] // 40) + (
+        [stats["rows_written"] % 40] if stats["rows_written"] % 40 else []
+    )
+    assert stats["chunks"] == len(bulk_repo.chunks)
+
+
+def test_full_pool_and_finished_formation():
+    start = NOW - timedelta(hours=4, minutes=10)
+    running = NOW - timedelta(hours=2, minutes=30)
+    pools = [
+        # 已满：不发放、不写库，化仙阵继续
+        ImmortalizePool(user_id=1, pool_level=1, current_exp=2500, formation_level=1,
+                        formation_started_at=running, formation_ends_at=running + timedelta(hours=4),
+                        formation_last_grant_at=running),
+        # 已结束：补发剩余整小时并清除
+        ImmortalizePool(user_id=2, pool_level=3, current_exp=0, formation_level=3,
+                        formation_started_at=start, formation_ends_at=start + timedelta(hours=4),
+                        formation_last_grant_at=start + timedelta(hours=2)),
+        # 发放 1 小时后池满：终止
+        ImmortalizePool(user_id=3, pool_level=1, current_exp=2400, formation_level=1,
+                        formation_started_at=running, formation_ends_at=running + timedelta(hours=4),
+                        formation_last_grant_at=running),
+    ]
+    repo = FakePoolRepo(pools)
+    stats = ImmortalizePoolService(pool_repo=repo, player_repo=None).settle_formations(now=NOW)
+
+    assert repo.pools[1] == pools[0]
+    assert repo.pools[2].current_exp == 2 * 900 and repo.pools[2].formation_started_at is None
+    assert repo.pools[3].current_exp == 2500 and repo.pools[3].formation_ends_at is None
+    assert (stats["granted"], stats["finished"], stats["rows_written"]) == (2, 2, 2)
+
+
+def test_overlapping_runs_do_not_grant_twice():
+    pools = make_pools(11, count=60)
+    repo = FakePoolRepo(pools)
+    first = ImmortalizePoolService(pool_repo=repo, player_repo=None)
+    second = ImmortalizePoolService(pool_repo=repo, player_repo=None)
+
+    # 两个进程读到同一份快照，先后写回：后写的一方全部落空
+    stale = repo.get_active_formations()
+    repo.get_active_formations = lambda: [replace(p) for p in stale]
+    first.settle_formations(now=NOW)
+    once = {uid: replace(p) for uid, p in repo.pools.items()}
+    second.settle_formations(now=NOW)
+
+    assert repo.pools == once
+    assert any(p.current_exp != q.current_exp for p, q in zip(pools, once.values()))
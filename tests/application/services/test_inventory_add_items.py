@@ -0,0 +1,92 @@
+"""InventoryService.add_items：与逐个 add_item 的堆叠 / 溢出结果一致，整包只读写背包各一次
+
+运行方式（项目根目录）：
+    python -m pytest tests/application/services/test_inventory_add_items.py -vv
+"""
+
+import random
+from collections import Counter
+
+import pytest
+
+from application.services.inventory_service import InventoryError, InventoryService
+from domain.entities.item import InventoryItem, Item, PlayerBag
+from infrastructure.memory.inventory_repo_inmemory import InMemoryInventoryRepo
+
+
+class CountingInventoryRepo(InMemoryInventoryRepo):
+    """内存背包 + 容量，并统计每个方法的调用次数"""
+
+    def __init__(self, capacity):
+        super().__init__()
+        self.capacity = capacity
+        self.calls = Counter()
+
+    def __getattribute__(self, name):
+        if not name.startswith("_") and name not in ("calls", "capacity"):
+            self.calls[name] += 1
+        return super().__getattribute__(name)
+
+    def get_slot_count(self, user_id, is_temporary=False):
+        return sum(1 for inv in self._data.values() if inv.user_id == user_id and inv.is_temporary == is_temporary)
+
+    def get_bag_info(self, user_id):
+        return PlayerBag(user_id=user_id, capacity=self.capacity)
+
+
+class ItemRepo:
+    def __init__(self):
+        self.items = {i: Item(id=i, name=f"item-{i}", stackable=i % 5 != 0) for i in range(1, 31)}
+
+    def get_by_id(self, item_id):
+        return self.items.get(item_id)
+
+
+def make_service(capacity, seed_items=()):
+    repo = CountingInventoryRepo(capacity)
+    for item_id, quantity, is_temp in seed_items:
+        repo.save(InventoryItem(user_id=1, item_id=item_id, quantity=quantity, is_temporary=is_temp))
+    return InventoryService(ItemRepo(), repo), repo
+
+
+def bag_state(repo):
+    return Counter((inv.item_id, inv.quantity, inv.is_temporary) for inv in repo.get_by_user_id(1))
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_add_items_matches_sequential_add_item(seed):
+    rng = random.Random(seed)
+    capacity = rng.randint(3, 25)
+    seed_items = [(rng.randint(1, 30), rng.randint(1, 99), rng.random() < 0.2) for _ in range(rng.randint(0, 20))]
+    bundle = [(rng.randint(1, 30), rng.choice([1, 5, 60, 99, 150, 400])) for _ in range(20)]
+
+    sequential, sequential_repo = make_service(capacity, seed_items)
+    expected_temp = False
+    for item_id, quantity in bundle:
+        expected_temp = sequential.add_item(1, item_id, quantity)[1] or expected_temp
+
+    batched, batched_repo = make_service(capacity, seed_items)
+    assert batched.add_items(1, bundle) == expected_temp
+    assert bag_state(batched_repo) == bag_state(sequential_repo)
+
+
+def test_bundle_reads_and_writes_bag_once():
+    service, repo = make_service(capacity=10, seed_items=[(1, 98, False), (2, 10, True)])
+    repo.calls.clear()
+
+    assert service.add_items(1, [(i, 120) for i in range(1, 21)]) is True
+
+    assert repo.calls["get_by_user_id"] == 1
+    assert repo.calls["get_bag_info"] == 1
+    assert repo.calls["save_many"] == 1
+    assert repo.calls["get_slot_count"] == 0 and repo.calls["find_all_items"] == 0
+
+
+def test_unknown_item_rejects_whole_bundle():
+    service, repo = make_service(capacity=10)
+
+    with pytest.raises(InventoryError):
+        service.add_items(1, [(1, 5), (999, 1)])
+
+    assert bag_state(repo) == Counter()
+    assert service.add_items(1, []) is False
@@ -0,0 +1,195 @@
+"""排行榜物化视图：分页/名次口径、增量更新、事务提交后生效、定期后台对账且不覆盖对账期间的增量
+
+运行方式（项目根目录）：
+    python -m pytest tests/application/services/test_leaderboard_service.py -vv
+"""
+
+import threading
+from types import SimpleNamespace
+
+from application.services.leaderboard_service import LeaderboardService, RankBoard
+from infrastructure.db import unit_of_work
+
+
+class FakeLeaderboardRepo:
+    def __init__(self):
+        self.players = [
+            {"user_id": 1, "nickname": "甲", "level": 50, "exp": 100},
+            {"user_id": 2, "nickname": "乙", "level": 50, "exp": 300},
+            {"user_id": 3, "nickname": "丙", "level": 62, "exp": 0},
+            {"user_id": 4, "nickname": "丁", "level": 50, "exp": 100},
+        ]
+        self.arena = [
+            {"user_id": 1, "rank_name": "天阶", "success_count": 3},
+            {"user_id": 2, "rank_name": "天阶", "success_count": 5},
+            {"user_id": 3, "rank_name": "飞马", "success_count": 4},
+            {"user_id": 1, "rank_name": "飞马", "success_count": 6},
+        ]
+        self.towers = [{"user_id": 2, "max_floor": 30}, {"user_id": 3, "max_floor": 12}]
+        self.loads = 0
+
+    def load_players(self):
+        self.loads += 1
+        return [dict(r) for r in self.players]
+
+    def load_arena_success(self):
+        return [dict(r) for r in self.arena]
+
+    def load_tower_floors(self, tower_type):
+        assert tower_type == "tongtian"
+        return [dict(r) for r in self.towers]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class DeferredRunner:
+    """代替后台线程：任务先排队，由测试决定何时执行"""
+
+    def __init__(self):
+        self.tasks = []
+
+    def __call__(self, task):
+        self.tasks.append(task)
+
+    def run_all(self):
+        tasks, self.tasks = self.tasks, []
+        for task in tasks:
+            task()
+
+
+def make_service(runner=None):
+    repo, clock = FakeLeaderboardRepo(), FakeClock()
+    service = LeaderboardService(repo, reconcile_interval=60, clock=clock, run_in_background=runner or DeferredRunner())
+    return service, repo, clock
+
+
+def test_rank_board_orders_pages_and_shares_rank_on_ties():
+    board = RankBoard()
+    board.load([(1, (50, 100)), (2, (50, 300)), (3, (62, 0)), (4, (50, 100))])
+
+    assert board.page(0, 10) == [(3, (62, 0)), (2, (50, 300)), (1, (50, 100)), (4, (50, 100))]
+    assert board.page(2, 1) == [(1, (50, 100))]
+    assert [board.rank_of(uid) for uid in (3, 2, 1, 4)] == [1, 2, 3, 3]
+
+    board.update(4, (63, 0))
+    board.update(1, (50, 100))  # 分数不变
+    assert board.page(0, 2) == [(4, (63, 0)), (3, (62, 0))]
+    assert board.rank_of(1) == 4 and len(board) == 4
+    assert board.rank_of(99) is None
+
+
+def test_pages_match_route_format_and_load_once():
+    service, repo, _ = make_service()
+
+    level = service.get_level_page(1, 2, user_id=4)
+    assert level == {
+        "list": [
+            {"userId": 3, "nickname": "丙", "level": 62, "exp": 0},
+            {"userId": 2, "nickname": "乙", "level": 50, "exp": 300},
+        ],
+        "total": 4,
+        "myRank": 3,
+    }
+
+    arena = service.get_arena_page(1, 10, user_id=1, rank_name="天阶")
+    assert [(r["userId"], r["successCount"], r["rankName"]) for r in arena["list"]] == [(2, 5, "天阶"), (1, 3, "天阶")]
+    assert arena["myRank"] == 2
+
+    overall = service.get_arena_page(1, 10)
+    assert [(r["userId"], r["successCount"]) for r in overall["list"]] == [(1, 9), (2, 5), (3, 4)]
+    assert overall["list"][0]["rankName"] == "全部擂台"
+    assert service.get_arena_page(1, 10, rank_name="战神") == {"list": [], "total": 0, "myRank": None}
+
+    tower = service.get_tower_page(1, 10, user_id=3)
+    assert [(r["userId"], r["maxFloor"], r["nickname"]) for r in tower["list"]] == [(2, 30, "乙"), (3, 12, "丙")]
+    assert tower["myRank"] == 2
+    assert repo.loads == 1
+
+
+def test_incremental_updates_apply_after_commit_only():
+    service, repo, _ = make_service()
+    service.get_level_page(1, 10)
+
+    service.on_player_saved(SimpleNamespace(user_id=1, nickname="甲", level=70, exp=5))
+    service.on_tower_state_saved(SimpleNamespace(user_id=1, tower_type="tongtian", max_floor_record=40))
+    service.on_tower_state_saved(SimpleNamespace(user_id=4, tower_type="shiyuan", max_floor_record=99))
+    assert service.get_level_page(1, 1)["list"][0]["userId"] == 1
+    assert service.get_tower_page(1, 10, user_id=1)["myRank"] == 1
+    assert service.get_tower_page(1, 10)["total"] == 3
+
+    try:
+        with unit_of_work.transaction():
+            service.record_arena_success(3, "飞马", 2)
+            assert service.get_arena_page(1, 10, user_id=3, rank_name="飞马")["myRank"] == 2
+            raise RuntimeError("rollback")
+    except RuntimeError:
+        pass
+    assert service.get_arena_page(1, 10, user_id=3, rank_name="飞马")["myRank"] == 2
+
+    with unit_of_work.transaction():
+        service.record_arena_success(3, "飞马", 2)
+    assert service.get_arena_page(1, 10, user_id=3, rank_name="飞马")["myRank"] == 1
+    assert service.get_arena_page(1, 10, user_id=3)["list"][0]["userId"] == 1
+    assert repo.loads == 1
+
+
+def test_periodic_reconcile_picks_up_external_writes():
+    runner = DeferredRunner()
+    service, repo, clock = make_service(runner)
+    service.get_level_page(1, 10)
+
+    repo.players.append({"user_id": 5, "nickname": "戊", "level": 80, "exp": 0})
+    clock.now = 30
+    assert service.get_level_page(1, 10)["total"] == 4
+
+    # 到期的查询只触发一次后台对账，本身继续返回旧榜单
+    clock.now = 61
+    assert service.get_level_page(1, 10)["total"] == 4
+    assert service.get_level_page(1, 10)["total"] == 4
+    assert len(runner.tasks) == 1 and repo.loads == 1
+
+    runner.run_all()
+    page = service.get_level_page(1, 10, user_id=5)
+    assert page["total"] == 5 and page["myRank"] == 1
+    assert repo.loads == 2 and runner.tasks == []
+
+
+def test_increments_committed_during_reconcile_survive_the_swap():
+    runner = DeferredRunner()
+    service, repo, clock = make_service(runner)
+    service.get_level_page(1, 10)
+    clock.now = 61
+    service.get_level_page(1, 10)
+
+    load_arena = repo.load_arena_success
+
+    def scan_while_players_win():
+        # 读到擂台快照之前提交一次（快照已含），之后再提交一次（快照不含）
+        service.record_arena_success(2, "天阶", 1)
+        repo.arena[1]["success_count"] = 6
+        rows = load_arena()
+        service.record_arena_success(2, "天阶", 1)
+        service.on_player_saved(SimpleNamespace(user_id=4, nickname="丁", level=90, exp=0))
+        service.on_tower_state_saved(SimpleNamespace(user_id=3, tower_type="tongtian", max_floor_record=50))
+        # 对账查询不持锁：其它线程的查询可以照常返回旧榜单
+        pages = []
+        reader = threading.Thread(target=lambda: pages.append(service.get_level_page(1, 1)))
+        reader.start()
+        reader.join(2)
+        assert pages and pages[0]["list"][0]["userId"] == 4
+        return rows
+
+    repo.load_arena_success = scan_while_players_win
+    runner.run_all()
+
+    arena = service.get_arena_page(1, 10, user_id=2, rank_name="天阶")
+    assert arena["list"][0] == {"userId": 2, "nickname": "乙", "level": 50, "successCount": 7, "rankName": "天阶"}
+    assert service.get_level_page(1, 1)["list"][0]["userId"] == 4
+    assert service.get_tower_page(1, 1)["list"][0]["userId"] == 3
+    assert repo.loads == 2
@@ -0,0 +1,129 @@
+"""一键噬魂：经验表二分定位与逐级升级一致，材料一次删除、目标一次更新
+
+运行方式（项目根目录）：
+    python -m pytest tests/application/services/test_mosoul_feed_service.py -vv
+"""
+
+import random
+
+import pytest
+
+from application.services.mosoul_feed_service import MoSoulFeedError, MoSoulFeedService
+from domain.entities.mosoul import MoSoul, _load_upgrade_config
+from domain.services.mosoul_system import GRADE_TEMPLATES, MOSOUL_MAX_LEVEL, MoSoulExpTable
+
+CONFIG = _load_upgrade_config()
+GRADES = list(CONFIG["upgrade_exp"].keys())
+
+
+def step_feed(config, grade, level, exp, add_exp):
+    """逐级升级的参考实现"""
+    if level >= MOSOUL_MAX_LEVEL:
+        return level, exp, 0
+    levels = config["upgrade_exp"].get(grade, {}).get("levels", {})
+    start_level, start_exp = level, exp
+    exp += add_exp
+    while level < MOSOUL_MAX_LEVEL:
+        required = int(levels.get(str(level), 0) or 0)
+        if required <= 0 or exp < required:
+            break
+        exp -= required
+        level += 1
+    if level >= MOSOUL_MAX_LEVEL:
+        needed = sum(int(levels[str(lv)]) for lv in range(start_level, MOSOUL_MAX_LEVEL)) - start_exp
+        return MOSOUL_MAX_LEVEL, 0, max(0, min(add_exp, needed))
+    return level, exp, add_exp
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_binary_search_matches_step_by_step(seed):
+    rng = random.Random(seed)
+    table = MoSoulExpTable(CONFIG)
+    for _ in range(200):
+        grade = rng.choice(GRADES)
+        level = rng.randint(1, MOSOUL_MAX_LEVEL)
+        exp = rng.randint(0, 3000)
+        add_exp = rng.choice([0, 50, rng.randint(1, 5000), rng.randint(1, 5_000_000)])
+        assert table.feed(grade, level, exp, add_exp) == step_feed(CONFIG, grade, level, exp, add_exp)
+
+
+def test_missing_level_config_stops_leveling():
+    config = {"upgrade_exp": {"yellow_soul": {"levels": {"1": 100, "2": 200}}}}
+    table = MoSoulExpTable(config)
+
+    assert table.feed("yellow_soul", 1, 0, 250) == (2, 150, 250)
+    assert table.feed("yellow_soul", 1, 0, 10_000) == (3, 9_700, 10_000)
+    assert table.feed("unknown", 1, 0, 10) == (1, 10, 10)
+    assert table.feed("yellow_soul", 10, 5, 10) == (10, 5, 0)
+
+
+class FakeMoSoulRepo:
+    def __init__(self, souls):
+        self.souls = {s.id: s for s in souls}
+        self.saved = []
+        self.deleted = []
+        self.listed = 0
+
+    def get_by_id(self, soul_id):
+        soul = self.souls.get(soul_id)
+        return MoSoul(**vars(soul)) if soul else None
+
+    def get_unequipped_by_user_id(self, user_id):
+        self.listed += 1
+        return [MoSoul(**vars(s)) for s in self.souls.values() if s.user_id == user_id and s.beast_id is None]
+
+    def save(self, soul):
+        self.saved.append(soul)
+        self.souls[soul.id] = MoSoul(**vars(soul))
+        return soul
+
+    def delete_batch(self, soul_ids):
+        self.deleted.append(list(soul_ids))
+        for soul_id in soul_ids:
+            del self.souls[soul_id]
+
+
+def template(grade, i=0):
+    return GRADE_TEMPLATES[grade][i]
+
+
+def make_repo():
+    souls = [MoSoul(id=1, user_id=7, template_id=template("earth_soul"), level=2, exp=100, beast_id=42)]
+    souls += [MoSoul(id=10 + i, user_id=7, template_id=template("yellow_soul", i % 12)) for i in range(60)]
+    souls += [MoSoul(id=100 + i, user_id=7, template_id=template("dark_soul", i)) for i in range(5)]
+    souls += [MoSoul(id=200, user_id=7, template_id=template("heaven_soul"), beast_id=42)]
+    souls += [MoSoul(id=300, user_id=8, template_id=template("god_soul"))]
+    return FakeMoSoulRepo(souls)
+
+
+def test_consume_all_deletes_materials_in_one_batch():
+    repo = make_repo()
+    table = MoSoulExpTable(CONFIG)
+    service = MoSoulFeedService(repo, table)
+
+    result = service.consume_all(7, 1)
+
+    provide = CONFIG["grade_exp_provide"]
+    exp_total = 60 * provide["yellow_soul"] + 5 * provide["dark_soul"]
+    level, exp, used = step_feed(CONFIG, "earth_soul", 2, 100, exp_total)
+    assert (result.consumed_count, result.exp_total, result.exp_used) == (65, exp_total, used)
+    assert (result.before_level, result.after_level, result.after_exp) == (2, level, exp)
+    assert result.beast_id == 42 and result.exp_wasted == exp_total - used
+    assert repo.listed == 1 and len(repo.saved) == 1 and len(repo.deleted) == 1
+    assert sorted(repo.deleted[0]) == list(range(10, 70)) + list(range(100, 105))
+    assert sorted(repo.souls) == [1, 200, 300]
+    assert (repo.souls[1].level, repo.souls[1].exp) == (level, exp)
+
+
+def test_grade_filter_and_errors():
+    repo = make_repo()
+    service = MoSoulFeedService(repo, MoSoulExpTable(CONFIG))
+
+    result = service.consume_all(7, 1, "dark_soul")
+    assert result.consumed_count == 5 and sorted(repo.deleted[0]) == list(range(100, 105))
+
+    with pytest.raises(MoSoulFeedError, match="没有可吞噬的材料魔魂"):
+        service.consume_all(7, 1, "dark_soul")
+    with pytest.raises(MoSoulFeedError, match="目标魔魂不存在"):
+        service.consume_all(7, 300)
+    assert len(repo.saved) == 1
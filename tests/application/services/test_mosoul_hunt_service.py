@@ -0,0 +1,226 @@
+"""一键猎魂：引擎在内存中连续猎魂（停止条件、保底、账目守恒），服务层一个事务内一次性落库
+
+运行方式（项目根目录）：
+    python -m pytest tests/application/services/test_mosoul_hunt_service.py -vv
+"""
+
+import random
+
+import pytest
+
+from application.services.mosoul_hunt_service import MoSoulBatchHuntService, MoSoulHuntError
+from domain.services.mosoul_system import (
+    ADV_DRAGON_PITY_COUNTER_KEY,
+    ADV_GLOBAL_DRAGON_PITY,
+    ADV_PERSONAL_DRAGON_PITY,
+    GRADE_TEMPLATES,
+    HUNTER_CONFIG,
+    MAX_BATCH_HUNTS,
+    NORMAL_HEAVEN_PITY_COPPER,
+    NORMAL_HEAVEN_PITY_COUNTER_KEY,
+    SOUL_CHARM_ITEM_ID,
+    BatchHuntSnapshot,
+    MoSoulBatchHuntEngine,
+)
+
+
+def snapshot(arena_type="normal", gold=10_000_000, soul_charm=0, warehouse_count=0, capacity=500, **kwargs):
+    return BatchHuntSnapshot(
+        arena_type=arena_type,
+        gold=gold,
+        soul_charm=soul_charm,
+        warehouse_count=warehouse_count,
+        warehouse_capacity=capacity,
+        unlocked=kwargs.pop("unlocked", {}),
+        **kwargs,
+    )
+
+
+def grade_of(template_id):
+    return next(grade for grade, ids in GRADE_TEMPLATES.items() if template_id in ids)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_roll_is_deterministic_and_balanced(seed):
+    start = snapshot(gold=3_000_000, capacity=60)
+    plan = MoSoulBatchHuntEngine(random.Random(seed)).roll(start, MAX_BATCH_HUNTS)
+    again = MoSoulBatchHuntEngine(random.Random(seed)).roll(start, MAX_BATCH_HUNTS)
+
+    assert plan.rolls == again.rolls and plan.end == again.end
+    assert start.gold == 3_000_000 and start.unlocked == {}  # 快照不被修改
+    assert plan.end.gold == start.gold - plan.total_cost + plan.total_sell == start.gold + plan.gold_delta
+    assert plan.total_cost == sum(r.cost for r in plan.rolls)
+    assert plan.end.warehouse_count == len(plan.template_ids) <= 60
+    assert all(grade_of(t) not in ("dragon_soul", "waste_soul") for t in plan.template_ids)
+    if len(plan.rolls) < MAX_BATCH_HUNTS:
+        assert plan.stop_reason
+
+
+def test_stops_when_gold_runs_out():
+    cost = HUNTER_CONFIG["amy"]["cost"]
+    rng = random.Random(1)
+    rng.random = lambda: 0.99  # 不解锁下一位猎魂师
+    plan = MoSoulBatchHuntEngine(rng).roll(snapshot(gold=cost * 2 + 1), 10)
+
+    assert plan.stop_reason == "铜钱不足"
+    assert plan.end.gold < cost
+    assert all(r.hunter_id == "amy" for r in plan.rolls)
+
+
+def test_stops_when_warehouse_is_full():
+    plan = MoSoulBatchHuntEngine(random.Random(3)).roll(snapshot(warehouse_count=40, capacity=40), 10)
+
+    assert plan.rolls == [] and plan.stop_reason == "储魂器已满（40/40）"
+    assert plan.gold_delta == 0
+
+
+def test_normal_heaven_pity_forces_heaven_soul():
+    cost = HUNTER_CONFIG["wote"]["cost"]
+    start = snapshot(unlocked={"wote_unlocked": True}, global_copper_consumed=NORMAL_HEAVEN_PITY_COPPER - cost)
+    plan = MoSoulBatchHuntEngine(random.Random(7)).roll(start, 1)
+
+    assert plan.rolls[0].hunter_id == "wote"
+    assert grade_of(plan.rolls[0].template_id) == "heaven_soul"
+    assert plan.end.global_copper_consumed == 0
+    assert plan.end.unlocked["wote_unlocked"] is False
+
+
+def test_advanced_dragon_pity_personal_and_global():
+    personal = snapshot("advanced", soul_charm=4, personal_soul_charm_consumed=ADV_PERSONAL_DRAGON_PITY - 4)
+    plan = MoSoulBatchHuntEngine(random.Random(5)).roll(personal, 5)
+    assert [grade_of(t) for t in plan.template_ids] == ["dragon_soul"]
+    assert plan.end.personal_soul_charm_consumed == 0
+    assert plan.stop_reason == "追魂法宝不足" and plan.soul_charm_spent == 4
+
+    shared = snapshot("advanced", soul_charm=8, global_soul_charm_consumed=ADV_GLOBAL_DRAGON_PITY - 2)
+    plan = MoSoulBatchHuntEngine(random.Random(5)).roll(shared, 1)
+    assert grade_of(plan.template_ids[0]) == "dragon_soul"
+    assert plan.end.global_soul_charm_consumed == 2
+    assert plan.end.personal_soul_charm_consumed == 4
+
+
+class FakeHuntRepo:
+    def __init__(self, warehouse_count=0):
+        self.warehouse_count = warehouse_count
+        self.personal = {}
+        self.global_counters = {}
+        self.created = []
+        self.calls = []
+
+    def count_unequipped(self, user_id):
+        return self.warehouse_count
+
+    def lock_personal_consumed(self, user_id):
+        self.calls.append("lock_personal")
+        return self.personal.get(user_id, (0, 0))
+
+    def save_personal_consumed(self, user_id, soul_charm, copper):
+        self.calls.append("save_personal")
+        self.personal[user_id] = (soul_charm, copper)
+
+    def lock_global_consumed(self, counter_key):
+        self.calls.append(f"lock_global:{counter_key}")
+        return self.global_counters.get(counter_key, (0, 0))
+
+    def save_global_consumed(self, counter_key, soul_charm, copper):
+        self.calls.append(f"save_global:{counter_key}")
+        self.global_counters[counter_key] = (soul_charm, copper)
+
+    def create_mosouls(self, user_id, template_ids):
+        self.calls.append("create_mosouls")
+        start = len(self.created) + 1
+        self.created.extend(template_ids)
+        return list(range(start, start + len(template_ids)))
+
+
+class FakePlayerRepo:
+    def __init__(self, gold, fail_update=False):
+        self.gold = gold
+        self.fail_update = fail_update
+        self.updates = []
+
+    def get_player_by_id(self, user_id):
+        return {"id": user_id, "gold": self.gold}
+
+    def update_gold(self, user_id, delta, min_balance=None):
+        self.updates.append(delta)
+        if self.fail_update:
+            return False
+        self.gold += delta
+        return True
+
+
+class FakeInventory:
+    def __init__(self, soul_charm):
+        self.soul_charm = soul_charm
+        self.removed = []
+
+    def get_item_count(self, user_id, item_id, include_temp=False):
+        assert item_id == SOUL_CHARM_ITEM_ID
+        return self.soul_charm
+
+    def remove_item(self, user_id, item_id, quantity):
+        self.removed.append(quantity)
+        self.soul_charm -= quantity
+
+
+def make_service(gold=5_000_000, soul_charm=0, warehouse_count=0, fail_update=False, seed=11):
+    repo, player, inventory = FakeHuntRepo(warehouse_count), FakePlayerRepo(gold, fail_update), FakeInventory(soul_charm)
+    ensured = []
+    service = MoSoulBatchHuntService(
+        repo, inventory, player,
+        ensure_tables=lambda: ensured.append(True),
+        engine=MoSoulBatchHuntEngine(random.Random(seed)),
+    )
+    return service, repo, player, inventory, ensured
+
+
+def test_normal_batch_writes_once():
+    service, repo, player, inventory, ensured = make_service()
+
+    plan = service.batch_hunt(1, "normal", {}, count=500, warehouse_capacity=1000)
+
+    assert ensured == [True]
+    assert len(plan.rolls) == MAX_BATCH_HUNTS
+    assert player.updates == [plan.gold_delta] and player.gold == plan.end.gold
+    assert inventory.removed == []
+    assert repo.calls == [
+        f"lock_global:{NORMAL_HEAVEN_PITY_COUNTER_KEY}",
+        f"save_global:{NORMAL_HEAVEN_PITY_COUNTER_KEY}",
+        "create_mosouls",
+    ]
+    assert repo.global_counters[NORMAL_HEAVEN_PITY_COUNTER_KEY] == (0, plan.end.global_copper_consumed)
+    assert plan.soul_ids == list(range(1, len(plan.template_ids) + 1))
+    assert repo.created == plan.template_ids
+
+
+def test_advanced_batch_saves_both_pity_counters():
+    service, repo, player, inventory, _ = make_service(soul_charm=50)
+    repo.personal[1] = (ADV_PERSONAL_DRAGON_PITY - 4, 123)
+
+    plan = service.batch_hunt(1, "advanced", {}, count=MAX_BATCH_HUNTS, warehouse_capacity=1000)
+
+    assert plan.stop_reason == "追魂法宝不足"
+    assert inventory.removed == [plan.soul_charm_spent] and inventory.soul_charm == plan.end.soul_charm
+    assert player.updates == []
+    assert repo.personal[1] == (plan.end.personal_soul_charm_consumed, 123)
+    assert repo.global_counters[ADV_DRAGON_PITY_COUNTER_KEY] == (plan.end.global_soul_charm_consumed, 0)
+    assert grade_of(repo.created[0]) == "dragon_soul"
+
+
+def test_failed_gold_update_aborts_batch():
+    service, repo, player, _, _ = make_service(fail_update=True)
+
+    with pytest.raises(MoSoulHuntError):
+        service.batch_hunt(1, "normal", {}, count=20, warehouse_capacity=1000)
+
+    assert repo.created == [] and repo.global_counters == {}
+
+
+def test_full_warehouse_writes_nothing():
+    service, repo, player, _, _ = make_service(warehouse_count=30)
+
+    plan = service.batch_hunt(1, "normal", {}, count=10, warehouse_capacity=30)
+
+    assert plan.rolls == [] and plan.stop_reason
+    assert player.updates == [] and "create_mosouls" not in repo.calls
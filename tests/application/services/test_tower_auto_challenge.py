@@ -0,0 +1,104 @@
+"""自动闯塔流水线：与逐层 battle_one_floor 结果一致，只保留最后一层战报
+
+运行方式（项目根目录）：
+    python -m pytest tests/application/services/test_tower_auto_challenge.py -vv
+"""
+
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from application.services.tower_service import PlayerBeast, TowerBattleService
+from domain.entities.tower import TowerState
+from infrastructure.config.tower_config_repo import ConfigTowerRepo
+
+
+class MemoryStateRepo:
+    def __init__(self):
+        self.states = {}
+
+    def get_by_user_id(self, user_id, tower_type):
+        return self.states.setdefault((user_id, tower_type), TowerState(user_id=user_id, tower_type=tower_type))
+
+    def save(self, state):
+        self.states[(state.user_id, state.tower_type)] = state
+
+
+class CountingPlayerRepo:
+    def __init__(self):
+        self.calls = 0
+
+    def get_by_id(self, user_id):
+        self.calls += 1
+        return SimpleNamespace(level=80, nickname="测试玩家", vip_level=0, yuanbao=0)
+
+
+@pytest.fixture(scope="module")
+def config_repo():
+    return ConfigTowerRepo()
+
+
+def make_team(scale):
+    return [
+        PlayerBeast(
+            id=i, name=f"兽{i}", realm="天界", level=80,
+            hp=int(20000 * scale), attack=int(5000 * scale), defense=int(2500 * scale), speed=500,
+            nature="法系" if i % 2 else "物系", skills=["高级必杀", "高级连击", "高级反击"],
+        )
+        for i in range(1, 6)
+    ]
+
+
+def legacy_climb(service, user_id, tower_type, team, max_floor, rng):
+    """改造前的逐层实现：每层重新读取守塔幻兽、完整记录战报"""
+    outcomes = []
+    for floor in range(1, max_floor + 1):
+        guardians = service.config_repo.get_guardians_for_floor(tower_type, floor)
+        battle = service.battle_one_floor(user_id, tower_type, team, guardians, floor, rng=rng)
+        if battle.is_victory:
+            if service.config_repo.should_give_special_reward(tower_type, floor):
+                service.roll_special_reward(tower_type, floor)
+            service.roll_spirit_drop(tower_type, floor)
+        outcomes.append((floor, battle.is_victory))
+        if not battle.is_victory:
+            return outcomes, battle
+    return outcomes, battle
+
+
+@pytest.mark.parametrize("scale,seed", [(0.5, 1), (1, 3), (1, 8), (3, 5)])
+def test_pipeline_matches_floor_by_floor_battles(config_repo, scale, seed):
+    max_floor = config_repo.get_tower_config("tongtian").get("max_floor", 120)
+
+    legacy = TowerBattleService(MemoryStateRepo(), config_repo, None, CountingPlayerRepo())
+    random.seed(seed)
+    expected, expected_last = legacy_climb(
+        legacy, 1, "tongtian", make_team(scale), max_floor, random.Random(seed)
+    )
+    expected_next = random.random()
+
+    players = CountingPlayerRepo()
+    service = TowerBattleService(MemoryStateRepo(), config_repo, None, players)
+    random.seed(seed)
+    result = service.auto_challenge(1, "tongtian", make_team(scale), use_buff=False, rng=random.Random(seed))
+
+    # 战斗只使用传入的 rng；模块级 random 只被奖励掉落消耗，与逐层实现一致
+    assert [(b.floor, b.is_victory) for b in result.battles] == expected
+    assert random.random() == expected_next
+    assert players.calls == 2  # 次数校验 + 战报名称，各一次，与层数无关
+
+    *middle, last = result.battles
+    assert all(b.rounds == [] for b in middle)
+    assert last.to_detail_dict()["rounds"] == expected_last.to_detail_dict()["rounds"]
+    assert last.rounds
+
+
+def test_guardian_templates_are_cached_and_not_mutated(config_repo):
+    service = TowerBattleService(MemoryStateRepo(), config_repo, None, CountingPlayerRepo())
+    floor = service.get_guardian_floor("tongtian", 30)
+
+    random.seed(2)
+    service.auto_challenge(1, "tongtian", make_team(3), use_buff=False)
+
+    assert service.get_guardian_floor("tongtian", 30) is floor
+    assert all(b.hp_current == b.hp_max and not b.is_dead and not b.status_effects for b in floor.beasts)
@@ -0,0 +1,91 @@
+"""配置注册表：只解析一次、冻结共享、mtime 变化后整体替换、派生结构随之重建
+
+运行方式（项目根目录）：
+    python -m pytest tests/config/test_config_registry.py -vv
+"""
+
+import copy
+import json
+import os
+
+import pytest
+
+from infrastructure.config.registry import ConfigRegistry, FrozenDict, FrozenList
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def write(path, data, mtime):
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def registry(tmp_path):
+    write(tmp_path / "shop.json", {"items": [{"id": 1, "price": 10}], "categories": []}, 1000)
+    clock = FakeClock()
+    return ConfigRegistry(tmp_path, check_interval=1.0, clock=clock), tmp_path, clock
+
+
+def test_parsed_once_and_shared_frozen(registry):
+    reg, _, clock = registry
+    first = reg.get("shop.json")
+    for _ in range(5):
+        clock.now += 2
+        assert reg.get("shop.json") is first
+
+    assert isinstance(first, FrozenDict) and isinstance(first["items"], FrozenList)
+    with pytest.raises(TypeError):
+        first["items"][0]["price"] = 1
+    with pytest.raises(TypeError):
+        first["items"].append({})
+    assert json.loads(json.dumps(first)) == {"items": [{"id": 1, "price": 10}], "categories": []}
+
+    thawed = copy.deepcopy(first)
+    thawed["items"][0]["price"] = 1
+    assert type(thawed) is dict and first["items"][0]["price"] == 10
+
+    stats = reg.stats()["shop.json"]
+    assert stats["loads"] == 1 and stats["hits"] == 6
+
+
+def test_hot_reload_swaps_object_and_rebuilds_derived(registry):
+    reg, path, clock = registry
+    builds = []
+
+    def price_index(config):
+        builds.append(1)
+        return {item["id"]: item["price"] for item in config["items"]}
+
+    old = reg.get("shop.json")
+    assert reg.derived("shop.json", price_index) == {1: 10}
+    assert reg.derived("shop.json", price_index) == {1: 10}
+
+    write(path / "shop.json", {"items": [{"id": 1, "price": 20}]}, 2000)
+    assert reg.get("shop.json") is old  # 未到检查间隔
+    clock.now += 1
+    new = reg.get("shop.json")
+
+    assert new is not old and old["items"][0]["price"] == 10
+    assert reg.derived("shop.json", price_index) == {1: 20}
+    assert len(builds) == 2
+    assert reg.stats()["shop.json"]["loads"] == 2
+
+
+def test_broken_rewrite_keeps_previous_config(registry):
+    reg, path, clock = registry
+    old = reg.get("shop.json")
+
+    (path / "shop.json").write_text("{\"items\": [", encoding="utf-8")
+    os.utime(path / "shop.json", (3000, 3000))
+    clock.now += 1
+    assert reg.get("shop.json") is old
+
+    with pytest.raises(FileNotFoundError):
+        reg.get("missing.json")
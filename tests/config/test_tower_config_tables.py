@@ -0,0 +1,59 @@
+"""闯塔配置预编译表：与按需构建结果一致、查询不分配、返回副本、重载整体替换
+
+运行方式（项目根目录）：
+    python -m pytest tests/config/test_tower_config_tables.py -vv
+"""
+
+import pytest
+
+from domain.services.tower_floor import build_guardian_floor
+from infrastructure.config.tower_config_repo import ConfigTowerRepo
+
+
+@pytest.fixture(scope="module")
+def repo():
+    return ConfigTowerRepo()
+
+
+@pytest.mark.parametrize("tower_type,floor", [("tongtian", 1), ("tongtian", 120), ("longwen", 37), ("zhanling", 100)])
+def test_tables_match_on_demand_build(repo, tower_type, floor):
+    tables = repo._tables
+    built = build_guardian_floor(repo._build_guardians(
+        tables.tower_config, tables.guardians_config, tables.tongtian_beasts_config, tower_type, floor
+    ))
+    cached = repo.get_guardian_floor(tower_type, floor)
+
+    assert cached.stats == built.stats
+    assert cached.guardians == built.guardians
+    assert [(b.name, b.hp_max, b.physical_attack, b.magic_defense, b.speed, b.attack_type) for b in cached.beasts] == [
+        (b.name, b.hp_max, b.physical_attack, b.magic_defense, b.speed, b.attack_type) for b in built.beasts
+    ]
+    assert repo.get_guardian_floor(tower_type, floor) is cached
+
+
+def test_rewards_are_flattened_and_dict_views_are_copies(repo):
+    reward = repo.get_floor_reward_entry("tongtian", 10)
+    assert reward == (1270, 0, ())
+    assert repo.get_floor_reward_entry("tongtian", 10) is reward
+    assert repo.get_milestone_entry("tongtian", 10).gold == 500
+    assert repo.get_milestone_entry("tongtian", 11) is None
+
+    rewards = repo.get_floor_rewards("tongtian", 10)
+    rewards["milestone"] = {"gold": 1}
+    rewards["items"].append("x")
+    assert repo.get_floor_rewards("tongtian", 10) == {"gold": 1270, "exp": 0, "items": []}
+    assert repo.get_milestone_reward("tongtian", 10) == {"gold": 500, "items": []}
+    assert repo.get_floor_rewards("tongtian", 999) == {"gold": 0, "exp": 0, "items": []}
+
+
+def test_reload_swaps_tables_atomically():
+    repo = ConfigTowerRepo()
+    old_tables = repo._tables
+    old_floor = repo.get_guardian_floor("tongtian", 5)
+
+    repo.reload()
+
+    assert repo._tables is not old_tables
+    assert repo.get_guardian_floor("tongtian", 5) is not old_floor
+    assert repo.get_guardian_floor("tongtian", 5).stats == old_floor.stats
+    assert old_tables.guardian_floors[("tongtian", 5)] is old_floor  # 旧表仍完整可用
@@ -0,0 +1,169 @@
+"""数据库连接池单元测试（无需MySQL）
+
+运行方式（项目根目录）：
+    python -m pytest tests/db/test_connection_pool.py -vv
+"""
+
+import threading
+import time
+
+import pytest
+
+from infrastructure.db.connection_pool import ConnectionPool, PoolExhaustedError
+
+
+class FakeConnection:
+    """模拟原始连接"""
+    def __init__(self, serial):
+        self.serial = serial
+        self.closed = False
+        self.alive = True
+        self.rollbacks = 0
+        self.pings = 0
+
+    def ping(self, reconnect=False):
+        self.pings += 1
+        if not self.alive:
+            raise ConnectionError("gone")
+
+    def rollback(self):
+        if not self.alive:
+            raise ConnectionError("gone")
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnector:
+    def __init__(self):
+        self.created = []
+
+    def __call__(self):
+        conn = FakeConnection(len(self.created) + 1)
+        self.created.append(conn)
+        return conn
+
+
+def test_reuses_connection_and_rolls_back_on_release():
+    connector = FakeConnector()
+    pool = ConnectionPool(connector, min_size=0, max_size=2)
+
+    conn = pool.acquire()
+    first = conn.raw
+    conn.close()
+    conn.close()  # 重复归还无副作用
+
+    conn = pool.acquire()
+    assert conn.raw is first
+    conn.close()
+
+    assert len(connector.created) == 1
+    assert first.rollbacks == 2
+    assert not first.closed
+    assert pool.stats()["checkouts"] == 2
+
+
+def test_warmup_creates_min_size_connections():
+    connector = FakeConnector()
+    pool = ConnectionPool(connector, min_size=3, max_size=5)
+
+    pool.acquire().close()
+
+    stats = pool.stats()
+    assert len(connector.created) == 3
+    assert stats["idle"] == 3
+    assert stats["total"] == 3
+
+
+def test_exhaustion_times_out_and_is_counted():
+    pool = ConnectionPool(FakeConnector(), min_size=0, max_size=1, checkout_timeout=0.05)
+
+    held = pool.acquire()
+    with pytest.raises(PoolExhaustedError):
+        pool.acquire()
+    held.close()
+
+    stats = pool.stats()
+    assert stats["timeouts"] == 1
+    assert stats["waits"] == 1
+    assert stats["in_use"] == 0
+
+
+def test_waiter_gets_connection_released_by_other_thread():
+    pool = ConnectionPool(FakeConnector(), min_size=0, max_size=1, checkout_timeout=2)
+    held = pool.acquire()
+    got = []
+
+    def waiter():
+        conn = pool.acquire()
+        got.append(conn.raw)
+        conn.close()
+
+    t = threading.Thread(target=waiter)
+    t.start()
+    time.sleep(0.05)
+    raw = held.raw
+    held.close()
+    t.join(timeout=2)
+
+    assert got == [raw]
+    assert pool.stats()["waits"] == 1
+
+
+def test_failed_health_check_replaces_connection():
+    connector = FakeConnector()
+    pool = ConnectionPool(connector, min_size=0, max_size=2, health_check_interval=0)
+
+    conn = pool.acquire()
+    broken = conn.raw
+    conn.close()
+    broken.alive = False
+
+    conn = pool.acquire()
+    assert conn.raw is not broken
+    conn.close()
+
+    assert broken.closed
+    assert pool.stats()["health_check_failures"] == 1
+    assert pool.stats()["total"] == 1
+
+
+def test_max_lifetime_recycles_connection():
+    connector = FakeConnector()
+    pool = ConnectionPool(connector, min_size=0, max_size=2, max_lifetime=0.01)
+
+    conn = pool.acquire()
+    old = conn.raw
+    time.sleep(0.02)
+    conn.close()
+
+    conn = pool.acquire()
+    assert conn.raw is not old
+    conn.close()
+
+    assert old.closed
+    assert pool.stats()["recycled"] >= 1
+
+
+def test_concurrent_checkouts_never_exceed_max_size():
+    connector = FakeConnector()
+    pool = ConnectionPool(connector, min_size=0, max_size=4, checkout_timeout=5)
+
+    def worker():
+        for _ in range(50):
+            conn = pool.acquire()
+            time.sleep(0.0005)
+            conn.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stats = pool.stats()
+    assert len(connector.created) <= 4
+    assert stats["peak_in_use"] <= 4
+    assert stats["in_use"] == 0
+    assert stats["checkouts"] == 500
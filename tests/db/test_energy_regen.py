@@ -0,0 +1,116 @@
+"""调度器活力恢复：单条 UPDATE 与逐 VIP 等级更新结果一致，读取时补算与定时任务速率、上限相同（无需MySQL）
+
+运行方式（项目根目录）：
+    python -m pytest tests/db/test_energy_regen.py -vv
+"""
+
+import sqlite3
+from datetime import datetime, timedelta
+
+from domain.entities.player import Player
+from infrastructure import scheduler
+
+
+def make_db(rows):
+    db = sqlite3.connect(":memory:")
+    db.create_function("LEAST", 2, min)
+    db.execute(
+        "CREATE TABLE player (user_id INTEGER PRIMARY KEY, vip_level INTEGER, energy INTEGER,"
+        " last_energy_recovery_time TEXT)"
+    )
+    db.executemany("INSERT INTO player VALUES (?, ?, ?, NULL)", rows)
+    return db
+
+
+def run_statement(db, sql, params):
+    return db.execute(sql.replace("%s", "?"), params).rowcount
+
+
+def test_single_statement_matches_per_level_updates(monkeypatch):
+    caps = scheduler._load_vip_energy_max_config()
+    rows = []
+    uid = 0
+    for vip in list(range(11)) + [12]:
+        cap = caps.get(vip, 100)
+        for energy in (0, cap - 1, cap, cap + 5):
+            uid += 1
+            rows.append((uid, vip, energy))
+
+    expected = make_db(rows)
+    for vip in range(11):
+        cap = caps.get(vip, 100)
+        expected.execute(
+            "UPDATE player SET energy = LEAST(energy + 1, ?) WHERE vip_level = ? AND energy < ?",
+            (cap, vip, cap),
+        )
+
+    actual = make_db(rows)
+    executed = []
+
+    def fake_execute_update(sql, params=None):
+        executed.append(sql)
+        return run_statement(actual, sql, params)
+
+    monkeypatch.setattr(scheduler, "execute_update", fake_execute_update)
+    scheduler._run_energy_regen()
+
+    assert len(executed) == 1
+    query = "SELECT user_id, energy FROM player ORDER BY user_id"
+    assert actual.execute(query).fetchall() == expected.execute(query).fetchall()
+    # 参与恢复的玩家（含已满的）都记下恢复时间，读取时不会把这一分钟再补算一次
+    stamped = actual.execute(
+        "SELECT user_id FROM player WHERE last_energy_recovery_time IS NOT NULL ORDER BY user_id"
+    ).fetchall()
+    assert stamped == [(uid,) for uid, vip, _ in rows if vip in range(11)]
+
+
+def test_capped_player_spending_after_hours_is_not_refilled_on_read(monkeypatch):
+    caps = scheduler._load_vip_energy_max_config()
+    cap = caps.get(0, 100)
+    tick = datetime(2026, 5, 1, 18, 0, 0)
+    db = make_db([(1, 0, cap)])
+    db.execute("UPDATE player SET last_energy_recovery_time = ?", ((tick - timedelta(hours=6)).isoformat(" "),))
+
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return tick
+
+    monkeypatch.setattr(scheduler, "datetime", FrozenDatetime)
+    monkeypatch.setattr(scheduler, "execute_update", lambda sql, params=None: run_statement(db, sql, params))
+
+    # 满活力挂机 6 小时，定时任务照常运行；随后消耗 30 点再读取
+    scheduler._run_energy_regen()
+    db.execute("UPDATE player SET energy = energy - 30")
+
+    energy, stamp = db.execute("SELECT energy, last_energy_recovery_time FROM player").fetchone()
+    player = Player(
+        user_id=1, username="u", vip_level=0, energy=energy,
+        last_energy_recovery_time=datetime.fromisoformat(stamp),
+    )
+    player.recover_energy(tick + timedelta(seconds=30))
+    assert player.energy == cap - 30
+
+    player.recover_energy(tick + timedelta(minutes=2))
+    assert player.energy == cap - 28  # 之后仍按每分钟 +1 恢复
+
+
+def test_statement_is_reused_until_config_changes():
+    first = scheduler._build_energy_regen_statement()
+    assert scheduler._build_energy_regen_statement() is first
+
+
+def test_lazy_recovery_matches_job_rate_and_vip_cap():
+    caps = scheduler._load_vip_energy_max_config()
+    vip = max(caps, key=caps.get) if caps else 0
+    cap = caps.get(vip, 100)
+    start = datetime(2026, 5, 1, 12, 0, 0)
+
+    player = Player(user_id=1, username="u", vip_level=vip, energy=cap - 10, last_energy_recovery_time=start)
+    assert player.max_energy == cap
+    assert player.recover_energy(start + timedelta(minutes=7, seconds=30))
+    assert player.energy == cap - 3  # 每分钟 +1，与定时任务一致
+    assert player.last_energy_recovery_time == start + timedelta(minutes=7)
+
+    assert player.recover_energy(start + timedelta(hours=1))
+    assert player.energy == cap
@@ -0,0 +1,145 @@
+"""数据库工作单元（请求级事务）单元测试（无需MySQL）
+
+运行方式（项目根目录）：
+    python -m pytest tests/db/test_unit_of_work.py -vv
+"""
+
+import pytest
+
+from infrastructure.db import connection
+from infrastructure.db.connection_pool import ConnectionPool
+from infrastructure.db.unit_of_work import transaction, transactional, current_unit_of_work
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.lastrowid = 0
+
+    def execute(self, sql, params=None):
+        self.conn.executed.append(sql)
+        self.lastrowid = len(self.conn.executed)
+        return 1
+
+    def fetchall(self):
+        return [{"n": 1}]
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakeConnection:
+    def __init__(self):
+        self.executed = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def ping(self, reconnect=False):
+        pass
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_pool(monkeypatch):
+    created = []
+
+    def connect():
+        conn = FakeConnection()
+        created.append(conn)
+        return conn
+
+    pool = ConnectionPool(connect, min_size=0, max_size=4)
+    monkeypatch.setattr(connection, "get_pool", lambda: pool)
+    pool.created_connections = created
+    return pool
+
+
+def test_autocommit_without_transaction(fake_pool):
+    connection.execute_update("UPDATE a")
+    connection.execute_update("UPDATE b")
+
+    conn = fake_pool.created_connections[0]
+    assert conn.commits == 2
+
+
+def test_statements_share_one_connection_and_one_commit(fake_pool):
+    with transaction() as uow:
+        connection.execute_query("SELECT 1")
+        connection.execute_update("UPDATE a")
+        new_id = connection.execute_insert("INSERT b")
+        legacy = connection.get_connection()
+        with legacy.cursor() as cursor:
+            cursor.execute("DELETE c")
+        legacy.commit()
+        legacy.close()
+
+    assert new_id == 3
+    assert len(fake_pool.created_connections) == 1
+    conn = fake_pool.created_connections[0]
+    assert conn.executed == ["SELECT 1", "UPDATE a", "INSERT b", "DELETE c"]
+    assert conn.commits == 1
+    assert uow.statements == 4
+    assert fake_pool.stats()["in_use"] == 0
+
+
+def test_exception_rolls_back_and_skips_commit(fake_pool):
+    committed = []
+    with pytest.raises(ValueError):
+        with transaction() as uow:
+            uow.on_commit(lambda: committed.append(True))
+            connection.execute_update("UPDATE a")
+            raise ValueError("boom")
+
+    conn = fake_pool.created_connections[0]
+    assert conn.commits == 0
+    assert conn.rollbacks >= 1
+    assert committed == []
+    assert current_unit_of_work() is None
+
+
+def test_nested_transactions_join_outer(fake_pool):
+    @transactional
+    def inner():
+        connection.execute_update("UPDATE inner")
+        return current_unit_of_work()
+
+    with transaction() as outer:
+        connection.execute_update("UPDATE outer")
+        assert inner() is outer
+
+    conn = fake_pool.created_connections[0]
+    assert conn.commits == 1
+    assert conn.executed == ["UPDATE outer", "UPDATE inner"]
+
+
+def test_on_commit_runs_after_commit(fake_pool):
+    order = []
+    with transaction() as uow:
+        connection.execute_update("UPDATE a")
+        uow.on_commit(lambda: order.append(fake_pool.created_connections[0].commits))
+
+    assert order == [1]
+
+
+def test_transaction_without_sql_does_not_borrow_connection(fake_pool):
+    with transaction():
+        pass
+
+    assert fake_pool.created_connections == []
@@ -0,0 +1,50 @@
+"""PVP 引擎测试共用的幻兽 / 玩家构造
+
+各测试文件只保留自己的对阵（幻兽编号、攻击类型、技能与属性覆盖）。
+"""
+
+import pytest
+
+from domain.services.pvp_battle_engine import PvpBeast, PvpPlayer
+
+
+def _make_beast(beast_id, attack_type, skills, **overrides):
+    stats = dict(
+        id=beast_id,
+        name=f"beast-{beast_id}",
+        hp_max=6000,
+        hp_current=6000,
+        physical_attack=2600,
+        magic_attack=2500,
+        physical_defense=1500,
+        magic_defense=1400,
+        speed=400,
+        attack_type=attack_type,
+        skills=skills,
+    )
+    stats.update(overrides)
+    return PvpBeast(**stats)
+
+
+@pytest.fixture(scope="session")
+def make_beast():
+    """make_beast(beast_id, attack_type, skills, **属性覆盖) -> 满血 PvpBeast"""
+    return _make_beast
+
+
+@pytest.fixture(scope="session")
+def make_players():
+    """make_players(攻方幻兽, 守方幻兽, attacker_id=1, defender_id=2) -> (攻方, 守方)
+
+    幻兽按 (beast_id, attack_type, skills[, {属性覆盖}]) 描述；每次调用都构造新的满血对象。
+    """
+
+    def build(attacker_beasts, defender_beasts, attacker_id=1, defender_id=2, level=45):
+        def team(specs):
+            return [_make_beast(*spec[:3], **(spec[3] if len(spec) > 3 else {})) for spec in specs]
+
+        attacker = PvpPlayer(player_id=attacker_id, level=level, name="攻方", beasts=team(attacker_beasts))
+        defender = PvpPlayer(player_id=defender_id, level=level, name="守方", beasts=team(defender_beasts))
+        return attacker, defender
+
+    return build
@@ -0,0 +1,72 @@
+"""紧凑战报：编码后解码得到的战报与完整日志直接渲染的结果逐字一致，且体积远小于 JSON
+
+运行方式（项目根目录）：
+    python -m pytest tests/domain/services/test_battle_report.py -vv
+"""
+
+import json
+import random
+
+import pytest
+
+from domain.services.battle_report import (
+    RESULT_STYLE_FALLEN,
+    RESULT_STYLE_WINNER,
+    build_battle_data,
+    decode_battle_report,
+    encode_battle_report,
+)
+from domain.services.pvp_battle_engine import LOG_COMPACT, PvpBattleResult, PvpPlayer, run_pvp_battle
+
+
+ATTACKER = [
+    (11, "physical", ["高级必杀", "高级破甲", "高级反击"], {"speed": 420}),
+    (12, "magic", ["高级吸血", "高级麻痹", "高级毒攻", "高级闪避"]),
+    (13, "physical", ["高级连击"]),
+]
+DEFENDER = [
+    (21, "magic", ["高级致盲", "高级反震", "闪避"], {"hp_max": 8000, "hp_current": 8000}),
+    (22, "physical", ["毒攻", "抗性增强", "反击"], {"hp_max": 8000, "hp_current": 8000}),
+]
+
+
+@pytest.fixture
+def run(make_players):
+    def run_seeded(seed, **kwargs):
+        attacker, defender = make_players(ATTACKER, DEFENDER, attacker_id=7, defender_id=9)
+        random.seed(seed)
+        return run_pvp_battle(attacker, defender, max_log_turns=50, **kwargs), attacker, defender
+
+    return run_seeded
+
+
+@pytest.mark.parametrize("style", [RESULT_STYLE_WINNER, RESULT_STYLE_FALLEN])
+@pytest.mark.parametrize("seed", range(20))
+def test_decoded_report_matches_full_render(seed, style, run):
+    full, attacker, defender = run(seed)
+    expected = build_battle_data(full, attacker, defender, style)
+
+    compact, attacker, defender = run(seed, log_mode=LOG_COMPACT)
+    blob = encode_battle_report(compact, attacker, defender, style)
+
+    assert isinstance(blob, bytes)
+    assert decode_battle_report(blob) == expected
+    assert len(blob) * 4 < len(json.dumps(expected, ensure_ascii=False).encode("utf-8"))
+
+
+def test_empty_battle_keeps_outcome(make_beast):
+    attacker = PvpPlayer(player_id=7, level=30, name="攻方", beasts=[make_beast(11, "physical", [])])
+    defender = PvpPlayer(player_id=9, level=30, name="守方", beasts=[])
+    result = PvpBattleResult(
+        attacker_player_id=7, defender_player_id=9, winner_player_id=7, loser_player_id=9, total_turns=0
+    )
+
+    assert decode_battle_report(encode_battle_report(result, attacker, defender)) == {
+        "is_victory": True, "attacker_wins": 1, "defender_wins": 0, "battles": [],
+    }
+
+
+def test_full_mode_result_is_rejected(run):
+    full, attacker, defender = run(1)
+    with pytest.raises(ValueError):
+        encode_battle_report(full, attacker, defender)
@@ -0,0 +1,80 @@
+"""PVP 批量模拟器与单场引擎的一致性
+
+运行方式（项目根目录）：
+    python -m pytest tests/domain/services/test_pvp_batch_simulator.py -vv
+"""
+
+import copy
+import random
+
+from domain.services.pvp_batch_simulator import MatchupSimulator, simulate_matchup
+from domain.services.pvp_battle_engine import LOG_COMPACT, LOG_NONE, run_pvp_battle
+
+
+ATTACKER = [
+    (11, "physical", ["高级必杀", "高级破甲", "高级反击"], {"speed": 420}),
+    (12, "magic", ["高级吸血", "高级麻痹", "毒攻", "高级闪避"], {"hp_max": 5000, "hp_current": 5000}),
+    (13, "physical", ["连击", "偷袭", "反震"], {"physical_attack": 1200}),
+]
+DEFENDER = [
+    (21, "magic", ["高级雷击", "高级反震", "闪避"], {"critical_resist": 0.5, "hp_max": 8000, "hp_current": 8000}),
+    (22, "physical", ["高级冲撞", "抗性增强", "高级反击"], {"poison_resist": 0.5, "hp_max": 8000, "hp_current": 8000}),
+    # 先手数值与攻方 11 号完全相同（两者相遇时走随机先手分支）
+    (23, "physical", ["高级虚弱"], {"speed": 420}),
+]
+
+
+def test_same_seed_reproduces_scalar_engine_exactly(make_players):
+    attacker, defender = make_players(ATTACKER, DEFENDER)
+    sim = MatchupSimulator(attacker, defender)
+
+    for seed in range(120):
+        a, d = copy.deepcopy(attacker), copy.deepcopy(defender)
+        expected = run_pvp_battle(a, d, max_log_turns=10 ** 6, log_mode=LOG_COMPACT, rng=random.Random(seed))
+
+        outcome = sim.fight(random.Random(seed))
+
+        assert outcome.attacker_won == (expected.winner_player_id == attacker.player_id)
+        assert outcome.turns == expected.total_turns == len(expected.compact_logs)
+        # 伤害合计与逐条战报一致：己方出手伤害 + 对方出手时被反震/反击的伤害
+        for side, total in ((0, outcome.attacker_damage), (1, outcome.defender_damage)):
+            assert total == sum(
+                c.damage if c.actor == side else c.reflect_damage for c in expected.compact_logs
+            )
+        assert outcome.attacker_hp_left == sum(b.hp_current for b in a.beasts)
+        assert outcome.defender_hp_left == sum(b.hp_current for b in d.beasts)
+
+
+def test_win_rate_agrees_with_independent_scalar_runs(make_players):
+    attacker, defender = make_players(ATTACKER, DEFENDER)
+    stats = simulate_matchup(attacker, defender, fights=1500, seed=7)
+
+    rng_state = random.getstate()
+    try:
+        random.seed(99)
+        scalar_wins = 0
+        for _ in range(400):
+            result = run_pvp_battle(copy.deepcopy(attacker), copy.deepcopy(defender), log_mode=LOG_NONE)
+            scalar_wins += result.winner_player_id == attacker.player_id
+    finally:
+        random.setstate(rng_state)
+
+    # 两组独立样本的胜率差应在约 4 个标准误之内
+    p = stats.win_rate
+    stderr = (p * (1 - p) * (1 / 1500 + 1 / 400)) ** 0.5
+    assert 0.2 < p < 0.8
+    assert abs(scalar_wins / 400 - p) < 4 * stderr
+
+
+def test_stats_and_inputs_untouched(make_players):
+    attacker, defender = make_players(ATTACKER, DEFENDER)
+    snapshot = copy.deepcopy((attacker, defender))
+
+    stats = simulate_matchup(attacker, defender, fights=300, seed=1)
+
+    assert (attacker, defender) == snapshot
+    assert stats.fights == 300 == len(stats.turns) == sum(stats.turn_histogram().values())
+    summary = stats.to_dict()
+    assert 0.0 <= summary["win_rate_95"][0] <= summary["win_rate"] <= summary["win_rate_95"][1] <= 1.0
+    assert summary["attacker_damage"]["min"] > 0
+    assert stats.to_dict() == simulate_matchup(attacker, defender, fights=300, seed=1).to_dict()
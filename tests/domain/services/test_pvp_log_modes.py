@@ -0,0 +1,63 @@
+"""run_pvp_battle 战报模式：full / compact / none 结果一致，紧凑战报可逐字还原
+
+运行方式（项目根目录）：
+    python -m pytest tests/domain/services/test_pvp_log_modes.py -vv
+"""
+
+import copy
+import random
+
+import pytest
+
+from domain.services.pvp_battle_engine import (
+    LOG_COMPACT,
+    LOG_NONE,
+    expand_compact_logs,
+    run_pvp_battle,
+)
+
+
+ATTACKER = [
+    (11, "physical", ["高级必杀", "高级破甲", "高级反击"], {"speed": 420}),
+    (12, "magic", ["高级吸血", "高级麻痹", "高级毒攻", "高级闪避"]),
+]
+DEFENDER = [
+    (21, "magic", ["高级致盲", "高级反震", "闪避"], {"hp_max": 8000, "hp_current": 8000}),
+    (22, "physical", ["毒攻", "抗性增强", "反击"], {"hp_max": 8000, "hp_current": 8000}),
+]
+
+
+@pytest.fixture
+def run(make_players):
+    def run_seeded(seed, **kwargs):
+        attacker, defender = make_players(ATTACKER, DEFENDER)
+        random.seed(seed)
+        return run_pvp_battle(attacker, defender, **kwargs), attacker, defender
+
+    return run_seeded
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_compact_stream_expands_to_full_report(seed, run):
+    full, _, _ = run(seed, max_log_turns=200)
+    compact, attacker, defender = run(seed, max_log_turns=200, log_mode=LOG_COMPACT)
+
+    assert compact.logs == []
+    assert len(compact.compact_logs) == len(full.logs)
+    assert expand_compact_logs(compact.compact_logs, attacker, defender) == full.logs
+    assert compact.expand_logs(attacker, defender) is compact.logs
+
+
+def test_result_only_mode_keeps_outcome_and_skips_logs(run):
+    for seed in range(30):
+        full, _, _ = run(seed)
+        fast, _, _ = run(seed, log_mode=LOG_NONE)
+
+        assert (fast.winner_player_id, fast.total_turns) == (full.winner_player_id, full.total_turns)
+        assert fast.logs == [] and fast.compact_logs == []
+
+
+def test_unknown_log_mode_is_rejected(make_players):
+    attacker, defender = make_players(ATTACKER, DEFENDER)
+    with pytest.raises(ValueError):
+        run_pvp_battle(copy.deepcopy(attacker), copy.deepcopy(defender), log_mode="verbose")
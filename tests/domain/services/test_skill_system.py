@@ -0,0 +1,76 @@
+"""技能系统预编译技能表
+
+运行方式（项目根目录）：
+    python -m pytest tests/domain/services/test_skill_system.py -vv
+"""
+
+import copy
+import random
+
+from domain.services.skill_system import (
+    get_skill_config,
+    get_skill_id,
+    get_skill_info,
+    get_skill_name,
+    get_skill_table,
+    resolve_skill_set,
+    trigger_active_skill,
+    try_trigger_active_skill,
+    try_trigger_passive_skill,
+)
+
+
+def test_every_configured_skill_is_interned_with_its_config_id():
+    config = get_skill_config()
+    for name, skill_id in config["skill_ids"].items():
+        assert get_skill_id(name) == skill_id
+        assert get_skill_name(skill_id) == name
+        assert get_skill_info(name)["category"] in ("active", "passive", "buff", "debuff")
+    assert get_skill_id("普攻") == 0 and get_skill_name(0) == "普攻"
+    assert get_skill_info("不存在的技能") is None
+
+
+def test_resolved_set_filters_by_attack_type_and_is_cached():
+    skills = ["高级破甲", "高级致盲", "高级必杀", "高级必杀", "高级闪避", "抗性增强", "体魄", "未知"]
+
+    physical = resolve_skill_set(skills, "physical")
+    magic = resolve_skill_set(skills, "magic")
+
+    assert [s.name for s in physical.actives] == ["高级破甲", "高级必杀", "高级必杀"]
+    assert [s.name for s in magic.actives] == ["高级致盲", "高级必杀", "高级必杀"]
+    assert [s.name for s in physical.passives] == ["高级闪避"]
+    assert physical.poison_resist_rates == (0.5,)
+    assert resolve_skill_set(list(skills), "physical") is physical
+    assert copy.deepcopy(physical) is physical
+
+
+def test_trigger_consumes_random_numbers_like_a_raw_config_scan():
+    config = get_skill_config()["active_skills"]
+    skills = ["高级必杀", "高级连击", "高级雷击", "高级撕咬"]  # 雷击为法攻技能，物攻幻兽不参与
+    raw = [(name, config["advanced"][name]) for name in skills if config["advanced"][name]["attack_type"] != "magic"]
+
+    for seed in range(200):
+        random.seed(seed)
+        candidates = list(raw)
+        random.shuffle(candidates)
+        expected = ""
+        for name, info in candidates:
+            rate = info["trigger_rate"] * (0.5 if info.get("is_critical") else 1)
+            if random.random() < rate:
+                expected = name
+                break
+        expected_next = random.random()
+
+        random.seed(seed)
+        result = try_trigger_active_skill(skills, "physical", defender_critical_resist=0.5)
+
+        assert result.skill_name == expected
+        assert random.random() == expected_next
+
+
+def test_untriggered_results_are_shared_and_empty():
+    skill_set = resolve_skill_set(["体魄"], "physical")
+    assert trigger_active_skill(skill_set) is trigger_active_skill(skill_set)
+    assert not trigger_active_skill(skill_set).triggered
+    assert not try_trigger_passive_skill(["体魄"], is_normal_attack=True).triggered
+    assert get_skill_table() is get_skill_table()